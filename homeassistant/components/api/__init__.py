@@ -12,6 +12,7 @@ from homeassistant.auth.permissions.const import POLICY_READ
 from homeassistant.bootstrap import DATA_LOGGING
 from homeassistant.components.http import HomeAssistantView
 from homeassistant.const import (
+    CONTENT_TYPE_JSON,
     EVENT_HOMEASSISTANT_STOP,
     MATCH_ALL,
     URL_API,
@@ -28,7 +29,11 @@ import homeassistant.core as ha
 from homeassistant.core import HomeAssistant
 from homeassistant.exceptions import ServiceNotFound, TemplateError, Unauthorized
 from homeassistant.helpers import template
-from homeassistant.helpers.json import json_dumps, json_loads
+from homeassistant.helpers.json import (
+    JSON_ENCODE_EXCEPTIONS,
+    json_dumps,
+    json_loads,
+)
 from homeassistant.helpers.service import async_get_all_descriptions
 from homeassistant.helpers.typing import ConfigType
 
@@ -175,7 +180,12 @@ class APIStatesView(HomeAssistantView):
             for state in request.app["hass"].states.async_all()
             if entity_perm(state.entity_id, "read")
         ]
-        return self.json(states)
+        try:
+            body = b"[" + b",".join(state.as_dict_json for state in states) + b"]"
+        except JSON_ENCODE_EXCEPTIONS:
+            # Let the view log the bad data and fail the request
+            return self.json(states)
+        return _json_response(body)
 
 
 class APIEntityStateView(HomeAssistantView):
@@ -192,7 +202,11 @@ class APIEntityStateView(HomeAssistantView):
             raise Unauthorized(entity_id=entity_id)
 
         if state := request.app["hass"].states.get(entity_id):
-            return self.json(state)
+            try:
+                return _json_response(state.as_dict_json)
+            except JSON_ENCODE_EXCEPTIONS:
+                # Let the view log the bad data and fail the request
+                return self.json(state)
         return self.json_message("Entity not found.", HTTPStatus.NOT_FOUND)
 
     async def post(self, request, entity_id):
@@ -395,3 +409,10 @@ def async_events_json(hass):
         {"event": key, "listener_count": value}
         for key, value in hass.bus.async_listeners().items()
     ]
+
+
+def _json_response(body: bytes) -> web.Response:
+    """Return a JSON response of an already serialized body."""
+    response = web.Response(body=body, content_type=CONTENT_TYPE_JSON)
+    response.enable_compression()
+    return response
@@ -0,0 +1,5 @@
+"""History integration constants."""
+
+DOMAIN = "history"
+HISTORY_FILTERS = "history_filters"
+HISTORY_USE_INCLUDE_ORDER = "history_use_include_order"
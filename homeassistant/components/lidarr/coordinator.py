@@ -36,6 +36,9 @@ class LidarrDataUpdateCoordinator(DataUpdateCoordinator[T], Generic[T], ABC):
             logger=LOGGER,
             name=DOMAIN,
             update_interval=timedelta(seconds=30),
+            # The coordinators poll the same server
+            update_group=host_configuration.url,
+            max_update_backoff=timedelta(minutes=5),
         )
         self.api_client = api_client
         self.host_configuration = host_configuration
@@ -15,8 +15,8 @@ from .entities_and_devices import entities_devices_stmt
 
 
 def statement_for_request(
-    start_day: dt,
-    end_day: dt,
+    start_day_dt: dt,
+    end_day_dt: dt,
     event_types: tuple[str, ...],
     entity_ids: list[str] | None = None,
     device_ids: list[str] | None = None,
@@ -24,6 +24,8 @@ def statement_for_request(
     context_id: str | None = None,
 ) -> StatementLambdaElement:
     """Generate the logbook statement for a logbook request."""
+    start_day = start_day_dt.timestamp()
+    end_day = end_day_dt.timestamp()
 
     # No entities: logbook sends everything for the timeframe
     # limited by the context_id and the yaml configured filter
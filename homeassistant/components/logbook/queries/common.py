@@ -1,8 +1,6 @@
 """Queries for logbook."""
 from __future__ import annotations
 
-from datetime import datetime as dt
-
 import sqlalchemy
 from sqlalchemy import select
 from sqlalchemy.orm import Query
@@ -18,8 +16,10 @@ from homeassistant.components.recorder.db_schema import (
     STATES_CONTEXT_ID_INDEX,
     EventData,
     Events,
+    EventTypes,
     StateAttributes,
     States,
+    StatesMeta,
 )
 from homeassistant.components.recorder.filters import like_domain_matchers
 
@@ -45,9 +45,9 @@ PSUEDO_EVENT_STATE_CHANGED = None
 
 EVENT_COLUMNS = (
     Events.event_id.label("event_id"),
-    Events.event_type.label("event_type"),
+    EventTypes.event_type.label("event_type"),
     Events.event_data.label("event_data"),
-    Events.time_fired.label("time_fired"),
+    Events.time_fired_ts.label("time_fired_ts"),
     Events.context_id.label("context_id"),
     Events.context_user_id.label("context_user_id"),
     Events.context_parent_id.label("context_parent_id"),
@@ -56,7 +56,7 @@ EVENT_COLUMNS = (
 STATE_COLUMNS = (
     States.state_id.label("state_id"),
     States.state.label("state"),
-    States.entity_id.label("entity_id"),
+    StatesMeta.entity_id.label("entity_id"),
     SHARED_ATTRS_JSON["icon"].as_string().label("icon"),
     OLD_FORMAT_ATTRS_JSON["icon"].as_string().label("old_format_icon"),
 )
@@ -64,7 +64,7 @@ STATE_COLUMNS = (
 STATE_CONTEXT_ONLY_COLUMNS = (
     States.state_id.label("state_id"),
     States.state.label("state"),
-    States.entity_id.label("entity_id"),
+    StatesMeta.entity_id.label("entity_id"),
     literal(value=None, type_=sqlalchemy.String).label("icon"),
     literal(value=None, type_=sqlalchemy.String).label("old_format_icon"),
 )
@@ -79,7 +79,7 @@ EVENT_COLUMNS_FOR_STATE_SELECT = [
         "event_type"
     ),
     literal(value=None, type_=sqlalchemy.Text).label("event_data"),
-    States.last_updated.label("time_fired"),
+    States.last_updated_ts.label("time_fired_ts"),
     States.context_id.label("context_id"),
     States.context_user_id.label("context_user_id"),
     States.context_parent_id.label("context_parent_id"),
@@ -108,19 +108,26 @@ NOT_CONTEXT_ONLY = literal(None).label("context_only")
 
 
 def select_events_context_id_subquery(
-    start_day: dt,
-    end_day: dt,
+    start_day: float,
+    end_day: float,
     event_types: tuple[str, ...],
 ) -> Select:
     """Generate the select for a context_id subquery."""
     return (
         select(Events.context_id)
-        .where((Events.time_fired > start_day) & (Events.time_fired < end_day))
-        .where(Events.event_type.in_(event_types))
+        .where((Events.time_fired_ts > start_day) & (Events.time_fired_ts < end_day))
+        .where(_event_type_id_matcher(event_types))
         .outerjoin(EventData, (Events.data_id == EventData.data_id))
     )
 
 
+def _event_type_id_matcher(event_types: tuple[str, ...]) -> ClauseList:
+    """Match the event_type_id of the event_types."""
+    return Events.event_type_id.in_(
+        select(EventTypes.event_type_id).where(EventTypes.event_type.in_(event_types))
+    )
+
+
 def select_events_context_only() -> Select:
     """Generate an events query that mark them as for context_only.
 
@@ -142,14 +149,15 @@ def select_states_context_only() -> Select:
 
 
 def select_events_without_states(
-    start_day: dt, end_day: dt, event_types: tuple[str, ...]
+    start_day: float, end_day: float, event_types: tuple[str, ...]
 ) -> Select:
     """Generate an events select that does not join states."""
     return (
         select(*EVENT_ROWS_NO_STATES, NOT_CONTEXT_ONLY)
-        .where((Events.time_fired > start_day) & (Events.time_fired < end_day))
-        .where(Events.event_type.in_(event_types))
+        .where((Events.time_fired_ts > start_day) & (Events.time_fired_ts < end_day))
+        .where(_event_type_id_matcher(event_types))
         .outerjoin(EventData, (Events.data_id == EventData.data_id))
+        .outerjoin(EventTypes, (Events.event_type_id == EventTypes.event_type_id))
     )
 
 
@@ -163,7 +171,7 @@ def select_states() -> Select:
 
 
 def legacy_select_events_context_id(
-    start_day: dt, end_day: dt, context_id: str
+    start_day: float, end_day: float, context_id: str
 ) -> Select:
     """Generate a legacy events context id select that also joins states."""
     # This can be removed once we no longer have event_ids in the states table
@@ -174,20 +182,23 @@ def legacy_select_events_context_id(
             *STATE_COLUMNS,
             NOT_CONTEXT_ONLY,
         )
+        .outerjoin(EventTypes, (Events.event_type_id == EventTypes.event_type_id))
         .outerjoin(States, (Events.event_id == States.event_id))
+        .outerjoin(StatesMeta, (States.metadata_id == StatesMeta.metadata_id))
         .where(
-            (States.last_updated == States.last_changed) | States.last_changed.is_(None)
+            (States.last_updated_ts == States.last_changed_ts)
+            | States.last_changed_ts.is_(None)
         )
         .where(_not_continuous_entity_matcher())
         .outerjoin(
             StateAttributes, (States.attributes_id == StateAttributes.attributes_id)
         )
-        .where((Events.time_fired > start_day) & (Events.time_fired < end_day))
+        .where((Events.time_fired_ts > start_day) & (Events.time_fired_ts < end_day))
         .where(Events.context_id == context_id)
     )
 
 
-def apply_states_filters(query: Query, start_day: dt, end_day: dt) -> Query:
+def apply_states_filters(query: Query, start_day: float, end_day: float) -> Query:
     """Filter states by time range.
 
     Filters states that do not have an old state or new state (added / removed)
@@ -196,13 +207,15 @@ def apply_states_filters(query: Query, start_day: dt, end_day: dt) -> Query:
     """
     return (
         query.filter(
-            (States.last_updated > start_day) & (States.last_updated < end_day)
+            (States.last_updated_ts > start_day) & (States.last_updated_ts < end_day)
         )
+        .outerjoin(StatesMeta, (States.metadata_id == StatesMeta.metadata_id))
         .outerjoin(OLD_STATE, (States.old_state_id == OLD_STATE.state_id))
         .where(_missing_state_matcher())
         .where(_not_continuous_entity_matcher())
         .where(
-            (States.last_updated == States.last_changed) | States.last_changed.is_(None)
+            (States.last_updated_ts == States.last_changed_ts)
+            | States.last_changed_ts.is_(None)
         )
         .outerjoin(
             StateAttributes, (States.attributes_id == StateAttributes.attributes_id)
@@ -243,7 +256,7 @@ def _not_possible_continuous_domain_matcher() -> sqlalchemy.and_:
     """
     return sqlalchemy.and_(
         *[
-            ~States.entity_id.like(entity_domain)
+            ~StatesMeta.entity_id.like(entity_domain)
             for entity_domain in (
                 *ALWAYS_CONTINUOUS_ENTITY_ID_LIKE,
                 *CONDITIONALLY_CONTINUOUS_ENTITY_ID_LIKE,
@@ -260,7 +273,7 @@ def _conditionally_continuous_domain_matcher() -> sqlalchemy.or_:
     """
     return sqlalchemy.or_(
         *[
-            States.entity_id.like(entity_domain)
+            StatesMeta.entity_id.like(entity_domain)
             for entity_domain in CONDITIONALLY_CONTINUOUS_ENTITY_ID_LIKE
         ],
     ).self_group()
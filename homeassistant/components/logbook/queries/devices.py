@@ -2,7 +2,6 @@
 from __future__ import annotations
 
 from collections.abc import Iterable
-from datetime import datetime as dt
 
 import sqlalchemy
 from sqlalchemy import lambda_stmt, select
@@ -15,7 +14,9 @@ from homeassistant.components.recorder.db_schema import (
     DEVICE_ID_IN_EVENT,
     EventData,
     Events,
+    EventTypes,
     States,
+    StatesMeta,
 )
 
 from .common import (
@@ -29,8 +30,8 @@ from .common import (
 
 
 def _select_device_id_context_ids_sub_query(
-    start_day: dt,
-    end_day: dt,
+    start_day: float,
+    end_day: float,
     event_types: tuple[str, ...],
     json_quotable_device_ids: list[str],
 ) -> CompoundSelect:
@@ -43,8 +44,8 @@ def _select_device_id_context_ids_sub_query(
 
 def _apply_devices_context_union(
     query: Query,
-    start_day: dt,
-    end_day: dt,
+    start_day: float,
+    end_day: float,
     event_types: tuple[str, ...],
     json_quotable_device_ids: list[str],
 ) -> CompoundSelect:
@@ -60,18 +61,21 @@ def _apply_devices_context_union(
             select_events_context_only()
             .select_from(devices_cte)
             .outerjoin(Events, devices_cte.c.context_id == Events.context_id)
-        ).outerjoin(EventData, (Events.data_id == EventData.data_id)),
+        )
+        .outerjoin(EventData, (Events.data_id == EventData.data_id))
+        .outerjoin(EventTypes, (Events.event_type_id == EventTypes.event_type_id)),
         apply_states_context_hints(
             select_states_context_only()
             .select_from(devices_cte)
             .outerjoin(States, devices_cte.c.context_id == States.context_id)
+            .outerjoin(StatesMeta, (States.metadata_id == StatesMeta.metadata_id))
         ),
     )
 
 
 def devices_stmt(
-    start_day: dt,
-    end_day: dt,
+    start_day: float,
+    end_day: float,
     event_types: tuple[str, ...],
     json_quotable_device_ids: list[str],
 ) -> StatementLambdaElement:
@@ -85,7 +89,7 @@ def devices_stmt(
             end_day,
             event_types,
             json_quotable_device_ids,
-        ).order_by(Events.time_fired)
+        ).order_by(Events.time_fired_ts)
     )
     return stmt
 
@@ -2,21 +2,23 @@
 from __future__ import annotations
 
 from collections.abc import Iterable
-from datetime import datetime as dt
 
 import sqlalchemy
 from sqlalchemy import lambda_stmt, select, union_all
 from sqlalchemy.orm import Query
+from sqlalchemy.sql.elements import ClauseList
 from sqlalchemy.sql.lambdas import StatementLambdaElement
 from sqlalchemy.sql.selectable import CTE, CompoundSelect
 
 from homeassistant.components.recorder.db_schema import (
     ENTITY_ID_IN_EVENT,
-    ENTITY_ID_LAST_UPDATED_INDEX,
+    METADATA_ID_LAST_UPDATED_INDEX_TS,
     OLD_ENTITY_ID_IN_EVENT,
     EventData,
     Events,
+    EventTypes,
     States,
+    StatesMeta,
 )
 
 from .common import (
@@ -32,8 +34,8 @@ from .common import (
 
 
 def _select_entities_context_ids_sub_query(
-    start_day: dt,
-    end_day: dt,
+    start_day: float,
+    end_day: float,
     event_types: tuple[str, ...],
     entity_ids: list[str],
     json_quoted_entity_ids: list[str],
@@ -44,16 +46,18 @@ def _select_entities_context_ids_sub_query(
             apply_event_entity_id_matchers(json_quoted_entity_ids)
         ),
         apply_entities_hints(select(States.context_id))
-        .filter((States.last_updated > start_day) & (States.last_updated < end_day))
-        .where(States.entity_id.in_(entity_ids)),
+        .filter(
+            (States.last_updated_ts > start_day) & (States.last_updated_ts < end_day)
+        )
+        .where(apply_states_metadata_id_matcher(entity_ids)),
     )
     return select(union.c.context_id).group_by(union.c.context_id)
 
 
 def _apply_entities_context_union(
     query: Query,
-    start_day: dt,
-    end_day: dt,
+    start_day: float,
+    end_day: float,
     event_types: tuple[str, ...],
     entity_ids: list[str],
     json_quoted_entity_ids: list[str],
@@ -77,18 +81,21 @@ def _apply_entities_context_union(
             select_events_context_only()
             .select_from(entities_cte)
             .outerjoin(Events, entities_cte.c.context_id == Events.context_id)
-        ).outerjoin(EventData, (Events.data_id == EventData.data_id)),
+        )
+        .outerjoin(EventData, (Events.data_id == EventData.data_id))
+        .outerjoin(EventTypes, (Events.event_type_id == EventTypes.event_type_id)),
         apply_states_context_hints(
             select_states_context_only()
             .select_from(entities_cte)
             .outerjoin(States, entities_cte.c.context_id == States.context_id)
+            .outerjoin(StatesMeta, (States.metadata_id == StatesMeta.metadata_id))
         ),
     )
 
 
 def entities_stmt(
-    start_day: dt,
-    end_day: dt,
+    start_day: float,
+    end_day: float,
     event_types: tuple[str, ...],
     entity_ids: list[str],
     json_quoted_entity_ids: list[str],
@@ -104,17 +111,24 @@ def entities_stmt(
             event_types,
             entity_ids,
             json_quoted_entity_ids,
-        ).order_by(Events.time_fired)
+        ).order_by(Events.time_fired_ts)
     )
 
 
 def states_query_for_entity_ids(
-    start_day: dt, end_day: dt, entity_ids: list[str]
+    start_day: float, end_day: float, entity_ids: list[str]
 ) -> Query:
     """Generate a select for states from the States table for specific entities."""
     return apply_states_filters(
         apply_entities_hints(select_states()), start_day, end_day
-    ).where(States.entity_id.in_(entity_ids))
+    ).where(apply_states_metadata_id_matcher(entity_ids))
+
+
+def apply_states_metadata_id_matcher(entity_ids: list[str]) -> ClauseList:
+    """Create a matcher for the metadata_id of the entity_ids in the states table."""
+    return States.metadata_id.in_(
+        select(StatesMeta.metadata_id).where(StatesMeta.entity_id.in_(entity_ids))
+    )
 
 
 def apply_event_entity_id_matchers(
@@ -136,5 +150,7 @@ def apply_event_entity_id_matchers(
 def apply_entities_hints(query: Query) -> Query:
     """Force mysql to use the right index on large selects."""
     return query.with_hint(
-        States, f"FORCE INDEX ({ENTITY_ID_LAST_UPDATED_INDEX})", dialect_name="mysql"
+        States,
+        f"FORCE INDEX ({METADATA_ID_LAST_UPDATED_INDEX_TS})",
+        dialect_name="mysql",
     )
@@ -11,13 +11,17 @@ from typing import Any, cast
 
 import voluptuous as vol
 
-from homeassistant.components import persistent_notification
+from homeassistant.components import persistent_notification, websocket_api
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_SCAN_INTERVAL, CONF_TYPE
-from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.core import HomeAssistant, ServiceCall, callback
+from homeassistant.helpers import loop_monitor
 import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers.entity import no_op_state_writes
 from homeassistant.helpers.event import async_track_time_interval
 from homeassistant.helpers.service import async_register_admin_service
+from homeassistant.helpers.template import async_get_render_stats
+from homeassistant.helpers.update_coordinator import async_get_polling_scheduler
 
 from .const import DOMAIN
 
@@ -28,6 +32,11 @@ SERVICE_STOP_LOG_OBJECTS = "stop_log_objects"
 SERVICE_DUMP_LOG_OBJECTS = "dump_log_objects"
 SERVICE_LOG_THREAD_FRAMES = "log_thread_frames"
 SERVICE_LOG_EVENT_LOOP_SCHEDULED = "log_event_loop_scheduled"
+SERVICE_LOG_NO_OP_STATE_WRITES = "log_no_op_state_writes"
+SERVICE_START_LOOP_MONITOR = "start_loop_monitor"
+SERVICE_STOP_LOOP_MONITOR = "stop_loop_monitor"
+SERVICE_LOG_EXECUTOR_POOLS = "log_executor_pools"
+SERVICE_LOG_COORDINATOR_REFRESHES = "log_coordinator_refreshes"
 
 
 SERVICES = (
@@ -38,11 +47,17 @@ SERVICES = (
     SERVICE_DUMP_LOG_OBJECTS,
     SERVICE_LOG_THREAD_FRAMES,
     SERVICE_LOG_EVENT_LOOP_SCHEDULED,
+    SERVICE_LOG_NO_OP_STATE_WRITES,
+    SERVICE_START_LOOP_MONITOR,
+    SERVICE_STOP_LOOP_MONITOR,
+    SERVICE_LOG_EXECUTOR_POOLS,
+    SERVICE_LOG_COORDINATOR_REFRESHES,
 )
 
 DEFAULT_SCAN_INTERVAL = timedelta(seconds=30)
 
 CONF_SECONDS = "seconds"
+CONF_SLOW_CALLBACK_THRESHOLD = "slow_callback_threshold"
 
 LOG_INTERVAL_SUB = "log_interval_subscription"
 
@@ -152,6 +167,36 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
             arepr.maxstring = original_maxstring
             arepr.maxother = original_maxother
 
+    async def _async_dump_no_op_state_writes(call: ServiceCall) -> None:
+        """Log the number of state writes that changed nothing."""
+        _LOGGER.critical(
+            "No-op state writes by integration: %s",
+            no_op_state_writes(hass).most_common(),
+        )
+
+    async def _async_start_loop_monitor(call: ServiceCall) -> None:
+        """Start monitoring the event loop."""
+        loop_monitor.async_start(hass, call.data[CONF_SLOW_CALLBACK_THRESHOLD])
+
+    async def _async_stop_loop_monitor(call: ServiceCall) -> None:
+        """Stop monitoring the event loop."""
+        loop_monitor.async_stop(hass)
+
+    async def _async_dump_executor_pools(call: ServiceCall) -> None:
+        """Log the statistics of the named executor pools."""
+        for name, pool in sorted(hass.async_executor_pools().items()):
+            _LOGGER.critical("Executor pool %s: %s", name, pool.stats.as_dict())
+
+    async def _async_dump_coordinator_refreshes(call: ServiceCall) -> None:
+        """Log the refresh statistics of the update coordinators."""
+        scheduler = async_get_polling_scheduler(hass)
+        for stats in sorted(
+            scheduler.async_refresh_stats(),
+            key=lambda stats: stats["mean_duration"],
+            reverse=True,
+        ):
+            _LOGGER.critical("Coordinator refreshes: %s", stats)
+
     async_register_admin_service(
         hass,
         DOMAIN,
@@ -215,6 +260,52 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         _async_dump_scheduled,
     )
 
+    async_register_admin_service(
+        hass,
+        DOMAIN,
+        SERVICE_LOG_NO_OP_STATE_WRITES,
+        _async_dump_no_op_state_writes,
+    )
+
+    async_register_admin_service(
+        hass,
+        DOMAIN,
+        SERVICE_START_LOOP_MONITOR,
+        _async_start_loop_monitor,
+        schema=vol.Schema(
+            {
+                vol.Optional(
+                    CONF_SLOW_CALLBACK_THRESHOLD,
+                    default=loop_monitor.DEFAULT_SLOW_CALLBACK_THRESHOLD,
+                ): vol.All(vol.Coerce(float), vol.Range(min=0))
+            }
+        ),
+    )
+
+    async_register_admin_service(
+        hass,
+        DOMAIN,
+        SERVICE_STOP_LOOP_MONITOR,
+        _async_stop_loop_monitor,
+    )
+
+    async_register_admin_service(
+        hass,
+        DOMAIN,
+        SERVICE_LOG_EXECUTOR_POOLS,
+        _async_dump_executor_pools,
+    )
+
+    async_register_admin_service(
+        hass,
+        DOMAIN,
+        SERVICE_LOG_COORDINATOR_REFRESHES,
+        _async_dump_coordinator_refreshes,
+    )
+
+    websocket_api.async_register_command(hass, websocket_loop_monitor)
+    websocket_api.async_register_command(hass, websocket_template_renders)
+
     return True
 
 
@@ -225,9 +316,44 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     if LOG_INTERVAL_SUB in hass.data[DOMAIN]:
         hass.data[DOMAIN][LOG_INTERVAL_SUB]()
     hass.data.pop(DOMAIN)
+    loop_monitor.async_stop(hass)
     return True
 
 
+@websocket_api.require_admin
+@websocket_api.websocket_command({vol.Required("type"): "profiler/loop_monitor"})
+@callback
+def websocket_loop_monitor(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Return the measurements of the event loop monitor."""
+    if (monitor := loop_monitor.async_get(hass)) is None:
+        connection.send_error(
+            msg["id"], websocket_api.ERR_NOT_FOUND, "The loop monitor is not running"
+        )
+        return
+    connection.send_result(msg["id"], monitor.as_dict())
+
+
+@websocket_api.require_admin
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "profiler/template_renders",
+        vol.Optional("limit"): cv.positive_int,
+    }
+)
+@callback
+def websocket_template_renders(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Return the render statistics of the templates, most expensive first."""
+    connection.send_result(msg["id"], async_get_render_stats(hass, msg.get("limit")))
+
+
 async def _async_generate_profile(hass: HomeAssistant, call: ServiceCall):
     # Imports deferred to avoid loading modules
     # in memory since usually only one part of this
@@ -0,0 +1,30 @@
+"""Diagnostics support for Profiler."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import loop_monitor
+from homeassistant.helpers.event import async_get_pending_timers
+from homeassistant.helpers.template import (
+    async_get_render_stats,
+    async_get_template_cache_stats,
+)
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    monitor = loop_monitor.async_get(hass)
+    return {
+        "loop_monitor": monitor.as_dict() if monitor is not None else None,
+        "executor_pools": {
+            name: pool.stats.as_dict()
+            for name, pool in hass.async_executor_pools().items()
+        },
+        "template_caches": async_get_template_cache_stats(hass),
+        "template_renders": async_get_render_stats(hass),
+        "pending_timers": async_get_pending_timers(hass),
+    }
@@ -6,8 +6,9 @@ from typing import Any
 
 import voluptuous as vol
 
-from homeassistant.const import CONF_EXCLUDE, EVENT_STATE_CHANGED
+from homeassistant.const import CONF_EXCLUDE, EVENT_STATE_CHANGED, Platform
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers import discovery
 import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.entityfilter import (
     INCLUDE_EXCLUDE_BASE_FILTER_SCHEMA,
@@ -30,7 +31,7 @@ from .const import (  # noqa: F401
     EXCLUDE_ATTRIBUTES,
     SQLITE_URL_PREFIX,
 )
-from .core import Recorder
+from .core import EVENT_DATA_ID_CACHE_SIZE, STATE_ATTRIBUTES_ID_CACHE_SIZE, Recorder
 from .services import async_register_services
 from .tasks import AddRecorderPlatformTask
 from .util import get_instance
@@ -44,9 +45,14 @@ DEFAULT_DB_INTEGRITY_CHECK = True
 DEFAULT_DB_MAX_RETRIES = 10
 DEFAULT_DB_RETRY_WAIT = 3
 DEFAULT_COMMIT_INTERVAL = 1
+DEFAULT_BULK_INSERT = False
+DEFAULT_CONTINUOUS_PURGE = False
+DEFAULT_TELEMETRY_SENSORS = False
+DEFAULT_HISTORY_CACHE_HOURS = 0
 
 CONF_AUTO_PURGE = "auto_purge"
 CONF_AUTO_REPACK = "auto_repack"
+CONF_CONTINUOUS_PURGE = "continuous_purge"
 CONF_DB_URL = "db_url"
 CONF_DB_MAX_RETRIES = "db_max_retries"
 CONF_DB_RETRY_WAIT = "db_retry_wait"
@@ -54,6 +60,11 @@ CONF_PURGE_KEEP_DAYS = "purge_keep_days"
 CONF_PURGE_INTERVAL = "purge_interval"
 CONF_EVENT_TYPES = "event_types"
 CONF_COMMIT_INTERVAL = "commit_interval"
+CONF_BULK_INSERT = "bulk_insert"
+CONF_STATE_ATTRIBUTES_CACHE_SIZE = "state_attributes_cache_size"
+CONF_EVENT_DATA_CACHE_SIZE = "event_data_cache_size"
+CONF_TELEMETRY_SENSORS = "telemetry_sensors"
+CONF_HISTORY_CACHE_HOURS = "history_cache_hours"
 
 
 EXCLUDE_SCHEMA = INCLUDE_EXCLUDE_FILTER_SCHEMA_INNER.extend(
@@ -89,6 +100,9 @@ CONFIG_SCHEMA = vol.Schema(
                 {
                     vol.Optional(CONF_AUTO_PURGE, default=True): cv.boolean,
                     vol.Optional(CONF_AUTO_REPACK, default=True): cv.boolean,
+                    vol.Optional(
+                        CONF_CONTINUOUS_PURGE, default=DEFAULT_CONTINUOUS_PURGE
+                    ): cv.boolean,
                     vol.Optional(CONF_PURGE_KEEP_DAYS, default=10): vol.All(
                         vol.Coerce(int), vol.Range(min=1)
                     ),
@@ -97,6 +111,22 @@ CONFIG_SCHEMA = vol.Schema(
                     vol.Optional(
                         CONF_COMMIT_INTERVAL, default=DEFAULT_COMMIT_INTERVAL
                     ): cv.positive_int,
+                    vol.Optional(
+                        CONF_BULK_INSERT, default=DEFAULT_BULK_INSERT
+                    ): cv.boolean,
+                    vol.Optional(
+                        CONF_STATE_ATTRIBUTES_CACHE_SIZE,
+                        default=STATE_ATTRIBUTES_ID_CACHE_SIZE,
+                    ): cv.positive_int,
+                    vol.Optional(
+                        CONF_EVENT_DATA_CACHE_SIZE, default=EVENT_DATA_ID_CACHE_SIZE
+                    ): cv.positive_int,
+                    vol.Optional(
+                        CONF_TELEMETRY_SENSORS, default=DEFAULT_TELEMETRY_SENSORS
+                    ): cv.boolean,
+                    vol.Optional(
+                        CONF_HISTORY_CACHE_HOURS, default=DEFAULT_HISTORY_CACHE_HOURS
+                    ): cv.positive_int,
                     vol.Optional(
                         CONF_DB_MAX_RETRIES, default=DEFAULT_DB_MAX_RETRIES
                     ): cv.positive_int,
@@ -134,8 +164,13 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     entity_filter = convert_include_exclude_filter(conf)
     auto_purge = conf[CONF_AUTO_PURGE]
     auto_repack = conf[CONF_AUTO_REPACK]
+    continuous_purge = conf[CONF_CONTINUOUS_PURGE]
     keep_days = conf[CONF_PURGE_KEEP_DAYS]
     commit_interval = conf[CONF_COMMIT_INTERVAL]
+    bulk_insert = conf[CONF_BULK_INSERT]
+    state_attributes_cache_size = conf[CONF_STATE_ATTRIBUTES_CACHE_SIZE]
+    event_data_cache_size = conf[CONF_EVENT_DATA_CACHE_SIZE]
+    history_cache_hours = conf[CONF_HISTORY_CACHE_HOURS]
     db_max_retries = conf[CONF_DB_MAX_RETRIES]
     db_retry_wait = conf[CONF_DB_RETRY_WAIT]
     db_url = conf.get(CONF_DB_URL) or DEFAULT_URL.format(
@@ -160,6 +195,11 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
         entity_filter=entity_filter,
         exclude_t=exclude_t,
         exclude_attributes_by_domain=exclude_attributes_by_domain,
+        bulk_insert=bulk_insert,
+        state_attributes_cache_size=state_attributes_cache_size,
+        event_data_cache_size=event_data_cache_size,
+        continuous_purge=continuous_purge,
+        history_cache_hours=history_cache_hours,
     )
     instance.async_initialize()
     instance.async_register()
@@ -168,6 +208,10 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     statistics.async_setup(hass)
     websocket_api.async_setup(hass)
     await async_process_integration_platforms(hass, DOMAIN, _process_recorder_platform)
+    if conf[CONF_TELEMETRY_SENSORS]:
+        hass.async_create_task(
+            discovery.async_load_platform(hass, Platform.SENSOR, DOMAIN, {}, config)
+        )
 
     return await instance.async_db_ready
 
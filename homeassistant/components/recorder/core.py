@@ -2,10 +2,11 @@
 from __future__ import annotations
 
 import asyncio
-from collections.abc import Callable, Iterable
+from collections.abc import Callable, Iterable, Iterator
 from concurrent.futures import CancelledError
 import contextlib
 from datetime import datetime, timedelta
+import itertools
 import logging
 import queue
 import sqlite3
@@ -16,7 +17,14 @@ from typing import Any, TypeVar, cast
 import async_timeout
 from awesomeversion import AwesomeVersion
 from lru import LRU  # pylint: disable=no-name-in-module
-from sqlalchemy import create_engine, event as sqlalchemy_event, exc, func, select
+from sqlalchemy import (
+    create_engine,
+    event as sqlalchemy_event,
+    exc,
+    func,
+    insert,
+    select,
+)
 from sqlalchemy.engine import Engine
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import scoped_session, sessionmaker
@@ -41,7 +49,7 @@ from homeassistant.helpers.start import async_at_started
 from homeassistant.helpers.typing import UNDEFINED, UndefinedType
 import homeassistant.util.dt as dt_util
 
-from . import migration, statistics
+from . import migration, purge, statistics
 from .const import (
     DB_WORKER_PREFIX,
     DOMAIN,
@@ -59,13 +67,16 @@ from .db_schema import (
     Base,
     EventData,
     Events,
+    EventTypes,
     StateAttributes,
     States,
+    StatesMeta,
     Statistics,
     StatisticsRuns,
     StatisticsShortTerm,
 )
 from .executor import DBInterruptibleThreadPoolExecutor
+from .history_cache import CachedStateRow, HistoryCache
 from .models import (
     StatisticData,
     StatisticMetaData,
@@ -73,13 +84,23 @@ from .models import (
     process_timestamp,
 )
 from .pool import POOL_SIZE, MutexPool, RecorderPool
-from .queries import find_shared_attributes_id, find_shared_data_id
+from .queries import (
+    allocate_postgresql_state_ids,
+    find_event_type_id,
+    find_max_state_id,
+    find_recently_used_shared_attributes,
+    find_recently_used_shared_data,
+    find_shared_attributes_id,
+    find_shared_data_id,
+    find_states_metadata_id,
+)
 from .run_history import RunHistory
 from .tasks import (
     AdjustStatisticsTask,
     ChangeStatisticsUnitTask,
     ClearStatisticsTask,
     CommitTask,
+    ContinuousPurgeTask,
     DatabaseLockTask,
     EventTask,
     ImportStatisticsTask,
@@ -93,6 +114,7 @@ from .tasks import (
     UpdateStatisticsMetadataTask,
     WaitTask,
 )
+from .telemetry import RecorderTelemetry
 from .util import (
     build_mysqldb_conv,
     dburl_to_path,
@@ -123,10 +145,29 @@ EXPIRE_AFTER_COMMITS = 120
 # - How much memory our low end hardware has
 STATE_ATTRIBUTES_ID_CACHE_SIZE = 2048
 EVENT_DATA_ID_CACHE_SIZE = 2048
+EVENT_TYPE_ID_CACHE_SIZE = 2048
+# The number of entity_id to metadata_id mappings to cache in memory
+#
+# Every entity that changes state needs a mapping so
+# this needs to be large enough to hold all the
+# entities of a large install.
+STATES_META_ID_CACHE_SIZE = 8192
+
+ID_CACHE_STATE_ATTRIBUTES = "state_attributes"
+ID_CACHE_EVENT_DATA = "event_data"
+ID_CACHE_EVENT_TYPES = "event_types"
+ID_CACHE_STATES_META = "states_meta"
+
+# The number of state_ids reserved at once from the
+# postgresql sequence when states are written with bulk inserts
+BULK_STATE_ID_BLOCK_SIZE = 1000
+
+HISTORY_CACHE_EXPIRE_INTERVAL = timedelta(minutes=5)
 
 SHUTDOWN_TASK = object()
 
 COMMIT_TASK = CommitTask()
+CONTINUOUS_PURGE_TASK = ContinuousPurgeTask()
 KEEP_ALIVE_TASK = KeepAliveTask()
 WAIT_TASK = WaitTask()
 
@@ -159,6 +200,11 @@ class Recorder(threading.Thread):
         entity_filter: Callable[[str], bool],
         exclude_t: list[str],
         exclude_attributes_by_domain: dict[str, set[str]],
+        bulk_insert: bool = False,
+        state_attributes_cache_size: int = STATE_ATTRIBUTES_ID_CACHE_SIZE,
+        event_data_cache_size: int = EVENT_DATA_ID_CACHE_SIZE,
+        continuous_purge: bool = False,
+        history_cache_hours: int = 0,
     ) -> None:
         """Initialize the recorder."""
         threading.Thread.__init__(self, name="Recorder")
@@ -167,8 +213,15 @@ class Recorder(threading.Thread):
         self.auto_purge = auto_purge
         self.auto_repack = auto_repack
         self.keep_days = keep_days
+        self.continuous_purge = continuous_purge
+        # Number of MAX_ROWS_TO_PURGE batches removed by the next
+        # continuous purge slice, adapted after every slice
+        self.continuous_purge_batches = 1
+        self.continuous_purge_queued = False
+        self.continuous_purge_idle_until = 0.0
         self._hass_started: asyncio.Future[object] = asyncio.Future()
         self.commit_interval = commit_interval
+        self.bulk_insert = bulk_insert
         self._queue: queue.SimpleQueue[RecorderTask] = queue.SimpleQueue()
         self.db_url = uri
         self.db_max_retries = db_max_retries
@@ -191,11 +244,40 @@ class Recorder(threading.Thread):
         self.schema_version = 0
         self._commits_without_expire = 0
         self._old_states: dict[str, States] = {}
-        self._state_attributes_ids: LRU = LRU(STATE_ATTRIBUTES_ID_CACHE_SIZE)
-        self._event_data_ids: LRU = LRU(EVENT_DATA_ID_CACHE_SIZE)
+        self._id_cache_evictions: dict[str, int] = {}
+        self._state_attributes_ids = self._create_id_cache(
+            ID_CACHE_STATE_ATTRIBUTES, state_attributes_cache_size
+        )
+        self._event_data_ids = self._create_id_cache(
+            ID_CACHE_EVENT_DATA, event_data_cache_size
+        )
+        self._event_type_ids = self._create_id_cache(
+            ID_CACHE_EVENT_TYPES, EVENT_TYPE_ID_CACHE_SIZE
+        )
+        self._states_meta_ids = self._create_id_cache(
+            ID_CACHE_STATES_META, STATES_META_ID_CACHE_SIZE
+        )
         self._pending_state_attributes: dict[str, StateAttributes] = {}
         self._pending_event_data: dict[str, EventData] = {}
+        self._pending_event_types: dict[str, EventTypes] = {}
+        self._pending_states_meta: dict[str, StatesMeta] = {}
         self._pending_expunge: list[States] = []
+        # Rows written with executemany when bulk_insert is enabled
+        self._pending_bulk_events: list[dict[str, Any]] = []
+        self._pending_bulk_states: list[dict[str, Any]] = []
+        self._pending_bulk_row_ids: list[tuple[dict[str, Any], str, Base]] = []
+        self._bulk_state_ids: Iterator[int] = iter(())
+        self._old_state_ids: dict[str, int] = {}
+        self.telemetry = RecorderTelemetry()
+        # The recently written states are kept in memory for history
+        # queries when the cache is enabled
+        self.history_cache = (
+            HistoryCache(history_cache_hours * 3600) if history_cache_hours else None
+        )
+        # States are only added to the history cache once they are committed
+        self._pending_history_rows: list[CachedStateRow] = []
+        self._uncommitted_events = 0
+        self._uncommitted_states = 0
         self.event_session: Session | None = None
         self._get_session: Callable[[], Session] | None = None
         self._completed_first_database_setup: bool | None = None
@@ -212,6 +294,8 @@ class Recorder(threading.Thread):
         self._commit_listener: CALLBACK_TYPE | None = None
         self._periodic_listener: CALLBACK_TYPE | None = None
         self._nightly_listener: CALLBACK_TYPE | None = None
+        self._continuous_purge_listener: CALLBACK_TYPE | None = None
+        self._history_cache_listener: CALLBACK_TYPE | None = None
         self.enabled = True
 
     @property
@@ -219,6 +303,37 @@ class Recorder(threading.Thread):
         """Return the number of items in the recorder backlog."""
         return self._queue.qsize()
 
+    @property
+    def id_cache_stats(self) -> dict[str, dict[str, int]]:
+        """Return the usage counters of the id caches."""
+        stats: dict[str, dict[str, int]] = {}
+        for name, cache in (
+            (ID_CACHE_STATE_ATTRIBUTES, self._state_attributes_ids),
+            (ID_CACHE_EVENT_DATA, self._event_data_ids),
+            (ID_CACHE_EVENT_TYPES, self._event_type_ids),
+            (ID_CACHE_STATES_META, self._states_meta_ids),
+        ):
+            hits, misses = cache.get_stats()
+            stats[name] = {
+                "size": len(cache),
+                "max_size": cache.get_size(),
+                "hits": hits,
+                "misses": misses,
+                "evictions": self._id_cache_evictions[name],
+            }
+        return stats
+
+    def _create_id_cache(self, name: str, size: int) -> LRU:
+        """Create a bounded id cache that counts its evictions."""
+        self._id_cache_evictions[name] = 0
+
+        def _evicted(key: str, value: int) -> None:
+            self._id_cache_evictions[name] += 1
+
+        cache = LRU(size)
+        cache.set_callback(_evicted)
+        return cache
+
     @property
     def dialect_name(self) -> SupportedDialect | None:
         """Return the dialect the recorder uses."""
@@ -251,6 +366,9 @@ class Recorder(threading.Thread):
     def set_enable(self, enable: bool) -> None:
         """Enable or disable recording events and states."""
         self.enabled = enable
+        if not enable and self.history_cache:
+            # The states are not written while disabled
+            self.history_cache.clear()
 
     @callback
     def async_start_executor(self) -> None:
@@ -352,6 +470,12 @@ class Recorder(threading.Thread):
         if self._nightly_listener:
             self._nightly_listener()
             self._nightly_listener = None
+        if self._continuous_purge_listener:
+            self._continuous_purge_listener()
+            self._continuous_purge_listener = None
+        if self._history_cache_listener:
+            self._history_cache_listener()
+            self._history_cache_listener = None
         if self._periodic_listener:
             self._periodic_listener()
             self._periodic_listener = None
@@ -468,6 +592,25 @@ class Recorder(threading.Thread):
         else:
             self.queue_task(PerodicCleanupTask())
 
+    @callback
+    def _async_continuous_purge(self, now: datetime) -> None:
+        """Queue a continuous purge slice unless live writes are waiting."""
+        if (
+            self.continuous_purge_queued
+            or self._database_lock_task
+            or self.backlog > purge.CONTINUOUS_PURGE_MAX_BACKLOG
+            or time.monotonic() < self.continuous_purge_idle_until
+        ):
+            return
+        self.continuous_purge_queued = True
+        self.queue_task(CONTINUOUS_PURGE_TASK)
+
+    @callback
+    def _async_expire_history_cache(self, now: datetime) -> None:
+        """Drop the cached states that are older than the window."""
+        assert self.history_cache is not None
+        self.history_cache.expire(now.timestamp())
+
     @callback
     def async_periodic_statistics(self, now: datetime) -> None:
         """Trigger the statistics run.
@@ -557,6 +700,24 @@ class Recorder(threading.Thread):
                 self.hass, self._async_commit, timedelta(seconds=self.commit_interval)
             )
 
+        # Purge a small slice of old data every commit cycle
+        # instead of purging a whole day of data at night
+        if self.auto_purge and self.continuous_purge:
+            self._continuous_purge_listener = async_track_time_interval(
+                self.hass,
+                self._async_continuous_purge,
+                timedelta(seconds=max(self.commit_interval, 1)),
+            )
+
+        # Rows are only dropped from the history cache when the
+        # entity changes so entities that stopped changing are expired
+        if self.history_cache:
+            self._history_cache_listener = async_track_time_interval(
+                self.hass,
+                self._async_expire_history_cache,
+                HISTORY_CACHE_EXPIRE_INTERVAL,
+            )
+
         # Run nightly tasks at 4:12am
         self._nightly_listener = async_track_time_change(
             self.hass, self.async_nightly_tasks, hour=4, minute=12, second=0
@@ -653,6 +814,8 @@ class Recorder(threading.Thread):
         with session_scope(session=self.get_session()) as session:
             self._schedule_compile_missing_statistics(session)
 
+        self._prewarm_id_caches()
+
         _LOGGER.debug("Recorder processing the queue")
         self.hass.add_job(self._async_set_recorder_ready_migration_done)
         self._run_event_loop()
@@ -783,13 +946,45 @@ class Recorder(threading.Thread):
         if not self.enabled:
             return
         if event.event_type == EVENT_STATE_CHANGED:
-            self._process_state_changed_event_into_session(event)
+            if self.bulk_insert:
+                self._process_state_changed_event_into_bulk_rows(event)
+            else:
+                self._process_state_changed_event_into_session(event)
+        elif self.bulk_insert:
+            self._process_non_state_changed_event_into_bulk_rows(event)
         else:
             self._process_non_state_changed_event_into_session(event)
         # Commit if the commit interval is zero
         if not self.commit_interval:
             self._commit_event_session_or_retry()
 
+    def _prewarm_id_caches(self) -> None:
+        """Load the most recently used shared attributes and data into the caches.
+
+        Without this every entity that changes state after a restart
+        would need a query to find its attributes_id.
+        """
+        try:
+            with session_scope(session=self.get_session()) as session:
+                for attributes_id, shared_attrs in session.execute(
+                    find_recently_used_shared_attributes(
+                        self._state_attributes_ids.get_size()
+                    )
+                ):
+                    self._state_attributes_ids[shared_attrs] = attributes_id
+                for data_id, shared_data in session.execute(
+                    find_recently_used_shared_data(self._event_data_ids.get_size())
+                ):
+                    self._event_data_ids[shared_data] = data_id
+        except SQLAlchemyError as err:
+            _LOGGER.warning("Could not load the recently used attributes: %s", err)
+            return
+        _LOGGER.debug(
+            "Loaded %s attributes and %s event data ids into the caches",
+            len(self._state_attributes_ids),
+            len(self._event_data_ids),
+        )
+
     def _find_shared_attr_in_db(self, attr_hash: int, shared_attrs: str) -> int | None:
         """Find shared attributes in the db from the hash and shared_attrs."""
         #
@@ -801,10 +996,12 @@ class Recorder(threading.Thread):
         # need to flush before checking the database.
         #
         assert self.event_session is not None
+        self.telemetry.shared_attributes_lookups += 1
         with self.event_session.no_autoflush:
             if attributes_id := self.event_session.execute(
                 find_shared_attributes_id(attr_hash, shared_attrs)
             ).first():
+                self.telemetry.shared_attributes_lookup_hits += 1
                 return cast(int, attributes_id[0])
         return None
 
@@ -819,19 +1016,158 @@ class Recorder(threading.Thread):
         # need to flush before checking the database.
         #
         assert self.event_session is not None
+        self.telemetry.shared_data_lookups += 1
         with self.event_session.no_autoflush:
             if data_id := self.event_session.execute(
                 find_shared_data_id(data_hash, shared_data)
             ).first():
+                self.telemetry.shared_data_lookup_hits += 1
                 return cast(int, data_id[0])
         return None
 
+    def _find_event_type_id_in_db(self, event_type: str) -> int | None:
+        """Find the event_type_id in the db from the event_type."""
+        #
+        # See _find_shared_attr_in_db for why we
+        # avoid flushing the event session here.
+        #
+        assert self.event_session is not None
+        with self.event_session.no_autoflush:
+            if event_type_id := self.event_session.execute(
+                find_event_type_id(event_type)
+            ).first():
+                return cast(int, event_type_id[0])
+        return None
+
+    def _find_states_metadata_id_in_db(self, entity_id: str) -> int | None:
+        """Find the states metadata_id in the db from the entity_id."""
+        #
+        # See _find_shared_attr_in_db for why we
+        # avoid flushing the event session here.
+        #
+        assert self.event_session is not None
+        with self.event_session.no_autoflush:
+            if metadata_id := self.event_session.execute(
+                find_states_metadata_id(entity_id)
+            ).first():
+                return cast(int, metadata_id[0])
+        return None
+
+    def _resolve_event_type_id(self, event_type: str) -> int | EventTypes:
+        """Return the event_type_id for an event_type.
+
+        If the event_type is not in the database yet the pending
+        EventTypes row that will be written in the next commit
+        is returned instead.
+        """
+        assert self.event_session is not None
+        # Matching event_type found in the pending commit
+        if pending_event_types := self._pending_event_types.get(event_type):
+            return pending_event_types
+        # Matching event_type_id found in the cache
+        if event_type_id := self._event_type_ids.get(event_type):
+            return cast(int, event_type_id)
+        # Matching event_type found in the database
+        if event_type_id := self._find_event_type_id_in_db(event_type):
+            self._event_type_ids[event_type] = event_type_id
+            return event_type_id
+        # No matching event_type found, save it in the DB
+        dbevent_type = EventTypes(event_type=event_type)
+        self._pending_event_types[event_type] = dbevent_type
+        self.event_session.add(dbevent_type)
+        return dbevent_type
+
+    def _resolve_data_id(self, shared_data_bytes: bytes) -> int | EventData:
+        """Return the data_id for the shared event data.
+
+        If the data is not in the database yet the pending
+        EventData row is returned instead.
+        """
+        assert self.event_session is not None
+        shared_data = shared_data_bytes.decode("utf-8")
+        # Matching attributes found in the pending commit
+        if pending_event_data := self._pending_event_data.get(shared_data):
+            return pending_event_data
+        # Matching attributes id found in the cache
+        if data_id := self._event_data_ids.get(shared_data):
+            return cast(int, data_id)
+        data_hash = EventData.hash_shared_data_bytes(shared_data_bytes)
+        # Matching attributes found in the database
+        if data_id := self._find_shared_data_in_db(data_hash, shared_data):
+            self._event_data_ids[shared_data] = data_id
+            return data_id
+        # No matching attributes found, save them in the DB
+        dbevent_data = EventData(shared_data=shared_data, hash=data_hash)
+        self._pending_event_data[shared_data] = dbevent_data
+        self.event_session.add(dbevent_data)
+        return dbevent_data
+
+    def _resolve_metadata_id(self, entity_id: str) -> int | StatesMeta:
+        """Return the states metadata_id for an entity_id.
+
+        If the entity_id is not in the database yet the pending
+        StatesMeta row is returned instead.
+        """
+        assert self.event_session is not None
+        # Matching metadata found in the pending commit
+        if pending_states_meta := self._pending_states_meta.get(entity_id):
+            return pending_states_meta
+        # Matching metadata_id found in the cache
+        if metadata_id := self._states_meta_ids.get(entity_id):
+            return cast(int, metadata_id)
+        # Matching metadata found in the database
+        if metadata_id := self._find_states_metadata_id_in_db(entity_id):
+            self._states_meta_ids[entity_id] = metadata_id
+            return metadata_id
+        # No matching metadata found, save it in the DB
+        dbstates_meta = StatesMeta(entity_id=entity_id)
+        self._pending_states_meta[entity_id] = dbstates_meta
+        self.event_session.add(dbstates_meta)
+        return dbstates_meta
+
+    def _resolve_attributes_id(
+        self, shared_attrs_bytes: bytes
+    ) -> int | StateAttributes:
+        """Return the attributes_id for the shared state attributes.
+
+        If the attributes are not in the database yet the pending
+        StateAttributes row is returned instead.
+        """
+        assert self.event_session is not None
+        shared_attrs = shared_attrs_bytes.decode("utf-8")
+        # Matching attributes found in the pending commit
+        if pending_attributes := self._pending_state_attributes.get(shared_attrs):
+            return pending_attributes
+        # Matching attributes id found in the cache
+        if attributes_id := self._state_attributes_ids.get(shared_attrs):
+            return cast(int, attributes_id)
+        attr_hash = StateAttributes.hash_shared_attrs_bytes(shared_attrs_bytes)
+        # Matching attributes found in the database
+        if attributes_id := self._find_shared_attr_in_db(attr_hash, shared_attrs):
+            self._state_attributes_ids[shared_attrs] = attributes_id
+            return attributes_id
+        # No matching attributes found, save them in the DB
+        dbstate_attributes = StateAttributes(shared_attrs=shared_attrs, hash=attr_hash)
+        self._pending_state_attributes[shared_attrs] = dbstate_attributes
+        self.event_session.add(dbstate_attributes)
+        return dbstate_attributes
+
     def _process_non_state_changed_event_into_session(self, event: Event) -> None:
         """Process any event into the session except state changed."""
         assert self.event_session is not None
         dbevent = Events.from_event(event)
+        # The event_type is stored in the event_types table
+        # and linked by the event_type_id
+        dbevent.event_type = None
+        event_type_id = self._resolve_event_type_id(event.event_type)
+        if isinstance(event_type_id, EventTypes):
+            dbevent.event_type_rel = event_type_id
+        else:
+            dbevent.event_type_id = event_type_id
+
         if not event.data:
             self.event_session.add(dbevent)
+            self._uncommitted_events += 1
             return
 
         try:
@@ -840,27 +1176,14 @@ class Recorder(threading.Thread):
             _LOGGER.warning("Event is not JSON serializable: %s: %s", event, ex)
             return
 
-        shared_data = shared_data_bytes.decode("utf-8")
-        # Matching attributes found in the pending commit
-        if pending_event_data := self._pending_event_data.get(shared_data):
-            dbevent.event_data_rel = pending_event_data
-        # Matching attributes id found in the cache
-        elif data_id := self._event_data_ids.get(shared_data):
-            dbevent.data_id = data_id
+        data_id = self._resolve_data_id(shared_data_bytes)
+        if isinstance(data_id, EventData):
+            dbevent.event_data_rel = data_id
         else:
-            data_hash = EventData.hash_shared_data_bytes(shared_data_bytes)
-            # Matching attributes found in the database
-            if data_id := self._find_shared_data_in_db(data_hash, shared_data):
-                self._event_data_ids[shared_data] = dbevent.data_id = data_id
-            # No matching attributes found, save them in the DB
-            else:
-                dbevent_data = EventData(shared_data=shared_data, hash=data_hash)
-                dbevent.event_data_rel = self._pending_event_data[
-                    shared_data
-                ] = dbevent_data
-                self.event_session.add(dbevent_data)
+            dbevent.data_id = data_id
 
         self.event_session.add(dbevent)
+        self._uncommitted_events += 1
 
     def _process_state_changed_event_into_session(self, event: Event) -> None:
         """Process a state_changed event into the session."""
@@ -878,40 +1201,177 @@ class Recorder(threading.Thread):
             )
             return
 
-        shared_attrs = shared_attrs_bytes.decode("utf-8")
+        entity_id: str = event.data["entity_id"]
+        # The entity_id is stored in the states_meta table
+        # and linked by the metadata_id
+        dbstate.entity_id = None
+        metadata_id = self._resolve_metadata_id(entity_id)
+        if isinstance(metadata_id, StatesMeta):
+            dbstate.states_meta_rel = metadata_id
+        else:
+            dbstate.metadata_id = metadata_id
+
         dbstate.attributes = None
-        # Matching attributes found in the pending commit
-        if pending_attributes := self._pending_state_attributes.get(shared_attrs):
-            dbstate.state_attributes = pending_attributes
-        # Matching attributes id found in the cache
-        elif attributes_id := self._state_attributes_ids.get(shared_attrs):
-            dbstate.attributes_id = attributes_id
+        attributes_id = self._resolve_attributes_id(shared_attrs_bytes)
+        if isinstance(attributes_id, StateAttributes):
+            dbstate.state_attributes = attributes_id
         else:
-            attr_hash = StateAttributes.hash_shared_attrs_bytes(shared_attrs_bytes)
-            # Matching attributes found in the database
-            if attributes_id := self._find_shared_attr_in_db(attr_hash, shared_attrs):
-                dbstate.attributes_id = attributes_id
-                self._state_attributes_ids[shared_attrs] = attributes_id
-            # No matching attributes found, save them in the DB
-            else:
-                dbstate_attributes = StateAttributes(
-                    shared_attrs=shared_attrs, hash=attr_hash
-                )
-                dbstate.state_attributes = dbstate_attributes
-                self._pending_state_attributes[shared_attrs] = dbstate_attributes
-                self.event_session.add(dbstate_attributes)
+            dbstate.attributes_id = attributes_id
 
-        if old_state := self._old_states.pop(dbstate.entity_id, None):
+        if old_state := self._old_states.pop(entity_id, None):
             if old_state.state_id:
                 dbstate.old_state_id = old_state.state_id
             else:
                 dbstate.old_state = old_state
         if event.data.get("new_state"):
-            self._old_states[dbstate.entity_id] = dbstate
+            self._old_states[entity_id] = dbstate
             self._pending_expunge.append(dbstate)
         else:
             dbstate.state = None
         self.event_session.add(dbstate)
+        self._uncommitted_states += 1
+        if self.history_cache:
+            self._add_to_history_cache(
+                entity_id,
+                dbstate.state,
+                dbstate.last_changed_ts,
+                dbstate.last_updated_ts,
+                shared_attrs_bytes,
+            )
+
+    def _add_to_history_cache(
+        self,
+        entity_id: str,
+        state: str | None,
+        last_changed_ts: float | None,
+        last_updated_ts: float,
+        shared_attrs_bytes: bytes,
+    ) -> None:
+        """Add a written state to the history cache when it is committed."""
+        self._pending_history_rows.append(
+            CachedStateRow(
+                entity_id,
+                state,
+                last_changed_ts,
+                last_updated_ts,
+                None,
+                shared_attrs_bytes.decode("utf-8"),
+            )
+        )
+
+    def _set_bulk_row_id(
+        self, row: dict[str, Any], column: str, row_id: int | Base
+    ) -> None:
+        """Set a foreign key of a bulk row.
+
+        Pending rows do not have an id until the session is flushed
+        so the column is filled in by _write_bulk_rows.
+        """
+        if isinstance(row_id, int):
+            row[column] = row_id
+        else:
+            row[column] = None
+            self._pending_bulk_row_ids.append((row, column, row_id))
+
+    def _process_non_state_changed_event_into_bulk_rows(self, event: Event) -> None:
+        """Process any event except state changed into a bulk row."""
+        row = Events.row_from_event(event)
+        row["event_type"] = None
+        row["data_id"] = None
+        if event.data:
+            try:
+                shared_data_bytes = EventData.shared_data_bytes_from_event(event)
+            except JSON_ENCODE_EXCEPTIONS as ex:
+                _LOGGER.warning("Event is not JSON serializable: %s: %s", event, ex)
+                return
+            self._set_bulk_row_id(
+                row, "data_id", self._resolve_data_id(shared_data_bytes)
+            )
+        self._set_bulk_row_id(
+            row, "event_type_id", self._resolve_event_type_id(event.event_type)
+        )
+        self._pending_bulk_events.append(row)
+        self._uncommitted_events += 1
+
+    def _process_state_changed_event_into_bulk_rows(self, event: Event) -> None:
+        """Process a state_changed event into a bulk row."""
+        try:
+            row = States.row_from_event(event)
+            shared_attrs_bytes = StateAttributes.shared_attrs_bytes_from_event(
+                event, self._exclude_attributes_by_domain
+            )
+        except JSON_ENCODE_EXCEPTIONS as ex:
+            _LOGGER.warning(
+                "State is not JSON serializable: %s: %s",
+                event.data.get("new_state"),
+                ex,
+            )
+            return
+
+        entity_id: str = row["entity_id"]
+        row["entity_id"] = None
+        self._set_bulk_row_id(row, "metadata_id", self._resolve_metadata_id(entity_id))
+        self._set_bulk_row_id(
+            row, "attributes_id", self._resolve_attributes_id(shared_attrs_bytes)
+        )
+        # The state_id is assigned here instead of by the database
+        # so the next state of the entity can reference it even
+        # if both are written in the same executemany
+        row["state_id"] = state_id = self._next_bulk_state_id()
+        row["old_state_id"] = self._old_state_ids.pop(entity_id, None)
+        if event.data.get("new_state"):
+            self._old_state_ids[entity_id] = state_id
+        else:
+            row["state"] = None
+        self._pending_bulk_states.append(row)
+        self._uncommitted_states += 1
+        if self.history_cache:
+            self._add_to_history_cache(
+                entity_id,
+                row["state"],
+                row["last_changed_ts"],
+                row["last_updated_ts"],
+                shared_attrs_bytes,
+            )
+
+    def _next_bulk_state_id(self) -> int:
+        """Return the next unused state_id."""
+        if (state_id := next(self._bulk_state_ids, None)) is None:
+            self._bulk_state_ids = self._allocate_bulk_state_ids()
+            state_id = next(self._bulk_state_ids)
+        return state_id
+
+    def _allocate_bulk_state_ids(self) -> Iterator[int]:
+        """Reserve state_ids for bulk rows."""
+        assert self.event_session is not None
+        with self.event_session.no_autoflush:
+            if self.dialect_name == SupportedDialect.POSTGRESQL:
+                # Take the ids from the sequence so rows inserted
+                # by the database do not collide with them
+                return iter(
+                    self.event_session.execute(
+                        allocate_postgresql_state_ids(BULK_STATE_ID_BLOCK_SIZE)
+                    )
+                    .scalars()
+                    .all()
+                )
+            max_state_id = self.event_session.execute(find_max_state_id()).scalar()
+        # The recorder is the only writer of the states table so
+        # the ids after the highest one are free until the commit
+        return itertools.count((max_state_id or 0) + 1)
+
+    def _write_bulk_rows(self) -> None:
+        """Write the pending bulk rows with executemany."""
+        assert self.event_session is not None
+        # Flush the pending event_types, event_data, states_meta
+        # and state_attributes rows so their ids are known
+        self.event_session.flush()
+        for row, column, pending in self._pending_bulk_row_ids:
+            row[column] = getattr(pending, column)
+        if self._pending_bulk_events:
+            self.event_session.execute(insert(Events), self._pending_bulk_events)
+        if self._pending_bulk_states:
+            self.event_session.execute(insert(States), self._pending_bulk_states)
 
     def _handle_database_error(self, err: Exception) -> bool:
         """Handle a database error that may result in moving away the corrupt db."""
@@ -925,7 +1385,13 @@ class Recorder(threading.Thread):
 
     def _event_session_has_pending_writes(self) -> bool:
         return bool(
-            self.event_session and (self.event_session.new or self.event_session.dirty)
+            self.event_session
+            and (
+                self.event_session.new
+                or self.event_session.dirty
+                or self._pending_bulk_events
+                or self._pending_bulk_states
+            )
         )
 
     def _commit_event_session_or_retry(self) -> None:
@@ -953,8 +1419,31 @@ class Recorder(threading.Thread):
     def _commit_event_session(self) -> None:
         assert self.event_session is not None
         self._commits_without_expire += 1
+        start = time.monotonic()
 
+        if self._pending_bulk_events or self._pending_bulk_states:
+            self._write_bulk_rows()
         self.event_session.commit()
+        if self._pending_history_rows:
+            assert self.history_cache is not None
+            for row in self._pending_history_rows:
+                self.history_cache.add(row)
+            self._pending_history_rows = []
+        self.telemetry.record_commit(
+            time.monotonic() - start,
+            self._uncommitted_events,
+            self._uncommitted_states,
+        )
+        self._uncommitted_events = 0
+        self._uncommitted_states = 0
+        if self.bulk_insert:
+            self._pending_bulk_events = []
+            self._pending_bulk_states = []
+            self._pending_bulk_row_ids = []
+            if self.dialect_name != SupportedDialect.POSTGRESQL:
+                # Read the highest state_id again for the next
+                # batch in case something else wrote states
+                self._bulk_state_ids = iter(())
         if self._pending_expunge:
             for dbstate in self._pending_expunge:
                 # Expunge the state so its not expired
@@ -975,6 +1464,12 @@ class Recorder(threading.Thread):
         for event_data in self._pending_event_data.values():
             self._event_data_ids[event_data.shared_data] = event_data.data_id
         self._pending_event_data = {}
+        for event_types in self._pending_event_types.values():
+            self._event_type_ids[event_types.event_type] = event_types.event_type_id
+        self._pending_event_types = {}
+        for states_meta in self._pending_states_meta.values():
+            self._states_meta_ids[states_meta.entity_id] = states_meta.metadata_id
+        self._pending_states_meta = {}
 
         # Expire is an expensive operation (frequently more expensive
         # than the flush and commit itself) so we only
@@ -988,6 +1483,9 @@ class Recorder(threading.Thread):
         self._close_event_session()
         self._close_connection()
         move_away_broken_database(dburl_to_path(self.db_url))
+        if self.history_cache:
+            # The cached states are not in the new database
+            self.history_cache.clear()
         self.run_history.reset()
         self._setup_recorder()
         self._setup_run()
@@ -995,10 +1493,23 @@ class Recorder(threading.Thread):
     def _close_event_session(self) -> None:
         """Close the event session."""
         self._old_states = {}
-        self._state_attributes_ids = {}
-        self._event_data_ids = {}
+        self._old_state_ids = {}
+        self._uncommitted_events = 0
+        self._uncommitted_states = 0
+        self._pending_bulk_events = []
+        self._pending_bulk_states = []
+        self._pending_bulk_row_ids = []
+        self._bulk_state_ids = iter(())
+        self._state_attributes_ids.clear()
+        self._event_data_ids.clear()
+        self._event_type_ids.clear()
+        self._states_meta_ids.clear()
         self._pending_state_attributes = {}
         self._pending_event_data = {}
+        self._pending_event_types = {}
+        self._pending_states_meta = {}
+        # The uncommitted states are rolled back
+        self._pending_history_rows = []
 
         if not self.event_session:
             return
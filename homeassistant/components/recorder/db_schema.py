@@ -4,6 +4,7 @@ from __future__ import annotations
 from collections.abc import Callable
 from datetime import datetime, timedelta
 import logging
+import time
 from typing import Any, TypeVar, cast
 
 import ciso8601
@@ -53,7 +54,7 @@ from .models import StatisticData, StatisticMetaData, process_timestamp
 # pylint: disable=invalid-name
 Base = declarative_base()
 
-SCHEMA_VERSION = 30
+SCHEMA_VERSION = 33
 
 _StatisticsBaseSelfT = TypeVar("_StatisticsBaseSelfT", bound="StatisticsBase")
 
@@ -61,7 +62,9 @@ _LOGGER = logging.getLogger(__name__)
 
 TABLE_EVENTS = "events"
 TABLE_EVENT_DATA = "event_data"
+TABLE_EVENT_TYPES = "event_types"
 TABLE_STATES = "states"
+TABLE_STATES_META = "states_meta"
 TABLE_STATE_ATTRIBUTES = "state_attributes"
 TABLE_RECORDER_RUNS = "recorder_runs"
 TABLE_SCHEMA_CHANGES = "schema_changes"
@@ -72,9 +75,11 @@ TABLE_STATISTICS_SHORT_TERM = "statistics_short_term"
 
 ALL_TABLES = [
     TABLE_STATES,
+    TABLE_STATES_META,
     TABLE_STATE_ATTRIBUTES,
     TABLE_EVENTS,
     TABLE_EVENT_DATA,
+    TABLE_EVENT_TYPES,
     TABLE_RECORDER_RUNS,
     TABLE_SCHEMA_CHANGES,
     TABLE_STATISTICS,
@@ -90,9 +95,16 @@ TABLES_TO_CHECK = [
     TABLE_SCHEMA_CHANGES,
 ]
 
-LAST_UPDATED_INDEX = "ix_states_last_updated"
-ENTITY_ID_LAST_UPDATED_INDEX = "ix_states_entity_id_last_updated"
+LEGACY_LAST_UPDATED_INDEX = "ix_states_last_updated"
+LAST_UPDATED_INDEX_TS = "ix_states_last_updated_ts"
+LEGACY_ENTITY_ID_LAST_UPDATED_INDEX = "ix_states_entity_id_last_updated"
+METADATA_ID_LAST_UPDATED_INDEX = "ix_states_metadata_id_last_updated"
+METADATA_ID_LAST_UPDATED_INDEX_TS = "ix_states_metadata_id_last_updated_ts"
 EVENTS_CONTEXT_ID_INDEX = "ix_events_context_id"
+LEGACY_EVENT_TYPE_TIME_FIRED_INDEX = "ix_events_event_type_time_fired"
+EVENT_TYPE_ID_TIME_FIRED_INDEX = "ix_events_event_type_id_time_fired"
+EVENT_TYPE_ID_TIME_FIRED_INDEX_TS = "ix_events_event_type_id_time_fired_ts"
+LEGACY_TIME_FIRED_INDEX = "ix_events_time_fired"
 STATES_CONTEXT_ID_INDEX = "ix_states_context_id"
 
 
@@ -121,6 +133,7 @@ DOUBLE_TYPE = (
     .with_variant(oracle.DOUBLE_PRECISION(), "oracle")
     .with_variant(postgresql.DOUBLE_PRECISION(), "postgresql")
 )
+TIMESTAMP_TYPE = DOUBLE_TYPE
 
 
 class JSONLiteral(JSON):  # type: ignore[misc]
@@ -146,43 +159,72 @@ class Events(Base):  # type: ignore[misc,valid-type]
     __table_args__ = (
         # Used for fetching events at a specific time
         # see logbook
-        Index("ix_events_event_type_time_fired", "event_type", "time_fired"),
+        Index(EVENT_TYPE_ID_TIME_FIRED_INDEX_TS, "event_type_id", "time_fired_ts"),
         {"mysql_default_charset": "utf8mb4", "mysql_collate": "utf8mb4_unicode_ci"},
     )
     __tablename__ = TABLE_EVENTS
     event_id = Column(Integer, Identity(), primary_key=True)
+    # event_type is no longer used for new rows, see event_type_id
     event_type = Column(String(MAX_LENGTH_EVENT_EVENT_TYPE))
     event_data = Column(Text().with_variant(mysql.LONGTEXT, "mysql"))
     origin = Column(String(MAX_LENGTH_EVENT_ORIGIN))  # no longer used for new rows
     origin_idx = Column(SmallInteger)
-    time_fired = Column(DATETIME_TYPE, index=True)
+    time_fired = Column(DATETIME_TYPE)  # no longer used for new rows
+    time_fired_ts = Column(TIMESTAMP_TYPE, index=True)
     context_id = Column(String(MAX_LENGTH_EVENT_CONTEXT_ID), index=True)
     context_user_id = Column(String(MAX_LENGTH_EVENT_CONTEXT_ID))
     context_parent_id = Column(String(MAX_LENGTH_EVENT_CONTEXT_ID))
     data_id = Column(Integer, ForeignKey("event_data.data_id"), index=True)
+    event_type_id = Column(Integer, ForeignKey("event_types.event_type_id"))
     event_data_rel = relationship("EventData")
+    event_type_rel = relationship("EventTypes")
 
     def __repr__(self) -> str:
         """Return string representation of instance for debugging."""
         return (
             "<recorder.Events("
             f"id={self.event_id}, type='{self.event_type}', "
-            f"origin_idx='{self.origin_idx}', time_fired='{self.time_fired}'"
+            f"event_type_id={self.event_type_id}, "
+            f"origin_idx='{self.origin_idx}', time_fired='{self._time_fired_isotime}'"
             f", data_id={self.data_id})>"
         )
 
+    @staticmethod
+    def row_from_event(event: Event) -> dict[str, Any]:
+        """Create the column values of an event row from a native event."""
+        return {
+            "event_type": event.event_type,
+            "event_data": None,
+            "origin_idx": EVENT_ORIGIN_TO_IDX.get(event.origin),
+            "time_fired": None,
+            "time_fired_ts": dt_util.utc_to_timestamp(event.time_fired),
+            "context_id": event.context.id,
+            "context_user_id": event.context.user_id,
+            "context_parent_id": event.context.parent_id,
+        }
+
     @staticmethod
     def from_event(event: Event) -> Events:
         """Create an event database object from a native event."""
-        return Events(
-            event_type=event.event_type,
-            event_data=None,
-            origin_idx=EVENT_ORIGIN_TO_IDX.get(event.origin),
-            time_fired=event.time_fired,
-            context_id=event.context.id,
-            context_user_id=event.context.user_id,
-            context_parent_id=event.context.parent_id,
-        )
+        return Events(**Events.row_from_event(event))
+
+    @property
+    def _time_fired_isotime(self) -> str | None:
+        """Return time_fired as an isotime string."""
+        date_time: datetime | None
+        if self.time_fired_ts is not None:
+            date_time = dt_util.utc_from_timestamp(self.time_fired_ts)
+        else:
+            date_time = process_timestamp(self.time_fired)
+        if date_time is None:
+            return None
+        return date_time.isoformat(sep=" ", timespec="seconds")
+
+    def get_time_fired(self) -> datetime | None:
+        """Return time_fired as a datetime."""
+        if self.time_fired_ts is not None:
+            return dt_util.utc_from_timestamp(self.time_fired_ts)
+        return process_timestamp(self.time_fired)
 
     def to_native(self, validate_entity_id: bool = True) -> Event | None:
         """Convert to a native HA Event."""
@@ -191,14 +233,19 @@ class Events(Base):  # type: ignore[misc,valid-type]
             user_id=self.context_user_id,
             parent_id=self.context_parent_id,
         )
+        event_type = self.event_type
+        if event_type is None and self.event_type_rel is not None:
+            # Newer rows only store the event_type_id, the event_type
+            # lives in the event_types table
+            event_type = self.event_type_rel.event_type
         try:
             return Event(
-                self.event_type,
+                event_type,
                 json_loads(self.event_data) if self.event_data else {},
                 EventOrigin(self.origin)
                 if self.origin
                 else EVENT_ORIGIN_ORDER[self.origin_idx],
-                process_timestamp(self.time_fired),
+                self.get_time_fired(),
                 context=context,
             )
         except JSON_DECODE_EXCEPTIONS:
@@ -261,11 +308,12 @@ class States(Base):  # type: ignore[misc,valid-type]
     __table_args__ = (
         # Used for fetching the state of entities at a specific time
         # (get_states in history.py)
-        Index(ENTITY_ID_LAST_UPDATED_INDEX, "entity_id", "last_updated"),
+        Index(METADATA_ID_LAST_UPDATED_INDEX_TS, "metadata_id", "last_updated_ts"),
         {"mysql_default_charset": "utf8mb4", "mysql_collate": "utf8mb4_unicode_ci"},
     )
     __tablename__ = TABLE_STATES
     state_id = Column(Integer, Identity(), primary_key=True)
+    # entity_id is no longer used for new rows, see metadata_id
     entity_id = Column(String(MAX_LENGTH_STATE_ENTITY_ID))
     state = Column(String(MAX_LENGTH_STATE_STATE))
     attributes = Column(
@@ -274,8 +322,10 @@ class States(Base):  # type: ignore[misc,valid-type]
     event_id = Column(  # no longer used for new rows
         Integer, ForeignKey("events.event_id", ondelete="CASCADE"), index=True
     )
-    last_changed = Column(DATETIME_TYPE)
-    last_updated = Column(DATETIME_TYPE, default=dt_util.utcnow, index=True)
+    last_changed = Column(DATETIME_TYPE)  # no longer used for new rows
+    last_changed_ts = Column(TIMESTAMP_TYPE)
+    last_updated = Column(DATETIME_TYPE)  # no longer used for new rows
+    last_updated_ts = Column(TIMESTAMP_TYPE, default=time.time, index=True)
     old_state_id = Column(Integer, ForeignKey("states.state_id"), index=True)
     attributes_id = Column(
         Integer, ForeignKey("state_attributes.attributes_id"), index=True
@@ -284,47 +334,67 @@ class States(Base):  # type: ignore[misc,valid-type]
     context_user_id = Column(String(MAX_LENGTH_EVENT_CONTEXT_ID))
     context_parent_id = Column(String(MAX_LENGTH_EVENT_CONTEXT_ID))
     origin_idx = Column(SmallInteger)  # 0 is local, 1 is remote
+    metadata_id = Column(Integer, ForeignKey("states_meta.metadata_id"))
     old_state = relationship("States", remote_side=[state_id])
     state_attributes = relationship("StateAttributes")
+    states_meta_rel = relationship("StatesMeta")
 
     def __repr__(self) -> str:
         """Return string representation of instance for debugging."""
         return (
             f"<recorder.States(id={self.state_id}, entity_id='{self.entity_id}',"
-            f" state='{self.state}', event_id='{self.event_id}',"
-            f" last_updated='{self.last_updated.isoformat(sep=' ', timespec='seconds')}',"
+            f" metadata_id={self.metadata_id}, state='{self.state}',"
+            f" event_id='{self.event_id}',"
+            f" last_updated='{self._last_updated_isotime}',"
             f" old_state_id={self.old_state_id}, attributes_id={self.attributes_id})>"
         )
 
+    @property
+    def _last_updated_isotime(self) -> str | None:
+        """Return last_updated as an isotime string."""
+        if (date_time := self.get_last_updated()) is None:
+            return None
+        return date_time.isoformat(sep=" ", timespec="seconds")
+
+    def get_last_updated(self) -> datetime | None:
+        """Return last_updated as a datetime."""
+        if self.last_updated_ts is not None:
+            return dt_util.utc_from_timestamp(self.last_updated_ts)
+        return process_timestamp(self.last_updated)
+
     @staticmethod
-    def from_event(event: Event) -> States:
-        """Create object from a state_changed event."""
-        entity_id = event.data["entity_id"]
+    def row_from_event(event: Event) -> dict[str, Any]:
+        """Create the column values of a state row from a state_changed event."""
         state: State | None = event.data.get("new_state")
-        dbstate = States(
-            entity_id=entity_id,
-            attributes=None,
-            context_id=event.context.id,
-            context_user_id=event.context.user_id,
-            context_parent_id=event.context.parent_id,
-            origin_idx=EVENT_ORIGIN_TO_IDX.get(event.origin),
-        )
+        row: dict[str, Any] = {
+            "entity_id": event.data["entity_id"],
+            "attributes": None,
+            "context_id": event.context.id,
+            "context_user_id": event.context.user_id,
+            "context_parent_id": event.context.parent_id,
+            "origin_idx": EVENT_ORIGIN_TO_IDX.get(event.origin),
+        }
 
         # None state means the state was removed from the state machine
         if state is None:
-            dbstate.state = ""
-            dbstate.last_updated = event.time_fired
-            dbstate.last_changed = None
-            return dbstate
+            row["state"] = ""
+            row["last_updated_ts"] = dt_util.utc_to_timestamp(event.time_fired)
+            row["last_changed_ts"] = None
+            return row
 
-        dbstate.state = state.state
-        dbstate.last_updated = state.last_updated
+        row["state"] = state.state
+        row["last_updated_ts"] = dt_util.utc_to_timestamp(state.last_updated)
         if state.last_updated == state.last_changed:
-            dbstate.last_changed = None
+            row["last_changed_ts"] = None
         else:
-            dbstate.last_changed = state.last_changed
+            row["last_changed_ts"] = dt_util.utc_to_timestamp(state.last_changed)
 
-        return dbstate
+        return row
+
+    @staticmethod
+    def from_event(event: Event) -> States:
+        """Create object from a state_changed event."""
+        return States(**States.row_from_event(event))
 
     def to_native(self, validate_entity_id: bool = True) -> State | None:
         """Convert to an HA state object."""
@@ -339,13 +409,24 @@ class States(Base):  # type: ignore[misc,valid-type]
             # When json_loads fails
             _LOGGER.exception("Error converting row to state: %s", self)
             return None
-        if self.last_changed is None or self.last_changed == self.last_updated:
-            last_changed = last_updated = process_timestamp(self.last_updated)
-        else:
-            last_updated = process_timestamp(self.last_updated)
+        last_updated = self.get_last_updated()
+        if (
+            self.last_changed_ts is not None
+            and self.last_changed_ts != self.last_updated_ts
+        ):
+            last_changed = dt_util.utc_from_timestamp(self.last_changed_ts)
+        elif self.last_updated_ts is None and self.last_changed is not None:
+            # Legacy row that has not been migrated to timestamps yet
             last_changed = process_timestamp(self.last_changed)
+        else:
+            last_changed = last_updated
+        entity_id = self.entity_id
+        if entity_id is None and self.states_meta_rel is not None:
+            # Newer rows only store the metadata_id, the entity_id
+            # lives in the states_meta table
+            entity_id = self.states_meta_rel.entity_id
         return State(
-            self.entity_id,
+            entity_id,
             self.state,
             # Join the state_attributes table on attributes_id to get the attributes
             # for newer states
@@ -399,6 +480,9 @@ class StateAttributes(Base):  # type: ignore[misc,valid-type]
         exclude_attrs = (
             exclude_attrs_by_domain.get(domain, set()) | ALL_DOMAIN_EXCLUDE_ATTRS
         )
+        if exclude_attrs.isdisjoint(state.attributes):
+            # Reuse the JSON cached on the state
+            return state.attributes_json
         return json_bytes(
             {k: v for k, v in state.attributes.items() if k not in exclude_attrs}
         )
@@ -418,6 +502,44 @@ class StateAttributes(Base):  # type: ignore[misc,valid-type]
             return {}
 
 
+class EventTypes(Base):  # type: ignore[misc,valid-type]
+    """Event type history."""
+
+    __table_args__ = (
+        {"mysql_default_charset": "utf8mb4", "mysql_collate": "utf8mb4_unicode_ci"},
+    )
+    __tablename__ = TABLE_EVENT_TYPES
+    event_type_id = Column(Integer, Identity(), primary_key=True)
+    event_type = Column(String(MAX_LENGTH_EVENT_EVENT_TYPE), index=True, unique=True)
+
+    def __repr__(self) -> str:
+        """Return string representation of instance for debugging."""
+        return (
+            "<recorder.EventTypes("
+            f"id={self.event_type_id}, event_type='{self.event_type}'"
+            ")>"
+        )
+
+
+class StatesMeta(Base):  # type: ignore[misc,valid-type]
+    """Metadata for states."""
+
+    __table_args__ = (
+        {"mysql_default_charset": "utf8mb4", "mysql_collate": "utf8mb4_unicode_ci"},
+    )
+    __tablename__ = TABLE_STATES_META
+    metadata_id = Column(Integer, Identity(), primary_key=True)
+    entity_id = Column(String(MAX_LENGTH_STATE_ENTITY_ID), index=True, unique=True)
+
+    def __repr__(self) -> str:
+        """Return string representation of instance for debugging."""
+        return (
+            "<recorder.StatesMeta("
+            f"id={self.metadata_id}, entity_id='{self.entity_id}'"
+            ")>"
+        )
+
+
 class StatisticsBase:
     """Statistics base class."""
 
@@ -535,14 +657,16 @@ class RecorderRuns(Base):  # type: ignore[misc,valid-type]
 
         assert session is not None, "RecorderRuns need to be persisted"
 
-        query = session.query(distinct(States.entity_id)).filter(
-            States.last_updated >= self.start
+        query = (
+            session.query(distinct(StatesMeta.entity_id))
+            .join(States, States.metadata_id == StatesMeta.metadata_id)
+            .filter(States.last_updated_ts >= self.start.timestamp())
         )
 
         if point_in_time is not None:
-            query = query.filter(States.last_updated < point_in_time)
+            query = query.filter(States.last_updated_ts < point_in_time.timestamp())
         elif self.end is not None:
-            query = query.filter(States.last_updated < self.end)
+            query = query.filter(States.last_updated_ts < self.end.timestamp())
 
         return [row[0] for row in query]
 
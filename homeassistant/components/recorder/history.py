@@ -4,7 +4,7 @@ from __future__ import annotations
 from collections import defaultdict
 from collections.abc import Callable, Iterable, Iterator, MutableMapping
 from datetime import datetime
-from itertools import groupby
+from itertools import chain, groupby
 import logging
 import time
 from typing import Any, cast
@@ -15,7 +15,7 @@ from sqlalchemy.orm.query import Query
 from sqlalchemy.orm.session import Session
 from sqlalchemy.sql.expression import literal
 from sqlalchemy.sql.lambdas import StatementLambdaElement
-from sqlalchemy.sql.selectable import Subquery
+from sqlalchemy.sql.selectable import ScalarSelect, Select, Subquery
 
 from homeassistant.components.websocket_api import (
     COMPRESSED_STATE_LAST_UPDATED,
@@ -25,15 +25,10 @@ from homeassistant.core import HomeAssistant, State, split_entity_id
 import homeassistant.util.dt as dt_util
 
 from .. import recorder
-from .db_schema import RecorderRuns, StateAttributes, States
+from .db_schema import RecorderRuns, StateAttributes, States, StatesMeta
 from .filters import Filters
-from .models import (
-    LazyState,
-    process_datetime_to_timestamp,
-    process_timestamp,
-    process_timestamp_to_utc_isoformat,
-    row_to_compressed_state,
-)
+from .history_cache import HistoryCache
+from .models import LazyState, process_timestamp, row_to_compressed_state
 from .util import execute_stmt_lambda_element, session_scope
 
 _LOGGER = logging.getLogger(__name__)
@@ -60,16 +55,16 @@ NEED_ATTRIBUTE_DOMAINS = {
 }
 
 BASE_STATES = [
-    States.entity_id,
+    StatesMeta.entity_id,
     States.state,
-    States.last_changed,
-    States.last_updated,
+    States.last_changed_ts,
+    States.last_updated_ts,
 ]
 BASE_STATES_NO_LAST_CHANGED = [
-    States.entity_id,
+    StatesMeta.entity_id,
     States.state,
-    literal(value=None, type_=Text).label("last_changed"),
-    States.last_updated,
+    literal(value=None, type_=Text).label("last_changed_ts"),
+    States.last_updated_ts,
 ]
 QUERY_STATE_NO_ATTR = [
     *BASE_STATES,
@@ -112,6 +107,30 @@ def _schema_version(hass: HomeAssistant) -> int:
     return recorder.get_instance(hass).schema_version
 
 
+def _metadata_ids_for_entity_ids(entity_ids: list[str]) -> Select:
+    """Select the metadata_ids for the given entity_ids.
+
+    The states table is filtered on the integer metadata_id
+    so the entity_id strings only need to be looked up in
+    the small states_meta table.
+    """
+    return select(StatesMeta.metadata_id).where(StatesMeta.entity_id.in_(entity_ids))
+
+
+def _metadata_id_for_entity_id(entity_id: str) -> ScalarSelect:
+    """Select the metadata_id for the given entity_id."""
+    return (
+        select(StatesMeta.metadata_id)
+        .where(StatesMeta.entity_id == entity_id)
+        .scalar_subquery()
+    )
+
+
+def _join_states_meta(query: Query) -> Query:
+    """Join the states_meta table to resolve the entity_id."""
+    return query.outerjoin(StatesMeta, States.metadata_id == StatesMeta.metadata_id)
+
+
 def lambda_stmt_and_join_attributes(
     schema_version: int, no_attributes: bool, include_last_changed: bool = True
 ) -> tuple[StatementLambdaElement, bool]:
@@ -185,7 +204,7 @@ def _ignore_domains_filter(query: Query) -> Query:
     return query.filter(
         and_(
             *[
-                ~States.entity_id.like(entity_domain)
+                ~StatesMeta.entity_id.like(entity_domain)
                 for entity_domain in IGNORE_DOMAINS_ENTITY_ID_LIKE
             ]
         )
@@ -212,24 +231,27 @@ def _significant_states_stmt(
         and split_entity_id(entity_ids[0])[0] not in SIGNIFICANT_DOMAINS
     ):
         stmt += lambda q: q.filter(
-            (States.last_changed == States.last_updated) | States.last_changed.is_(None)
+            (States.last_changed_ts == States.last_updated_ts)
+            | States.last_changed_ts.is_(None)
         )
     elif significant_changes_only:
         stmt += lambda q: q.filter(
             or_(
                 *[
-                    States.entity_id.like(entity_domain)
+                    StatesMeta.entity_id.like(entity_domain)
                     for entity_domain in SIGNIFICANT_DOMAINS_ENTITY_ID_LIKE
                 ],
                 (
-                    (States.last_changed == States.last_updated)
-                    | States.last_changed.is_(None)
+                    (States.last_changed_ts == States.last_updated_ts)
+                    | States.last_changed_ts.is_(None)
                 ),
             )
         )
 
     if entity_ids:
-        stmt += lambda q: q.filter(States.entity_id.in_(entity_ids))
+        stmt += lambda q: q.filter(
+            States.metadata_id.in_(_metadata_ids_for_entity_ids(entity_ids))
+        )
     else:
         stmt += _ignore_domains_filter
         if filters and filters.has_config:
@@ -238,15 +260,18 @@ def _significant_states_stmt(
                 lambda q: q.filter(entity_filter), track_on=[filters]
             )
 
-    stmt += lambda q: q.filter(States.last_updated > start_time)
+    start_time_ts = start_time.timestamp()
+    stmt += lambda q: q.filter(States.last_updated_ts > start_time_ts)
     if end_time:
-        stmt += lambda q: q.filter(States.last_updated < end_time)
+        end_time_ts = end_time.timestamp()
+        stmt += lambda q: q.filter(States.last_updated_ts < end_time_ts)
 
+    stmt += _join_states_meta
     if join_attributes:
         stmt += lambda q: q.outerjoin(
             StateAttributes, States.attributes_id == StateAttributes.attributes_id
         )
-    stmt += lambda q: q.order_by(States.entity_id, States.last_updated)
+    stmt += lambda q: q.order_by(States.metadata_id, States.last_updated_ts)
     return stmt
 
 
@@ -275,6 +300,20 @@ def get_significant_states_with_session(
     as well as all states from certain domains (for instance
     thermostat so that we get current temperature in our graphs).
     """
+    if entity_ids and (history_cache := recorder.get_instance(hass).history_cache):
+        return _get_significant_states_with_history_cache(
+            hass,
+            session,
+            history_cache,
+            start_time,
+            end_time,
+            entity_ids,
+            include_start_time_state,
+            significant_changes_only,
+            minimal_response,
+            no_attributes,
+            compressed_state_format,
+        )
     stmt = _significant_states_stmt(
         _schema_version(hass),
         start_time,
@@ -301,6 +340,94 @@ def get_significant_states_with_session(
     )
 
 
+def _get_significant_states_with_history_cache(
+    hass: HomeAssistant,
+    session: Session,
+    history_cache: HistoryCache,
+    start_time: datetime,
+    end_time: datetime | None,
+    entity_ids: list[str],
+    include_start_time_state: bool,
+    significant_changes_only: bool,
+    minimal_response: bool,
+    no_attributes: bool,
+    compressed_state_format: bool,
+) -> MutableMapping[str, list[State | dict[str, Any]]]:
+    """Return the significant states of entity_ids using the history cache.
+
+    Only the rows that are not in the cache are queried from the
+    database, so the query does not touch the database at all
+    when every entity is cached since before start_time.
+    """
+    cached = history_cache.get_history(
+        entity_ids,
+        start_time.timestamp(),
+        end_time.timestamp() if end_time else None,
+        SIGNIFICANT_DOMAINS,
+        significant_changes_only,
+        no_attributes,
+    )
+    schema_version = _schema_version(hass)
+    rows: dict[str, list[Row]] = defaultdict(list)
+    stitch_before = (
+        None
+        if cached.stitch_before is None
+        else dt_util.utc_from_timestamp(cached.stitch_before)
+    )
+    # The stitched entities are only cached since stitch_before
+    # so their older rows are queried from the database
+    for query_entity_ids, query_end_time in (
+        (cached.uncached_entity_ids, end_time),
+        (cached.stitched_entity_ids, stitch_before),
+    ):
+        if not query_entity_ids:
+            continue
+        stmt = _significant_states_stmt(
+            schema_version,
+            start_time,
+            query_end_time,
+            query_entity_ids,
+            None,
+            significant_changes_only,
+            no_attributes,
+        )
+        for ent_id, group in groupby(
+            execute_stmt_lambda_element(session, stmt, None, query_end_time),
+            lambda row: row.entity_id,
+        ):
+            rows[ent_id].extend(group)
+    for ent_id, cached_rows in cached.rows.items():
+        rows[ent_id].extend(cast(list[Row], cached_rows))
+
+    initial_states = cast(dict[str, Row], dict(cached.initial_rows))
+    if include_start_time_state and (
+        query_entity_ids := [*cached.uncached_entity_ids, *cached.stitched_entity_ids]
+    ):
+        initial_states.update(
+            (row.entity_id, row)
+            for row in _get_rows_with_session(
+                hass,
+                session,
+                start_time,
+                query_entity_ids,
+                no_attributes=no_attributes,
+            )
+        )
+    return _sorted_states_to_dict(
+        hass,
+        session,
+        chain.from_iterable(rows.values()),
+        start_time,
+        entity_ids,
+        None,
+        include_start_time_state,
+        minimal_response,
+        no_attributes,
+        compressed_state_format,
+        initial_states if include_start_time_state else {},
+    )
+
+
 def get_full_significant_states_with_session(
     hass: HomeAssistant,
     session: Session,
@@ -330,6 +457,38 @@ def get_full_significant_states_with_session(
     )
 
 
+def get_significant_state_rows_with_session(
+    hass: HomeAssistant,
+    session: Session,
+    start_time: datetime,
+    end_time: datetime,
+    entity_ids: list[str],
+) -> dict[str, tuple[Row | None, list[Row]]]:
+    """Return the significant state rows during start_time - end_time by entity_id.
+
+    This returns the same states as get_significant_states_with_session but
+    does not create State objects for callers which only need a few columns.
+
+    The first item of each tuple is the row with the state at start_time,
+    which should be treated as if it was last updated at start_time.
+    """
+    stmt = _significant_states_stmt(
+        _schema_version(hass), start_time, end_time, entity_ids, None, True, False
+    )
+    rows = execute_stmt_lambda_element(session, stmt, None, end_time)
+    initial_states: dict[str, Row] = {
+        row.entity_id: row
+        for row in _get_rows_with_session(hass, session, start_time, entity_ids)
+    }
+    result: dict[str, tuple[Row | None, list[Row]]] = {
+        ent_id: (initial_states.pop(ent_id, None), list(group))
+        for ent_id, group in groupby(rows, lambda row: row.entity_id)
+    }
+    for ent_id, row in initial_states.items():
+        result[ent_id] = (row, [])
+    return result
+
+
 def _state_changed_during_period_stmt(
     schema_version: int,
     start_time: datetime,
@@ -342,22 +501,30 @@ def _state_changed_during_period_stmt(
     stmt, join_attributes = lambda_stmt_and_join_attributes(
         schema_version, no_attributes, include_last_changed=False
     )
+    start_time_ts = start_time.timestamp()
     stmt += lambda q: q.filter(
-        ((States.last_changed == States.last_updated) | States.last_changed.is_(None))
-        & (States.last_updated > start_time)
+        (
+            (States.last_changed_ts == States.last_updated_ts)
+            | States.last_changed_ts.is_(None)
+        )
+        & (States.last_updated_ts > start_time_ts)
     )
     if end_time:
-        stmt += lambda q: q.filter(States.last_updated < end_time)
+        end_time_ts = end_time.timestamp()
+        stmt += lambda q: q.filter(States.last_updated_ts < end_time_ts)
     if entity_id:
-        stmt += lambda q: q.filter(States.entity_id == entity_id)
+        stmt += lambda q: q.filter(
+            States.metadata_id == _metadata_id_for_entity_id(entity_id)
+        )
+    stmt += _join_states_meta
     if join_attributes:
         stmt += lambda q: q.outerjoin(
             StateAttributes, States.attributes_id == StateAttributes.attributes_id
         )
     if descending:
-        stmt += lambda q: q.order_by(States.entity_id, States.last_updated.desc())
+        stmt += lambda q: q.order_by(States.metadata_id, States.last_updated_ts.desc())
     else:
-        stmt += lambda q: q.order_by(States.entity_id, States.last_updated)
+        stmt += lambda q: q.order_by(States.metadata_id, States.last_updated_ts)
     if limit:
         stmt += lambda q: q.limit(limit)
     return stmt
@@ -410,17 +577,21 @@ def _get_last_state_changes_stmt(
         schema_version, False, include_last_changed=False
     )
     stmt += lambda q: q.filter(
-        (States.last_changed == States.last_updated) | States.last_changed.is_(None)
+        (States.last_changed_ts == States.last_updated_ts)
+        | States.last_changed_ts.is_(None)
     )
     if entity_id:
-        stmt += lambda q: q.filter(States.entity_id == entity_id)
+        stmt += lambda q: q.filter(
+            States.metadata_id == _metadata_id_for_entity_id(entity_id)
+        )
+    stmt += _join_states_meta
     if join_attributes:
         stmt += lambda q: q.outerjoin(
             StateAttributes, States.attributes_id == StateAttributes.attributes_id
         )
-    stmt += lambda q: q.order_by(States.entity_id, States.last_updated.desc()).limit(
-        number_of_states
-    )
+    stmt += lambda q: q.order_by(
+        States.metadata_id, States.last_updated_ts.desc()
+    ).limit(number_of_states)
     return stmt
 
 
@@ -461,6 +632,8 @@ def _get_states_for_entites_stmt(
     stmt, join_attributes = lambda_stmt_and_join_attributes(
         schema_version, no_attributes, include_last_changed=True
     )
+    run_start_ts = run_start.timestamp()
+    utc_point_in_time_ts = utc_point_in_time.timestamp()
     # We got an include-list of entities, accelerate the query by filtering already
     # in the inner query.
     stmt += lambda q: q.where(
@@ -468,14 +641,15 @@ def _get_states_for_entites_stmt(
         == (
             select(func.max(States.state_id).label("max_state_id"))
             .filter(
-                (States.last_updated >= run_start)
-                & (States.last_updated < utc_point_in_time)
+                (States.last_updated_ts >= run_start_ts)
+                & (States.last_updated_ts < utc_point_in_time_ts)
             )
-            .filter(States.entity_id.in_(entity_ids))
-            .group_by(States.entity_id)
+            .filter(States.metadata_id.in_(_metadata_ids_for_entity_ids(entity_ids)))
+            .group_by(States.metadata_id)
             .subquery()
         ).c.max_state_id
     )
+    stmt += _join_states_meta
     if join_attributes:
         stmt += lambda q: q.outerjoin(
             StateAttributes, (States.attributes_id == StateAttributes.attributes_id)
@@ -484,20 +658,20 @@ def _get_states_for_entites_stmt(
 
 
 def _generate_most_recent_states_by_date(
-    run_start: datetime,
-    utc_point_in_time: datetime,
+    run_start_ts: float,
+    utc_point_in_time_ts: float,
 ) -> Subquery:
     """Generate the sub query for the most recent states by data."""
     return (
         select(
-            States.entity_id.label("max_entity_id"),
-            func.max(States.last_updated).label("max_last_updated"),
+            States.metadata_id.label("max_metadata_id"),
+            func.max(States.last_updated_ts).label("max_last_updated"),
         )
         .filter(
-            (States.last_updated >= run_start)
-            & (States.last_updated < utc_point_in_time)
+            (States.last_updated_ts >= run_start_ts)
+            & (States.last_updated_ts < utc_point_in_time_ts)
         )
-        .group_by(States.entity_id)
+        .group_by(States.metadata_id)
         .subquery()
     )
 
@@ -518,7 +692,7 @@ def _get_states_for_all_stmt(
     # This filtering can't be done in the inner query because the domain column is
     # not indexed and we can't control what's in the custom filter.
     most_recent_states_by_date = _generate_most_recent_states_by_date(
-        run_start, utc_point_in_time
+        run_start.timestamp(), utc_point_in_time.timestamp()
     )
     stmt += lambda q: q.where(
         States.state_id
@@ -527,15 +701,16 @@ def _get_states_for_all_stmt(
             .join(
                 most_recent_states_by_date,
                 and_(
-                    States.entity_id == most_recent_states_by_date.c.max_entity_id,
-                    States.last_updated
+                    States.metadata_id == most_recent_states_by_date.c.max_metadata_id,
+                    States.last_updated_ts
                     == most_recent_states_by_date.c.max_last_updated,
                 ),
             )
-            .group_by(States.entity_id)
+            .group_by(States.metadata_id)
             .subquery()
         ).c.max_state_id,
     )
+    stmt += _join_states_meta
     stmt += _ignore_domains_filter
     if filters and filters.has_config:
         entity_filter = filters.states_entity_filter()
@@ -587,6 +762,11 @@ def _get_rows_with_session(
     return execute_stmt_lambda_element(session, stmt)
 
 
+def _utc_isoformat_from_timestamp(timestamp: float) -> str:
+    """Convert an epoch timestamp to an UTC isoformat string."""
+    return dt_util.utc_from_timestamp(timestamp).isoformat()
+
+
 def _get_single_entity_states_stmt(
     schema_version: int,
     utc_point_in_time: datetime,
@@ -598,14 +778,16 @@ def _get_single_entity_states_stmt(
     stmt, join_attributes = lambda_stmt_and_join_attributes(
         schema_version, no_attributes, include_last_changed=True
     )
+    utc_point_in_time_ts = utc_point_in_time.timestamp()
     stmt += (
         lambda q: q.filter(
-            States.last_updated < utc_point_in_time,
-            States.entity_id == entity_id,
+            States.last_updated_ts < utc_point_in_time_ts,
+            States.metadata_id == _metadata_id_for_entity_id(entity_id),
         )
-        .order_by(States.last_updated.desc())
+        .order_by(States.last_updated_ts.desc())
         .limit(1)
     )
+    stmt += _join_states_meta
     if join_attributes:
         stmt += lambda q: q.outerjoin(
             StateAttributes, States.attributes_id == StateAttributes.attributes_id
@@ -624,28 +806,28 @@ def _sorted_states_to_dict(
     minimal_response: bool = False,
     no_attributes: bool = False,
     compressed_state_format: bool = False,
+    initial_states: dict[str, Row] | None = None,
 ) -> MutableMapping[str, list[State | dict[str, Any]]]:
     """Convert SQL results into JSON friendly data structure.
 
     This takes our state list and turns it into a JSON friendly data
     structure {'entity_id': [list of states], 'entity_id2': [list of states]}
 
-    States must be sorted by entity_id and last_updated
+    States must be sorted by metadata_id and last_updated
 
     We also need to go back and create a synthetic zero data point for
     each list of states, otherwise our graphs won't start on the Y
-    axis correctly.
+    axis correctly. The states at start_time are queried unless
+    initial_states is given.
     """
     if compressed_state_format:
         state_class = row_to_compressed_state
-        _process_timestamp: Callable[
-            [datetime], float | str
-        ] = process_datetime_to_timestamp
+        _process_timestamp: Callable[[float], float | str] = float
         attr_time = COMPRESSED_STATE_LAST_UPDATED
         attr_state = COMPRESSED_STATE_STATE
     else:
         state_class = LazyState  # type: ignore[assignment]
-        _process_timestamp = process_timestamp_to_utc_isoformat
+        _process_timestamp = _utc_isoformat_from_timestamp
         attr_time = LAST_CHANGED_KEY
         attr_state = STATE_KEY
 
@@ -657,8 +839,9 @@ def _sorted_states_to_dict(
 
     # Get the states at the start time
     timer_start = time.perf_counter()
-    initial_states: dict[str, Row] = {}
-    if include_start_time_state:
+    if initial_states is None and not include_start_time_state:
+        initial_states = {}
+    elif initial_states is None:
         initial_states = {
             row.entity_id: row
             for row in _get_rows_with_session(
@@ -719,7 +902,7 @@ def _sorted_states_to_dict(
                     #
                     # We use last_updated for for last_changed since its the same
                     #
-                    attr_time: _process_timestamp(row.last_updated),
+                    attr_time: _process_timestamp(row.last_updated_ts),
                 }
             )
             prev_state = state
@@ -730,4 +913,8 @@ def _sorted_states_to_dict(
         result[ent_id].append(state_class(row, {}, start_time))
 
     # Filter out the empty lists if some states had 0 results.
+    if entity_ids is None:
+        # The rows are sorted by metadata_id so the entities
+        # have to be put back in entity_id order
+        return {key: result[key] for key in sorted(result) if result[key]}
     return {key: val for key, val in result.items() if val}
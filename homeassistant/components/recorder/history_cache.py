@@ -0,0 +1,206 @@
+"""Keep the recently recorded states in memory for history queries."""
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Callable, Iterable
+import threading
+from typing import NamedTuple
+
+from homeassistant.core import split_entity_id
+
+# Older rows of an entity are dropped from the cache when it has more rows
+HISTORY_CACHE_MAX_ROWS_PER_ENTITY = 2048
+
+
+class CachedStateRow(NamedTuple):
+    """A recorded state with the columns of a history query row."""
+
+    entity_id: str
+    state: str | None
+    last_changed_ts: float | None
+    last_updated_ts: float
+    attributes: str | None
+    shared_attrs: str | None
+
+
+class CachedHistory(NamedTuple):
+    """The part of a history query that can be answered by the cache.
+
+    rows holds the rows after start_time of the entities that are fully
+    cached, and the rows from stitch_before on of the entities in
+    stitched_entity_ids. The rows of the stitched entities before
+    stitch_before and all rows of the uncached entities must be queried
+    from the database.
+    """
+
+    rows: dict[str, list[CachedStateRow]]
+    initial_rows: dict[str, CachedStateRow]
+    stitch_before: float | None
+    stitched_entity_ids: list[str]
+    uncached_entity_ids: list[str]
+
+
+class HistoryCache:
+    """Cache the states written by the recorder during the last window seconds.
+
+    The rows of an entity are complete from its oldest cached row on, so
+    the cache can answer any query starting after that row. Rows are
+    added by the recorder thread and read by the database executor.
+    """
+
+    def __init__(
+        self,
+        window: float,
+        max_rows_per_entity: int = HISTORY_CACHE_MAX_ROWS_PER_ENTITY,
+    ) -> None:
+        """Initialize the cache."""
+        self._window = window
+        self._max_rows_per_entity = max_rows_per_entity
+        self._rows: dict[str, deque[CachedStateRow]] = {}
+        self._lock = threading.Lock()
+
+    def add(self, row: CachedStateRow) -> None:
+        """Add a row written by the recorder."""
+        with self._lock:
+            if (rows := self._rows.get(row.entity_id)) is None:
+                self._rows[row.entity_id] = deque((row,))
+                return
+            if rows[-1].shared_attrs == row.shared_attrs:
+                # Share the string with the previous row to save memory
+                row = row._replace(shared_attrs=rows[-1].shared_attrs)
+            rows.append(row)
+            self._trim(rows, row.last_updated_ts - self._window)
+
+    def _trim(self, rows: deque[CachedStateRow], cutoff: float) -> None:
+        """Drop the rows of an entity that are no longer needed.
+
+        The oldest row is kept as long as it is the state at the
+        start of the window.
+        """
+        while len(rows) > self._max_rows_per_entity or (
+            len(rows) > 1 and rows[1].last_updated_ts <= cutoff
+        ):
+            rows.popleft()
+
+    def expire(self, now: float) -> None:
+        """Drop the rows that are older than the window."""
+        with self._lock:
+            for rows in self._rows.values():
+                self._trim(rows, now - self._window)
+
+    def purge(self, purge_before: float) -> None:
+        """Remove the rows that are purged from the database."""
+        with self._lock:
+            for entity_id in list(self._rows):
+                rows = self._rows[entity_id]
+                while rows and rows[0].last_updated_ts < purge_before:
+                    rows.popleft()
+                if not rows:
+                    del self._rows[entity_id]
+
+    def remove_entities(self, entity_filter: Callable[[str], bool]) -> None:
+        """Remove the rows of the entities matching entity_filter."""
+        with self._lock:
+            for entity_id in [
+                entity_id for entity_id in self._rows if entity_filter(entity_id)
+            ]:
+                del self._rows[entity_id]
+
+    def clear(self) -> None:
+        """Remove all rows."""
+        with self._lock:
+            self._rows.clear()
+
+    def get_history(
+        self,
+        entity_ids: Iterable[str],
+        start_ts: float,
+        end_ts: float | None,
+        significant_domains: set[str],
+        significant_changes_only: bool,
+        no_attributes: bool,
+    ) -> CachedHistory:
+        """Return the rows of a history query that are in the cache.
+
+        The rows match the ones returned by the significant states query.
+        """
+        rows: dict[str, list[CachedStateRow]] = {}
+        initial_rows: dict[str, CachedStateRow] = {}
+        stitch_before: float | None = None
+        stitched: dict[str, deque[CachedStateRow]] = {}
+        uncached_entity_ids: list[str] = []
+        with self._lock:
+            for entity_id in entity_ids:
+                if not (entity_rows := self._rows.get(entity_id)):
+                    uncached_entity_ids.append(entity_id)
+                    continue
+                oldest_ts = entity_rows[0].last_updated_ts
+                if oldest_ts < start_ts:
+                    initial_row: CachedStateRow | None = None
+                    selected: list[CachedStateRow] = []
+                    for row in entity_rows:
+                        if row.last_updated_ts < start_ts:
+                            initial_row = row
+                        elif row.last_updated_ts > start_ts:
+                            selected.append(row)
+                    assert initial_row is not None
+                    initial_rows[entity_id] = initial_row
+                    rows[entity_id] = selected
+                elif end_ts is not None and end_ts <= oldest_ts:
+                    uncached_entity_ids.append(entity_id)
+                else:
+                    stitched[entity_id] = entity_rows
+                    if stitch_before is None or oldest_ts > stitch_before:
+                        stitch_before = oldest_ts
+            # The rows of all stitched entities are complete from
+            # the newest of their oldest rows on
+            for entity_id, entity_rows in stitched.items():
+                assert stitch_before is not None
+                rows[entity_id] = [
+                    row
+                    for row in entity_rows
+                    if row.last_updated_ts >= stitch_before
+                    and row.last_updated_ts > start_ts
+                ]
+
+        for entity_id, entity_rows in rows.items():
+            if end_ts is not None:
+                entity_rows = [
+                    row for row in entity_rows if row.last_updated_ts < end_ts
+                ]
+            if (
+                significant_changes_only
+                and split_entity_id(entity_id)[0] not in significant_domains
+            ):
+                entity_rows = [
+                    row
+                    for row in entity_rows
+                    if row.last_changed_ts is None
+                    or row.last_changed_ts == row.last_updated_ts
+                ]
+            if significant_changes_only or no_attributes:
+                entity_rows = [
+                    _query_row(row, significant_changes_only, no_attributes)
+                    for row in entity_rows
+                ]
+            rows[entity_id] = entity_rows
+        if no_attributes:
+            initial_rows = {
+                entity_id: _query_row(row, False, True)
+                for entity_id, row in initial_rows.items()
+            }
+
+        return CachedHistory(
+            rows, initial_rows, stitch_before, list(stitched), uncached_entity_ids
+        )
+
+
+def _query_row(
+    row: CachedStateRow, significant_changes_only: bool, no_attributes: bool
+) -> CachedStateRow:
+    """Return the row with the columns the history query leaves out set to None."""
+    return row._replace(
+        last_changed_ts=None if significant_changes_only else row.last_changed_ts,
+        attributes=None if no_attributes else row.attributes,
+        shared_attrs=None if no_attributes else row.shared_attrs,
+    )
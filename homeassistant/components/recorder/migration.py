@@ -9,7 +9,7 @@ import logging
 from typing import TYPE_CHECKING
 
 import sqlalchemy
-from sqlalchemy import ForeignKeyConstraint, MetaData, Table, func, text
+from sqlalchemy import ForeignKeyConstraint, MetaData, Table, func, text, update
 from sqlalchemy.engine import Engine
 from sqlalchemy.exc import (
     DatabaseError,
@@ -26,16 +26,35 @@ from homeassistant.core import HomeAssistant
 
 from .const import SupportedDialect
 from .db_schema import (
+    EVENT_TYPE_ID_TIME_FIRED_INDEX,
+    EVENT_TYPE_ID_TIME_FIRED_INDEX_TS,
+    LAST_UPDATED_INDEX_TS,
+    LEGACY_ENTITY_ID_LAST_UPDATED_INDEX,
+    LEGACY_EVENT_TYPE_TIME_FIRED_INDEX,
+    LEGACY_LAST_UPDATED_INDEX,
+    LEGACY_TIME_FIRED_INDEX,
+    METADATA_ID_LAST_UPDATED_INDEX,
+    METADATA_ID_LAST_UPDATED_INDEX_TS,
     SCHEMA_VERSION,
     TABLE_STATES,
     Base,
+    Events,
+    EventTypes,
     SchemaChanges,
+    States,
+    StatesMeta,
     Statistics,
     StatisticsMeta,
     StatisticsRuns,
     StatisticsShortTerm,
 )
 from .models import process_timestamp
+from .queries import (
+    find_entity_ids_to_migrate,
+    find_event_type_id,
+    find_event_types_to_migrate,
+    find_states_metadata_id,
+)
 from .statistics import (
     correct_db_schema as statistics_correct_db_schema,
     delete_statistics_duplicates,
@@ -52,6 +71,9 @@ LIVE_MIGRATION_MIN_SCHEMA_VERSION = 0
 
 _LOGGER = logging.getLogger(__name__)
 
+# The number of rows to migrate to timestamps in a single transaction
+TIMESTAMP_MIGRATION_BATCH_SIZE = 250000
+
 
 def raise_if_exception_missing_str(ex: Exception, match_substrs: Iterable[str]) -> None:
     """Raise an exception if the exception and cause do not contain the match substrs."""
@@ -821,10 +843,182 @@ def _apply_update(  # noqa: C901
         # Once we require SQLite >= 3.35.5, we should drop the column:
         # ALTER TABLE statistics_meta DROP COLUMN state_unit_of_measurement
         pass
+    elif new_version == 31:
+        # Move the entity_id strings out of the states table
+        # and into the states_meta table
+        _add_columns(session_maker, "states", [f"metadata_id {big_int}"])
+        _create_index(session_maker, "states", METADATA_ID_LAST_UPDATED_INDEX)
+        _migrate_entity_ids(session_maker)
+        _drop_index(session_maker, "states", LEGACY_ENTITY_ID_LAST_UPDATED_INDEX)
+    elif new_version == 32:
+        # Move the event_type strings out of the events table
+        # and into the event_types table
+        _add_columns(session_maker, "events", [f"event_type_id {big_int}"])
+        _create_index(session_maker, "events", EVENT_TYPE_ID_TIME_FIRED_INDEX)
+        _migrate_event_types(session_maker)
+        _drop_index(session_maker, "events", LEGACY_EVENT_TYPE_TIME_FIRED_INDEX)
+    elif new_version == 33:
+        # Store the times as epoch timestamps to avoid
+        # parsing datetimes when reading the rows back
+        _add_columns(session_maker, "events", ["time_fired_ts DOUBLE PRECISION"])
+        _add_columns(
+            session_maker,
+            "states",
+            ["last_updated_ts DOUBLE PRECISION", "last_changed_ts DOUBLE PRECISION"],
+        )
+        _create_index(session_maker, "events", "ix_events_time_fired_ts")
+        _create_index(session_maker, "events", EVENT_TYPE_ID_TIME_FIRED_INDEX_TS)
+        _create_index(session_maker, "states", LAST_UPDATED_INDEX_TS)
+        _create_index(session_maker, "states", METADATA_ID_LAST_UPDATED_INDEX_TS)
+        _migrate_columns_to_timestamp(session_maker, engine)
+        _drop_index(session_maker, "events", LEGACY_TIME_FIRED_INDEX)
+        _drop_index(session_maker, "events", EVENT_TYPE_ID_TIME_FIRED_INDEX)
+        _drop_index(session_maker, "states", LEGACY_LAST_UPDATED_INDEX)
+        _drop_index(session_maker, "states", METADATA_ID_LAST_UPDATED_INDEX)
     else:
         raise ValueError(f"No schema migration defined for version {new_version}")
 
 
+def _migrate_entity_ids(session_maker: Callable[[], Session]) -> None:
+    """Move the entity_id of every states row to the states_meta table.
+
+    The rows are migrated in batches of MAX_ROWS_TO_PURGE to avoid
+    holding a large transaction open on big databases.
+    """
+    _LOGGER.warning(
+        "Migrating entity_ids to the states_meta table. Note: this can take several "
+        "minutes on large databases and slow computers. Please be patient!"
+    )
+    metadata_ids: dict[str, int] = {}
+    while True:
+        with session_scope(session=session_maker()) as session:
+            if not (states := session.execute(find_entity_ids_to_migrate()).all()):
+                break
+            state_ids_by_entity_id: dict[str, list[int]] = {}
+            for state_id, entity_id in states:
+                state_ids_by_entity_id.setdefault(entity_id, []).append(state_id)
+            for entity_id, state_ids in state_ids_by_entity_id.items():
+                if (metadata_id := metadata_ids.get(entity_id)) is None:
+                    if row := session.execute(
+                        find_states_metadata_id(entity_id)
+                    ).first():
+                        metadata_id = row[0]
+                    else:
+                        states_meta = StatesMeta(entity_id=entity_id)
+                        session.add(states_meta)
+                        session.flush()
+                        metadata_id = states_meta.metadata_id
+                    metadata_ids[entity_id] = metadata_id
+                session.execute(
+                    update(States)
+                    .where(States.state_id.in_(state_ids))
+                    .values(entity_id=None, metadata_id=metadata_id)
+                    .execution_options(synchronize_session=False)
+                )
+    _LOGGER.debug("Migrated %s entity_ids to the states_meta table", len(metadata_ids))
+
+
+def _migrate_event_types(session_maker: Callable[[], Session]) -> None:
+    """Move the event_type of every events row to the event_types table.
+
+    The rows are migrated in batches of MAX_ROWS_TO_PURGE to avoid
+    holding a large transaction open on big databases.
+    """
+    _LOGGER.warning(
+        "Migrating event_types to the event_types table. Note: this can take several "
+        "minutes on large databases and slow computers. Please be patient!"
+    )
+    event_type_ids: dict[str, int] = {}
+    while True:
+        with session_scope(session=session_maker()) as session:
+            if not (events := session.execute(find_event_types_to_migrate()).all()):
+                break
+            event_ids_by_event_type: dict[str, list[int]] = {}
+            for event_id, event_type in events:
+                event_ids_by_event_type.setdefault(event_type, []).append(event_id)
+            for event_type, event_ids in event_ids_by_event_type.items():
+                if (event_type_id := event_type_ids.get(event_type)) is None:
+                    if row := session.execute(find_event_type_id(event_type)).first():
+                        event_type_id = row[0]
+                    else:
+                        event_types = EventTypes(event_type=event_type)
+                        session.add(event_types)
+                        session.flush()
+                        event_type_id = event_types.event_type_id
+                    event_type_ids[event_type] = event_type_id
+                session.execute(
+                    update(Events)
+                    .where(Events.event_id.in_(event_ids))
+                    .values(event_type=None, event_type_id=event_type_id)
+                    .execution_options(synchronize_session=False)
+                )
+    _LOGGER.debug(
+        "Migrated %s event_types to the event_types table", len(event_type_ids)
+    )
+
+
+def _datetime_to_timestamp_sql(dialect: str, column: str) -> str:
+    """Return the sql to convert a datetime column to an epoch timestamp."""
+    if dialect == SupportedDialect.SQLITE:
+        # strftime %s only has second precision so the
+        # microseconds are added back from the end of the string
+        return f"(strftime('%s',{column}) + cast(substr({column},-7) AS FLOAT))"
+    if dialect == SupportedDialect.MYSQL:
+        # Avoid UNIX_TIMESTAMP since it depends on the session time zone
+        return f"(TIMESTAMPDIFF(MICROSECOND,'1970-01-01 00:00:00',{column})/1000000)"
+    return f"EXTRACT(EPOCH FROM {column})"
+
+
+def _migrate_columns_to_timestamp(
+    session_maker: Callable[[], Session], engine: Engine
+) -> None:
+    """Move the datetime columns of the events and states tables to timestamps.
+
+    The legacy datetime columns are cleared as each row is migrated
+    so the time is not stored twice.
+    """
+    _LOGGER.warning(
+        "Migrating times to timestamps. Note: this can take several "
+        "minutes on large databases and slow computers. Please be patient!"
+    )
+    dialect = engine.dialect.name
+    time_fired = _datetime_to_timestamp_sql(dialect, "time_fired")
+    last_updated = _datetime_to_timestamp_sql(dialect, "last_updated")
+    last_changed = _datetime_to_timestamp_sql(dialect, "last_changed")
+    events_set = (
+        f"time_fired_ts=(CASE WHEN time_fired IS NULL THEN 0 ELSE {time_fired} END),"
+        " time_fired=NULL"
+    )
+    states_set = (
+        "last_updated_ts="
+        f"(CASE WHEN last_updated IS NULL THEN 0 ELSE {last_updated} END),"
+        f" last_changed_ts={last_changed}, last_updated=NULL, last_changed=NULL"
+    )
+    if dialect == SupportedDialect.MYSQL:
+        # MySQL does not support LIMIT in a subquery of the table being updated
+        statements = (
+            f"UPDATE events SET {events_set} WHERE time_fired_ts IS NULL "
+            f"LIMIT {TIMESTAMP_MIGRATION_BATCH_SIZE}",
+            f"UPDATE states SET {states_set} WHERE last_updated_ts IS NULL "
+            f"LIMIT {TIMESTAMP_MIGRATION_BATCH_SIZE}",
+        )
+    else:
+        statements = (
+            f"UPDATE events SET {events_set} WHERE event_id IN "
+            "(SELECT event_id FROM events WHERE time_fired_ts IS NULL "
+            f"LIMIT {TIMESTAMP_MIGRATION_BATCH_SIZE})",
+            f"UPDATE states SET {states_set} WHERE state_id IN "
+            "(SELECT state_id FROM states WHERE last_updated_ts IS NULL "
+            f"LIMIT {TIMESTAMP_MIGRATION_BATCH_SIZE})",
+        )
+    for statement in statements:
+        while True:
+            with session_scope(session=session_maker()) as session:
+                result = session.connection().execute(text(statement))
+                if not result.rowcount:
+                    break
+
+
 def _initialize_database(session: Session) -> bool:
     """Initialize a new database, or a database created before introducing schema changes.
 
@@ -840,7 +1034,7 @@ def _initialize_database(session: Session) -> bool:
     indexes = inspector.get_indexes("events")
 
     for index in indexes:
-        if index["column_names"] == ["time_fired"]:
+        if index["column_names"] in (["time_fired"], ["time_fired_ts"]):
             # Schema addition from version 1 detected. New DB.
             session.add(StatisticsRuns(start=get_start_time()))
             session.add(SchemaChanges(schema_version=SCHEMA_VERSION))
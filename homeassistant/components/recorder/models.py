@@ -176,8 +176,8 @@ class LazyState(State):
     def last_changed(self) -> datetime:
         """Last changed datetime."""
         if self._last_changed is None:
-            if (last_changed := self._row.last_changed) is not None:
-                self._last_changed = process_timestamp(last_changed)
+            if (last_changed_ts := self._row.last_changed_ts) is not None:
+                self._last_changed = dt_util.utc_from_timestamp(last_changed_ts)
             else:
                 self._last_changed = self.last_updated
         return self._last_changed
@@ -191,7 +191,7 @@ class LazyState(State):
     def last_updated(self) -> datetime:
         """Last updated datetime."""
         if self._last_updated is None:
-            self._last_updated = process_timestamp(self._row.last_updated)
+            self._last_updated = dt_util.utc_from_timestamp(self._row.last_updated_ts)
         return self._last_updated
 
     @last_updated.setter
@@ -207,18 +207,18 @@ class LazyState(State):
         To be used for JSON serialization.
         """
         if self._last_changed is None and self._last_updated is None:
-            last_updated_isoformat = process_timestamp_to_utc_isoformat(
-                self._row.last_updated
-            )
+            last_updated_ts = self._row.last_updated_ts
+            last_updated_isoformat = dt_util.utc_from_timestamp(
+                last_updated_ts
+            ).isoformat()
             if (
-                self._row.last_changed is None
-                or self._row.last_changed == self._row.last_updated
-            ):
+                last_changed_ts := self._row.last_changed_ts
+            ) is None or last_changed_ts == last_updated_ts:
                 last_changed_isoformat = last_updated_isoformat
             else:
-                last_changed_isoformat = process_timestamp_to_utc_isoformat(
-                    self._row.last_changed
-                )
+                last_changed_isoformat = dt_util.utc_from_timestamp(
+                    last_changed_ts
+                ).isoformat()
         else:
             last_updated_isoformat = self.last_updated.isoformat()
             if self.last_changed == self.last_updated:
@@ -273,16 +273,12 @@ def row_to_compressed_state(
     if start_time:
         comp_state[COMPRESSED_STATE_LAST_UPDATED] = start_time.timestamp()
     else:
-        row_last_updated: datetime = row.last_updated
-        comp_state[COMPRESSED_STATE_LAST_UPDATED] = process_datetime_to_timestamp(
-            row_last_updated
-        )
+        row_last_updated_ts: float = row.last_updated_ts
+        comp_state[COMPRESSED_STATE_LAST_UPDATED] = row_last_updated_ts
         if (
-            row_changed_changed := row.last_changed
-        ) and row_last_updated != row_changed_changed:
-            comp_state[COMPRESSED_STATE_LAST_CHANGED] = process_datetime_to_timestamp(
-                row_changed_changed
-            )
+            row_last_changed_ts := row.last_changed_ts
+        ) and row_last_updated_ts != row_last_changed_ts:
+            comp_state[COMPRESSED_STATE_LAST_CHANGED] = row_last_changed_ts
     return comp_state
 
 
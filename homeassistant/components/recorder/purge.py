@@ -8,13 +8,13 @@ from itertools import islice, zip_longest
 import logging
 from typing import TYPE_CHECKING, Any
 
+from sqlalchemy.engine.row import Row
 from sqlalchemy.orm.session import Session
-from sqlalchemy.sql.expression import distinct
 
 from homeassistant.const import EVENT_STATE_CHANGED
 
 from .const import MAX_ROWS_TO_PURGE, SupportedDialect
-from .db_schema import Events, StateAttributes, States
+from .db_schema import Events, EventTypes, StateAttributes, States, StatesMeta
 from .queries import (
     attributes_ids_exist_in_states,
     attributes_ids_exist_in_states_sqlite,
@@ -48,6 +48,16 @@ _LOGGER = logging.getLogger(__name__)
 DEFAULT_STATES_BATCHES_PER_PURGE = 20  # We expect ~95% de-dupe rate
 DEFAULT_EVENTS_BATCHES_PER_PURGE = 15  # We expect ~92% de-dupe rate
 
+# A continuous purge slice should not hold the recorder
+# thread for longer than this, in seconds
+CONTINUOUS_PURGE_TARGET_TIME = 0.25
+# Live writes waiting in the queue above which continuous
+# purge slices are skipped and shrunk
+CONTINUOUS_PURGE_MAX_BACKLOG = 50
+# Seconds to wait before looking for more data to purge
+# once a continuous purge has caught up
+CONTINUOUS_PURGE_IDLE_INTERVAL = 300
+
 
 def take(take_num: int, iterable: Iterable) -> list[Any]:
     """Return first n items of the iterable as a list.
@@ -83,6 +93,8 @@ def purge_old_data(
         purge_before.isoformat(sep=" ", timespec="seconds"),
     )
     using_sqlite = instance.dialect_name == SupportedDialect.SQLITE
+    if instance.history_cache:
+        instance.history_cache.purge(purge_before.timestamp())
 
     with session_scope(session=instance.get_session()) as session:
         # Purge a max of MAX_ROWS_TO_PURGE, based on the oldest states or events record
@@ -133,6 +145,23 @@ def purge_old_data(
     return True
 
 
+def next_continuous_purge_batches(batches: int, elapsed: float, backlog: int) -> int:
+    """Return the number of batches to purge in the next continuous purge slice.
+
+    The slice grows by one batch while slices are fast and the queue is
+    nearly empty, and is halved as soon as a slice is slow or live writes
+    are waiting.
+    """
+    if elapsed > CONTINUOUS_PURGE_TARGET_TIME or backlog > CONTINUOUS_PURGE_MAX_BACKLOG:
+        return max(1, batches // 2)
+    if (
+        elapsed < CONTINUOUS_PURGE_TARGET_TIME / 2
+        and backlog < CONTINUOUS_PURGE_MAX_BACKLOG / 10
+    ):
+        return min(batches + 1, DEFAULT_STATES_BATCHES_PER_PURGE)
+    return batches
+
+
 def _purging_legacy_format(session: Session) -> bool:
     """Check if there are any legacy event_id linked states rows remaining."""
     return bool(session.execute(find_legacy_row()).scalar())
@@ -233,7 +262,7 @@ def _select_state_attributes_ids_to_purge(
     """Return sets of state and attribute ids to purge."""
     state_ids = set()
     attributes_ids = set()
-    for state in session.execute(find_states_to_purge(purge_before)).all():
+    for state in session.execute(find_states_to_purge(purge_before.timestamp())).all():
         state_ids.add(state.state_id)
         if state.attributes_id:
             attributes_ids.add(state.attributes_id)
@@ -251,7 +280,7 @@ def _select_event_data_ids_to_purge(
     """Return sets of event and data ids to purge."""
     event_ids = set()
     data_ids = set()
-    for event in session.execute(find_events_to_purge(purge_before)).all():
+    for event in session.execute(find_events_to_purge(purge_before.timestamp())).all():
         event_ids.add(event.event_id)
         if event.data_id:
             data_ids.add(event.data_id)
@@ -420,7 +449,9 @@ def _select_legacy_event_state_and_attributes_and_data_ids_to_purge(
     still need to be able to purge them.
     """
     events = session.execute(
-        find_legacy_event_state_and_attributes_and_data_ids_to_purge(purge_before)
+        find_legacy_event_state_and_attributes_and_data_ids_to_purge(
+            purge_before.timestamp()
+        )
     ).all()
     _LOGGER.debug("Selected %s event ids to remove", len(events))
     event_ids = set()
@@ -471,6 +502,14 @@ def _evict_purged_states_from_old_states_cache(
     for purged_state_id in purged_state_ids.intersection(old_state_reversed):
         old_states.pop(old_state_reversed[purged_state_id], None)
 
+    # The same for the old state ids used by bulk inserts
+    old_state_ids = instance._old_state_ids  # pylint: disable=protected-access
+    old_state_ids_reversed = {
+        old_state_id: entity_id for entity_id, old_state_id in old_state_ids.items()
+    }
+    for purged_state_id in purged_state_ids.intersection(old_state_ids_reversed):
+        old_state_ids.pop(old_state_ids_reversed[purged_state_id], None)
+
 
 def _evict_purged_data_from_data_cache(
     instance: Recorder, purged_data_ids: set[int]
@@ -574,32 +613,50 @@ def _purge_filtered_data(instance: Recorder, session: Session) -> bool:
     using_sqlite = instance.dialect_name == SupportedDialect.SQLITE
 
     # Check if excluded entity_ids are in database
-    excluded_entity_ids: list[str] = [
-        entity_id
-        for (entity_id,) in session.query(distinct(States.entity_id)).all()
+    excluded_metadata_ids: list[int] = [
+        metadata_id
+        for (metadata_id, entity_id) in _select_metadata_ids_with_states(session)
         if not instance.entity_filter(entity_id)
     ]
-    if len(excluded_entity_ids) > 0:
-        _purge_filtered_states(instance, session, excluded_entity_ids, using_sqlite)
+    if len(excluded_metadata_ids) > 0:
+        _purge_filtered_states(instance, session, excluded_metadata_ids, using_sqlite)
         return False
 
     # Check if excluded event_types are in database
-    excluded_event_types: list[str] = [
-        event_type
-        for (event_type,) in session.query(distinct(Events.event_type)).all()
-        if event_type in instance.exclude_t
-    ]
-    if len(excluded_event_types) > 0:
-        _purge_filtered_events(instance, session, excluded_event_types)
+    excluded_event_type_ids: list[int] = []
+    excluded_event_types: list[str] = []
+    for event_type_id, event_type in (
+        session.query(EventTypes.event_type_id, EventTypes.event_type)
+        .filter(EventTypes.event_type.in_(instance.exclude_t))
+        .join(Events, Events.event_type_id == EventTypes.event_type_id)
+        .distinct()
+        .all()
+    ):
+        excluded_event_type_ids.append(event_type_id)
+        excluded_event_types.append(event_type)
+    if len(excluded_event_type_ids) > 0:
+        _purge_filtered_events(
+            instance, session, excluded_event_type_ids, excluded_event_types
+        )
         return False
 
     return True
 
 
+def _select_metadata_ids_with_states(session: Session) -> list[Row]:
+    """Select the metadata_id and entity_id of every entity that has states."""
+    return (
+        session.query(StatesMeta.metadata_id, StatesMeta.entity_id)
+        .join(States, States.metadata_id == StatesMeta.metadata_id)
+        .distinct()
+        .all()
+    )
+
+
 def _purge_filtered_states(
     instance: Recorder,
     session: Session,
-    excluded_entity_ids: list[str],
+    excluded_metadata_ids: list[int],
     using_sqlite: bool,
 ) -> None:
     """Remove filtered states and linked events."""
@@ -609,7 +666,7 @@ def _purge_filtered_states(
     state_ids, attributes_ids, event_ids = zip(
         *(
             session.query(States.state_id, States.attributes_id, States.event_id)
-            .filter(States.entity_id.in_(excluded_entity_ids))
+            .filter(States.metadata_id.in_(excluded_metadata_ids))
             .limit(MAX_ROWS_TO_PURGE)
             .all()
         )
@@ -627,14 +684,17 @@ def _purge_filtered_states(
 
 
 def _purge_filtered_events(
-    instance: Recorder, session: Session, excluded_event_types: list[str]
+    instance: Recorder,
+    session: Session,
+    excluded_event_type_ids: list[int],
+    excluded_event_types: list[str],
 ) -> None:
     """Remove filtered events and linked states."""
     using_sqlite = instance.dialect_name == SupportedDialect.SQLITE
     event_ids, data_ids = zip(
         *(
             session.query(Events.event_id, Events.data_id)
-            .filter(Events.event_type.in_(excluded_event_types))
+            .filter(Events.event_type_id.in_(excluded_event_type_ids))
             .limit(MAX_ROWS_TO_PURGE)
             .all()
         )
@@ -654,23 +714,28 @@ def _purge_filtered_events(
         _purge_batch_data_ids(instance, session, unused_data_ids_set)
     if EVENT_STATE_CHANGED in excluded_event_types:
         session.query(StateAttributes).delete(synchronize_session=False)
-        instance._state_attributes_ids = {}  # pylint: disable=protected-access
+        instance._state_attributes_ids.clear()  # pylint: disable=protected-access
 
 
 @retryable_database_job("purge")
 def purge_entity_data(instance: Recorder, entity_filter: Callable[[str], bool]) -> bool:
     """Purge states and events of specified entities."""
     using_sqlite = instance.dialect_name == SupportedDialect.SQLITE
+    if instance.history_cache:
+        instance.history_cache.remove_entities(entity_filter)
     with session_scope(session=instance.get_session()) as session:
-        selected_entity_ids: list[str] = [
-            entity_id
-            for (entity_id,) in session.query(distinct(States.entity_id)).all()
-            if entity_filter(entity_id)
-        ]
+        selected_metadata_ids: list[int] = []
+        selected_entity_ids: list[str] = []
+        for metadata_id, entity_id in _select_metadata_ids_with_states(session):
+            if entity_filter(entity_id):
+                selected_metadata_ids.append(metadata_id)
+                selected_entity_ids.append(entity_id)
         _LOGGER.debug("Purging entity data for %s", selected_entity_ids)
-        if len(selected_entity_ids) > 0:
+        if len(selected_metadata_ids) > 0:
             # Purge a max of MAX_ROWS_TO_PURGE, based on the oldest states or events record
-            _purge_filtered_states(instance, session, selected_entity_ids, using_sqlite)
+            _purge_filtered_states(
+                instance, session, selected_metadata_ids, using_sqlite
+            )
             _LOGGER.debug("Purging entity data hasn't fully completed yet")
             return False
 
@@ -4,7 +4,17 @@ from __future__ import annotations
 from collections.abc import Iterable
 from datetime import datetime
 
-from sqlalchemy import delete, distinct, func, lambda_stmt, select, union_all, update
+from sqlalchemy import (
+    delete,
+    distinct,
+    func,
+    lambda_stmt,
+    select,
+    text,
+    union_all,
+    update,
+)
+from sqlalchemy.sql.elements import TextClause
 from sqlalchemy.sql.lambdas import StatementLambdaElement
 from sqlalchemy.sql.selectable import Select
 
@@ -12,9 +22,11 @@ from .const import MAX_ROWS_TO_PURGE
 from .db_schema import (
     EventData,
     Events,
+    EventTypes,
     RecorderRuns,
     StateAttributes,
     States,
+    StatesMeta,
     StatisticsRuns,
     StatisticsShortTerm,
 )
@@ -40,6 +52,42 @@ def find_shared_data_id(attr_hash: int, shared_data: str) -> StatementLambdaElem
     )
 
 
+def find_states_metadata_id(entity_id: str) -> StatementLambdaElement:
+    """Find a metadata_id by entity_id."""
+    return lambda_stmt(
+        lambda: select(StatesMeta.metadata_id).filter(StatesMeta.entity_id == entity_id)
+    )
+
+
+def find_event_type_id(event_type: str) -> StatementLambdaElement:
+    """Find an event_type_id by event_type."""
+    return lambda_stmt(
+        lambda: select(EventTypes.event_type_id).filter(
+            EventTypes.event_type == event_type
+        )
+    )
+
+
+def find_event_types_to_migrate() -> StatementLambdaElement:
+    """Find events rows that still have an event_type instead of an event_type_id."""
+    return lambda_stmt(
+        lambda: select(Events.event_id, Events.event_type)
+        .filter(Events.event_type_id.is_(None))
+        .filter(Events.event_type.is_not(None))
+        .limit(MAX_ROWS_TO_PURGE)
+    )
+
+
+def find_entity_ids_to_migrate() -> StatementLambdaElement:
+    """Find states rows that still have an entity_id instead of a metadata_id."""
+    return lambda_stmt(
+        lambda: select(States.state_id, States.entity_id)
+        .filter(States.metadata_id.is_(None))
+        .filter(States.entity_id.is_not(None))
+        .limit(MAX_ROWS_TO_PURGE)
+    )
+
+
 def _state_attrs_exist(attr: int | None) -> Select:
     """Check if a state attributes id exists in the states table."""
     return select(func.min(States.attributes_id)).where(States.attributes_id == attr)
@@ -578,20 +626,20 @@ def delete_recorder_runs_rows(
     )
 
 
-def find_events_to_purge(purge_before: datetime) -> StatementLambdaElement:
+def find_events_to_purge(purge_before: float) -> StatementLambdaElement:
     """Find events to purge."""
     return lambda_stmt(
         lambda: select(Events.event_id, Events.data_id)
-        .filter(Events.time_fired < purge_before)
+        .filter(Events.time_fired_ts < purge_before)
         .limit(MAX_ROWS_TO_PURGE)
     )
 
 
-def find_states_to_purge(purge_before: datetime) -> StatementLambdaElement:
+def find_states_to_purge(purge_before: float) -> StatementLambdaElement:
     """Find states to purge."""
     return lambda_stmt(
         lambda: select(States.state_id, States.attributes_id)
-        .filter(States.last_updated < purge_before)
+        .filter(States.last_updated_ts < purge_before)
         .limit(MAX_ROWS_TO_PURGE)
     )
 
@@ -624,7 +672,7 @@ def find_latest_statistics_runs_run_id() -> StatementLambdaElement:
 
 
 def find_legacy_event_state_and_attributes_and_data_ids_to_purge(
-    purge_before: datetime,
+    purge_before: float,
 ) -> StatementLambdaElement:
     """Find the latest row in the legacy format to purge."""
     return lambda_stmt(
@@ -632,7 +680,7 @@ def find_legacy_event_state_and_attributes_and_data_ids_to_purge(
             Events.event_id, Events.data_id, States.state_id, States.attributes_id
         )
         .outerjoin(States, Events.event_id == States.event_id)
-        .filter(Events.time_fired < purge_before)
+        .filter(Events.time_fired_ts < purge_before)
         .limit(MAX_ROWS_TO_PURGE)
     )
 
@@ -640,3 +688,52 @@ def find_legacy_event_state_and_attributes_and_data_ids_to_purge(
 def find_legacy_row() -> StatementLambdaElement:
     """Check if there are still states in the table with an event_id."""
     return lambda_stmt(lambda: select(func.max(States.event_id)))
+
+
+def find_max_state_id() -> StatementLambdaElement:
+    """Find the highest state_id."""
+    return lambda_stmt(lambda: select(func.max(States.state_id)))
+
+
+def allocate_postgresql_state_ids(count: int) -> TextClause:
+    """Reserve count state_ids from the postgresql states sequence."""
+    return text(
+        "SELECT nextval(pg_get_serial_sequence('states', 'state_id')) "
+        "FROM generate_series(1, :count)"
+    ).bindparams(count=count)
+
+
+def find_recently_used_shared_attributes(limit: int) -> StatementLambdaElement:
+    """Find the shared attributes of the newest states."""
+    return lambda_stmt(
+        lambda: select(
+            StateAttributes.attributes_id, StateAttributes.shared_attrs
+        ).where(
+            StateAttributes.attributes_id.in_(
+                select(
+                    select(States.attributes_id)
+                    .order_by(States.state_id.desc())
+                    .limit(limit)
+                    .subquery()
+                    .c.attributes_id
+                )
+            )
+        )
+    )
+
+
+def find_recently_used_shared_data(limit: int) -> StatementLambdaElement:
+    """Find the shared data of the newest events."""
+    return lambda_stmt(
+        lambda: select(EventData.data_id, EventData.shared_data).where(
+            EventData.data_id.in_(
+                select(
+                    select(Events.data_id)
+                    .order_by(Events.event_id.desc())
+                    .limit(limit)
+                    .subquery()
+                    .c.data_id
+                )
+            )
+        )
+    )
@@ -0,0 +1,134 @@
+"""Diagnostic sensors with the performance counters of the recorder."""
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import timedelta
+
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorEntityDescription,
+    SensorStateClass,
+)
+from homeassistant.const import UnitOfTime
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity import EntityCategory
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.typing import ConfigType, DiscoveryInfoType, StateType
+
+from .core import Recorder
+from .util import get_instance
+
+SCAN_INTERVAL = timedelta(seconds=30)
+
+
+@dataclass
+class RecorderSensorRequiredKeysMixin:
+    """Class for recorder sensor required keys."""
+
+    value: Callable[[Recorder], StateType]
+
+
+@dataclass
+class RecorderSensorEntityDescription(
+    SensorEntityDescription, RecorderSensorRequiredKeysMixin
+):
+    """A class that describes recorder sensor entities."""
+
+
+def _milliseconds(duration: float | None) -> float | None:
+    """Convert a duration in seconds to milliseconds."""
+    return None if duration is None else round(duration * 1000, 2)
+
+
+SENSOR_TYPES: tuple[RecorderSensorEntityDescription, ...] = (
+    RecorderSensorEntityDescription(
+        key="backlog",
+        name="Recorder backlog",
+        icon="mdi:tray-full",
+        native_unit_of_measurement="tasks",
+        state_class=SensorStateClass.MEASUREMENT,
+        value=lambda instance: instance.backlog,
+    ),
+    RecorderSensorEntityDescription(
+        key="events_per_second",
+        name="Recorder events written",
+        icon="mdi:database-arrow-down",
+        native_unit_of_measurement="events/s",
+        state_class=SensorStateClass.MEASUREMENT,
+        value=lambda instance: round(instance.telemetry.rates()[0], 2),
+    ),
+    RecorderSensorEntityDescription(
+        key="states_per_second",
+        name="Recorder states written",
+        icon="mdi:database-arrow-down",
+        native_unit_of_measurement="states/s",
+        state_class=SensorStateClass.MEASUREMENT,
+        value=lambda instance: round(instance.telemetry.rates()[1], 2),
+    ),
+    RecorderSensorEntityDescription(
+        key="commit_duration",
+        name="Recorder commit duration",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        value=lambda instance: _milliseconds(instance.telemetry.commit_duration.last),
+    ),
+    RecorderSensorEntityDescription(
+        key="purge_duration",
+        name="Recorder purge duration",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        value=lambda instance: _milliseconds(instance.telemetry.purge_duration.last),
+    ),
+    RecorderSensorEntityDescription(
+        key="statistics_duration",
+        name="Recorder statistics compile duration",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        value=lambda instance: _milliseconds(
+            instance.telemetry.statistics_duration.last
+        ),
+    ),
+)
+
+
+async def async_setup_platform(
+    hass: HomeAssistant,
+    config: ConfigType,
+    async_add_entities: AddEntitiesCallback,
+    discovery_info: DiscoveryInfoType | None = None,
+) -> None:
+    """Set up the recorder telemetry sensors."""
+    if discovery_info is None:
+        return
+    instance = get_instance(hass)
+    async_add_entities(
+        (
+            RecorderTelemetrySensor(instance, description)
+            for description in SENSOR_TYPES
+        ),
+        True,
+    )
+
+
+class RecorderTelemetrySensor(SensorEntity):
+    """A sensor with a performance counter of the recorder."""
+
+    entity_description: RecorderSensorEntityDescription
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+
+    def __init__(
+        self, instance: Recorder, description: RecorderSensorEntityDescription
+    ) -> None:
+        """Initialize the sensor."""
+        self.entity_description = description
+        self._instance = instance
+        self._attr_unique_id = f"recorder_{description.key}"
+
+    async def async_update(self) -> None:
+        """Read the counter from the recorder."""
+        self._attr_native_value = self.entity_description.value(self._instance)
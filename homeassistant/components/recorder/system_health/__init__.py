@@ -9,7 +9,7 @@ from homeassistant.core import HomeAssistant, callback
 
 from .. import get_instance
 from ..const import SupportedDialect
-from ..core import Recorder
+from ..core import ID_CACHE_EVENT_DATA, ID_CACHE_STATE_ATTRIBUTES, Recorder
 from ..util import session_scope
 from .mysql import db_size_bytes as mysql_db_size_bytes
 from .postgresql import db_size_bytes as postgresql_db_size_bytes
@@ -54,6 +54,22 @@ def _async_get_db_engine_info(instance: Recorder) -> dict[str, Any]:
     return db_engine_info
 
 
+@callback
+def _async_get_id_cache_info(instance: Recorder) -> dict[str, Any]:
+    """Get the usage of the shared attributes and event data caches."""
+    id_cache_stats = instance.id_cache_stats
+    return {
+        f"{name}_cache": (
+            f"{stats['hits']} hits, {stats['misses']} misses,"
+            f" {stats['evictions']} evictions"
+        )
+        for name, stats in (
+            (ID_CACHE_STATE_ATTRIBUTES, id_cache_stats[ID_CACHE_STATE_ATTRIBUTES]),
+            (ID_CACHE_EVENT_DATA, id_cache_stats[ID_CACHE_EVENT_DATA]),
+        )
+    }
+
+
 async def system_health_info(hass: HomeAssistant) -> dict[str, Any]:
     """Get info for the info page."""
     instance = get_instance(hass)
@@ -61,6 +77,7 @@ async def system_health_info(hass: HomeAssistant) -> dict[str, Any]:
     run_history = instance.run_history
     database_name = urlparse(instance.db_url).path.lstrip("/")
     db_engine_info = _async_get_db_engine_info(instance)
+    id_cache_info = _async_get_id_cache_info(instance)
     db_stats: dict[str, Any] = {}
 
     if instance.async_db_ready.done():
@@ -71,4 +88,4 @@ async def system_health_info(hass: HomeAssistant) -> dict[str, Any]:
             "oldest_recorder_run": run_history.first.start,
             "current_recorder_run": run_history.current.start,
         }
-    return db_runs | db_stats | db_engine_info
+    return db_runs | db_stats | db_engine_info | id_cache_info
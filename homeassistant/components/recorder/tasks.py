@@ -5,12 +5,14 @@ import abc
 import asyncio
 from collections.abc import Callable, Iterable
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import datetime, timedelta
 import threading
+import time
 from typing import TYPE_CHECKING, Any
 
 from homeassistant.core import Event
 from homeassistant.helpers.typing import UndefinedType
+import homeassistant.util.dt as dt_util
 
 from . import purge, statistics
 from .const import DOMAIN, EXCLUDE_ATTRIBUTES
@@ -89,9 +91,12 @@ class PurgeTask(RecorderTask):
 
     def run(self, instance: Recorder) -> None:
         """Purge the database."""
-        if purge.purge_old_data(
+        start = time.monotonic()
+        finished = purge.purge_old_data(
             instance, self.purge_before, self.repack, self.apply_filter
-        ):
+        )
+        instance.telemetry.purge_duration.record(time.monotonic() - start)
+        if finished:
             with instance.get_session() as session:
                 instance.run_history.load_from_db(session)
             # We always need to do the db cleanups after a purge
@@ -105,6 +110,37 @@ class PurgeTask(RecorderTask):
         )
 
 
+@dataclass
+class ContinuousPurgeTask(RecorderTask):
+    """Object to store information about a continuous purge slice."""
+
+    def run(self, instance: Recorder) -> None:
+        """Purge a bounded slice of old data and size the next one."""
+        instance.continuous_purge_queued = False
+        batches = instance.continuous_purge_batches
+        purge_before = dt_util.utcnow() - timedelta(days=instance.keep_days)
+        start = time.monotonic()
+        finished = purge.purge_old_data(
+            instance,
+            purge_before,
+            repack=False,
+            events_batch_size=batches,
+            states_batch_size=batches,
+        )
+        elapsed = time.monotonic() - start
+        instance.telemetry.purge_duration.record(elapsed)
+        instance.continuous_purge_batches = purge.next_continuous_purge_batches(
+            batches, elapsed, instance.backlog
+        )
+        if finished:
+            with instance.get_session() as session:
+                instance.run_history.load_from_db(session)
+            # Nothing is left to purge until more data ages out
+            instance.continuous_purge_idle_until = (
+                time.monotonic() + purge.CONTINUOUS_PURGE_IDLE_INTERVAL
+            )
+
+
 @dataclass
 class PurgeEntitiesTask(RecorderTask):
     """Object to store entity information about purge task."""
@@ -137,7 +173,10 @@ class StatisticsTask(RecorderTask):
 
     def run(self, instance: Recorder) -> None:
         """Run statistics task."""
-        if statistics.compile_statistics(instance, self.start, self.fire_events):
+        start = time.monotonic()
+        finished = statistics.compile_statistics(instance, self.start, self.fire_events)
+        instance.telemetry.statistics_duration.record(time.monotonic() - start)
+        if finished:
             return
         # Schedule a new statistics task if this one didn't finish
         instance.queue_task(StatisticsTask(self.start, self.fire_events))
@@ -0,0 +1,115 @@
+"""Performance telemetry of the recorder."""
+from __future__ import annotations
+
+from bisect import bisect_left
+from collections import deque
+from collections.abc import Sequence
+import time
+from typing import Any
+
+# Upper bounds in seconds of the commit duration histogram buckets
+COMMIT_DURATION_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5)
+# Upper bounds in seconds of the purge and statistics duration histogram buckets
+TASK_DURATION_BUCKETS = (0.1, 0.5, 1, 5, 10, 30, 60, 300)
+# The written rows per second are averaged over this many seconds
+RATE_WINDOW = 60
+
+
+class DurationHistogram:
+    """A histogram of durations with fixed bucket bounds."""
+
+    def __init__(self, buckets: Sequence[float]) -> None:
+        """Initialize the histogram."""
+        self._buckets = buckets
+        self._counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.last: float | None = None
+        self.max = 0.0
+
+    def record(self, duration: float) -> None:
+        """Record a duration."""
+        self._counts[bisect_left(self._buckets, duration)] += 1
+        self.count += 1
+        self.total += duration
+        self.last = duration
+        self.max = max(self.max, duration)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the histogram as a dict.
+
+        The buckets are cumulative and keyed by their upper bound.
+        """
+        buckets: dict[str, int] = {}
+        cumulative = 0
+        for bound, count in zip(self._buckets, self._counts):
+            cumulative += count
+            buckets[str(bound)] = cumulative
+        buckets["+Inf"] = self.count
+        return {
+            "count": self.count,
+            "sum": self.total,
+            "last": self.last,
+            "max": self.max,
+            "buckets": buckets,
+        }
+
+
+class RecorderTelemetry:
+    """Collect the performance counters of the recorder.
+
+    The counters are only written from the recorder thread.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the counters."""
+        self.events_written = 0
+        self.states_written = 0
+        self.shared_attributes_lookups = 0
+        self.shared_attributes_lookup_hits = 0
+        self.shared_data_lookups = 0
+        self.shared_data_lookup_hits = 0
+        self.commit_duration = DurationHistogram(COMMIT_DURATION_BUCKETS)
+        self.purge_duration = DurationHistogram(TASK_DURATION_BUCKETS)
+        self.statistics_duration = DurationHistogram(TASK_DURATION_BUCKETS)
+        self._samples: deque[tuple[float, int, int]] = deque()
+
+    def record_commit(self, duration: float, events: int, states: int) -> None:
+        """Record a commit of the event session."""
+        self.commit_duration.record(duration)
+        self.events_written += events
+        self.states_written += states
+        now = time.monotonic()
+        samples = self._samples
+        samples.append((now, self.events_written, self.states_written))
+        while samples[0][0] < now - RATE_WINDOW:
+            samples.popleft()
+
+    def rates(self) -> tuple[float, float]:
+        """Return the events and states written per second."""
+        if not (samples := list(self._samples)):
+            return 0.0, 0.0
+        start, events, states = samples[0]
+        if (elapsed := time.monotonic() - start) <= 0:
+            return 0.0, 0.0
+        return (
+            (self.events_written - events) / elapsed,
+            (self.states_written - states) / elapsed,
+        )
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the counters as a dict."""
+        events_per_second, states_per_second = self.rates()
+        return {
+            "events_written": self.events_written,
+            "states_written": self.states_written,
+            "events_per_second": round(events_per_second, 2),
+            "states_per_second": round(states_per_second, 2),
+            "shared_attributes_lookups": self.shared_attributes_lookups,
+            "shared_attributes_lookup_hits": self.shared_attributes_lookup_hits,
+            "shared_data_lookups": self.shared_data_lookups,
+            "shared_data_lookup_hits": self.shared_data_lookup_hits,
+            "commit_duration": self.commit_duration.as_dict(),
+            "purge_duration": self.purge_duration.as_dict(),
+            "statistics_duration": self.statistics_duration.as_dict(),
+        }
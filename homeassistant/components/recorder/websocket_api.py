@@ -62,6 +62,7 @@ def async_setup(hass: HomeAssistant) -> None:
     websocket_api.async_register_command(hass, ws_list_statistic_ids)
     websocket_api.async_register_command(hass, ws_import_statistics)
     websocket_api.async_register_command(hass, ws_info)
+    websocket_api.async_register_command(hass, ws_telemetry)
     websocket_api.async_register_command(hass, ws_update_statistics_metadata)
     websocket_api.async_register_command(hass, ws_validate_statistics)
 
@@ -497,9 +498,11 @@ def ws_info(
     migration_is_live = async_migration_is_live(hass)
     recording = instance.recording if instance else False
     thread_alive = instance.is_alive() if instance else False
+    id_caches = instance.id_cache_stats if instance else None
 
     recorder_info = {
         "backlog": backlog,
+        "id_caches": id_caches,
         "max_backlog": MAX_QUEUE_BACKLOG,
         "migration_in_progress": migration_in_progress,
         "migration_is_live": migration_is_live,
@@ -509,6 +512,27 @@ def ws_info(
     connection.send_result(msg["id"], recorder_info)
 
 
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "recorder/telemetry",
+    }
+)
+@callback
+def ws_telemetry(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict[str, Any]
+) -> None:
+    """Return the performance counters of the recorder."""
+    instance = get_instance(hass)
+    connection.send_result(
+        msg["id"],
+        {
+            "backlog": instance.backlog,
+            "max_backlog": MAX_QUEUE_BACKLOG,
+            **instance.telemetry.as_dict(),
+        },
+    )
+
+
 @websocket_api.ws_require_user(only_supervisor=True)
 @websocket_api.websocket_command({vol.Required("type"): "backup/start"})
 @websocket_api.async_response
@@ -4,11 +4,11 @@ from __future__ import annotations
 from collections import defaultdict
 from collections.abc import Iterable, MutableMapping
 import datetime
-import itertools
 import logging
 import math
 from typing import Any
 
+from sqlalchemy.engine.row import Row
 from sqlalchemy.orm.session import Session
 
 from homeassistant.components.recorder import (
@@ -22,6 +22,7 @@ from homeassistant.components.recorder.models import (
     StatisticData,
     StatisticMetaData,
     StatisticResult,
+    decode_attributes_from_row,
 )
 from homeassistant.const import (
     ATTR_UNIT_OF_MEASUREMENT,
@@ -73,6 +74,9 @@ WARN_UNSTABLE_UNIT = "sensor_warn_unstable_unit"
 # Link to dev statistics where issues around LTS can be fixed
 LINK_DEV_STATISTICS = "https://my.home-assistant.io/redirect/developer_statistics"
 
+_EPOCH = datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+_MICROSECOND = datetime.timedelta(microseconds=1)
+
 
 def _get_sensor_states(hass: HomeAssistant) -> list[State]:
     """Get the current state of all sensors for which to compile statistics."""
@@ -89,47 +93,56 @@ def _get_sensor_states(hass: HomeAssistant) -> list[State]:
     return statistics_sensors
 
 
+def _timestamp_to_microseconds(timestamp: float) -> int:
+    """Convert an epoch timestamp to microseconds.
+
+    This rounds the same way as datetime.fromtimestamp, the durations
+    are exactly the same as the ones between the datetimes of the states.
+    """
+    fraction, seconds = math.modf(timestamp)
+    return int(seconds) * 1_000_000 + round(fraction * 1e6)
+
+
+def _datetime_to_microseconds(value: datetime.datetime) -> int:
+    """Convert a datetime to microseconds since the epoch."""
+    return (value - _EPOCH) // _MICROSECOND
+
+
 def _time_weighted_average(
-    fstates: list[tuple[float, State]], start: datetime.datetime, end: datetime.datetime
+    fvalues: list[float], timestamps: list[int], start: int, end: int
 ) -> float:
     """Calculate a time weighted average.
 
-    The average is calculated by weighting the states by duration in seconds between
-    state changes.
+    The average is calculated by weighting the values by duration in seconds between
+    state changes. The timestamps and the start and end of the period are in
+    microseconds since the epoch.
     Note: there's no interpolation of values between state changes.
     """
-    old_fstate: float | None = None
-    old_start_time: datetime.datetime | None = None
+    old_fvalue: float | None = None
+    old_start_time: int | None = None
     accumulated = 0.0
 
-    for fstate, state in fstates:
+    for fvalue, timestamp in zip(fvalues, timestamps):
         # The recorder will give us the last known state, which may be well
         # before the requested start time for the statistics
-        start_time = start if state.last_updated < start else state.last_updated
+        start_time = start if timestamp < start else timestamp
         if old_start_time is None:
             # Adjust start time, if there was no last known state
             start = start_time
         else:
-            duration = start_time - old_start_time
             # Accumulate the value, weighted by duration until next state change
-            assert old_fstate is not None
-            accumulated += old_fstate * duration.total_seconds()
+            assert old_fvalue is not None
+            accumulated += old_fvalue * ((start_time - old_start_time) / 1_000_000)
 
-        old_fstate = fstate
+        old_fvalue = fvalue
         old_start_time = start_time
 
-    if old_fstate is not None:
+    if old_fvalue is not None:
         # Accumulate the value, weighted by duration until end of the period
         assert old_start_time is not None
-        duration = end - old_start_time
-        accumulated += old_fstate * duration.total_seconds()
-
-    return accumulated / (end - start).total_seconds()
-
+        accumulated += old_fvalue * ((end - old_start_time) / 1_000_000)
 
-def _get_units(fstates: list[tuple[float, State]]) -> set[str | None]:
-    """Return a set of all units."""
-    return {item[1].attributes.get(ATTR_UNIT_OF_MEASUREMENT) for item in fstates}
+    return accumulated / ((end - start) / 1_000_000)
 
 
 def _equivalent_units(units: set[str | None]) -> bool:
@@ -150,29 +163,20 @@ def _parse_float(state: str) -> float:
     return fstate
 
 
-def _normalize_states(
+def _normalize_units(
     hass: HomeAssistant,
-    session: Session,
     old_metadatas: dict[str, tuple[int, StatisticMetaData]],
-    entity_history: Iterable[State],
     entity_id: str,
-) -> tuple[str | None, list[tuple[float, State]]]:
-    """Normalize units."""
-    old_metadata = old_metadatas[entity_id][1] if entity_id in old_metadatas else None
-    state_unit: str | None = None
-
-    fstates: list[tuple[float, State]] = []
-    for state in entity_history:
-        try:
-            fstate = _parse_float(state.state)
-        except (ValueError, TypeError):  # TypeError to guard for NULL state in DB
-            continue
-        fstates.append((fstate, state))
-
-    if not fstates:
-        return None, fstates
+    fvalues: list[float],
+    units: list[str | None],
+) -> tuple[str | None, list[int], list[float]]:
+    """Normalize units.
 
-    state_unit = fstates[0][1].attributes.get(ATTR_UNIT_OF_MEASUREMENT)
+    Returns the unit of the statistics, the indices of the values which
+    can be used for the statistics and the values in that unit.
+    """
+    old_metadata = old_metadatas[entity_id][1] if entity_id in old_metadatas else None
+    state_unit = units[0]
 
     statistics_unit: str | None
     if not old_metadata:
@@ -189,7 +193,7 @@ def _normalize_states(
     ):
         # The unit used by this sensor doesn't support unit conversion
 
-        all_units = _get_units(fstates)
+        all_units = set(units)
         if not _equivalent_units(all_units):
             if WARN_UNSTABLE_UNIT not in hass.data:
                 hass.data[WARN_UNSTABLE_UNIT] = set()
@@ -212,15 +216,14 @@ def _normalize_states(
                     extra,
                     LINK_DEV_STATISTICS,
                 )
-            return None, []
-        state_unit = fstates[0][1].attributes.get(ATTR_UNIT_OF_MEASUREMENT)
-        return state_unit, fstates
+            return None, [], []
+        return state_unit, list(range(len(fvalues))), fvalues
 
     converter = statistics.STATISTIC_UNIT_TO_UNIT_CONVERTER[statistics_unit]
-    valid_fstates: list[tuple[float, State]] = []
+    valid_indices: list[int] = []
+    valid_fvalues: list[float] = []
 
-    for fstate, state in fstates:
-        state_unit = state.attributes.get(ATTR_UNIT_OF_MEASUREMENT)
+    for index, (fvalue, state_unit) in enumerate(zip(fvalues, units)):
         # Exclude states with unsupported unit from statistics
         if state_unit not in converter.VALID_UNITS:
             if WARN_UNSUPPORTED_UNIT not in hass.data:
@@ -242,16 +245,88 @@ def _normalize_states(
                 )
             continue
 
-        valid_fstates.append(
-            (
-                converter.convert(
-                    fstate, from_unit=state_unit, to_unit=statistics_unit
-                ),
-                state,
-            )
+        valid_indices.append(index)
+        valid_fvalues.append(
+            converter.convert(fvalue, from_unit=state_unit, to_unit=statistics_unit)
         )
 
-    return statistics_unit, valid_fstates
+    return statistics_unit, valid_indices, valid_fvalues
+
+
+def _normalize_states(
+    hass: HomeAssistant,
+    session: Session,
+    old_metadatas: dict[str, tuple[int, StatisticMetaData]],
+    entity_history: Iterable[State],
+    entity_id: str,
+) -> tuple[str | None, list[tuple[float, State]]]:
+    """Normalize units."""
+    fstates: list[tuple[float, State]] = []
+    for state in entity_history:
+        try:
+            fstate = _parse_float(state.state)
+        except (ValueError, TypeError):  # TypeError to guard for NULL state in DB
+            continue
+        fstates.append((fstate, state))
+
+    if not fstates:
+        return None, fstates
+
+    statistics_unit, indices, fvalues = _normalize_units(
+        hass,
+        old_metadatas,
+        entity_id,
+        [fstate for fstate, _ in fstates],
+        [state.attributes.get(ATTR_UNIT_OF_MEASUREMENT) for _, state in fstates],
+    )
+    return statistics_unit, [
+        (fvalue, fstates[index][1]) for index, fvalue in zip(indices, fvalues)
+    ]
+
+
+def _normalize_rows(
+    hass: HomeAssistant,
+    old_metadatas: dict[str, tuple[int, StatisticMetaData]],
+    initial_row: Row | None,
+    rows: list[Row],
+    start_time: datetime.datetime,
+    entity_id: str,
+    attr_cache: dict[str, dict[str, Any]],
+) -> tuple[str | None, list[float], list[int]]:
+    """Normalize the units of state rows into columns.
+
+    Returns the unit of the statistics, the values in that unit and the
+    timestamps of the values in microseconds since the epoch.
+    """
+    fvalues: list[float] = []
+    units: list[str | None] = []
+    timestamps: list[int] = []
+    if initial_row is not None:
+        # The state at the start time is treated as updated at the start time
+        start_timestamp = _datetime_to_microseconds(start_time)
+        rows = [initial_row, *rows]
+    for row in rows:
+        try:
+            fvalue = _parse_float(row.state)
+        except (ValueError, TypeError):  # TypeError to guard for NULL state in DB
+            continue
+        fvalues.append(fvalue)
+        units.append(
+            decode_attributes_from_row(row, attr_cache).get(ATTR_UNIT_OF_MEASUREMENT)
+        )
+        timestamps.append(
+            start_timestamp
+            if row is initial_row
+            else _timestamp_to_microseconds(row.last_updated_ts)
+        )
+
+    if not fvalues:
+        return None, [], []
+
+    statistics_unit, indices, fvalues = _normalize_units(
+        hass, old_metadatas, entity_id, fvalues, units
+    )
+    return statistics_unit, fvalues, [timestamps[index] for index in indices]
 
 
 def _suggest_report_issue(hass: HomeAssistant, entity_id: str) -> str:
@@ -420,53 +495,79 @@ def _compile_statistics(  # noqa: C901
         for i in sensor_states
         if "sum" not in wanted_statistics[i.entity_id]
     ]
+    # The mean, min and max are compiled from columns of the state rows
+    # without creating State objects for every state of every sensor
+    history_start = start - datetime.timedelta.resolution
+    history_rows: dict[str, tuple[Row | None, list[Row]]] = {}
     if entities_significant_history:
-        _history_list = history.get_full_significant_states_with_session(
+        history_rows = history.get_significant_state_rows_with_session(
             hass,
             session,
-            start - datetime.timedelta.resolution,
+            history_start,
             end,
-            entity_ids=entities_significant_history,
+            entities_significant_history,
         )
-        history_list = {**history_list, **_history_list}
     # If there are no recent state changes, the sensor's state may already be pruned
     # from the recorder. Get the state from the state machine instead.
     for _state in sensor_states:
-        if _state.entity_id not in history_list:
+        if (
+            _state.entity_id not in history_list
+            and _state.entity_id not in history_rows
+        ):
             history_list[_state.entity_id] = [_state]
 
     to_process = []
     to_query = []
+    attr_cache: dict[str, dict[str, Any]] = {}
     for _state in sensor_states:
         entity_id = _state.entity_id
-        if entity_id not in history_list:
+        fstates: list[tuple[float, State]] | None = None
+        if entity_id in history_rows:
+            statistics_unit, fvalues, timestamps = _normalize_rows(
+                hass,
+                old_metadatas,
+                *history_rows[entity_id],
+                history_start,
+                entity_id,
+                attr_cache,
+            )
+        elif entity_id in history_list:
+            statistics_unit, fstates = _normalize_states(
+                hass,
+                session,
+                old_metadatas,
+                history_list[entity_id],
+                entity_id,
+            )
+            fvalues = [fstate for fstate, _ in fstates]
+            timestamps = [
+                _datetime_to_microseconds(state.last_updated) for _, state in fstates
+            ]
+        else:
             continue
 
-        entity_history = history_list[entity_id]
-        statistics_unit, fstates = _normalize_states(
-            hass,
-            session,
-            old_metadatas,
-            entity_history,
-            entity_id,
-        )
-
-        if not fstates:
+        if not fvalues:
             continue
 
         state_class = _state.attributes[ATTR_STATE_CLASS]
 
-        to_process.append((entity_id, statistics_unit, state_class, fstates))
+        to_process.append(
+            (entity_id, statistics_unit, state_class, fvalues, timestamps, fstates)
+        )
         if "sum" in wanted_statistics[entity_id]:
             to_query.append(entity_id)
 
     last_stats = statistics.get_latest_short_term_statistics(
         hass, to_query, {"last_reset", "state", "sum"}, metadata=old_metadatas
     )
+    start_timestamp = _datetime_to_microseconds(start)
+    end_timestamp = _datetime_to_microseconds(end)
     for (  # pylint: disable=too-many-nested-blocks
         entity_id,
         statistics_unit,
         state_class,
+        fvalues,
+        timestamps,
         fstates,
     ) in to_process:
         # Check metadata
@@ -507,14 +608,19 @@ def _compile_statistics(  # noqa: C901
         # Make calculations
         stat: StatisticData = {"start": start}
         if "max" in wanted_statistics[entity_id]:
-            stat["max"] = max(*itertools.islice(zip(*fstates), 1))  # type: ignore[typeddict-item]
+            stat["max"] = max(fvalues)
         if "min" in wanted_statistics[entity_id]:
-            stat["min"] = min(*itertools.islice(zip(*fstates), 1))  # type: ignore[typeddict-item]
+            stat["min"] = min(fvalues)
 
         if "mean" in wanted_statistics[entity_id]:
-            stat["mean"] = _time_weighted_average(fstates, start, end)
+            stat["mean"] = _time_weighted_average(
+                fvalues, timestamps, start_timestamp, end_timestamp
+            )
 
         if "sum" in wanted_statistics[entity_id]:
+            # Sensors with a sum are always normalized from State objects
+            # as the last_reset attribute of every state is needed
+            assert fstates is not None
             last_reset = old_last_reset = None
             new_state = old_state = None
             _sum = 0.0
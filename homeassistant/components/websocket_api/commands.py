@@ -243,35 +243,33 @@ def handle_get_states(
     """Handle get states command."""
     states = _async_get_allowed_states(hass, connection)
 
-    # JSON serialize here so we can recover if it blows up due to the
-    # state machine containing unserializable data. This command is required
-    # to succeed for the UI to show.
-    response = messages.result_message(msg["id"], states)
-    try:
-        connection.send_message(JSON_DUMP(response))
-        return
-    except (ValueError, TypeError):
+    # The JSON of each state is cached on the state and shared
+    # with the other consumers. Leave out the states that can not
+    # be serialized since this command is required to succeed
+    # for the UI to show.
+    serialized_states: list[bytes] = []
+    cannot_serialize = False
+    for state in states:
+        try:
+            serialized_states.append(state.as_dict_json)
+        except (ValueError, TypeError):
+            cannot_serialize = True
+
+    if cannot_serialize:
         connection.logger.error(
             "Unable to serialize to JSON. Bad data found at %s",
             format_unserializable_data(
-                find_paths_unserializable_data(response, dump=JSON_DUMP)
+                find_paths_unserializable_data(
+                    messages.result_message(msg["id"], states), dump=JSON_DUMP
+                )
             ),
         )
-    del response
 
-    # If we can't serialize, we'll filter out unserializable states
-    serialized = []
-    for state in states:
-        try:
-            serialized.append(JSON_DUMP(state))
-        except (ValueError, TypeError):
-            # Error is already logged above
-            pass
-
-    # We now have partially serialized states. Craft some JSON.
-    response2 = JSON_DUMP(messages.result_message(msg["id"], ["TO_REPLACE"]))
-    response2 = response2.replace('"TO_REPLACE"', ", ".join(serialized))
-    connection.send_message(response2)
+    connection.send_message(
+        messages.construct_result_message(
+            msg["id"], b"[" + b",".join(serialized_states) + b"]"
+        )
+    )
 
 
 @callback
@@ -294,8 +292,6 @@ def handle_subscribe_entities(
             event.data["entity_id"], POLICY_READ
         ):
             return
-        if entity_ids and event.data["entity_id"] not in entity_ids:
-            return
 
         connection.send_message(
             lambda: messages.cached_state_diff_message(msg["id"], event)
@@ -305,46 +301,51 @@ def handle_subscribe_entities(
     # state changed events or we will introduce a race condition
     # where some states are missed
     states = _async_get_allowed_states(hass, connection)
-    connection.subscriptions[msg["id"]] = hass.bus.async_listen(
-        EVENT_STATE_CHANGED, forward_entity_changes, run_immediately=True
-    )
+    if entity_ids:
+        connection.subscriptions[msg["id"]] = hass.bus.async_listen_state_changed(
+            forward_entity_changes, entity_ids=entity_ids, run_immediately=True
+        )
+    else:
+        connection.subscriptions[msg["id"]] = hass.bus.async_listen(
+            EVENT_STATE_CHANGED, forward_entity_changes, run_immediately=True
+        )
     connection.send_result(msg["id"])
-    data: dict[str, dict[str, dict]] = {
-        messages.ENTITY_EVENT_ADD: {
-            state.entity_id: messages.compressed_state_dict_add(state)
-            for state in states
-            if not entity_ids or state.entity_id in entity_ids
-        }
-    }
 
-    # JSON serialize here so we can recover if it blows up due to the
-    # state machine containing unserializable data. This command is required
-    # to succeed for the UI to show.
-    response = messages.event_message(msg["id"], data)
-    try:
-        connection.send_message(JSON_DUMP(response))
-        return
-    except (ValueError, TypeError):
+    # The compressed JSON of each state is cached on the state and
+    # shared with the other connections. Leave out the states that
+    # can not be serialized since this command is required to
+    # succeed for the UI to show.
+    serialized_states: list[bytes] = []
+    cannot_serialize: dict[str, dict[str, Any]] = {}
+    for state in states:
+        if entity_ids and state.entity_id not in entity_ids:
+            continue
+        try:
+            serialized_states.append(
+                b'"' + state.entity_id.encode() + b'":' + state.as_compressed_state_json
+            )
+        except (ValueError, TypeError):
+            cannot_serialize[state.entity_id] = state.as_compressed_state
+
+    if cannot_serialize:
         connection.logger.error(
             "Unable to serialize to JSON. Bad data found at %s",
             format_unserializable_data(
-                find_paths_unserializable_data(response, dump=JSON_DUMP)
+                find_paths_unserializable_data(
+                    messages.event_message(
+                        msg["id"], {messages.ENTITY_EVENT_ADD: cannot_serialize}
+                    ),
+                    dump=JSON_DUMP,
+                )
             ),
         )
-    del response
-
-    add_entities = data[messages.ENTITY_EVENT_ADD]
-    cannot_serialize: list[str] = []
-    for entity_id, state_dict in add_entities.items():
-        try:
-            JSON_DUMP(state_dict)
-        except (ValueError, TypeError):
-            cannot_serialize.append(entity_id)
-
-    for entity_id in cannot_serialize:
-        del add_entities[entity_id]
 
-    connection.send_message(JSON_DUMP(messages.event_message(msg["id"], data)))
+    # The event is {ENTITY_EVENT_ADD: {entity_id: compressed_state,…}}
+    connection.send_message(
+        messages.construct_event_message(
+            msg["id"], b'{"a":{' + b",".join(serialized_states) + b"}}"
+        )
+    )
 
 
 @decorators.websocket_command({vol.Required("type"): "get_services"})
@@ -27,6 +27,7 @@ from .const import (
     CONF_ALLOWLIST_EXTERNAL_URLS,
     CONF_AUTH_MFA_MODULES,
     CONF_AUTH_PROVIDERS,
+    CONF_BATCH_CALLBACKS,
     CONF_COUNTRY,
     CONF_CURRENCY,
     CONF_CUSTOMIZE,
@@ -304,6 +305,7 @@ CORE_CONFIG_SCHEMA = vol.All(
             # pylint: disable-next=no-value-for-parameter
             vol.Optional(CONF_MEDIA_DIRS): cv.schema_with_slug_keys(vol.IsDir()),
             vol.Optional(CONF_LEGACY_TEMPLATES): cv.boolean,
+            vol.Optional(CONF_BATCH_CALLBACKS): cv.boolean,
             vol.Optional(CONF_CURRENCY): _validate_currency,
             vol.Optional(CONF_COUNTRY): cv.country,
             vol.Optional(CONF_LANGUAGE): cv.language,
@@ -608,6 +610,8 @@ async def async_process_ha_core_config(hass: HomeAssistant, config: dict) -> Non
         if key in config:
             setattr(hac, attr, config[key])
 
+    hass.async_batch_callbacks(config.get(CONF_BATCH_CALLBACKS, False))
+
     _raise_issue_if_historic_currency(hass, hass.config.currency)
     _raise_issue_if_no_country(hass, hass.config.country)
 
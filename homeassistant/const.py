@@ -98,6 +98,7 @@ CONF_AUTH_MFA_MODULES: Final = "auth_mfa_modules"
 CONF_AUTH_PROVIDERS: Final = "auth_providers"
 CONF_AUTHENTICATION: Final = "authentication"
 CONF_BASE: Final = "base"
+CONF_BATCH_CALLBACKS: Final = "batch_callbacks"
 CONF_BEFORE: Final = "before"
 CONF_BELOW: Final = "below"
 CONF_BINARY_SENSORS: Final = "binary_sensors"
@@ -352,6 +353,14 @@ STATE_UNAVAILABLE: Final = "unavailable"
 STATE_OK: Final = "ok"
 STATE_PROBLEM: Final = "problem"
 
+# #### COMPRESSED STATES ####
+# Keys of the compressed representation of a state
+COMPRESSED_STATE_STATE: Final = "s"
+COMPRESSED_STATE_ATTRIBUTES: Final = "a"
+COMPRESSED_STATE_CONTEXT: Final = "c"
+COMPRESSED_STATE_LAST_CHANGED: Final = "lc"
+COMPRESSED_STATE_LAST_UPDATED: Final = "lu"
+
 # #### STATE AND EVENT ATTRIBUTES ####
 # Attribution
 ATTR_ATTRIBUTION: Final = "attribution"
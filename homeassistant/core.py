@@ -16,6 +16,7 @@ from collections.abc import (
     Mapping,
 )
 from contextlib import suppress
+import contextvars
 from contextvars import ContextVar
 import datetime
 import enum
@@ -26,6 +27,7 @@ import pathlib
 import re
 import threading
 from time import monotonic
+from types import MappingProxyType
 from typing import (
     TYPE_CHECKING,
     Any,
@@ -50,6 +52,11 @@ from .const import (
     ATTR_FRIENDLY_NAME,
     ATTR_SERVICE,
     ATTR_SERVICE_DATA,
+    COMPRESSED_STATE_ATTRIBUTES,
+    COMPRESSED_STATE_CONTEXT,
+    COMPRESSED_STATE_LAST_CHANGED,
+    COMPRESSED_STATE_LAST_UPDATED,
+    COMPRESSED_STATE_STATE,
     EVENT_CALL_SERVICE,
     EVENT_CORE_CONFIG_UPDATE,
     EVENT_HOMEASSISTANT_CLOSE,
@@ -74,12 +81,14 @@ from .exceptions import (
     ServiceNotFound,
     Unauthorized,
 )
+from .helpers.json import json_bytes
 from .util import dt as dt_util, location, ulid as ulid_util
 from .util.async_ import (
     fire_coroutine_threadsafe,
     run_callback_threadsafe,
     shutdown_run_callback_threadsafe,
 )
+from .util.executor import MeasuredThreadPoolExecutor
 from .util.read_only_dict import ReadOnlyDict
 from .util.timeout import TimeoutManager
 from .util.unit_system import (
@@ -124,6 +133,9 @@ BLOCK_LOG_TIMEOUT = 60
 # How long we wait for the result of a service call
 SERVICE_CALL_LIMIT = 10  # seconds
 
+# How many workers a named executor pool has by default
+DEFAULT_EXECUTOR_POOL_MAX_WORKERS = 8
+
 
 class ConfigSource(StrEnum):
     """Source of core configuration."""
@@ -275,6 +287,12 @@ class HomeAssistant:
         self.loop = asyncio.get_running_loop()
         self._pending_tasks: list[asyncio.Future[Any]] = []
         self._track_task = True
+        # Callbacks waiting to run in the next batch, None if not batching
+        self._callback_batch: list[
+            tuple[contextvars.Context, Callable[..., Any], tuple[Any, ...]]
+        ] | None = None
+        # Named executor pools, None once they are shut down
+        self._executor_pools: dict[str, MeasuredThreadPoolExecutor] | None = {}
         self.bus = EventBus(self)
         self.services = ServiceRegistry(self)
         self.states = StateMachine(self.bus, self.loop)
@@ -484,7 +502,13 @@ class HomeAssistant:
         elif hassjob.job_type == HassJobType.Callback:
             if TYPE_CHECKING:
                 hassjob.target = cast(Callable[..., _R], hassjob.target)
-            self.loop.call_soon(hassjob.target, *args)
+            if (batch := self._callback_batch) is None:
+                self.loop.call_soon(hassjob.target, *args)
+                return None
+            if not batch:
+                self.loop.call_soon(self._async_run_callback_batch, batch)
+            # Like a handle, each callback runs in the context it was added in
+            batch.append((contextvars.copy_context(), hassjob.target, args))
             return None
         else:
             if TYPE_CHECKING:
@@ -532,6 +556,95 @@ class HomeAssistant:
 
         return task
 
+    @callback
+    def async_get_executor_pool(
+        self, name: str, max_workers: int = DEFAULT_EXECUTOR_POOL_MAX_WORKERS
+    ) -> MeasuredThreadPoolExecutor | None:
+        """Return the named executor pool, creating it if needed.
+
+        max_workers is used when the pool is created. Returns None once the
+        pools are shut down.
+        """
+        if (pools := self._executor_pools) is None:
+            return None
+        if (pool := pools.get(name)) is None:
+            pool = pools[name] = MeasuredThreadPoolExecutor(
+                max_workers=max_workers, thread_name_prefix=f"SyncWorker_{name}"
+            )
+        return pool
+
+    @callback
+    def async_executor_pools(self) -> dict[str, MeasuredThreadPoolExecutor]:
+        """Return the named executor pools."""
+        return dict(self._executor_pools or {})
+
+    @callback
+    def async_add_executor_pool_job(
+        self,
+        pool: str,
+        target: Callable[..., _T],
+        *args: Any,
+        max_workers: int = DEFAULT_EXECUTOR_POOL_MAX_WORKERS,
+    ) -> asyncio.Future[_T]:
+        """Add an executor job to a named executor pool from within the event loop.
+
+        Jobs in a pool only compete for the workers of that pool, so slow
+        jobs in one pool do not delay the jobs in the others. max_workers
+        is used when the pool is created. Once the pools are shut down, the
+        job is run by the default executor.
+        """
+        task = self.loop.run_in_executor(
+            self.async_get_executor_pool(pool, max_workers), target, *args
+        )
+
+        # If a task is scheduled
+        if self._track_task:
+            self._pending_tasks.append(task)
+
+        return task
+
+    async def _async_shutdown_executor_pools(self) -> None:
+        """Shut down the named executor pools."""
+        pools, self._executor_pools = self._executor_pools, None
+        if not pools:
+            return
+        await asyncio.gather(
+            *(self.loop.run_in_executor(None, pool.shutdown) for pool in pools.values())
+        )
+
+    @callback
+    def async_batch_callbacks(self, enabled: bool = True) -> None:
+        """Enable or disable running the scheduled callbacks in batches.
+
+        When enabled, the callbacks scheduled with async_add_hass_job
+        during a loop iteration are run by a single handle in the next
+        iteration, instead of by a handle each.
+
+        Batching is enabled with the batch_callbacks option of the core
+        configuration.
+        """
+        if not enabled:
+            self._callback_batch = None
+        elif self._callback_batch is None:
+            self._callback_batch = []
+
+    @callback
+    def _async_run_callback_batch(
+        self,
+        batch: list[tuple[contextvars.Context, Callable[..., Any], tuple[Any, ...]]],
+    ) -> None:
+        """Run a batch of callbacks."""
+        if self._callback_batch is batch:
+            # Callbacks scheduled by this batch run in the next one
+            self._callback_batch = []
+        for context, target, args in batch:
+            try:
+                context.run(target, *args)
+            except Exception as exc:  # pylint: disable=broad-except
+                self.loop.call_exception_handler(
+                    {"message": f"Exception in callback {target}", "exception": exc}
+                )
+
     @callback
     def async_track_tasks(self) -> None:
         """Track tasks so you can wait for all tasks to be done."""
@@ -744,6 +857,8 @@ class HomeAssistant:
                 " continue"
             )
 
+        await self._async_shutdown_executor_pools()
+
         self.exit_code = exit_code
         self.state = CoreState.stopped
 
@@ -864,6 +979,18 @@ class EventBus:
     def __init__(self, hass: HomeAssistant) -> None:
         """Initialize a new event bus."""
         self._listeners: dict[str, list[_FilterableJob]] = {}
+        # The listeners to run for each event type, including the
+        # MATCH_ALL listeners. Built when the event type is fired
+        # and dropped when its listeners change.
+        self._dispatch: dict[str, tuple[_FilterableJob, ...]] = {
+            EVENT_HOMEASSISTANT_CLOSE: ()
+        }
+        self._match_all_listeners: tuple[_FilterableJob, ...] = ()
+        # The state changed listeners of entity_ids and domains are
+        # routed by a single listener with a lookup of the entity_id
+        self._state_changed_entity_listeners: dict[str, tuple[_FilterableJob, ...]] = {}
+        self._state_changed_domain_listeners: dict[str, tuple[_FilterableJob, ...]] = {}
+        self._state_changed_remove: CALLBACK_TYPE | None = None
         self._hass = hass
 
     @callback
@@ -909,12 +1036,16 @@ class EventBus:
                 event_type, "event_type", MAX_LENGTH_EVENT_EVENT_TYPE
             )
 
-        listeners = self._listeners.get(event_type, [])
+        if (listeners := self._dispatch.get(event_type)) is None:
+            listeners = self._async_build_dispatch(event_type)
 
-        # EVENT_HOMEASSISTANT_CLOSE should go only to this listeners
-        match_all_listeners = self._listeners.get(MATCH_ALL)
-        if match_all_listeners is not None and event_type != EVENT_HOMEASSISTANT_CLOSE:
-            listeners = match_all_listeners + listeners
+        if (
+            not listeners
+            # The event must be created to become the origin of the context
+            and (context is None or context.origin_event)
+            and not _LOGGER.isEnabledFor(logging.DEBUG)
+        ):
+            return
 
         event = Event(event_type, event_data, origin, time_fired, context)
         if not event.context.origin_event:
@@ -922,9 +1053,6 @@ class EventBus:
 
         _LOGGER.debug("Bus:Handling %s", event)
 
-        if not listeners:
-            return
-
         for job, event_filter, run_immediately in listeners:
             if event_filter is not None:
                 try:
@@ -997,6 +1125,7 @@ class EventBus:
         self, event_type: str, filterable_job: _FilterableJob
     ) -> CALLBACK_TYPE:
         self._listeners.setdefault(event_type, []).append(filterable_job)
+        self._async_listeners_changed(event_type)
 
         def remove_listener() -> None:
             """Remove the listener."""
@@ -1004,6 +1133,139 @@ class EventBus:
 
         return remove_listener
 
+    @callback
+    def async_listen_state_changed(
+        self,
+        listener: Callable[[Event], Coroutine[Any, Any, None] | None],
+        entity_ids: Iterable[str] = (),
+        domains: Iterable[str] = (),
+        run_immediately: bool = False,
+    ) -> CALLBACK_TYPE:
+        """Listen for state changed events of entities or domains.
+
+        The events are routed to the listeners with a lookup of the
+        entity_id of the event instead of an event_filter per listener.
+        The entity_ids and domains must be lowercase. Entity ids of one
+        of the domains are ignored so the listener runs once per event.
+
+        If run_immediately is passed, the callback will be run
+        right away instead of using call_soon. Only use this if
+        the callback results in scheduling another task.
+
+        This method must be run in the event loop.
+        """
+        if run_immediately and not is_callback(listener):
+            raise HomeAssistantError(f"Event listener {listener} is not a callback")
+        filterable_job = _FilterableJob(HassJob(listener), None, run_immediately)
+        domains = set(domains)
+        keys: list[tuple[dict[str, tuple[_FilterableJob, ...]], str]] = [
+            (self._state_changed_domain_listeners, domain) for domain in domains
+        ]
+        keys.extend(
+            (self._state_changed_entity_listeners, entity_id)
+            for entity_id in set(entity_ids)
+            if entity_id.partition(".")[0] not in domains
+        )
+        for listeners, key in keys:
+            listeners[key] = (*listeners.get(key, ()), filterable_job)
+
+        if self._state_changed_remove is None and keys:
+            self._state_changed_remove = self._async_listen_filterable_job(
+                EVENT_STATE_CHANGED,
+                _FilterableJob(HassJob(self._async_dispatch_state_changed), None, True),
+            )
+
+        @callback
+        def remove_listener() -> None:
+            """Remove the listener."""
+            self._async_remove_state_changed_listener(keys, filterable_job)
+
+        return remove_listener
+
+    @callback
+    def _async_remove_state_changed_listener(
+        self,
+        keys: list[tuple[dict[str, tuple[_FilterableJob, ...]], str]],
+        filterable_job: _FilterableJob,
+    ) -> None:
+        """Remove a listener of state changed events of entities or domains.
+
+        This method must be run in the event loop.
+        """
+        for listeners, key in keys:
+            if remaining := tuple(
+                job for job in listeners[key] if job is not filterable_job
+            ):
+                listeners[key] = remaining
+            else:
+                del listeners[key]
+
+        if (
+            self._state_changed_remove is not None
+            and not self._state_changed_entity_listeners
+            and not self._state_changed_domain_listeners
+        ):
+            self._state_changed_remove()
+            self._state_changed_remove = None
+
+    @callback
+    def _async_state_changed_listeners(
+        self, entity_id: str
+    ) -> tuple[_FilterableJob, ...]:
+        """Return the listeners of the entity and the domain of a state change.
+
+        This method must be run in the event loop.
+        """
+        listeners = self._state_changed_entity_listeners.get(entity_id, ())
+        if self._state_changed_domain_listeners and (
+            domain_listeners := self._state_changed_domain_listeners.get(
+                entity_id.partition(".")[0]
+            )
+        ):
+            listeners += domain_listeners
+        return listeners
+
+    @callback
+    def _async_dispatch_state_changed(self, event: Event) -> None:
+        """Dispatch a state change to the listeners of its entity and domain.
+
+        This method must be run in the event loop.
+        """
+        entity_id: str = event.data["entity_id"]
+        scheduled = False
+        for job, _, run_immediately in self._async_state_changed_listeners(entity_id):
+            if not run_immediately:
+                scheduled = True
+                continue
+            try:
+                job.target(event)
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception(
+                    "Error while processing state change for %s", entity_id
+                )
+        if scheduled:
+            self._hass.loop.call_soon(self._async_run_state_changed_jobs, event)
+
+    @callback
+    def _async_run_state_changed_jobs(self, event: Event) -> None:
+        """Run the listeners of a state change that do not run immediately.
+
+        The listeners are looked up again so the ones added or
+        removed since the state change was fired are respected.
+
+        This method must be run in the event loop.
+        """
+        entity_id: str = event.data["entity_id"]
+        for job, _, run_immediately in self._async_state_changed_listeners(entity_id):
+            if run_immediately:
+                continue
+            try:
+                self._hass.async_run_hass_job(job, event)
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception(
+                    "Error while processing state change for %s", entity_id
+                )
+
     def listen_once(
         self,
         event_type: str,
@@ -1081,6 +1343,7 @@ class EventBus:
             # delete event_type list if empty
             if not self._listeners[event_type]:
                 self._listeners.pop(event_type)
+            self._async_listeners_changed(event_type)
         except (KeyError, ValueError):
             # KeyError is key event_type listener did not exist
             # ValueError if listener did not exist within event_type
@@ -1088,6 +1351,36 @@ class EventBus:
                 "Unable to remove unknown job listener %s", filterable_job
             )
 
+    @callback
+    def _async_build_dispatch(self, event_type: str) -> tuple[_FilterableJob, ...]:
+        """Return the listeners to run for an event type.
+
+        This method must be run in the event loop.
+        """
+        if (listeners := self._listeners.get(event_type)) is None:
+            return self._match_all_listeners
+        dispatch = self._dispatch[event_type] = self._match_all_listeners + tuple(
+            listeners
+        )
+        return dispatch
+
+    @callback
+    def _async_listeners_changed(self, event_type: str) -> None:
+        """Drop the dispatch tables affected by a listener change.
+
+        This method must be run in the event loop.
+        """
+        if event_type == MATCH_ALL:
+            self._match_all_listeners = tuple(self._listeners.get(MATCH_ALL, ()))
+            self._dispatch = {
+                EVENT_HOMEASSISTANT_CLOSE: self._dispatch[EVENT_HOMEASSISTANT_CLOSE]
+            }
+        elif event_type == EVENT_HOMEASSISTANT_CLOSE:
+            # EVENT_HOMEASSISTANT_CLOSE should go only to its own listeners
+            self._dispatch[event_type] = tuple(self._listeners.get(event_type, ()))
+        else:
+            self._dispatch.pop(event_type, None)
+
 
 _StateT = TypeVar("_StateT", bound="State")
 
@@ -1115,6 +1408,10 @@ class State:
         "domain",
         "object_id",
         "_as_dict",
+        "_as_dict_json",
+        "_as_compressed_state",
+        "_as_compressed_state_json",
+        "_attributes_json",
     ]
 
     def __init__(
@@ -1144,12 +1441,21 @@ class State:
 
         self.entity_id = entity_id.lower()
         self.state = state
-        self.attributes = ReadOnlyDict(attributes or {})
+        # Attributes that are already read only can be shared between states
+        self.attributes = (
+            attributes
+            if type(attributes) is ReadOnlyDict  # pylint: disable=unidiomatic-typecheck
+            else ReadOnlyDict(attributes or {})
+        )
         self.last_updated = last_updated or dt_util.utcnow()
         self.last_changed = last_changed or self.last_updated
         self.context = context or Context()
         self.domain, self.object_id = split_entity_id(self.entity_id)
         self._as_dict: ReadOnlyDict[str, Collection[Any]] | None = None
+        self._as_dict_json: bytes | None = None
+        self._as_compressed_state: ReadOnlyDict[str, Any] | None = None
+        self._as_compressed_state_json: bytes | None = None
+        self._attributes_json: bytes | None = None
 
     def __hash__(self) -> int:
         """Make the state hashable.
@@ -1191,6 +1497,68 @@ class State:
             )
         return self._as_dict
 
+    @property
+    def as_dict_json(self) -> bytes:
+        """Return the JSON of the dict representation of the State.
+
+        The JSON is serialized once and reused by all consumers
+        since the State is immutable. Raises TypeError or ValueError
+        when the attributes can not be serialized.
+        """
+        if self._as_dict_json is None:
+            self._as_dict_json = json_bytes(self.as_dict())
+        return self._as_dict_json
+
+    @property
+    def as_compressed_state(self) -> ReadOnlyDict[str, Any]:
+        """Build a compressed dict of the State.
+
+        Omits the lu (last_updated) if it matches (lc) last_changed.
+
+        Sends c (context) as a string if it only contains an id.
+
+        The dict is built once and shared by all consumers, so it is read only.
+        """
+        if self._as_compressed_state is None:
+            if self.context.parent_id is None and self.context.user_id is None:
+                context: ReadOnlyDict[str, Any] | str = self.context.id
+            else:
+                context = ReadOnlyDict(self.context.as_dict())
+            compressed_state: dict[str, Any] = {
+                COMPRESSED_STATE_STATE: self.state,
+                COMPRESSED_STATE_ATTRIBUTES: self.attributes,
+                COMPRESSED_STATE_CONTEXT: context,
+                COMPRESSED_STATE_LAST_CHANGED: self.last_changed.timestamp(),
+            }
+            if self.last_changed != self.last_updated:
+                compressed_state[
+                    COMPRESSED_STATE_LAST_UPDATED
+                ] = self.last_updated.timestamp()
+            self._as_compressed_state = ReadOnlyDict(compressed_state)
+        return self._as_compressed_state
+
+    @property
+    def as_compressed_state_json(self) -> bytes:
+        """Return the JSON of the compressed dict of the State.
+
+        Raises TypeError or ValueError when the attributes can not
+        be serialized.
+        """
+        if self._as_compressed_state_json is None:
+            self._as_compressed_state_json = json_bytes(self.as_compressed_state)
+        return self._as_compressed_state_json
+
+    @property
+    def attributes_json(self) -> bytes:
+        """Return the JSON of the attributes of the State.
+
+        Raises TypeError or ValueError when the attributes can not
+        be serialized.
+        """
+        if self._attributes_json is None:
+            self._attributes_json = json_bytes(self.attributes)
+        return self._attributes_json
+
     @classmethod
     def from_dict(cls: type[_StateT], json_dict: dict[str, Any]) -> _StateT | None:
         """Initialize a state from a dict.
@@ -1262,12 +1630,19 @@ class State:
         )
 
 
+# The states of a domain that never had a state
+_EMPTY_DOMAIN_STATES: Mapping[str, State] = MappingProxyType({})
+
+
 class StateMachine:
     """Helper class that tracks the state of different entities."""
 
     def __init__(self, bus: EventBus, loop: asyncio.events.AbstractEventLoop) -> None:
         """Initialize state machine."""
         self._states: dict[str, State] = {}
+        # The states of each domain, the dicts are kept when they
+        # become empty so the views handed out stay current
+        self._domain_states: dict[str, dict[str, State]] = {}
         self._reservations: set[str] = set()
         self._bus = bus
         self._loop = loop
@@ -1291,12 +1666,12 @@ class StateMachine:
             return list(self._states)
 
         if isinstance(domain_filter, str):
-            domain_filter = (domain_filter.lower(),)
+            return list(self._domain_states.get(domain_filter.lower(), ()))
 
         return [
-            state.entity_id
-            for state in self._states.values()
-            if state.domain in domain_filter
+            entity_id
+            for domain in dict.fromkeys(domain_filter)
+            for entity_id in self._domain_states.get(domain, ())
         ]
 
     @callback
@@ -1311,10 +1686,11 @@ class StateMachine:
             return len(self._states)
 
         if isinstance(domain_filter, str):
-            domain_filter = (domain_filter.lower(),)
+            return len(self._domain_states.get(domain_filter.lower(), ()))
 
-        return len(
-            [None for state in self._states.values() if state.domain in domain_filter]
+        return sum(
+            len(self._domain_states.get(domain, ()))
+            for domain in dict.fromkeys(domain_filter)
         )
 
     def all(self, domain_filter: str | Iterable[str] | None = None) -> list[State]:
@@ -1335,12 +1711,31 @@ class StateMachine:
             return list(self._states.values())
 
         if isinstance(domain_filter, str):
-            domain_filter = (domain_filter.lower(),)
+            if domain_states := self._domain_states.get(domain_filter.lower()):
+                return list(domain_states.values())
+            return []
 
         return [
-            state for state in self._states.values() if state.domain in domain_filter
+            state
+            for domain in dict.fromkeys(domain_filter)
+            if (domain_states := self._domain_states.get(domain))
+            for state in domain_states.values()
         ]
 
+    @callback
+    def async_domain_states(self, domain: str) -> Mapping[str, State]:
+        """Return a read-only view of the states of a domain by entity_id.
+
+        The view is not a copy, it reflects the later changes of the
+        state machine. A domain that never had a state gets an empty
+        mapping instead, which does not.
+
+        This method must be run in the event loop.
+        """
+        if (domain_states := self._domain_states.get(domain.lower())) is None:
+            return _EMPTY_DOMAIN_STATES
+        return MappingProxyType(domain_states)
+
     def get(self, entity_id: str) -> State | None:
         """Retrieve state of entity_id or None if not found.
 
@@ -1382,6 +1777,7 @@ class StateMachine:
         if old_state is None:
             return False
 
+        del self._domain_states[old_state.domain][entity_id]
         old_state.expire()
         self._bus.async_fire(
             EVENT_STATE_CHANGED,
@@ -1448,7 +1844,7 @@ class StateMachine:
         attributes: Mapping[str, Any] | None = None,
         force_update: bool = False,
         context: Context | None = None,
-    ) -> None:
+    ) -> bool:
         """Set the state of an entity, add entity if it does not exist.
 
         Attributes is an optional dict to specify attributes of this state.
@@ -1456,6 +1852,9 @@ class StateMachine:
         If you just update the attributes and not the state, last changed will
         not be affected.
 
+        Returns False if neither the state nor the attributes changed and
+        nothing was written.
+
         This method must be run in the event loop.
         """
         entity_id = entity_id.lower()
@@ -1467,16 +1866,25 @@ class StateMachine:
             last_changed = None
         else:
             same_state = old_state.state == new_state and not force_update
-            same_attr = old_state.attributes == attributes
+            same_attr = (
+                attributes is old_state.attributes or old_state.attributes == attributes
+            )
             last_changed = old_state.last_changed if same_state else None
 
         if same_state and same_attr:
-            return
+            return False
 
         now = dt_util.utcnow()
 
         if context is None:
             context = Context(id=ulid_util.ulid(dt_util.utc_to_timestamp(now)))
+        attributes_json: bytes | None = None
+        if same_attr:
+            # Share the unchanged attributes and their JSON with the old state
+            assert old_state is not None
+            attributes = old_state.attributes
+            # pylint: disable-next=protected-access
+            attributes_json = old_state._attributes_json
         state = State(
             entity_id,
             new_state,
@@ -1486,9 +1894,15 @@ class StateMachine:
             context,
             old_state is None,
         )
+        if attributes_json is not None:
+            # pylint: disable-next=protected-access
+            state._attributes_json = attributes_json
         if old_state is not None:
             old_state.expire()
         self._states[entity_id] = state
+        if (domain_states := self._domain_states.get(state.domain)) is None:
+            domain_states = self._domain_states[state.domain] = {}
+        domain_states[entity_id] = state
         self._bus.async_fire(
             EVENT_STATE_CHANGED,
             {"entity_id": entity_id, "old_state": old_state, "new_state": state},
@@ -1496,6 +1910,7 @@ class StateMachine:
             context,
             time_fired=now,
         )
+        return True
 
 
 class Service:
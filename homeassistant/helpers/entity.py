@@ -3,6 +3,7 @@ from __future__ import annotations
 
 from abc import ABC
 import asyncio
+from collections import Counter
 from collections.abc import Coroutine, Iterable, Mapping, MutableMapping
 from dataclasses import dataclass
 from datetime import datetime, timedelta
@@ -37,16 +38,22 @@ from homeassistant.core import CALLBACK_TYPE, Context, Event, HomeAssistant, cal
 from homeassistant.exceptions import HomeAssistantError, NoEntitySpecifiedError
 from homeassistant.loader import bind_hass
 from homeassistant.util import dt as dt_util, ensure_unique_string, slugify
+from homeassistant.util.read_only_dict import ReadOnlyDict
 
 from . import device_registry as dr, entity_registry as er
 from .device_registry import DeviceEntryType
 from .entity_platform import EntityPlatform
-from .event import async_track_entity_registry_updated_event
-from .typing import StateType
+from .entity_values import EntityValues
+from .event import (
+    async_track_device_registry_updated_event,
+    async_track_entity_registry_updated_event,
+)
+from .typing import UNDEFINED, StateType
 
 _LOGGER = logging.getLogger(__name__)
 SLOW_UPDATE_WARNING = 10
 DATA_ENTITY_SOURCE = "entity_info"
+DATA_NO_OP_STATE_WRITES = "entity_no_op_state_writes"
 SOURCE_CONFIG_ENTRY = "config_entry"
 SOURCE_PLATFORM_CONFIG = "platform_config"
 
@@ -54,6 +61,98 @@ SOURCE_PLATFORM_CONFIG = "platform_config"
 # epsilon to make the string representation readable
 FLOAT_PRECISION = abs(int(math.floor(math.log10(abs(sys.float_info.epsilon))))) - 1
 
+# The properties whose state attributes are cached between state writes,
+# unless the entity class overrides them. name includes the friendly name.
+_CACHED_PROPERTIES: Final = frozenset(
+    {
+        "attribution",
+        "device_class",
+        "entity_picture",
+        "icon",
+        "name",
+        "supported_features",
+    }
+)
+
+# Setting any of these invalidates the cached state attributes
+_CACHED_PROPERTIES_INPUTS: Final = frozenset(
+    {f"_attr_{prop}" for prop in _CACHED_PROPERTIES}
+    | {"_attr_has_entity_name", "entity_description", "registry_entry"}
+)
+
+# The state attributes of the cached properties, in the order they are written
+_CACHED_PROPERTIES_ATTRIBUTES: Final = (
+    ATTR_ATTRIBUTION,
+    ATTR_DEVICE_CLASS,
+    ATTR_ENTITY_PICTURE,
+    ATTR_ICON,
+    ATTR_FRIENDLY_NAME,
+    ATTR_SUPPORTED_FEATURES,
+)
+
+
+class _CachedPropertyInput:
+    """An entity attribute the cached state attributes are calculated from.
+
+    Setting it invalidates the cached state attributes of the entity. Its
+    value is stored under another name, so an unset attribute still raises
+    AttributeError.
+    """
+
+    __slots__ = ("storage",)
+
+    def __init__(self, name: str) -> None:
+        """Initialize the input."""
+        self.storage = f"_{name.lstrip('_')}_input"
+
+    def __get__(self, obj: Entity | None, objtype: type | None = None) -> Any:
+        """Return the value."""
+        if obj is None:
+            return self
+        return getattr(obj, self.storage)
+
+    def __set__(self, obj: Entity, value: Any) -> None:
+        """Set the value and invalidate the cached state attributes."""
+        obj.__dict__[self.storage] = value
+        obj.__dict__["_static_attributes"] = None
+
+    def __delete__(self, obj: Entity) -> None:
+        """Delete the value and invalidate the cached state attributes."""
+        del obj.__dict__[self.storage]
+        obj.__dict__["_static_attributes"] = None
+
+
+def _attributes_input_unchanged(new: Any, old: Any) -> bool:
+    """Return if an input of the state attributes is known to be unchanged.
+
+    Inputs are not compared, as the state machine compares the attributes
+    that are calculated from them. A mapping may have been changed in
+    place, so the same mapping is only unchanged when it is read only.
+    """
+    return new is old and (
+        type(new) is ReadOnlyDict  # pylint: disable=unidiomatic-typecheck
+        or not isinstance(new, Mapping)
+    )
+
+
+def _install_cached_property_inputs(cls: type[Entity]) -> None:
+    """Make the inputs of the cached state attributes of a class invalidate them.
+
+    A value that a class or a mixin sets for an input is moved to the
+    storage of the input.
+    """
+    for name in _CACHED_PROPERTIES_INPUTS:
+        value = next(
+            (klass.__dict__[name] for klass in cls.__mro__ if name in klass.__dict__),
+            UNDEFINED,
+        )
+        if isinstance(value, _CachedPropertyInput):
+            continue
+        cached_input = _CachedPropertyInput(name)
+        if value is not UNDEFINED:
+            setattr(cls, cached_input.storage, value)
+        setattr(cls, name, cached_input)
+
 
 @callback
 @bind_hass
@@ -62,6 +161,13 @@ def entity_sources(hass: HomeAssistant) -> dict[str, dict[str, str]]:
     return hass.data.get(DATA_ENTITY_SOURCE, {})
 
 
+@callback
+@bind_hass
+def no_op_state_writes(hass: HomeAssistant) -> Counter[str]:
+    """Get the number of state writes that changed nothing, by integration."""
+    return hass.data.get(DATA_NO_OP_STATE_WRITES, Counter())
+
+
 def generate_entity_id(
     entity_id_format: str,
     name: str | None,
@@ -271,6 +377,23 @@ class Entity(ABC):
     # If entity is added to an entity platform
     _platform_state = EntityPlatformState.NOT_ADDED
 
+    # The cached properties the entity class does and does not override
+    _static_properties: frozenset[str] = _CACHED_PROPERTIES
+    _dynamic_properties: frozenset[str] = frozenset()
+
+    # State attributes of the static properties and of the customize config
+    _static_attributes: ReadOnlyDict[str, Any] | None = None
+    _customize: EntityValues | None = None
+    _customize_entity_id: str | None = None
+    _customize_attributes: ReadOnlyDict[str, Any] | None = None
+
+    # The last written state attributes and what they were calculated from
+    _last_attributes: ReadOnlyDict[str, Any] | None = None
+    _last_attributes_inputs: tuple[Any, ...] | None = None
+
+    # Unsubscribe from the device registry updates of the entity's device
+    _unsub_device_updates: CALLBACK_TYPE | None = None
+
     # Entity Properties
     _attr_assumed_state: bool = False
     _attr_attribution: str | None = None
@@ -295,6 +418,20 @@ class Entity(ABC):
     _attr_unique_id: str | None = None
     _attr_unit_of_measurement: str | None
 
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        """Find the cached properties the entity class overrides."""
+        super().__init_subclass__(**kwargs)
+        dynamic_properties = {
+            prop
+            for prop in _CACHED_PROPERTIES
+            if getattr(cls, prop) is not getattr(Entity, prop)
+        }
+        if cls.has_entity_name is not Entity.has_entity_name:
+            dynamic_properties.add("name")
+        cls._dynamic_properties = frozenset(dynamic_properties)
+        cls._static_properties = _CACHED_PROPERTIES - dynamic_properties
+        _install_cached_property_inputs(cls)
+
     @property
     def should_poll(self) -> bool:
         """Return True if entity has to be polled for state.
@@ -590,61 +727,62 @@ class Entity(ABC):
 
         start = timer()
 
-        attr = self.capability_attributes
-        attr = dict(attr) if attr else {}
-
+        capability_attributes = self.capability_attributes
         available = self.available  # only call self.available once per update cycle
         state = self._stringify_state(available)
+        state_attributes: Mapping[str, Any] | None = None
+        extra_state_attributes: Mapping[str, Any] | None = None
         if available:
-            attr.update(self.state_attributes or {})
-            attr.update(self.extra_state_attributes or {})
-
-        if (unit_of_measurement := self.unit_of_measurement) is not None:
-            attr[ATTR_UNIT_OF_MEASUREMENT] = unit_of_measurement
-
-        entry = self.registry_entry
-
-        if assumed_state := self.assumed_state:
-            attr[ATTR_ASSUMED_STATE] = assumed_state
-
-        if (attribution := self.attribution) is not None:
-            attr[ATTR_ATTRIBUTION] = attribution
+            state_attributes = self.state_attributes
+            extra_state_attributes = self.extra_state_attributes
+        unit_of_measurement = self.unit_of_measurement
+        assumed_state = self.assumed_state
+
+        if (static_attributes := self._static_attributes) is None:
+            static_attributes = ReadOnlyDict(
+                self._async_calculate_static_attributes(self._static_properties)
+            )
+            self._static_attributes = static_attributes
+        dynamic_attributes = (
+            self._async_calculate_static_attributes(self._dynamic_properties)
+            if self._dynamic_properties
+            else None
+        )
 
+        customize: EntityValues | None = self.hass.data.get(DATA_CUSTOMIZE)
         if (
-            device_class := (entry and entry.device_class) or self.device_class
-        ) is not None:
-            attr[ATTR_DEVICE_CLASS] = str(device_class)
-
-        if (entity_picture := self.entity_picture) is not None:
-            attr[ATTR_ENTITY_PICTURE] = entity_picture
-
-        if (icon := (entry and entry.icon) or self.icon) is not None:
-            attr[ATTR_ICON] = icon
-
-        def friendly_name() -> str | None:
-            """Return the friendly name.
-
-            If has_entity_name is False, this returns self.name
-            If has_entity_name is True, this returns device.name + self.name
-            """
-            if not self.has_entity_name or not self.registry_entry:
-                return self.name
-
-            device_registry = dr.async_get(self.hass)
-            if not (device_id := self.registry_entry.device_id) or not (
-                device_entry := device_registry.async_get(device_id)
-            ):
-                return self.name
-
-            if not self.name:
-                return device_entry.name_by_user or device_entry.name
-            return f"{device_entry.name_by_user or device_entry.name} {self.name}"
-
-        if (name := (entry and entry.name) or friendly_name()) is not None:
-            attr[ATTR_FRIENDLY_NAME] = name
+            customize is not self._customize
+            or self.entity_id is not self._customize_entity_id
+        ):
+            self._customize = customize
+            self._customize_entity_id = self.entity_id
+            self._customize_attributes = (
+                ReadOnlyDict(customize.get(self.entity_id))
+                if customize is not None
+                else None
+            )
 
-        if (supported_features := self.supported_features) is not None:
-            attr[ATTR_SUPPORTED_FEATURES] = supported_features
+        inputs = (
+            capability_attributes,
+            state_attributes,
+            extra_state_attributes,
+            unit_of_measurement,
+            assumed_state,
+            static_attributes,
+            dynamic_attributes,
+            self._customize_attributes,
+        )
+        # The same inputs give the previous attributes, so the state machine
+        # finds them unchanged without comparing them. Other inputs give new
+        # attributes, which only the state machine compares.
+        last_inputs = self._last_attributes_inputs
+        if (attr := self._last_attributes) is None or (
+            last_inputs is None
+            or not all(map(_attributes_input_unchanged, inputs, last_inputs))
+        ):
+            attr = self._async_calculate_attributes(*inputs)
+            self._last_attributes = attr
+            self._last_attributes_inputs = inputs
 
         end = timer()
 
@@ -659,10 +797,6 @@ class Entity(ABC):
                 report_issue,
             )
 
-        # Overwrite properties that have been set in the config file.
-        if DATA_CUSTOMIZE in self.hass.data:
-            attr.update(self.hass.data[DATA_CUSTOMIZE].get(self.entity_id))
-
         if (
             self._context_set is not None
             and dt_util.utcnow() - self._context_set > self.context_recent_time
@@ -670,9 +804,119 @@ class Entity(ABC):
             self._context = None
             self._context_set = None
 
-        self.hass.states.async_set(
-            self.entity_id, state, attr, self.force_update, self._context
-        )
+        if (
+            not self.hass.states.async_set(
+                self.entity_id, state, attr, self.force_update, self._context
+            )
+            and self.platform is not None
+        ):
+            if (counter := self.hass.data.get(DATA_NO_OP_STATE_WRITES)) is None:
+                counter = self.hass.data[DATA_NO_OP_STATE_WRITES] = Counter()
+            counter[self.platform.platform_name] += 1
+
+    @callback
+    def _async_calculate_attributes(
+        self,
+        capability_attributes: Mapping[str, Any] | None,
+        state_attributes: Mapping[str, Any] | None,
+        extra_state_attributes: Mapping[str, Any] | None,
+        unit_of_measurement: str | None,
+        assumed_state: bool,
+        static_attributes: Mapping[str, Any],
+        dynamic_attributes: Mapping[str, Any] | None,
+        customize_attributes: Mapping[str, Any] | None,
+    ) -> ReadOnlyDict[str, Any]:
+        """Calculate the state attributes."""
+        attr = dict(capability_attributes) if capability_attributes else {}
+        attr.update(state_attributes or {})
+        attr.update(extra_state_attributes or {})
+
+        if unit_of_measurement is not None:
+            attr[ATTR_UNIT_OF_MEASUREMENT] = unit_of_measurement
+
+        if assumed_state:
+            attr[ATTR_ASSUMED_STATE] = assumed_state
+
+        if dynamic_attributes is None:
+            attr.update(static_attributes)
+        else:
+            for key in _CACHED_PROPERTIES_ATTRIBUTES:
+                if key in static_attributes:
+                    attr[key] = static_attributes[key]
+                elif key in dynamic_attributes:
+                    attr[key] = dynamic_attributes[key]
+
+        # Overwrite properties that have been set in the config file.
+        if customize_attributes:
+            attr.update(customize_attributes)
+
+        return ReadOnlyDict(attr)
+
+    @callback
+    def _async_calculate_static_attributes(
+        self, properties: frozenset[str]
+    ) -> dict[str, Any]:
+        """Calculate the state attributes of the given cached properties."""
+        attr: dict[str, Any] = {}
+        entry = self.registry_entry
+
+        if (
+            "attribution" in properties
+            and (attribution := self.attribution) is not None
+        ):
+            attr[ATTR_ATTRIBUTION] = attribution
+
+        if (
+            "device_class" in properties
+            and (device_class := (entry and entry.device_class) or self.device_class)
+            is not None
+        ):
+            attr[ATTR_DEVICE_CLASS] = str(device_class)
+
+        if (
+            "entity_picture" in properties
+            and (entity_picture := self.entity_picture) is not None
+        ):
+            attr[ATTR_ENTITY_PICTURE] = entity_picture
+
+        if (
+            "icon" in properties
+            and (icon := (entry and entry.icon) or self.icon) is not None
+        ):
+            attr[ATTR_ICON] = icon
+
+        if (
+            "name" in properties
+            and (name := (entry and entry.name) or self._friendly_name()) is not None
+        ):
+            attr[ATTR_FRIENDLY_NAME] = name
+
+        if (
+            "supported_features" in properties
+            and (supported_features := self.supported_features) is not None
+        ):
+            attr[ATTR_SUPPORTED_FEATURES] = supported_features
+
+        return attr
+
+    def _friendly_name(self) -> str | None:
+        """Return the friendly name.
+
+        If has_entity_name is False, this returns self.name
+        If has_entity_name is True, this returns device.name + self.name
+        """
+        if not self.has_entity_name or not self.registry_entry:
+            return self.name
+
+        device_registry = dr.async_get(self.hass)
+        if not (device_id := self.registry_entry.device_id) or not (
+            device_entry := device_registry.async_get(device_id)
+        ):
+            return self.name
+
+        if not self.name:
+            return device_entry.name_by_user or device_entry.name
+        return f"{device_entry.name_by_user or device_entry.name} {self.name}"
 
     def schedule_update_ha_state(self, force_refresh: bool = False) -> None:
         """Schedule an update ha state change task.
@@ -721,7 +965,19 @@ class Entity(ABC):
             if hasattr(self, "async_update"):
                 task = self.hass.async_create_task(self.async_update())
             elif hasattr(self, "update"):
-                task = self.hass.async_add_executor_job(self.update)
+                # Updates limited by parallel updates run in an executor pool
+                # of the platform with as many workers, so a slow platform
+                # does not delay the others
+                if (platform := self.platform) and (
+                    workers := platform.parallel_updates_limit
+                ):
+                    task = self.hass.async_add_executor_pool_job(
+                        f"{platform.domain}.{platform.platform_name}",
+                        self.update,
+                        max_workers=workers,
+                    )
+                else:
+                    task = self.hass.async_add_executor_job(self.update)
             else:
                 return
 
@@ -885,6 +1141,8 @@ class Entity(ABC):
                     self.hass, self.entity_id, self._async_registry_updated
                 )
             )
+            self._async_subscribe_device_updates()
+            self.async_on_remove(self._async_unsubscribe_device_updates)
 
     async def async_internal_will_remove_from_hass(self) -> None:
         """Run when entity will be removed from hass.
@@ -916,6 +1174,8 @@ class Entity(ABC):
 
         assert old is not None
         if self.registry_entry.entity_id == old.entity_id:
+            if self.registry_entry.device_id != old.device_id:
+                self._async_subscribe_device_updates()
             self.async_registry_entry_updated()
             self.async_write_ha_state()
             return
@@ -926,6 +1186,36 @@ class Entity(ABC):
         self.entity_id = self.registry_entry.entity_id
         await self.platform.async_add_entities([self])
 
+    @callback
+    def _async_subscribe_device_updates(self) -> None:
+        """Subscribe to the device registry updates of the entity's device."""
+        self._async_unsubscribe_device_updates()
+        if self.registry_entry is None or not self.registry_entry.device_id:
+            return
+        self._unsub_device_updates = async_track_device_registry_updated_event(
+            self.hass, self.registry_entry.device_id, self._async_device_updated
+        )
+
+    @callback
+    def _async_unsubscribe_device_updates(self) -> None:
+        """Unsubscribe from the device registry updates."""
+        if self._unsub_device_updates is not None:
+            self._unsub_device_updates()
+            self._unsub_device_updates = None
+
+    @callback
+    def _async_device_updated(self, event: Event) -> None:
+        """Handle device registry update.
+
+        The friendly name may include the name of the device.
+        """
+        self._async_invalidate_static_attributes()
+
+    @callback
+    def _async_invalidate_static_attributes(self) -> None:
+        """Calculate the cached state attributes again on the next write."""
+        self._static_attributes = None
+
     def __eq__(self, other: Any) -> bool:
         """Return the comparison."""
         if not isinstance(other, self.__class__):
@@ -978,6 +1268,9 @@ class Entity(ABC):
         return report_issue
 
 
+_install_cached_property_inputs(Entity)
+
+
 @dataclass
 class ToggleEntityDescription(EntityDescription):
     """A class that describes toggle entities."""
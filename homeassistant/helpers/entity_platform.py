@@ -134,6 +134,8 @@ class EntityPlatform:
         self._process_updates: asyncio.Lock | None = None
 
         self.parallel_updates: asyncio.Semaphore | None = None
+        # How many entities may update at the same time, None if not limited
+        self.parallel_updates_limit: int | None = None
 
         # Platform is None for the EntityComponent "catch-all" EntityPlatform
         # which powers entity_component.add_entities
@@ -180,6 +182,7 @@ class EntityPlatform:
 
         if parallel_updates is not None:
             self.parallel_updates = asyncio.Semaphore(parallel_updates)
+            self.parallel_updates_limit = parallel_updates
 
         return self.parallel_updates
 
@@ -458,10 +461,13 @@ class EntityPlatform:
         ):
             return
 
+        # Polling may run up to a second late, which lets the polls
+        # due in the same second share one event loop timer
         self._async_unsub_polling = async_track_time_interval(
             self.hass,
             self._update_entity_states,
             self.scan_interval,
+            coalesce=True,
         )
 
     def _entity_id_already_exists(self, entity_id: str) -> tuple[bool, bool]:
@@ -7,7 +7,10 @@ import copy
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 import functools as ft
+import heapq
 import logging
+import math
+from operator import attrgetter
 from random import randint
 import time
 from typing import Any, Union, cast
@@ -37,15 +40,23 @@ from homeassistant.loader import bind_hass
 from homeassistant.util import dt as dt_util
 from homeassistant.util.async_ import run_callback_threadsafe
 
+from .device_registry import EVENT_DEVICE_REGISTRY_UPDATED
 from .entity_registry import EVENT_ENTITY_REGISTRY_UPDATED
 from .ratelimit import KeyedRateLimit
 from .sun import get_astral_event_next
-from .template import RenderInfo, Template, result_as_boolean
+from .template import (
+    RERENDER_ALL,
+    RERENDER_DOMAIN,
+    RERENDER_ENTITY,
+    RERENDER_REFRESH,
+    RERENDER_TIME,
+    RenderInfo,
+    Template,
+    render_pass,
+    result_as_boolean,
+)
 from .typing import TemplateVarsType
 
-TRACK_STATE_CHANGE_CALLBACKS = "track_state_change_callbacks"
-TRACK_STATE_CHANGE_LISTENER = "track_state_change_listener"
-
 TRACK_STATE_ADDED_DOMAIN_CALLBACKS = "track_state_added_domain_callbacks"
 TRACK_STATE_ADDED_DOMAIN_LISTENER = "track_state_added_domain_listener"
 
@@ -55,6 +66,13 @@ TRACK_STATE_REMOVED_DOMAIN_LISTENER = "track_state_removed_domain_listener"
 TRACK_ENTITY_REGISTRY_UPDATED_CALLBACKS = "track_entity_registry_updated_callbacks"
 TRACK_ENTITY_REGISTRY_UPDATED_LISTENER = "track_entity_registry_updated_listener"
 
+TRACK_DEVICE_REGISTRY_UPDATED_CALLBACKS = "track_device_registry_updated_callbacks"
+TRACK_DEVICE_REGISTRY_UPDATED_LISTENER = "track_device_registry_updated_listener"
+
+TRACK_TEMPLATE_REFRESH_BATCH = "track_template_refresh_batch"
+
+TRACK_TIMER_WHEEL = "track_timer_wheel"
+
 _ALL_LISTENER = "all"
 _DOMAINS_LISTENER = "domains"
 _ENTITIES_LISTENER = "entities"
@@ -248,9 +266,9 @@ def async_track_state_change_event(
 
     In order to avoid having to iterate a long list
     of EVENT_STATE_CHANGED and fire and create a job
-    for each one, we keep a dict of entity ids that
-    care about the state change events so we can
-    do a fast dict lookup to route events.
+    for each one, the event bus keeps a dict of entity
+    ids that care about the state change events so it
+    can do a fast dict lookup to route events.
     """
     if not (entity_ids := _async_string_to_lower_list(entity_ids)):
         return _remove_empty_listener
@@ -264,56 +282,9 @@ def _async_track_state_change_event(
     action: Callable[[Event], Any],
 ) -> CALLBACK_TYPE:
     """async_track_state_change_event without lowercasing."""
-    entity_callbacks: dict[str, list[HassJob[[Event], Any]]] = hass.data.setdefault(
-        TRACK_STATE_CHANGE_CALLBACKS, {}
-    )
-
-    if TRACK_STATE_CHANGE_LISTENER not in hass.data:
-
-        @callback
-        def _async_state_change_filter(event: Event) -> bool:
-            """Filter state changes by entity_id."""
-            return event.data.get("entity_id") in entity_callbacks
-
-        @callback
-        def _async_state_change_dispatcher(event: Event) -> None:
-            """Dispatch state changes by entity_id."""
-            entity_id = event.data.get("entity_id")
-
-            if entity_id not in entity_callbacks:
-                return
-
-            for job in entity_callbacks[entity_id][:]:
-                try:
-                    hass.async_run_hass_job(job, event)
-                except Exception:  # pylint: disable=broad-except
-                    _LOGGER.exception(
-                        "Error while processing state change for %s", entity_id
-                    )
-
-        hass.data[TRACK_STATE_CHANGE_LISTENER] = hass.bus.async_listen(
-            EVENT_STATE_CHANGED,
-            _async_state_change_dispatcher,
-            event_filter=_async_state_change_filter,
-        )
-
-    job = HassJob(action)
-
-    for entity_id in entity_ids:
-        entity_callbacks.setdefault(entity_id, []).append(job)
-
-    @callback
-    def remove_listener() -> None:
-        """Remove state change listener."""
-        _async_remove_indexed_listeners(
-            hass,
-            TRACK_STATE_CHANGE_CALLBACKS,
-            TRACK_STATE_CHANGE_LISTENER,
-            entity_ids,
-            job,
-        )
-
-    return remove_listener
+    if isinstance(entity_ids, str):
+        entity_ids = (entity_ids,)
+    return hass.bus.async_listen_state_changed(action, entity_ids=entity_ids)
 
 
 @callback
@@ -413,6 +384,74 @@ def async_track_entity_registry_updated_event(
     return remove_listener
 
 
+@bind_hass
+def async_track_device_registry_updated_event(
+    hass: HomeAssistant,
+    device_ids: str | Iterable[str],
+    action: Callable[[Event], Any],
+) -> CALLBACK_TYPE:
+    """Track specific device registry updated events indexed by device_id.
+
+    Similar to async_track_entity_registry_updated_event.
+    """
+    if not device_ids:
+        return _remove_empty_listener
+    if isinstance(device_ids, str):
+        device_ids = [device_ids]
+
+    device_callbacks: dict[str, list[HassJob[[Event], Any]]] = hass.data.setdefault(
+        TRACK_DEVICE_REGISTRY_UPDATED_CALLBACKS, {}
+    )
+
+    if TRACK_DEVICE_REGISTRY_UPDATED_LISTENER not in hass.data:
+
+        @callback
+        def _async_device_registry_updated_filter(event: Event) -> bool:
+            """Filter device registry updates by device_id."""
+            return event.data["device_id"] in device_callbacks
+
+        @callback
+        def _async_device_registry_updated_dispatcher(event: Event) -> None:
+            """Dispatch device registry updates by device_id."""
+            device_id = event.data["device_id"]
+
+            if device_id not in device_callbacks:
+                return
+
+            for job in device_callbacks[device_id][:]:
+                try:
+                    hass.async_run_hass_job(job, event)
+                except Exception:  # pylint: disable=broad-except
+                    _LOGGER.exception(
+                        "Error while processing device registry update for %s",
+                        device_id,
+                    )
+
+        hass.data[TRACK_DEVICE_REGISTRY_UPDATED_LISTENER] = hass.bus.async_listen(
+            EVENT_DEVICE_REGISTRY_UPDATED,
+            _async_device_registry_updated_dispatcher,
+            event_filter=_async_device_registry_updated_filter,
+        )
+
+    job = HassJob(action)
+
+    for device_id in device_ids:
+        device_callbacks.setdefault(device_id, []).append(job)
+
+    @callback
+    def remove_listener() -> None:
+        """Remove device registry update listener."""
+        _async_remove_indexed_listeners(
+            hass,
+            TRACK_DEVICE_REGISTRY_UPDATED_CALLBACKS,
+            TRACK_DEVICE_REGISTRY_UPDATED_LISTENER,
+            device_ids,
+            job,
+        )
+
+    return remove_listener
+
+
 @callback
 def _async_dispatch_domain_event(
     hass: HomeAssistant, event: Event, callbacks: dict[str, list[HassJob[[Event], Any]]]
@@ -442,16 +481,7 @@ def async_track_state_added_domain(
     """Track state change events when an entity is added to domains."""
     if not (domains := _async_string_to_lower_list(domains)):
         return _remove_empty_listener
-    return _async_track_state_added_domain(hass, domains, action)
 
-
-@bind_hass
-def _async_track_state_added_domain(
-    hass: HomeAssistant,
-    domains: str | Iterable[str],
-    action: Callable[[Event], Any],
-) -> CALLBACK_TYPE:
-    """async_track_state_added_domain without lowercasing."""
     domain_callbacks: dict[str, list[HassJob[[Event], Any]]] = hass.data.setdefault(
         TRACK_STATE_ADDED_DOMAIN_CALLBACKS, {}
     )
@@ -566,11 +596,12 @@ class _TrackStateChangeFiltered:
         hass: HomeAssistant,
         track_states: TrackStates,
         action: Callable[[Event], Any],
+        run_immediately: bool = False,
     ) -> None:
         """Handle removal / refresh of tracker init."""
         self.hass = hass
         self._action = action
-        self._action_as_hassjob = HassJob(action)
+        self._run_immediately = run_immediately
         self._listeners: dict[str, Callable[[], None]] = {}
         self._last_track_states: TrackStates = track_states
 
@@ -590,7 +621,6 @@ class _TrackStateChangeFiltered:
             self._setup_all_listener()
             return
 
-        self._setup_domains_listener(track_states.domains)
         self._setup_entities_listener(track_states.domains, track_states.entities)
 
     @property
@@ -614,7 +644,6 @@ class _TrackStateChangeFiltered:
         if new_track_states.all_states:
             if had_all_listener:
                 return
-            self._cancel_listener(_DOMAINS_LISTENER)
             self._cancel_listener(_ENTITIES_LISTENER)
             self._setup_all_listener()
             return
@@ -622,16 +651,9 @@ class _TrackStateChangeFiltered:
         if had_all_listener:
             self._cancel_listener(_ALL_LISTENER)
 
-        domains_changed = new_track_states.domains != last_track_states.domains
-
-        if had_all_listener or domains_changed:
-            domains_changed = True
-            self._cancel_listener(_DOMAINS_LISTENER)
-            self._setup_domains_listener(new_track_states.domains)
-
         if (
             had_all_listener
-            or domains_changed
+            or new_track_states.domains != last_track_states.domains
             or new_track_states.entities != last_track_states.entities
         ):
             self._cancel_listener(_ENTITIES_LISTENER)
@@ -654,39 +676,22 @@ class _TrackStateChangeFiltered:
 
     @callback
     def _setup_entities_listener(self, domains: set[str], entities: set[str]) -> None:
-        if domains:
-            entities = entities.copy()
-            entities.update(self.hass.states.async_entity_ids(domains))
-
         # Entities has changed to none
-        if not entities:
+        if not domains and not entities:
             return
 
-        self._listeners[_ENTITIES_LISTENER] = _async_track_state_change_event(
-            self.hass, entities, self._action
-        )
-
-    @callback
-    def _state_added(self, event: Event) -> None:
-        self._cancel_listener(_ENTITIES_LISTENER)
-        self._setup_entities_listener(
-            self._last_track_states.domains, self._last_track_states.entities
-        )
-        self.hass.async_run_hass_job(self._action_as_hassjob, event)
-
-    @callback
-    def _setup_domains_listener(self, domains: set[str]) -> None:
-        if not domains:
-            return
-
-        self._listeners[_DOMAINS_LISTENER] = _async_track_state_added_domain(
-            self.hass, domains, self._state_added
+        # The domains also cover the entities that are added to them
+        self._listeners[_ENTITIES_LISTENER] = self.hass.bus.async_listen_state_changed(
+            self._action,
+            entity_ids=entities,
+            domains=domains or (),
+            run_immediately=self._run_immediately,
         )
 
     @callback
     def _setup_all_listener(self) -> None:
         self._listeners[_ALL_LISTENER] = self.hass.bus.async_listen(
-            EVENT_STATE_CHANGED, self._action
+            EVENT_STATE_CHANGED, self._action, run_immediately=self._run_immediately
         )
 
 
@@ -696,6 +701,7 @@ def async_track_state_change_filtered(
     hass: HomeAssistant,
     track_states: TrackStates,
     action: Callable[[Event], Any],
+    run_immediately: bool = False,
 ) -> _TrackStateChangeFiltered:
     """Track state changes with a TrackStates filter that can be updated.
 
@@ -707,6 +713,9 @@ def async_track_state_change_filtered(
         A TrackStates data class.
     action
         Callable to call with results.
+    run_immediately
+        Call the action when the state changes instead of with call_soon.
+        The action must be a callback that only schedules other work.
 
     Returns
     -------
@@ -714,7 +723,7 @@ def async_track_state_change_filtered(
     cancel the tracking (async_remove).
 
     """
-    tracker = _TrackStateChangeFiltered(hass, track_states, action)
+    tracker = _TrackStateChangeFiltered(hass, track_states, action, run_immediately)
     tracker.async_setup()
     return tracker
 
@@ -810,6 +819,72 @@ def async_track_template(
 track_template = threaded_listener_factory(async_track_template)
 
 
+class _TemplateRefreshBatch:
+    """Refresh the trackers triggered by state changes in one pass.
+
+    The trackers triggered by the state changes of an iteration of the
+    event loop are refreshed together in the next one. Their templates
+    are rendered once for all the state changes, sharing the state
+    lookups, and the results are passed to the actions of the trackers
+    after.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the batch."""
+        self.hass = hass
+        self._pending: dict[TrackTemplateResultInfo, list[Event]] = {}
+        self._results: dict[
+            TrackTemplateResultInfo, tuple[Event | None, list[TrackTemplateResult]]
+        ] = {}
+
+    @callback
+    def async_add(self, tracker: TrackTemplateResultInfo, event: Event) -> None:
+        """Refresh a tracker for a state change in the next pass."""
+        if not self._pending:
+            self.hass.loop.call_soon(self._async_refresh)
+        self._pending.setdefault(tracker, []).append(event)
+
+    @callback
+    def async_discard(self, tracker: TrackTemplateResultInfo) -> None:
+        """Drop the pending refreshes of a tracker."""
+        self._pending.pop(tracker, None)
+        self._results.pop(tracker, None)
+
+    @callback
+    def _async_refresh(self) -> None:
+        """Refresh the pending trackers."""
+        pending = self._pending
+        self._pending = {}
+        results = self._results
+        with render_pass(self.hass):
+            for tracker, events in pending.items():
+                try:
+                    # pylint: disable-next=protected-access
+                    event, updates = tracker._async_render_updates(events)
+                except Exception:  # pylint: disable=broad-except
+                    _LOGGER.exception(
+                        "Error while refreshing templates %s",
+                        tracker._track_templates,  # pylint: disable=protected-access
+                    )
+                    continue
+                if updates:
+                    results[tracker] = (event, updates)
+
+        # The actions may remove the trackers of the results left
+        for tracker in list(results):
+            if (result := results.pop(tracker, None)) is not None:
+                # pylint: disable-next=protected-access
+                tracker._async_run_action(*result)
+
+
+@callback
+def _async_get_template_refresh_batch(hass: HomeAssistant) -> _TemplateRefreshBatch:
+    """Return the batch refreshing the trackers of templates."""
+    if (batch := hass.data.get(TRACK_TEMPLATE_REFRESH_BATCH)) is None:
+        batch = hass.data[TRACK_TEMPLATE_REFRESH_BATCH] = _TemplateRefreshBatch(hass)
+    return cast(_TemplateRefreshBatch, batch)
+
+
 class TrackTemplateResultInfo:
     """Handle removal / refresh of tracker."""
 
@@ -835,6 +910,7 @@ class TrackTemplateResultInfo:
         self._info: dict[Template, RenderInfo] = {}
         self._track_state_changes: _TrackStateChangeFiltered | None = None
         self._time_listeners: dict[Template, Callable[[], None]] = {}
+        self._batch = _async_get_template_refresh_batch(hass)
 
     def async_setup(self, raise_on_template_error: bool, strict: bool = False) -> None:
         """Activation of template tracking."""
@@ -880,7 +956,10 @@ class TrackTemplateResultInfo:
                 )
 
         self._track_state_changes = async_track_state_change_filtered(
-            self.hass, _render_infos_to_track_states(self._info.values()), self._refresh
+            self.hass,
+            _render_infos_to_track_states(self._info.values()),
+            self._async_state_changed,
+            run_immediately=True,
         )
         self._update_time_listeners()
         _LOGGER.debug(
@@ -921,7 +1000,7 @@ class TrackTemplateResultInfo:
 
         @callback
         def _refresh_from_time(now: datetime) -> None:
-            self._refresh(None, track_templates=track_templates)
+            self._refresh(None, track_templates=track_templates, trigger=RERENDER_TIME)
 
         self._time_listeners[template] = async_track_utc_time_change(
             self.hass, _refresh_from_time, second=0
@@ -938,6 +1017,7 @@ class TrackTemplateResultInfo:
         assert self._track_state_changes
         self._track_state_changes.async_remove()
         self._rate_limit.async_remove()
+        self._batch.async_discard(self)
         for template in list(self._time_listeners):
             self._time_listeners.pop(template)()
 
@@ -946,14 +1026,24 @@ class TrackTemplateResultInfo:
         """Force recalculate the template."""
         self._refresh(None)
 
+    @callback
+    def _async_state_changed(self, event: Event) -> None:
+        """Refresh the templates for a state change with the batch."""
+        self._batch.async_add(self, event)
+
     def _render_template_if_ready(
         self,
         track_template_: TrackTemplate,
         now: datetime,
-        event: Event | None,
+        events: Sequence[Event],
+        trigger: str,
     ) -> bool | TrackTemplateResult:
         """Re-render the template if conditions match.
 
+        The template is re-rendered for the last of the events that
+        changed a state it depends on, or unconditionally without events.
+        The trigger is recorded for re-renders without events.
+
         Returns False if the template was not re-rendered.
 
         Returns True if the template re-rendered and did not
@@ -964,11 +1054,12 @@ class TrackTemplateResultInfo:
         """
         template = track_template_.template
 
-        if event:
+        if events:
             info = self._info[template]
 
-            if not _event_triggers_rerender(event, info):
+            if (index := _last_rerender_index(events, info)) < 0:
                 return False
+            event = events[index]
 
             had_timer = self._rate_limit.async_has_timer(template)
 
@@ -988,7 +1079,9 @@ class TrackTemplateResultInfo:
                 template.template,
                 event,
             )
+            trigger = _rerender_trigger(event, info)
 
+        template.async_record_rerender(trigger)
         self._rate_limit.async_triggered(template, now)
         self._info[template] = info = template.async_render_to_info(
             track_template_.variables
@@ -1024,6 +1117,7 @@ class TrackTemplateResultInfo:
         event: Event | None,
         track_templates: Iterable[TrackTemplate] | None = None,
         replayed: bool | None = False,
+        trigger: str = RERENDER_REFRESH,
     ) -> None:
         """Refresh the template.
 
@@ -1036,9 +1130,32 @@ class TrackTemplateResultInfo:
 
         replayed is True if the event is being replayed because the
         rate limit was hit.
+
+        trigger is what triggered the refresh when there is no event.
+        """
+        event, updates = self._async_render_updates(
+            (event,) if event else (), track_templates, replayed, trigger
+        )
+        if updates:
+            self._async_run_action(event, updates)
+
+    @callback
+    def _async_render_updates(
+        self,
+        events: Sequence[Event],
+        track_templates: Iterable[TrackTemplate] | None = None,
+        replayed: bool | None = False,
+        trigger: str = RERENDER_REFRESH,
+    ) -> tuple[Event | None, list[TrackTemplateResult]]:
+        """Render the templates for state changes and return the changed results.
+
+        The templates are rendered once for all the events. The returned
+        event is the last of them, or None when all the templates were
+        rendered because the super template became true.
         """
         updates: list[TrackTemplateResult] = []
         info_changed = False
+        event = events[-1] if events else None
         now = event.time_fired if not replayed and event else dt_util.utcnow()
 
         def _apply_update(
@@ -1062,7 +1179,9 @@ class TrackTemplateResultInfo:
 
         # Update the super template first
         if super_template is not None:
-            update = self._render_template_if_ready(super_template, now, event)
+            update = self._render_template_if_ready(
+                super_template, now, events, trigger
+            )
             info_changed |= _apply_update(update, super_template.template)
 
             if isinstance(update, TrackTemplateResult):
@@ -1085,6 +1204,8 @@ class TrackTemplateResultInfo:
                 # Super template changed from not True to True, force re-render
                 # of all templates in the group
                 event = None
+                events = ()
+                trigger = RERENDER_REFRESH
                 track_templates = self._track_templates
 
         # Then update the remaining templates unless blocked by the super template
@@ -1093,9 +1214,21 @@ class TrackTemplateResultInfo:
                 if track_template_ == super_template:
                     continue
 
-                update = self._render_template_if_ready(track_template_, now, event)
+                update = self._render_template_if_ready(
+                    track_template_, now, events, trigger
+                )
                 info_changed |= _apply_update(update, track_template_.template)
 
+        if len(events) > 1 and len(updates) > 1:
+            # Pass on the results in the order of the events causing them,
+            # as if the events had been handled one by one
+            updates.sort(
+                key=lambda update: -1
+                if super_template is not None
+                and update.template is super_template.template
+                else _last_rerender_index(events, self._info[update.template])
+            )
+
         if info_changed:
             assert self._track_state_changes
             self._track_state_changes.async_update_listeners(
@@ -1108,22 +1241,27 @@ class TrackTemplateResultInfo:
                     ]
                 )
             )
-            _LOGGER.debug(
-                (
-                    "Template group %s listens for %s, re-render blocker by super"
-                    " template: %s"
-                ),
-                self._track_templates,
-                self.listeners,
-                block_updates,
-            )
-
-        if not updates:
-            return
+            if _LOGGER.isEnabledFor(logging.DEBUG):
+                _LOGGER.debug(
+                    (
+                        "Template group %s listens for %s, re-render blocker by"
+                        " super template: %s"
+                    ),
+                    self._track_templates,
+                    self.listeners,
+                    block_updates,
+                )
 
         for track_result in updates:
             self._last_result[track_result.template] = track_result.result
 
+        return event, updates
+
+    @callback
+    def _async_run_action(
+        self, event: Event | None, updates: list[TrackTemplateResult]
+    ) -> None:
+        """Pass the changed results to the action."""
         self.hass.async_run_hass_job(self._job, event, updates)
 
 
@@ -1269,6 +1407,252 @@ def async_track_same_state(
 track_same_state = threaded_listener_factory(async_track_same_state)
 
 
+class _Timer:
+    """A listener waiting for a point in time."""
+
+    __slots__ = ("timestamp", "job", "utc_point_in_time", "slot", "handle", "done")
+
+    def __init__(
+        self,
+        timestamp: float,
+        job: HassJob[[datetime], Coroutine[Any, Any, None] | None],
+        utc_point_in_time: datetime,
+    ) -> None:
+        """Initialize the timer."""
+        self.timestamp = timestamp
+        self.job = job
+        self.utc_point_in_time = utc_point_in_time
+        # The slot of the timer, or the handle of the event loop of a timer
+        # that is armed on its own
+        self.slot: _TimerSlot | None = None
+        self.handle: asyncio.TimerHandle | None = None
+        # Set when the timer ran or was cancelled
+        self.done = False
+
+
+class _TimerSlot:
+    """The timers due in the second before a whole second."""
+
+    __slots__ = ("second", "timers", "cancelled")
+
+    def __init__(self, second: int) -> None:
+        """Initialize the slot."""
+        self.second = second
+        self.timers: list[_Timer] = []
+        # The number of timers in the slot that are cancelled
+        self.cancelled = 0
+
+
+class _TimerWheel:
+    """Run the listeners waiting for a point in time.
+
+    Listeners due on a whole second, like the time pattern listeners, and
+    listeners that can run up to a second late are kept in slots of a
+    second, by the whole second they are due before. Only the earliest
+    slot is armed on the event loop, on its second, and every listener of
+    the slots that are due runs in that callback. The event loop has one
+    timer for all of them instead of one each. Other listeners are armed
+    on their own and run at their time.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the wheel."""
+        self.hass = hass
+        self._slots: dict[int, _TimerSlot] = {}
+        # Seconds of the slots in order, may hold slots that are gone
+        self._slot_heap: list[int] = []
+        self._gone_slots = 0
+        self._pending = 0
+        self._handle: asyncio.TimerHandle | None = None
+        self._handle_second: int | None = None
+        self._running = False
+
+    @property
+    def pending(self) -> int:
+        """Return the number of pending timers."""
+        return self._pending
+
+    @callback
+    def async_add(
+        self,
+        timestamp: float,
+        job: HassJob[[datetime], Coroutine[Any, Any, None] | None],
+        utc_point_in_time: datetime,
+        coalesce: bool,
+    ) -> CALLBACK_TYPE:
+        """Run a job at a timestamp and return a callback cancelling it.
+
+        With coalesce, the job may run up to a second late. Jobs due in
+        less than a second are still armed on their own, as a slot could
+        more than double their delay.
+        """
+        timer = _Timer(timestamp, job, utc_point_in_time)
+        self._pending += 1
+        second = math.ceil(timestamp)
+        if second != timestamp and (not coalesce or timestamp - time.time() < 1):
+            timer.handle = self.hass.loop.call_later(
+                timestamp - time.time(), self._async_run_timer, timer
+            )
+            return ft.partial(self._async_cancel, timer)
+
+        if (slot := self._slots.get(second)) is None:
+            slot = self._slots[second] = _TimerSlot(second)
+            heapq.heappush(self._slot_heap, second)
+        timer.slot = slot
+        slot.timers.append(timer)
+        if not self._running and (
+            self._handle_second is None or second < self._handle_second
+        ):
+            self._async_arm(second)
+        return ft.partial(self._async_cancel, timer)
+
+    @callback
+    def _async_cancel(self, timer: _Timer) -> None:
+        """Cancel a timer."""
+        if timer.done:
+            return
+        timer.done = True
+        self._pending -= 1
+        if timer.handle is not None:
+            timer.handle.cancel()
+            return
+        if not self._pending:
+            self._slots.clear()
+            self._slot_heap.clear()
+            self._gone_slots = 0
+            if self._handle is not None:
+                self._handle.cancel()
+                self._handle = self._handle_second = None
+            return
+
+        slot = cast(_TimerSlot, timer.slot)
+        slot.cancelled += 1
+        # Rebuild the slot when most of its timers are cancelled, so
+        # listeners that are rescheduled over and over, like debouncers,
+        # do not pile up cancelled timers
+        if slot.cancelled * 2 <= len(slot.timers):
+            return
+        slot.timers = [timer for timer in slot.timers if not timer.done]
+        slot.cancelled = 0
+        if slot.timers or self._slots.get(slot.second) is not slot:
+            return
+        del self._slots[slot.second]
+        self._gone_slots += 1
+        if self._gone_slots * 2 > len(self._slot_heap):
+            self._slot_heap = list(self._slots)
+            heapq.heapify(self._slot_heap)
+            self._gone_slots = 0
+
+    @callback
+    def _async_arm(self, second: int) -> None:
+        """Arm the timer of the event loop for the slot of a second."""
+        if self._handle is not None:
+            self._handle.cancel()
+        self._handle_second = second
+        self._handle = self.hass.loop.call_later(
+            second - time.time(), self._async_run_due
+        )
+
+    @callback
+    def _async_run_timer(self, timer: _Timer) -> None:
+        """Run a timer that is armed on its own."""
+        # Depending on the available clock support (including timer hardware
+        # and the OS kernel) it can happen that we fire a little bit too early
+        # as measured by utcnow(). That is bad when callbacks have assumptions
+        # about the current time. Thus, we rearm the timer for the remaining
+        # time.
+        if (delta := (timer.timestamp - time_tracker_timestamp())) > 0:
+            _LOGGER.debug("Called %f seconds too early, rearming", delta)
+            timer.handle = self.hass.loop.call_later(
+                delta, self._async_run_timer, timer
+            )
+            return
+
+        timer.done = True
+        self._pending -= 1
+        self.hass.async_run_hass_job(timer.job, timer.utc_point_in_time)
+
+    @callback
+    def _async_pop_slot(self) -> _TimerSlot | None:
+        """Remove the earliest second from the heap and return its slot."""
+        slot = self._slots.pop(heapq.heappop(self._slot_heap), None)
+        if slot is None and self._gone_slots:
+            self._gone_slots -= 1
+        return slot
+
+    @callback
+    def _async_run_due(self) -> None:
+        """Run the timers that are due and arm the next slot."""
+        armed_second = self._handle_second
+        if self._handle is not None:
+            self._handle.cancel()
+        self._handle = self._handle_second = None
+        now = time_tracker_timestamp()
+        due: list[_Timer] = []
+        while self._slot_heap and self._slot_heap[0] <= now:
+            if (slot := self._async_pop_slot()) is not None:
+                due.extend(slot.timers)
+
+        # The slot of the next second holds the timers that are due when
+        # we run late or the time was moved forward
+        if (slot := self._slots.get(math.ceil(now))) is not None:
+            due.extend(timer for timer in slot.timers if timer.timestamp <= now)
+            slot.timers = [timer for timer in slot.timers if timer.timestamp > now]
+            slot.cancelled = sum(timer.done for timer in slot.timers)
+            if not slot.timers:
+                del self._slots[slot.second]
+                self._gone_slots += 1
+
+        # Like a timer armed on its own, the slot is rearmed for the
+        # remaining time when we fire too early
+        if not due and armed_second is not None and (delta := armed_second - now) > 0:
+            _LOGGER.debug("Called %f seconds too early, rearming", delta)
+
+        due.sort(key=attrgetter("timestamp"))
+        self._running = True
+        try:
+            for timer in due:
+                # A timer may be cancelled by one running before it
+                if timer.done:
+                    continue
+                timer.done = True
+                self._pending -= 1
+                try:
+                    self.hass.async_run_hass_job(timer.job, timer.utc_point_in_time)
+                except Exception as exc:  # pylint: disable=broad-except
+                    self.hass.loop.call_exception_handler(
+                        {"message": f"Exception in timer {timer.job}", "exception": exc}
+                    )
+        finally:
+            self._running = False
+
+        while self._slot_heap:
+            if (second := self._slot_heap[0]) in self._slots:
+                if second != self._handle_second:
+                    self._async_arm(second)
+                return
+            self._async_pop_slot()
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = self._handle_second = None
+
+
+@callback
+def _async_get_timer_wheel(hass: HomeAssistant) -> _TimerWheel:
+    """Return the wheel running the timers."""
+    if (wheel := hass.data.get(TRACK_TIMER_WHEEL)) is None:
+        wheel = hass.data[TRACK_TIMER_WHEEL] = _TimerWheel(hass)
+    return cast(_TimerWheel, wheel)
+
+
+@callback
+def async_get_pending_timers(hass: HomeAssistant) -> int:
+    """Return the number of listeners waiting for a point in time."""
+    if (wheel := hass.data.get(TRACK_TIMER_WHEEL)) is None:
+        return 0
+    return cast(_TimerWheel, wheel).pending
+
+
 @callback
 @bind_hass
 def async_track_point_in_time(
@@ -1298,44 +1682,25 @@ def async_track_point_in_utc_time(
     action: HassJob[[datetime], Coroutine[Any, Any, None] | None]
     | Callable[[datetime], Coroutine[Any, Any, None] | None],
     point_in_time: datetime,
+    *,
+    coalesce: bool = False,
 ) -> CALLBACK_TYPE:
-    """Add a listener that fires once after a specific point in UTC time."""
+    """Add a listener that fires once after a specific point in UTC time.
+
+    Listeners that can run up to a second late should set coalesce. They
+    then share one event loop timer with the other listeners due in the
+    same second.
+    """
     # Ensure point_in_time is UTC
     utc_point_in_time = dt_util.as_utc(point_in_time)
     expected_fire_timestamp = dt_util.utc_to_timestamp(utc_point_in_time)
 
     # Since this is called once, we accept a HassJob so we can avoid
     # having to figure out how to call the action every time its called.
-    cancel_callback: asyncio.TimerHandle | None = None
-
-    @callback
-    def run_action(job: HassJob[[datetime], Coroutine[Any, Any, None] | None]) -> None:
-        """Call the action."""
-        nonlocal cancel_callback
-        # Depending on the available clock support (including timer hardware
-        # and the OS kernel) it can happen that we fire a little bit too early
-        # as measured by utcnow(). That is bad when callbacks have assumptions
-        # about the current time. Thus, we rearm the timer for the remaining
-        # time.
-        if (delta := (expected_fire_timestamp - time_tracker_timestamp())) > 0:
-            _LOGGER.debug("Called %f seconds too early, rearming", delta)
-
-            cancel_callback = hass.loop.call_later(delta, run_action, job)
-            return
-
-        hass.async_run_hass_job(job, utc_point_in_time)
-
     job = action if isinstance(action, HassJob) else HassJob(action)
-    delta = utc_point_in_time.timestamp() - time.time()
-    cancel_callback = hass.loop.call_later(delta, run_action, job)
-
-    @callback
-    def unsub_point_in_time_listener() -> None:
-        """Cancel the call_later."""
-        assert cancel_callback is not None
-        cancel_callback.cancel()
-
-    return unsub_point_in_time_listener
+    return _async_get_timer_wheel(hass).async_add(
+        expected_fire_timestamp, job, utc_point_in_time, coalesce
+    )
 
 
 track_point_in_utc_time = threaded_listener_factory(async_track_point_in_utc_time)
@@ -1364,8 +1729,14 @@ def async_track_time_interval(
     hass: HomeAssistant,
     action: Callable[[datetime], Coroutine[Any, Any, None] | None],
     interval: timedelta,
+    *,
+    coalesce: bool = False,
 ) -> CALLBACK_TYPE:
-    """Add a listener that fires repetitively at every timedelta interval."""
+    """Add a listener that fires repetitively at every timedelta interval.
+
+    With coalesce, the listener may run up to a second late, see
+    async_track_point_in_utc_time.
+    """
     remove: CALLBACK_TYPE
     interval_listener_job: HassJob[[datetime], None]
 
@@ -1382,12 +1753,14 @@ def async_track_time_interval(
         nonlocal interval_listener_job
 
         remove = async_track_point_in_utc_time(
-            hass, interval_listener_job, next_interval()
+            hass, interval_listener_job, next_interval(), coalesce=coalesce
         )
         hass.async_run_hass_job(job, now)
 
     interval_listener_job = HassJob(interval_listener)
-    remove = async_track_point_in_utc_time(hass, interval_listener_job, next_interval())
+    remove = async_track_point_in_utc_time(
+        hass, interval_listener_job, next_interval(), coalesce=coalesce
+    )
 
     def remove_listener() -> None:
         """Remove interval listener."""
@@ -1618,8 +1991,9 @@ def _render_infos_needs_all_listener(render_infos: Iterable[RenderInfo]) -> bool
 
         # Previous call had an exception
         # so we do not know which states
-        # to track
-        if render_info.exception:
+        # to track unless they were found
+        # without rendering the template
+        if render_info.exception and render_info.static_dependencies is None:
             return True
 
     return False
@@ -1651,6 +2025,30 @@ def _event_triggers_rerender(event: Event, info: RenderInfo) -> bool:
     return bool(info.filter_lifecycle(entity_id))
 
 
+@callback
+def _last_rerender_index(events: Sequence[Event], info: RenderInfo) -> int:
+    """Return the index of the last event re-rendering a template, or -1."""
+    for index in range(len(events) - 1, -1, -1):
+        if _event_triggers_rerender(events[index], info):
+            return index
+    return -1
+
+
+@callback
+def _rerender_trigger(event: Event, info: RenderInfo) -> str:
+    """Determine what made an event trigger a re-render."""
+    entity_id = cast(str, event.data.get(ATTR_ENTITY_ID))
+
+    if entity_id in info.entities:
+        return RERENDER_ENTITY
+
+    domain = split_entity_id(entity_id)[0]
+    if domain in info.domains or domain in info.domains_lifecycle:
+        return RERENDER_DOMAIN
+
+    return RERENDER_ALL
+
+
 @callback
 def _rate_limit_for_event(
     event: Event, info: RenderInfo, track_template_: TrackTemplate
@@ -0,0 +1,300 @@
+"""Monitor the event loop for stalls and the integrations keeping it busy."""
+from __future__ import annotations
+
+import asyncio
+from collections import Counter, deque
+import functools
+import sys
+import threading
+import time
+from types import FrameType
+from typing import Any, NamedTuple
+
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+from homeassistant.loader import bind_hass
+
+DATA_LOOP_MONITOR = "loop_monitor"
+
+DEFAULT_SLOW_CALLBACK_THRESHOLD = 0.1
+DEFAULT_LAG_INTERVAL = 1.0
+
+MAX_SLOW_CALLBACKS = 50
+
+# Time spent outside of integrations is attributed to the core
+CORE = "homeassistant"
+
+_INTEGRATION_PATHS = ("custom_components/", "homeassistant/components/")
+# Frames of the code that runs jobs, the job is the first frame after them
+_DISPATCHER_PATHS = ("asyncio/", "homeassistant/core.py")
+
+_ORIGINAL_HANDLE_RUN = asyncio.Handle._run  # pylint: disable=protected-access
+_ACTIVE_MONITOR: LoopMonitor | None = None
+
+
+class SlowCallback(NamedTuple):
+    """A callback or task step that blocked the event loop."""
+
+    time: float
+    duration: float
+    target: str
+    integration: str | None
+
+
+class _Sample(NamedTuple):
+    """The job a slow handle was running when it exceeded the threshold."""
+
+    running: tuple[asyncio.Handle, float]
+    target: str
+    integration: str | None
+
+
+class LoopMonitor:
+    """Monitor the event loop.
+
+    The lag of a timer that runs every lag_interval seconds is measured.
+    Handles that run longer than slow_callback_threshold seconds are
+    recorded with the job they ran and the integration the job belongs
+    to. A watchdog thread looks at the stack of the event loop once a
+    handle exceeds the threshold, to find the job run by the handle.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        slow_callback_threshold: float = DEFAULT_SLOW_CALLBACK_THRESHOLD,
+        lag_interval: float = DEFAULT_LAG_INTERVAL,
+    ) -> None:
+        """Initialize the monitor."""
+        self.hass = hass
+        self.slow_callback_threshold = slow_callback_threshold
+        self.lag_interval = lag_interval
+        self.slow_callbacks: deque[SlowCallback] = deque(maxlen=MAX_SLOW_CALLBACKS)
+        self.slow_callback_time: Counter[str] = Counter()
+        self.lag_count = 0
+        self.lag_total = 0.0
+        self.lag_max = 0.0
+        self.lag_last = 0.0
+        # The handle running in the event loop and when it started
+        self.running: tuple[asyncio.Handle, float] | None = None
+        self._sample: _Sample | None = None
+        self._integrations_by_filename: dict[str, str | None] = {}
+        self._stop = threading.Event()
+        self._lag_timer: asyncio.TimerHandle | None = None
+        self._unsub_stop: CALLBACK_TYPE | None = None
+        self._loop_thread_id = 0
+
+    @callback
+    def async_start(self) -> None:
+        """Start monitoring the event loop."""
+        global _ACTIVE_MONITOR  # pylint: disable=global-statement
+        if _ACTIVE_MONITOR is not None:
+            raise RuntimeError("The event loop is already monitored")
+        _ACTIVE_MONITOR = self
+        asyncio.Handle._run = _monitored_handle_run  # type: ignore[assignment]
+
+        self._loop_thread_id = threading.get_ident()
+        self._async_schedule_lag_timer(self.hass.loop.time())
+        self._unsub_stop = self.hass.bus.async_listen_once(
+            EVENT_HOMEASSISTANT_STOP, self._async_handle_stop
+        )
+        threading.Thread(target=self._watch, name="LoopMonitor", daemon=True).start()
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop monitoring the event loop."""
+        global _ACTIVE_MONITOR  # pylint: disable=global-statement
+        if _ACTIVE_MONITOR is self:
+            _ACTIVE_MONITOR = None
+            asyncio.Handle._run = _ORIGINAL_HANDLE_RUN  # type: ignore[assignment]
+        if self._lag_timer is not None:
+            self._lag_timer.cancel()
+            self._lag_timer = None
+        if self._unsub_stop is not None:
+            self._unsub_stop()
+            self._unsub_stop = None
+        self._stop.set()
+
+    @callback
+    def _async_handle_stop(self, _: Event) -> None:
+        """Stop the monitor when Home Assistant stops."""
+        self._unsub_stop = None
+        if async_get(self.hass) is self:
+            async_stop(self.hass)
+        self.async_stop()
+
+    @callback
+    def _async_schedule_lag_timer(self, now: float) -> None:
+        """Schedule the timer measuring the lag of the event loop."""
+        expected = now + self.lag_interval
+        self._lag_timer = self.hass.loop.call_at(
+            expected, self._async_measure_lag, expected
+        )
+
+    @callback
+    def _async_measure_lag(self, expected: float) -> None:
+        """Measure how late the timer runs."""
+        now = self.hass.loop.time()
+        lag = max(now - expected, 0.0)
+        self.lag_count += 1
+        self.lag_total += lag
+        self.lag_last = lag
+        self.lag_max = max(self.lag_max, lag)
+        self._async_schedule_lag_timer(now)
+
+    def record_slow_callback(
+        self, running: tuple[asyncio.Handle, float], duration: float
+    ) -> None:
+        """Record a handle that ran longer than the threshold."""
+        if (sample := self._sample) is not None and sample.running is running:
+            target, integration = sample.target, sample.integration
+        else:
+            # The watchdog did not see the handle, fall back to its callback
+            handle_target = _handle_target(running[0])
+            code = getattr(handle_target, "__code__", None) or getattr(
+                handle_target, "cr_code", None
+            )
+            target = getattr(handle_target, "__qualname__", None) or repr(handle_target)
+            integration = (
+                self._integration_from_filename(code.co_filename) if code else None
+            )
+        self.slow_callbacks.append(
+            SlowCallback(time.time(), duration, target, integration)
+        )
+        self.slow_callback_time[integration or CORE] += duration
+
+    def _watch(self) -> None:
+        """Sample the handles that exceed the threshold until stopped."""
+        timeout = self.slow_callback_threshold
+        while not self._stop.wait(timeout):
+            timeout = self.slow_callback_threshold
+            if (running := self.running) is None or (
+                self._sample is not None and self._sample.running is running
+            ):
+                continue
+            if (elapsed := time.perf_counter() - running[1]) < timeout:
+                timeout -= elapsed
+                continue
+            self._sample = self._sample_running(running)
+
+    def _sample_running(self, running: tuple[asyncio.Handle, float]) -> _Sample | None:
+        """Return the job the event loop is running for a handle."""
+        frame = sys._current_frames().get(  # pylint: disable=protected-access
+            self._loop_thread_id
+        )
+        frames: list[FrameType] = []
+        while frame is not None and frame.f_code is not _MONITORED_HANDLE_RUN_CODE:
+            frames.append(frame)
+            frame = frame.f_back
+        if frame is None or not frames or self.running is not running:
+            # The handle finished while the stack was looked at
+            return None
+        job_code = next(
+            (
+                frame.f_code
+                for frame in reversed(frames)
+                if not any(
+                    path in frame.f_code.co_filename for path in _DISPATCHER_PATHS
+                )
+            ),
+            frames[-1].f_code,
+        )
+        return _Sample(
+            running,
+            getattr(job_code, "co_qualname", job_code.co_name),
+            self._integration_from_frames(frames),
+        )
+
+    def _integration_from_frames(self, frames: list[FrameType]) -> str | None:
+        """Return the innermost integration of a stack of frames."""
+        for frame in frames:
+            if integration := self._integration_from_filename(frame.f_code.co_filename):
+                return integration
+        return None
+
+    def _integration_from_filename(self, filename: str) -> str | None:
+        """Return the integration a file belongs to."""
+        if filename in self._integrations_by_filename:
+            return self._integrations_by_filename[filename]
+        integration: str | None = None
+        for path in _INTEGRATION_PATHS:
+            if (index := filename.find(path)) != -1:
+                start = index + len(path)
+                if (end := filename.find("/", start)) != -1:
+                    integration = filename[start:end]
+                break
+        self._integrations_by_filename[filename] = integration
+        return integration
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the measurements as a dictionary."""
+        return {
+            "slow_callback_threshold": self.slow_callback_threshold,
+            "lag": {
+                "count": self.lag_count,
+                "mean": self.lag_total / self.lag_count if self.lag_count else 0.0,
+                "max": self.lag_max,
+                "last": self.lag_last,
+            },
+            "integrations": dict(self.slow_callback_time.most_common()),
+            "slow_callbacks": [
+                slow_callback._asdict() for slow_callback in self.slow_callbacks
+            ],
+        }
+
+
+def _monitored_handle_run(handle: asyncio.Handle) -> None:
+    """Run a handle and record it when it is slow."""
+    monitor = _ACTIVE_MONITOR
+    # pylint: disable-next=protected-access
+    if monitor is None or handle._loop is not monitor.hass.loop:
+        _ORIGINAL_HANDLE_RUN(handle)
+        return
+    running = monitor.running = (handle, time.perf_counter())
+    _ORIGINAL_HANDLE_RUN(handle)
+    monitor.running = None
+    if (duration := time.perf_counter() - running[1]) > monitor.slow_callback_threshold:
+        monitor.record_slow_callback(running, duration)
+
+
+_MONITORED_HANDLE_RUN_CODE = _monitored_handle_run.__code__
+
+
+def _handle_target(handle: asyncio.Handle) -> Any:
+    """Return the function or coroutine run by a handle."""
+    target: Any = handle._callback  # pylint: disable=protected-access
+    if isinstance(task := getattr(target, "__self__", None), asyncio.Task):
+        target = task.get_coro()
+    while isinstance(target, functools.partial):
+        target = target.func
+    return target
+
+
+@callback
+@bind_hass
+def async_get(hass: HomeAssistant) -> LoopMonitor | None:
+    """Return the running loop monitor."""
+    return hass.data.get(DATA_LOOP_MONITOR)
+
+
+@callback
+@bind_hass
+def async_start(
+    hass: HomeAssistant,
+    slow_callback_threshold: float = DEFAULT_SLOW_CALLBACK_THRESHOLD,
+) -> LoopMonitor:
+    """Start monitoring the event loop."""
+    if (monitor := async_get(hass)) is not None:
+        return monitor
+
+    monitor = hass.data[DATA_LOOP_MONITOR] = LoopMonitor(hass, slow_callback_threshold)
+    monitor.async_start()
+    return monitor
+
+
+@callback
+@bind_hass
+def async_stop(hass: HomeAssistant) -> None:
+    """Stop monitoring the event loop."""
+    if (monitor := hass.data.pop(DATA_LOOP_MONITOR, None)) is not None:
+        monitor.async_stop()
@@ -24,6 +24,10 @@ _LOGGER = logging.getLogger(__name__)
 
 STORAGE_SEMAPHORE = "storage_semaphore"
 
+# Stores are read and written by their own executor pool, so the
+# blocking jobs of integrations do not delay them
+STORAGE_EXECUTOR_POOL = "storage"
+
 _T = TypeVar("_T", bound=Union[Mapping[str, Any], Sequence[Any]])
 
 
@@ -140,8 +144,8 @@ class Store(Generic[_T]):
             # and we don't want that to mess with what we're trying to store.
             data = deepcopy(data)
         else:
-            data = await self.hass.async_add_executor_job(
-                json_util.load_json, self.path
+            data = await self.hass.async_add_executor_pool_job(
+                STORAGE_EXECUTOR_POOL, json_util.load_json, self.path
             )
 
             if data == {}:
@@ -281,7 +285,9 @@ class Store(Generic[_T]):
                 _LOGGER.error("Error writing config for %s: %s", self.key, err)
 
     async def _async_write_data(self, path: str, data: dict) -> None:
-        await self.hass.async_add_executor_job(self._write_data, self.path, data)
+        await self.hass.async_add_executor_pool_job(
+            STORAGE_EXECUTOR_POOL, self._write_data, self.path, data
+        )
 
     def _write_data(self, path: str, data: dict) -> None:
         """Write the data."""
@@ -306,4 +312,6 @@ class Store(Generic[_T]):
         self._async_cleanup_final_write_listener()
 
         with suppress(FileNotFoundError):
-            await self.hass.async_add_executor_job(os.unlink, self.path)
+            await self.hass.async_add_executor_pool_job(
+                STORAGE_EXECUTOR_POOL, os.unlink, self.path
+            )
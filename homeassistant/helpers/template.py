@@ -5,30 +5,40 @@ from ast import literal_eval
 import asyncio
 import base64
 import collections.abc
-from collections.abc import Callable, Collection, Generator, Iterable
+from collections.abc import (
+    Callable,
+    Collection,
+    Generator,
+    Iterable,
+    Mapping,
+    MutableMapping,
+)
 from contextlib import contextmanager, suppress
 from contextvars import ContextVar
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from functools import cache, lru_cache, partial, wraps
+from itertools import count
 import json
 import logging
 import math
-from operator import attrgetter
+from operator import attrgetter, itemgetter
 import random
 import re
 import statistics
 from struct import error as StructError, pack, unpack_from
 import sys
+from time import perf_counter
 from types import CodeType
-from typing import Any, Literal, NoReturn, TypeVar, cast, overload
+from typing import Any, Literal, NamedTuple, NoReturn, TypeVar, cast, overload
 from urllib.parse import urlencode as urllib_urlencode
-import weakref
 
 from awesomeversion import AwesomeVersion
 import jinja2
 from jinja2 import pass_context, pass_environment, pass_eval_context
 from jinja2.sandbox import ImmutableSandboxedEnvironment
 from jinja2.utils import Namespace
+from lru import LRU  # pylint: disable=no-name-in-module
 from typing_extensions import Concatenate, ParamSpec
 import voluptuous as vol
 
@@ -72,6 +82,8 @@ _SENTINEL = object()
 DATE_STR_FORMAT = "%Y-%m-%d %H:%M:%S"
 
 _RENDER_INFO = "template.render_info"
+_RENDER_PASS_STATES = "template.render_pass_states"
+_RENDER_STATS = "template.render_stats"
 _ENVIRONMENT = "template.environment"
 _ENVIRONMENT_LIMITED = "template.environment_limited"
 _ENVIRONMENT_STRICT = "template.environment_strict"
@@ -110,6 +122,20 @@ template_cv: ContextVar[tuple[str, str] | None] = ContextVar(
 CACHED_TEMPLATE_STATES = 512
 EVAL_CACHE_SIZE = 512
 
+# The number of compiled templates kept in memory, so instantiating the
+# same template again, as blueprints and reloads do, does not compile it
+COMPILED_TEMPLATE_CACHE_SIZE = 4096
+
+# The number of templates with render statistics
+RENDER_STATS_SIZE = 4096
+
+# What triggered a tracked template to re-render
+RERENDER_ENTITY = "entity"
+RERENDER_DOMAIN = "domain"
+RERENDER_ALL = "all"
+RERENDER_TIME = "time"
+RERENDER_REFRESH = "refresh"
+
 
 @bind_hass
 def attach(hass: HomeAssistant, obj: Any) -> None:
@@ -252,6 +278,9 @@ class RenderInfo:
         self.entities: collections.abc.Set[str] = set()
         self.rate_limit: timedelta | None = None
         self.has_time = False
+        # Set when the render failed and the states the template
+        # depends on were found without rendering it instead
+        self.static_dependencies: StaticDependencies | None = None
 
     def __repr__(self) -> str:
         """Representation of RenderInfo."""
@@ -287,16 +316,30 @@ class RenderInfo:
         self.domains = frozenset(self.domains)
         self.domains_lifecycle = frozenset(self.domains_lifecycle)
 
+    def _set_static_dependencies(self, dependencies: StaticDependencies) -> None:
+        """Track the states found without rendering the template."""
+        self.static_dependencies = dependencies
+        self.entities = self.entities | dependencies.entities
+        self.domains = self.domains | dependencies.domains
+        self.domains_lifecycle = self.domains_lifecycle | dependencies.domains
+        if dependencies.all_states:
+            self.all_states = self.all_states_lifecycle = True
+        if dependencies.has_time:
+            self.has_time = True
+
     def _freeze(self) -> None:
         self._freeze_sets()
+        # The states read by a failed render are only known
+        # when they were found without rendering the template
+        unknown_states = self.exception is not None and self.static_dependencies is None
 
         if self.rate_limit is None:
-            if self.all_states or self.exception:
+            if self.all_states or unknown_states:
                 self.rate_limit = ALL_STATES_RATE_LIMIT
             elif self.domains or self.domains_lifecycle:
                 self.rate_limit = DOMAIN_STATES_RATE_LIMIT
 
-        if self.exception:
+        if unknown_states:
             return
 
         if not self.all_states_lifecycle:
@@ -316,6 +359,273 @@ class RenderInfo:
             self.filter = _false
 
 
+class StaticDependencies(NamedTuple):
+    """The states a template depends on, found without rendering it."""
+
+    entities: frozenset[str]
+    domains: frozenset[str]
+    all_states: bool
+    has_time: bool
+
+
+class _NotStatic(Exception):
+    """Raised when the dependencies of a template cannot be proven."""
+
+
+# Functions, filters and tests taking entity ids as their first argument
+_STATE_FUNCTIONS = {"states", "is_state", "is_state_attr", "state_attr"}
+_STATE_FILTERS = {"states", "state_attr"}
+_STATE_TESTS = {"is_state", "is_state_attr"}
+# Functions and filters reading states that cannot be followed statically
+_DYNAMIC_STATE_FUNCTIONS = {"closest", "distance"}
+_STATE_READERS = _STATE_FUNCTIONS | _DYNAMIC_STATE_FUNCTIONS | {"expand"}
+_TIME_FUNCTIONS = {"now", "utcnow"}
+_UNANALYZABLE_NODES = (
+    jinja2.nodes.Macro,
+    jinja2.nodes.CallBlock,
+    jinja2.nodes.Import,
+    jinja2.nodes.FromImport,
+    jinja2.nodes.Include,
+    jinja2.nodes.Extends,
+)
+
+
+@lru_cache(maxsize=EVAL_CACHE_SIZE)
+def _parse_template(source: str) -> jinja2.nodes.Template:
+    """Parse a template into its abstract syntax tree."""
+    return _NO_HASS_ENV.parse(source)
+
+
+class _DependencyAnalyzer:
+    """Find the states a template reads by walking its syntax tree.
+
+    Entity ids must be literals, variables or names set once in the
+    template. Any read of the states that cannot be followed makes the
+    dependencies unprovable.
+    """
+
+    def __init__(self, hass: HomeAssistant, variables: Mapping[str, Any]) -> None:
+        """Initialize the analyzer."""
+        self.hass = hass
+        self.names: dict[str, Any] = dict(variables)
+        self.entities: set[str] = set()
+        self.domains: set[str] = set()
+        self.all_states = False
+        self.has_time = False
+
+    def analyze(self, tree: jinja2.nodes.Template) -> StaticDependencies:
+        """Return the dependencies of a template."""
+        self._collect_names(tree)
+        self._visit(tree)
+        return StaticDependencies(
+            frozenset(self.entities),
+            frozenset(self.domains),
+            self.all_states,
+            self.has_time,
+        )
+
+    def _collect_names(self, tree: jinja2.nodes.Template) -> None:
+        """Collect the names set once in the template to a foldable value."""
+        assigned: dict[str, list[jinja2.nodes.Node | None]] = {}
+        for node in tree.find_all(
+            (
+                jinja2.nodes.Assign,
+                jinja2.nodes.AssignBlock,
+                jinja2.nodes.For,
+                jinja2.nodes.With,
+            )
+        ):
+            targets: list[tuple[jinja2.nodes.Node, jinja2.nodes.Node | None]]
+            if isinstance(node, jinja2.nodes.Assign):
+                targets = [(node.target, node.node)]
+            elif isinstance(node, jinja2.nodes.With):
+                targets = list(zip(node.targets, node.values))
+            else:
+                targets = [(node.target, None)]
+            for target, value in targets:
+                if isinstance(target, jinja2.nodes.Name):
+                    assigned.setdefault(target.name, []).append(value)
+                    continue
+                for name in target.find_all(jinja2.nodes.Name):
+                    assigned.setdefault(name.name, []).append(None)
+        for name, values in assigned.items():
+            self.names.pop(name, None)
+            if len(values) != 1 or values[0] is None:
+                continue
+            with suppress(_NotStatic):
+                self.names[name] = self._fold(values[0])
+
+    def _fold(self, node: jinja2.nodes.Node) -> Any:
+        """Return the value of a constant expression."""
+        if isinstance(node, jinja2.nodes.Const):
+            return node.value
+        if isinstance(node, (jinja2.nodes.List, jinja2.nodes.Tuple)):
+            return [self._fold(item) for item in node.items]
+        if isinstance(node, jinja2.nodes.Name) and node.name in self.names:
+            return self.names[node.name]
+        if isinstance(node, jinja2.nodes.Concat):
+            return "".join(str(self._fold(item)) for item in node.nodes)
+        if isinstance(node, jinja2.nodes.Add):
+            left = self._fold(node.left)
+            right = self._fold(node.right)
+            if isinstance(left, str) and isinstance(right, str):
+                return left + right
+        raise _NotStatic
+
+    def _fold_entity_ids(self, node: jinja2.nodes.Node | None) -> list[str]:
+        """Return the entity ids of a constant expression."""
+        if node is None:
+            raise _NotStatic
+        value = self._fold(node)
+        if isinstance(value, TemplateStateBase):
+            return [value.entity_id]
+        if isinstance(value, str):
+            return [value.lower()]
+        if isinstance(value, list) and all(isinstance(item, str) for item in value):
+            return [item.lower() for item in value]
+        raise _NotStatic
+
+    def _add_expanded(self, entity_ids: list[str]) -> None:
+        """Add the entities expand reads, following groups and zones."""
+        # circular import.
+        from . import entity as entity_helper  # pylint: disable=import-outside-toplevel
+
+        search = list(entity_ids)
+        while search:
+            entity_id = search.pop()
+            if entity_id in self.entities:
+                continue
+            self.entities.add(entity_id)
+            if (state := self.hass.states.get(entity_id)) is None:
+                continue
+            if entity_id.startswith(_GROUP_DOMAIN_PREFIX) or (
+                (source := entity_helper.entity_sources(self.hass).get(entity_id))
+                and source["domain"] == "group"
+            ):
+                search += state.attributes.get(ATTR_ENTITY_ID) or []
+            elif entity_id.startswith(_ZONE_DOMAIN_PREFIX):
+                search += state.attributes.get(ATTR_PERSONS) or []
+
+    def _visit(self, node: jinja2.nodes.Node) -> None:
+        """Visit a node and its children."""
+        if isinstance(node, _UNANALYZABLE_NODES):
+            raise _NotStatic
+
+        if isinstance(node, jinja2.nodes.Call) and isinstance(
+            node.node, jinja2.nodes.Name
+        ):
+            name = node.node.name
+            if name in _STATE_FUNCTIONS or name == "expand":
+                if node.dyn_args or not node.args:
+                    raise _NotStatic
+                if name == "expand":
+                    self._add_expanded(
+                        [
+                            entity_id
+                            for arg in node.args
+                            for entity_id in self._fold_entity_ids(arg)
+                        ]
+                    )
+                    self._visit_all(node.kwargs)
+                else:
+                    self.entities.update(self._fold_entity_ids(node.args[0]))
+                    self._visit_all(node.args[1:], node.kwargs)
+                return
+            if name in _TIME_FUNCTIONS:
+                self.has_time = True
+
+        elif isinstance(node, jinja2.nodes.Filter) and (
+            node.name in _STATE_FILTERS or node.name == "expand"
+        ):
+            entity_ids = self._fold_entity_ids(node.node)
+            if node.name == "expand":
+                self._add_expanded(entity_ids)
+            else:
+                self.entities.update(entity_ids)
+            self._visit_all(node.args, node.kwargs)
+            return
+
+        elif (
+            isinstance(node, jinja2.nodes.Filter)
+            and node.name in _DYNAMIC_STATE_FUNCTIONS
+        ):
+            raise _NotStatic
+
+        elif isinstance(node, jinja2.nodes.Test) and node.name in _STATE_TESTS:
+            self.entities.update(self._fold_entity_ids(node.node))
+            self._visit_all(node.args, node.kwargs)
+            return
+
+        elif isinstance(node, (jinja2.nodes.Getattr, jinja2.nodes.Getitem)):
+            if (key := self._states_key(node)) is not None:
+                if "." in key:
+                    self.entities.add(key.lower())
+                else:
+                    self.domains.add(key.lower())
+                return
+            if (inner := node.node) is not None and (
+                (domain := self._states_key(inner)) is not None and "." not in domain
+            ):
+                # states.domain.object_id
+                if (object_id := self._key(node)) is not None:
+                    self.entities.add(f"{domain}.{object_id}".lower())
+                else:
+                    self.domains.add(domain.lower())
+                if isinstance(node, jinja2.nodes.Getitem):
+                    self._visit(node.arg)
+                return
+
+        elif isinstance(node, jinja2.nodes.Name) and node.ctx == "load":
+            if node.name == "states" and node.name not in self.names:
+                # Iterating or counting all states
+                self.all_states = True
+            elif isinstance(value := self.names.get(node.name), TemplateStateBase):
+                # Variables such as this
+                self.entities.add(value.entity_id)
+            elif node.name in _STATE_READERS and node.name not in self.names:
+                raise _NotStatic
+
+        elif (
+            isinstance(node, jinja2.nodes.Const)
+            and isinstance(node.value, str)
+            and node.value in _STATE_READERS
+        ):
+            # Filters such as map call the filters they are passed by name
+            raise _NotStatic
+
+        for child in node.iter_child_nodes():
+            self._visit(child)
+
+    def _visit_all(self, *node_lists: Iterable[jinja2.nodes.Node]) -> None:
+        """Visit lists of nodes."""
+        for node_list in node_lists:
+            for node in node_list:
+                self._visit(node)
+
+    def _key(self, node: jinja2.nodes.Getattr | jinja2.nodes.Getitem) -> str | None:
+        """Return the constant attribute or item a node gets."""
+        if isinstance(node, jinja2.nodes.Getattr):
+            return node.attr
+        with suppress(_NotStatic):
+            if isinstance(key := self._fold(node.arg), str):
+                return key
+        return None
+
+    def _states_key(self, node: jinja2.nodes.Node) -> str | None:
+        """Return the key of states.key or states[key]."""
+        if (
+            isinstance(node, (jinja2.nodes.Getattr, jinja2.nodes.Getitem))
+            and isinstance(node.node, jinja2.nodes.Name)
+            and node.node.name == "states"
+            and "states" not in self.names
+        ):
+            if (key := self._key(node)) is None:
+                # A key that is not constant may be any entity
+                raise _NotStatic
+            return key
+        return None
+
+
 class Template:
     """Class to hold a template and manage caching and rendering."""
 
@@ -419,10 +729,13 @@ class Template:
         if variables is not None:
             kwargs.update(variables)
 
+        start = perf_counter()
         try:
             render_result = _render_with_context(self.template, compiled, **kwargs)
         except Exception as err:
+            self._async_record_render(start, True)
             raise TemplateError(err) from err
+        self._async_record_render(start, False)
 
         render_result = render_result.strip()
 
@@ -431,6 +744,19 @@ class Template:
 
         return self._parse_result(render_result)
 
+    def _async_record_render(self, start: float, error: bool) -> None:
+        """Record the time of a render started at start."""
+        if self.hass is not None:
+            _async_get_render_stats(self.hass, self.template).record(
+                perf_counter() - start, error
+            )
+
+    @callback
+    def async_record_rerender(self, trigger: str) -> None:
+        """Record what triggered a tracked template to re-render."""
+        if self.hass is not None:
+            _async_get_render_stats(self.hass, self.template).record_rerender(trigger)
+
     def _parse_result(self, render_result: str) -> Any:
         """Parse the result."""
         try:
@@ -543,9 +869,45 @@ class Template:
         finally:
             del self.hass.data[_RENDER_INFO]
 
+        # A render that succeeds tracks exactly the states it read, which
+        # is never more than the analysis finds. A failed render may have
+        # stopped before reading all the states, so track the states
+        # found without rendering when they are known.
+        if render_info.exception is not None:
+            if variables is not None:
+                kwargs.update(variables)
+            if (dependencies := self.async_static_dependencies(kwargs)) is not None:
+                render_info._set_static_dependencies(dependencies)
+
         render_info._freeze()
         return render_info
 
+    @callback
+    def async_static_dependencies(
+        self, variables: TemplateVarsType = None
+    ) -> StaticDependencies | None:
+        """Return the states the template depends on without rendering it.
+
+        Returns None when the states cannot be proven from the source of
+        the template, such as when entity ids are computed while rendering.
+
+        Groups and zones that are expanded are resolved with their current
+        members. The groups and zones are dependencies too, so a tracker
+        renders the template again, and analyzes it again if the render
+        fails, when their members change.
+        """
+        assert self.hass
+        if self.is_static:
+            return StaticDependencies(frozenset(), frozenset(), False, False)
+        try:
+            tree = _parse_template(self.template)
+        except jinja2.TemplateError:
+            return None
+        try:
+            return _DependencyAnalyzer(self.hass, variables or {}).analyze(tree)
+        except _NotStatic:
+            return None
+
     def render_with_possible_json_value(self, value, error_value=_SENTINEL):
         """Render template with value exposed.
 
@@ -617,9 +979,7 @@ class Template:
         self._strict = strict
         env = self._env
 
-        self._compiled = jinja2.Template.from_code(
-            env, self._compiled_code, env.globals, None
-        )
+        self._compiled = env.template_from_code(self.template, self._compiled_code)
 
         return self._compiled
 
@@ -912,19 +1272,37 @@ def _state_generator(
     hass: HomeAssistant, domain: str | None
 ) -> Generator[TemplateState, None, None]:
     """State generator for a domain or all states."""
-    for state in sorted(hass.states.async_all(domain), key=attrgetter("entity_id")):
+    states: Iterable[State]
+    if domain is None:
+        states = hass.states.async_all()
+    else:
+        states = hass.states.async_domain_states(domain).values()
+    for state in sorted(states, key=attrgetter("entity_id")):
         yield _template_state_no_collect(hass, state)
 
 
 def _get_state_if_valid(hass: HomeAssistant, entity_id: str) -> TemplateState | None:
-    state = hass.states.get(entity_id)
+    state = _get_state(hass, entity_id)
     if state is None and not valid_entity_id(entity_id):
         raise TemplateError(f"Invalid entity ID '{entity_id}'")
-    return _get_template_state_from_state(hass, entity_id, state)
+    return state
 
 
 def _get_state(hass: HomeAssistant, entity_id: str) -> TemplateState | None:
-    return _get_template_state_from_state(hass, entity_id, hass.states.get(entity_id))
+    if (pass_states := hass.data.get(_RENDER_PASS_STATES)) is None:
+        return _get_template_state_from_state(
+            hass, entity_id, hass.states.get(entity_id)
+        )
+    if entity_id in pass_states:
+        template_state = pass_states[entity_id]
+    else:
+        state = hass.states.get(entity_id)
+        template_state = pass_states[entity_id] = (
+            None if state is None else _template_state(hass, state)
+        )
+    if template_state is None:
+        _collect_state(hass, entity_id)
+    return template_state
 
 
 @lru_cache(maxsize=CACHED_TEMPLATE_STATES)
@@ -1942,6 +2320,22 @@ def set_template(template_str: str, action: str) -> Generator:
         template_cv.set(None)
 
 
+@contextmanager
+def render_pass(hass: HomeAssistant) -> Generator[None, None, None]:
+    """Share the state lookups of the templates rendered in a pass.
+
+    The states must not change while the templates of the pass render.
+    """
+    if _RENDER_PASS_STATES in hass.data:
+        yield
+        return
+    hass.data[_RENDER_PASS_STATES] = {}
+    try:
+        yield
+    finally:
+        del hass.data[_RENDER_PASS_STATES]
+
+
 def _render_with_context(
     template_str: str, template: jinja2.Template, **kwargs: Any
 ) -> str:
@@ -1991,6 +2385,9 @@ class LoggingUndefined(jinja2.Undefined):
         return super().__bool__()
 
 
+_ENVIRONMENT_IDS = count()
+
+
 class TemplateEnvironment(ImmutableSandboxedEnvironment):
     """The Home Assistant template environment."""
 
@@ -2002,7 +2399,14 @@ class TemplateEnvironment(ImmutableSandboxedEnvironment):
             undefined = jinja2.StrictUndefined
         super().__init__(undefined=undefined)
         self.hass = hass
-        self.template_cache = weakref.WeakValueDictionary()
+        self.limited = limited
+        self.strict = strict
+        # Unlike id(), never reused by a later environment
+        self.compiled_code_id = next(_ENVIRONMENT_IDS)
+        # Templates bound to this environment by source
+        self.template_cache: MutableMapping[str, jinja2.Template] = LRU(
+            COMPILED_TEMPLATE_CACHE_SIZE
+        )
         self.filters["round"] = forgiving_round
         self.filters["multiply"] = multiply
         self.filters["log"] = logarithm
@@ -2247,11 +2651,113 @@ class TemplateEnvironment(ImmutableSandboxedEnvironment):
                 defer_init,
             )
 
+        key = (self.compiled_code_id, source)
         cached: CodeType | str | None
-        if (cached := self.template_cache.get(source)) is None:
-            cached = self.template_cache[source] = super().compile(source)
+        if (cached := _COMPILED_CODE_CACHE.get(key)) is None:
+            cached = _COMPILED_CODE_CACHE[key] = super().compile(source)
 
         return cached
 
+    def template_from_code(self, source: str, code: CodeType) -> jinja2.Template:
+        """Return the template of compiled code bound to this environment.
+
+        The template is shared by all Template objects with the same source.
+        """
+        if (template := self.template_cache.get(source)) is None:
+            template = self.template_cache[source] = jinja2.Template.from_code(
+                self, code, self.globals, None
+            )
+        return template
+
+
+# Compiled code of the templates by environment and source, shared by all
+# environments to bound its size
+_COMPILED_CODE_CACHE: MutableMapping[tuple[int, str], CodeType | str] = LRU(
+    COMPILED_TEMPLATE_CACHE_SIZE
+)
+
+
+def _lru_stats(cache: Any) -> dict[str, int]:
+    """Return the size, hits and misses of an LRU."""
+    hits, misses = cache.get_stats()
+    return {"size": len(cache), "hits": hits, "misses": misses}
+
+
+@callback
+def async_get_template_cache_stats(hass: HomeAssistant) -> dict[str, dict[str, int]]:
+    """Return the hit and miss statistics of the template caches."""
+    stats = {"compiled": _lru_stats(_COMPILED_CODE_CACHE)}
+    for name, env_key in (
+        ("parsed", _ENVIRONMENT),
+        ("parsed_limited", _ENVIRONMENT_LIMITED),
+        ("parsed_strict", _ENVIRONMENT_STRICT),
+    ):
+        if (env := hass.data.get(env_key)) is not None:
+            stats[name] = _lru_stats(env.template_cache)
+    return stats
+
+
+@dataclass
+class TemplateRenderStats:
+    """Statistics of the renders of a template."""
+
+    renders: int = 0
+    errors: int = 0
+    total_time: float = 0.0
+    max_time: float = 0.0
+    rerenders: dict[str, int] = field(default_factory=dict)
+
+    def record(self, duration: float, error: bool) -> None:
+        """Record a render."""
+        self.renders += 1
+        if error:
+            self.errors += 1
+        self.total_time += duration
+        if duration > self.max_time:
+            self.max_time = duration
+
+    def record_rerender(self, trigger: str) -> None:
+        """Record what triggered a re-render."""
+        self.rerenders[trigger] = self.rerenders.get(trigger, 0) + 1
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the statistics as a dictionary."""
+        return {
+            "renders": self.renders,
+            "errors": self.errors,
+            "total_time": self.total_time,
+            "mean_time": self.total_time / self.renders if self.renders else 0.0,
+            "max_time": self.max_time,
+            "rerenders": dict(self.rerenders),
+        }
+
+
+def _async_get_render_stats(hass: HomeAssistant, source: str) -> TemplateRenderStats:
+    """Return the render statistics of a template by source."""
+    if (all_stats := hass.data.get(_RENDER_STATS)) is None:
+        all_stats = hass.data[_RENDER_STATS] = LRU(RENDER_STATS_SIZE)
+    if (stats := all_stats.get(source)) is None:
+        stats = all_stats[source] = TemplateRenderStats()
+    return cast(TemplateRenderStats, stats)
+
+
+@callback
+def async_get_render_stats(
+    hass: HomeAssistant, limit: int | None = None
+) -> list[dict[str, Any]]:
+    """Return the render statistics of the templates, most expensive first.
+
+    The templates with the same source share their statistics.
+    """
+    all_stats = hass.data.get(_RENDER_STATS) or {}
+    return sorted(
+        (
+            {"template": source, **stats.as_dict()}
+            for source, stats in all_stats.items()
+        ),
+        key=itemgetter("total_time"),
+        reverse=True,
+    )[:limit]
+
 
 _NO_HASS_ENV = TemplateEnvironment(None)  # type: ignore[no-untyped-call]
@@ -3,12 +3,15 @@ from __future__ import annotations
 
 import asyncio
 from collections.abc import Awaitable, Callable, Coroutine, Generator
+from dataclasses import dataclass
 from datetime import datetime, timedelta
+from functools import partial
 import logging
-from random import randint
+from random import randint, uniform
 from time import monotonic
 from typing import Any, Generic, TypeVar
 import urllib.error
+from weakref import WeakSet
 
 import aiohttp
 import requests
@@ -20,7 +23,7 @@ from homeassistant.exceptions import (
     ConfigEntryError,
     ConfigEntryNotReady,
 )
-from homeassistant.util.dt import utcnow
+from homeassistant.util.dt import utc_from_timestamp, utcnow
 
 from . import entity, event
 from .debounce import Debouncer
@@ -28,6 +31,12 @@ from .debounce import Debouncer
 REQUEST_REFRESH_DEFAULT_COOLDOWN = 10
 REQUEST_REFRESH_DEFAULT_IMMEDIATE = True
 
+DATA_POLLING_SCHEDULER = "update_coordinator_polling_scheduler"
+
+# Coordinators of an update group are refreshed together when
+# they are due within this many seconds of each other
+UPDATE_GROUP_WINDOW = 10
+
 _T = TypeVar("_T")
 _DataUpdateCoordinatorT = TypeVar(
     "_DataUpdateCoordinatorT", bound="DataUpdateCoordinator[Any]"
@@ -38,8 +47,207 @@ class UpdateFailed(Exception):
     """Raised when an update has failed."""
 
 
+@dataclass
+class RefreshStats:
+    """Statistics of the refreshes of a coordinator."""
+
+    count: int = 0
+    failures: int = 0
+    last_duration: float = 0.0
+    max_duration: float = 0.0
+    total_duration: float = 0.0
+
+    def record(self, duration: float, success: bool) -> None:
+        """Record a refresh."""
+        self.count += 1
+        if not success:
+            self.failures += 1
+        self.last_duration = duration
+        self.max_duration = max(self.max_duration, duration)
+        self.total_duration += duration
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the statistics as a dictionary."""
+        return {
+            "count": self.count,
+            "failures": self.failures,
+            "last_duration": self.last_duration,
+            "mean_duration": self.total_duration / self.count if self.count else 0.0,
+            "max_duration": self.max_duration,
+        }
+
+
+class _ScheduledRefresh:
+    """A refresh of a coordinator scheduled by the polling scheduler."""
+
+    __slots__ = ("coordinator", "when", "cancelled", "unsub")
+
+    def __init__(self, coordinator: DataUpdateCoordinator[Any], when: float) -> None:
+        """Initialize the scheduled refresh."""
+        self.coordinator = coordinator
+        self.when = when
+        self.cancelled = False
+        self.unsub: CALLBACK_TYPE | None = None
+
+
+class _GroupRefresh:
+    """The refreshes of the coordinators of an update group that run together."""
+
+    __slots__ = ("group", "refreshes", "when", "unsub")
+
+    def __init__(self, group: str) -> None:
+        """Initialize the group refresh."""
+        self.group = group
+        self.refreshes: list[_ScheduledRefresh] = []
+        self.when = 0.0
+        self.unsub: CALLBACK_TYPE | None = None
+
+
+class PollingScheduler:
+    """Schedule the refreshes of the coordinators.
+
+    The refreshes are coalesced timers of the event helpers, so the
+    refreshes that are due in the same second run in one callback, up to
+    a second late.
+    The coordinators of an update group, such as the coordinators polling
+    the same host, join the pending refresh of the group when they are due
+    within UPDATE_GROUP_WINDOW seconds of it. They are refreshed one after
+    the other as soon as the first of them is due.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the scheduler."""
+        self.hass = hass
+        self.coordinators: WeakSet[DataUpdateCoordinator[Any]] = WeakSet()
+        # The latest refresh of each update group, which its coordinators join
+        self._groups: dict[str, _GroupRefresh] = {}
+
+    @callback
+    def async_schedule(
+        self, coordinator: DataUpdateCoordinator[Any], when: float
+    ) -> CALLBACK_TYPE:
+        """Schedule a refresh of a coordinator at a timestamp."""
+        scheduled = _ScheduledRefresh(coordinator, when)
+        group_refresh: _GroupRefresh | None = None
+        if (group := coordinator.update_group) is None:
+            self._async_arm(scheduled, when)
+        else:
+            group_refresh = self._groups.get(group)
+            if (
+                group_refresh is None
+                or abs(group_refresh.when - when) > UPDATE_GROUP_WINDOW
+            ):
+                group_refresh = self._groups[group] = _GroupRefresh(group)
+            group_refresh.refreshes.append(scheduled)
+            if group_refresh.unsub is None or when < group_refresh.when:
+                self._async_arm(group_refresh, when)
+
+        @callback
+        def unschedule() -> None:
+            """Remove the refresh."""
+            if scheduled.cancelled:
+                return
+            scheduled.cancelled = True
+            if group_refresh is None:
+                self._async_disarm(scheduled)
+                return
+            # The group is refreshing
+            if group_refresh.unsub is None:
+                return
+            refreshes = group_refresh.refreshes
+            refreshes.remove(scheduled)
+            if not refreshes:
+                self._async_disarm(group_refresh)
+                if self._groups.get(group_refresh.group) is group_refresh:
+                    del self._groups[group_refresh.group]
+            elif scheduled.when == group_refresh.when:
+                # The refresh the group was armed for is gone
+                self._async_arm(
+                    group_refresh, min(refresh.when for refresh in refreshes)
+                )
+
+        return unschedule
+
+    @callback
+    def _async_arm(
+        self, target: _ScheduledRefresh | _GroupRefresh, when: float
+    ) -> None:
+        """Arm a refresh or group refresh for a timestamp."""
+        if target.unsub is not None:
+            target.unsub()
+        target.when = when
+        target.unsub = event.async_track_point_in_utc_time(
+            self.hass,
+            HassJob(partial(self._async_fire, target)),
+            utc_from_timestamp(when),
+            coalesce=True,
+        )
+
+    @callback
+    def _async_disarm(self, target: _ScheduledRefresh | _GroupRefresh) -> None:
+        """Disarm a refresh or group refresh."""
+        if target.unsub is not None:
+            target.unsub()
+            target.unsub = None
+
+    @callback
+    def _async_fire(
+        self, target: _ScheduledRefresh | _GroupRefresh, now: datetime
+    ) -> None:
+        """Run a refresh or group refresh that is due."""
+        target.unsub = None
+        if isinstance(target, _ScheduledRefresh):
+            target.cancelled = True
+            # pylint: disable-next=protected-access
+            self.hass.async_run_hass_job(target.coordinator._job, now)
+            return
+        if self._groups.get(target.group) is target:
+            del self._groups[target.group]
+        self.hass.async_create_task(self._async_refresh_group(target.refreshes, now))
+
+    async def _async_refresh_group(
+        self, refreshes: list[_ScheduledRefresh], now: datetime
+    ) -> None:
+        """Refresh the coordinators of an update group one after the other."""
+        for scheduled in refreshes:
+            # The refresh is cancelled when the coordinator
+            # was refreshed while the group was refreshing
+            if scheduled.cancelled:
+                continue
+            scheduled.cancelled = True
+            # pylint: disable-next=protected-access
+            await scheduled.coordinator._handle_refresh_interval(now)
+
+    @callback
+    def async_refresh_stats(self) -> list[dict[str, Any]]:
+        """Return the refresh statistics of the coordinators."""
+        return [
+            {"name": coordinator.name, **coordinator.refresh_stats.as_dict()}
+            for coordinator in self.coordinators
+        ]
+
+
+@callback
+def async_get_polling_scheduler(hass: HomeAssistant) -> PollingScheduler:
+    """Return the polling scheduler of the coordinators."""
+    if (scheduler := hass.data.get(DATA_POLLING_SCHEDULER)) is None:
+        scheduler = hass.data[DATA_POLLING_SCHEDULER] = PollingScheduler(hass)
+    return scheduler
+
+
 class DataUpdateCoordinator(Generic[_T]):
-    """Class to manage fetching data from single endpoint."""
+    """Class to manage fetching data from single endpoint.
+
+    The refreshes are scheduled by the polling scheduler. A random delay
+    of up to update_jitter is added to each of them. With spread_updates,
+    the refreshes are aligned to a random phase of the update interval,
+    which spreads the coordinators with the same interval across it.
+    Coordinators with the same update_group, such as the host they poll,
+    are refreshed together. With max_update_backoff, the interval doubles
+    after each refresh in a row that raised UpdateFailed, up to
+    max_update_backoff. Other errors, such as timeouts, do not back off,
+    as the next refresh may well succeed.
+    """
 
     def __init__(
         self,
@@ -50,6 +258,10 @@ class DataUpdateCoordinator(Generic[_T]):
         update_interval: timedelta | None = None,
         update_method: Callable[[], Awaitable[_T]] | None = None,
         request_refresh_debouncer: Debouncer[Coroutine[Any, Any, None]] | None = None,
+        update_jitter: timedelta | None = None,
+        spread_updates: bool = False,
+        update_group: str | None = None,
+        max_update_backoff: timedelta | None = None,
     ) -> None:
         """Initialize global data updater."""
         self.hass = hass
@@ -57,7 +269,12 @@ class DataUpdateCoordinator(Generic[_T]):
         self.name = name
         self.update_method = update_method
         self.update_interval = update_interval
+        self.update_jitter = update_jitter
+        self.spread_updates = spread_updates
+        self.update_group = update_group
+        self.max_update_backoff = max_update_backoff
         self.config_entry = config_entries.current_entry.get()
+        self.refresh_stats = RefreshStats()
 
         # It's None before the first successful update.
         # Components should call async_config_entry_first_refresh
@@ -71,6 +288,10 @@ class DataUpdateCoordinator(Generic[_T]):
         self._microsecond = randint(
             event.RANDOM_MICROSECOND_MIN, event.RANDOM_MICROSECOND_MAX
         )
+        # The phase of the update interval the refreshes are aligned to
+        self._phase: float | None = None
+        # The number of refreshes that raised UpdateFailed in a row
+        self._failed_refreshes = 0
 
         self._listeners: dict[CALLBACK_TYPE, tuple[CALLBACK_TYPE, object | None]] = {}
         self._job = HassJob(self._handle_refresh_interval)
@@ -110,6 +331,7 @@ class DataUpdateCoordinator(Generic[_T]):
 
         # This is the first listener, set up interval.
         if schedule_refresh:
+            async_get_polling_scheduler(self.hass).coordinators.add(self)
             self._schedule_refresh()
 
         return remove_listener
@@ -156,10 +378,25 @@ class DataUpdateCoordinator(Generic[_T]):
         # when multiple coordinators are scheduled to update at the same time.
         #
         # https://github.com/home-assistant/core/issues/82231
-        self._unsub_refresh = event.async_track_point_in_utc_time(
-            self.hass,
-            self._job,
-            utcnow().replace(microsecond=self._microsecond) + self.update_interval,
+        interval = self.update_interval.total_seconds()
+        if self.max_update_backoff is not None and self._failed_refreshes:
+            # The exponent is capped so the interval stays a float
+            interval = min(
+                interval * 2 ** min(self._failed_refreshes, 32),
+                max(self.max_update_backoff.total_seconds(), interval),
+            )
+        now = utcnow()
+        if self.spread_updates and interval:
+            if self._phase is None:
+                self._phase = uniform(0, interval)
+            timestamp = now.timestamp()
+            when = timestamp + interval - (timestamp - self._phase) % interval
+        else:
+            when = now.replace(microsecond=self._microsecond).timestamp() + interval
+        if self.update_jitter is not None:
+            when += uniform(0, self.update_jitter.total_seconds())
+        self._unsub_refresh = async_get_polling_scheduler(self.hass).async_schedule(
+            self, when
         )
 
     async def _handle_refresh_interval(self, _now: datetime) -> None:
@@ -217,8 +454,8 @@ class DataUpdateCoordinator(Generic[_T]):
         if scheduled and self.hass.is_stopping:
             return
 
-        if log_timing := self.logger.isEnabledFor(logging.DEBUG):
-            start = monotonic()
+        log_timing = self.logger.isEnabledFor(logging.DEBUG)
+        start = monotonic()
         auth_failed = False
 
         try:
@@ -303,11 +540,19 @@ class DataUpdateCoordinator(Generic[_T]):
                 self.logger.info("Fetching %s data recovered", self.name)
 
         finally:
+            duration = monotonic() - start
+            self.refresh_stats.record(duration, self.last_update_success)
+            if not self.last_update_success and isinstance(
+                self.last_exception, UpdateFailed
+            ):
+                self._failed_refreshes += 1
+            else:
+                self._failed_refreshes = 0
             if log_timing:
                 self.logger.debug(
                     "Finished fetching %s data in %.3f seconds (success: %s)",
                     self.name,
-                    monotonic() - start,
+                    duration,
                     self.last_update_success,
                 )
             if not auth_failed and self._listeners and not self.hass.is_stopping:
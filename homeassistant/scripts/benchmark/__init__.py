@@ -8,17 +8,25 @@ from collections.abc import Callable
 from contextlib import suppress
 import json
 import logging
+from tempfile import TemporaryDirectory
 from timeit import default_timer as timer
 from typing import TypeVar
 
-from homeassistant import core
-from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant import config_entries, core
+from homeassistant.const import EVENT_STATE_CHANGED, MATCH_ALL
+from homeassistant.helpers import recorder as recorder_helper
 from homeassistant.helpers.entityfilter import convert_include_exclude_filter
 from homeassistant.helpers.event import (
+    TrackTemplate,
+    async_track_point_in_utc_time,
     async_track_state_change,
     async_track_state_change_event,
+    async_track_template_result,
 )
 from homeassistant.helpers.json import JSON_DUMP, JSONEncoder
+from homeassistant.helpers.template import Template
+from homeassistant.setup import async_setup_component
+import homeassistant.util.dt as dt_util
 
 # mypy: allow-untyped-calls, allow-untyped-defs, no-check-untyped-defs
 # mypy: no-warn-return-any
@@ -88,6 +96,23 @@ async def fire_events(hass):
     return timer() - start
 
 
+@benchmark
+async def fire_events_without_listeners(hass):
+    """Fire a million events nobody listens to."""
+    events_to_fire = 10**6
+
+    hass.bus.async_listen("other_event", core.callback(lambda _: None))
+
+    start = timer()
+
+    for _ in range(events_to_fire):
+        hass.bus.async_fire("benchmark_event")
+
+    await hass.async_block_till_done()
+
+    return timer() - start
+
+
 @benchmark
 async def fire_events_with_filter(hass):
     """Fire a million events with a filter that rejects them."""
@@ -120,6 +145,40 @@ async def fire_events_with_filter(hass):
     return timer() - start
 
 
+@benchmark
+async def fire_events_with_many_filters(hass):
+    """Fire 100k events to 200 filtered listeners and a listener for all events."""
+    count = 0
+    event_name = "benchmark_event"
+    events_to_fire = 10**5
+
+    @core.callback
+    def event_filter(event):
+        """Filter event."""
+        return False
+
+    @core.callback
+    def listener(_):
+        """Handle event."""
+        nonlocal count
+        count += 1
+
+    hass.bus.async_listen(MATCH_ALL, listener, run_immediately=True)
+    for _ in range(200):
+        hass.bus.async_listen(event_name, listener, event_filter=event_filter)
+
+    start = timer()
+
+    for _ in range(events_to_fire):
+        hass.bus.async_fire(event_name)
+
+    await hass.async_block_till_done()
+
+    assert count == events_to_fire
+
+    return timer() - start
+
+
 @benchmark
 async def state_changed_helper(hass):
     """Run a million events through state changed helper with 1000 entities."""
@@ -224,6 +283,140 @@ async def state_changed_event_filter_helper(hass):
     return timer() - start
 
 
+@benchmark
+async def state_changed_latency(hass):
+    """Measure the state_changed listener latency at 5k state changes per second."""
+    return await _state_changed_latency(hass)
+
+
+@benchmark
+async def state_changed_latency_batched(hass):
+    """Measure the state_changed listener latency with batched callbacks."""
+    hass.async_batch_callbacks()
+    return await _state_changed_latency(hass)
+
+
+async def _state_changed_latency(hass):
+    """Measure the total latency between setting states and a listener running."""
+    events_per_second = 5000
+    events_to_fire = 2 * events_per_second
+    entity_count = 100
+    latencies = []
+    fired = {}
+    done = asyncio.Event()
+
+    @core.callback
+    def listener(event):
+        """Record the latency of the event."""
+        latencies.append(timer() - fired[event.context.id])
+        if len(latencies) == events_to_fire:
+            done.set()
+
+    # A few listeners to all state changes, like the recorder and websockets
+    for _ in range(9):
+        hass.bus.async_listen(EVENT_STATE_CHANGED, core.callback(lambda _: None))
+    hass.bus.async_listen(EVENT_STATE_CHANGED, listener)
+    for idx in range(entity_count):
+        async_track_state_change_event(
+            hass, f"sensor.power_{idx}", core.callback(lambda _: None)
+        )
+
+    start = timer()
+
+    for idx in range(events_to_fire):
+        # Set the states in bursts every millisecond
+        if idx % (events_per_second // 1000) == 0:
+            await asyncio.sleep(max(0, start + idx / events_per_second - timer()))
+        context = core.Context()
+        fired[context.id] = timer()
+        hass.states.async_set(
+            f"sensor.power_{idx % entity_count}", idx, context=context
+        )
+
+    await done.wait()
+
+    # The time the state changes waited for the listener in total
+    return sum(latencies)
+
+
+@benchmark
+async def template_rerender_one_entity(hass):
+    """Re-render 300 templates tracking one entity that changes 1000 times."""
+    return await _template_rerender_one_entity(hass, 1)
+
+
+@benchmark
+async def template_rerender_one_entity_bursts(hass):
+    """Re-render 300 templates tracking one entity changing 5 times at once."""
+    return await _template_rerender_one_entity(hass, 5)
+
+
+async def _template_rerender_one_entity(hass, changes_per_iteration):
+    """Measure re-rendering 300 templates tracking one entity."""
+    template_count = 300
+    state_changes = 1000 * changes_per_iteration
+    last_state = str(state_changes - 1)
+    finished = 0
+    done = asyncio.Event()
+
+    @core.callback
+    def listener(event, updates):
+        """Count the results of the last state."""
+        nonlocal finished
+        if hass.states.get("sensor.power").state == last_state:
+            finished += len(updates)
+            if finished == template_count:
+                done.set()
+
+    hass.states.async_set("sensor.power", -1)
+    for idx in range(template_count):
+        template = Template(
+            f"{{{{ states('sensor.power') | int + {idx} }}}}"
+            f" {{{{ state_attr('sensor.power', 'unit_of_measurement') }}}}",
+            hass,
+        )
+        async_track_template_result(hass, [TrackTemplate(template, None)], listener)
+
+    start = timer()
+
+    for idx in range(state_changes):
+        hass.states.async_set("sensor.power", idx, {"unit_of_measurement": "W"})
+        if idx % changes_per_iteration == changes_per_iteration - 1:
+            await asyncio.sleep(0)
+
+    await done.wait()
+
+    return timer() - start
+
+
+@benchmark
+async def track_point_in_time(hass):
+    """Schedule 100k listeners for the same point in time and cancel half."""
+    count = 0
+    listeners = 10**5
+    done = asyncio.Event()
+
+    @core.callback
+    def listener(_):
+        """Handle the point in time."""
+        nonlocal count
+        count += 1
+        if count == listeners // 2:
+            done.set()
+
+    point_in_time = dt_util.utcnow()
+    start = timer()
+
+    for idx in range(listeners):
+        unsub = async_track_point_in_utc_time(hass, listener, point_in_time)
+        if idx % 2:
+            unsub()
+
+    await done.wait()
+
+    return timer() - start
+
+
 @benchmark
 async def filtering_entity_id(hass):
     """Run a 100k state changes through entity filter."""
@@ -311,6 +504,59 @@ async def json_serialize_states(hass):
     return timer() - start
 
 
+@benchmark
+async def recorder_insert(hass):
+    """Record 100k state changes with the ORM."""
+    return await _recorder_insert(hass, False)
+
+
+@benchmark
+async def recorder_bulk_insert(hass):
+    """Record 100k state changes with bulk inserts."""
+    return await _recorder_insert(hass, True)
+
+
+async def _recorder_insert(hass, bulk_insert):
+    """Measure recording 100k state changes."""
+    # pylint: disable-next=import-outside-toplevel
+    from homeassistant.components import recorder
+
+    with TemporaryDirectory() as config_dir:
+        # The database is created in the configuration directory
+        hass.config.config_dir = config_dir
+        hass.config_entries = config_entries.ConfigEntries(hass, {})
+        await hass.config_entries.async_initialize()
+        hass.config.skip_pip = True
+        recorder_helper.async_initialize_recorder(hass)
+        assert await async_setup_component(
+            hass,
+            recorder.DOMAIN,
+            {recorder.DOMAIN: {recorder.CONF_BULK_INSERT: bulk_insert}},
+        )
+        await hass.async_start()
+        instance = recorder.get_instance(hass)
+        await instance.async_recorder_ready.wait()
+
+        start = timer()
+
+        for idx in range(10**5):
+            hass.states.async_set(
+                f"sensor.benchmark{idx % 1000}", idx, {"unit_of_measurement": "W"}
+            )
+            # Let the events reach the recorder like a busy system would
+            if not idx % 1000:
+                await asyncio.sleep(0)
+
+        await hass.async_block_till_done()
+        await instance.async_block_till_done()
+        runtime = timer() - start
+
+        # Close the database before its directory is removed
+        await hass.async_stop()
+
+    return runtime
+
+
 def _create_state_changed_event_from_old_new(
     entity_id, event_time_fired, old_state, new_state
 ):
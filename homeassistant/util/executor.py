@@ -1,19 +1,23 @@
 """Executor util helpers."""
 from __future__ import annotations
 
-from concurrent.futures import ThreadPoolExecutor
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
 import contextlib
+from dataclasses import asdict, dataclass
 import logging
 import sys
-from threading import Thread
+from threading import Lock, Thread
 import time
 import traceback
-from typing import Any
+from typing import Any, TypeVar
 
 from .thread import async_raise
 
 _LOGGER = logging.getLogger(__name__)
 
+_T = TypeVar("_T")
+
 MAX_LOG_ATTEMPTS = 2
 
 _JOIN_ATTEMPTS = 10
@@ -91,3 +95,70 @@ class InterruptibleThreadPoolExecutor(ThreadPoolExecutor):
             )
             if timeout_remaining <= 0:
                 return
+
+
+@dataclass
+class ExecutorStats:
+    """Statistics of the jobs submitted to an executor."""
+
+    submitted: int = 0
+    started: int = 0
+    completed: int = 0
+    wait_time: float = 0.0
+    max_wait_time: float = 0.0
+    run_time: float = 0.0
+    max_run_time: float = 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the statistics as a dictionary."""
+        return {
+            **asdict(self),
+            "queued": self.submitted - self.started,
+            "running": self.started - self.completed,
+        }
+
+
+class MeasuredThreadPoolExecutor(InterruptibleThreadPoolExecutor):
+    """An InterruptibleThreadPoolExecutor that measures its jobs.
+
+    The time jobs wait in the queue for a worker and the time
+    they run are added to the stats of the executor.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        """Initialize the executor."""
+        super().__init__(*args, **kwargs)
+        self.stats = ExecutorStats()
+        self._stats_lock = Lock()
+
+    def submit(  # type: ignore[override]
+        self, fn: Callable[..., _T], /, *args: Any, **kwargs: Any
+    ) -> Future[_T]:
+        """Submit a job to the executor."""
+        with self._stats_lock:
+            self.stats.submitted += 1
+        return super().submit(self._run_measured, time.perf_counter(), fn, args, kwargs)
+
+    def _run_measured(
+        self,
+        submitted: float,
+        fn: Callable[..., _T],
+        args: tuple[Any, ...],
+        kwargs: dict[str, Any],
+    ) -> _T:
+        """Run a job and measure how long it waited and ran."""
+        started = time.perf_counter()
+        wait_time = started - submitted
+        stats = self.stats
+        with self._stats_lock:
+            stats.started += 1
+            stats.wait_time += wait_time
+            stats.max_wait_time = max(stats.max_wait_time, wait_time)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            run_time = time.perf_counter() - started
+            with self._stats_lock:
+                stats.completed += 1
+                stats.run_time += run_time
+                stats.max_run_time = max(stats.max_run_time, run_time)
@@ -57,6 +57,7 @@ from homeassistant.helpers import (
     storage,
 )
 from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.helpers.event import TRACK_TIMER_WHEEL
 from homeassistant.helpers.json import JSONEncoder
 from homeassistant.helpers.typing import ConfigType
 from homeassistant.setup import setup_component
@@ -160,7 +161,7 @@ def get_test_home_assistant():
 
 
 # pylint: disable=protected-access
-async def async_test_home_assistant(event_loop, load_registries=True):
+async def async_test_home_assistant(event_loop, load_registries=True):  # noqa: C901
     """Return a Home Assistant object pointing at test config dir."""
     hass = ha.HomeAssistant()
     store = auth_store.AuthStore(hass)
@@ -170,6 +171,7 @@ async def async_test_home_assistant(event_loop, load_registries=True):
 
     orig_async_add_job = hass.async_add_job
     orig_async_add_executor_job = hass.async_add_executor_job
+    orig_async_add_executor_pool_job = hass.async_add_executor_pool_job
     orig_async_create_task = hass.async_create_task
 
     def async_add_job(target, *args):
@@ -198,6 +200,19 @@ async def async_test_home_assistant(event_loop, load_registries=True):
 
         return orig_async_add_executor_job(target, *args)
 
+    def async_add_executor_pool_job(pool, target, *args, **kwargs):
+        """Add executor job to a named executor pool."""
+        check_target = target
+        while isinstance(check_target, ft.partial):
+            check_target = check_target.func
+
+        if isinstance(check_target, Mock):
+            fut = asyncio.Future()
+            fut.set_result(target(*args))
+            return fut
+
+        return orig_async_add_executor_pool_job(pool, target, *args, **kwargs)
+
     def async_create_task(coroutine):
         """Create task."""
         if isinstance(coroutine, Mock) and not isinstance(coroutine, AsyncMock):
@@ -272,6 +287,7 @@ async def async_test_home_assistant(event_loop, load_registries=True):
 
     hass.async_add_job = async_add_job
     hass.async_add_executor_job = async_add_executor_job
+    hass.async_add_executor_pool_job = async_add_executor_pool_job
     hass.async_create_task = async_create_task
     hass.async_wait_for_task_count = types.MethodType(async_wait_for_task_count, hass)
     hass._await_count_and_log_pending = types.MethodType(
@@ -434,7 +450,22 @@ def _async_fire_time_changed(
     hass: HomeAssistant, utc_datetime: datetime | None, fire_all: bool
 ) -> None:
     timestamp = date_util.utc_to_timestamp(utc_datetime)
-    for task in list(hass.loop._scheduled):
+    scheduled = list(hass.loop._scheduled)
+
+    # The coalesced listeners for a point in time share a timer of the event
+    # loop, which is armed for the whole second they are due before. Run
+    # the ones that are due at the time.
+    if (wheel := hass.data.get(TRACK_TIMER_WHEEL)) is not None:
+        with patch(
+            "homeassistant.helpers.event.time_tracker_utcnow",
+            return_value=utc_datetime,
+        ), patch(
+            "homeassistant.helpers.event.time_tracker_timestamp",
+            return_value=timestamp,
+        ):
+            wheel._async_run_due()
+
+    for task in scheduled:
         if not isinstance(task, asyncio.TimerHandle):
             continue
         if task.cancelled():
@@ -0,0 +1,225 @@
+"""The tests for the history websocket stream."""
+import asyncio
+from datetime import timedelta
+from unittest.mock import patch
+
+from homeassistant.components.recorder import history
+from homeassistant.components.websocket_api.const import TYPE_RESULT
+from homeassistant.setup import async_setup_component
+import homeassistant.util.dt as dt_util
+
+from tests.components.recorder.common import async_wait_recording_done
+
+
+async def test_history_stream_historical_only(recorder_mock, hass, hass_ws_client):
+    """Test history stream with an end time in the past."""
+    now = dt_util.utcnow()
+    await async_setup_component(hass, "history", {})
+    hass.states.async_set("sensor.one", "on", attributes={"any": "attr"})
+    sensor_one_last_updated = hass.states.get("sensor.one").last_updated
+    hass.states.async_set("sensor.two", "off", attributes={"any": "attr"})
+    sensor_two_last_updated = hass.states.get("sensor.two").last_updated
+    await async_wait_recording_done(hass)
+    end_time = dt_util.utcnow() + timedelta(microseconds=1)
+
+    client = await hass_ws_client()
+    with patch(
+        "homeassistant.components.history.websocket_api.dt_util.utcnow",
+        return_value=end_time + timedelta(seconds=1),
+    ):
+        await client.send_json(
+            {
+                "id": 1,
+                "type": "history/stream",
+                "entity_ids": ["sensor.one", "sensor.two"],
+                "start_time": now.isoformat(),
+                "end_time": end_time.isoformat(),
+                "include_start_time_state": True,
+                "significant_changes_only": False,
+                "no_attributes": True,
+                "minimal_response": True,
+            }
+        )
+        response = await client.receive_json()
+    assert response["success"]
+    assert response["id"] == 1
+    assert response["type"] == TYPE_RESULT
+
+    response = await client.receive_json()
+    assert response == {
+        "event": {
+            "end_time": end_time.timestamp(),
+            "start_time": now.timestamp(),
+            "states": {
+                "sensor.one": [
+                    {"a": {}, "lu": sensor_one_last_updated.timestamp(), "s": "on"}
+                ],
+                "sensor.two": [
+                    {"a": {}, "lu": sensor_two_last_updated.timestamp(), "s": "off"}
+                ],
+            },
+        },
+        "id": 1,
+        "type": "event",
+    }
+
+
+async def test_history_stream_live(recorder_mock, hass, hass_ws_client):
+    """Test history stream sends the history and then the new states."""
+    now = dt_util.utcnow()
+    await async_setup_component(hass, "history", {})
+    hass.states.async_set("sensor.one", "on", attributes={"any": "attr"})
+    sensor_one_last_updated = hass.states.get("sensor.one").last_updated
+    await async_wait_recording_done(hass)
+
+    client = await hass_ws_client()
+    await client.send_json(
+        {
+            "id": 1,
+            "type": "history/stream",
+            "entity_ids": ["sensor.one", "climate.test"],
+            "start_time": now.isoformat(),
+        }
+    )
+    response = await client.receive_json()
+    assert response["success"]
+    assert response["id"] == 1
+    assert response["type"] == TYPE_RESULT
+
+    response = await client.receive_json()
+    assert response["event"]["start_time"] == now.timestamp()
+    assert response["event"]["states"] == {
+        "sensor.one": [
+            {"a": {"any": "attr"}, "lu": sensor_one_last_updated.timestamp(), "s": "on"}
+        ],
+    }
+
+    # Attribute only changes are not significant for sensors
+    hass.states.async_set("sensor.one", "on", attributes={"any": "changed"})
+    hass.states.async_set("sensor.one", "off", attributes={"any": "again"})
+    sensor_one_off = hass.states.get("sensor.one")
+    hass.states.async_set("climate.test", "heat", attributes={"temperature": 20})
+    hass.states.async_set("climate.test", "heat", attributes={"temperature": 21})
+    climate_test = hass.states.get("climate.test")
+    hass.states.async_set("sensor.other", "on")
+    await async_wait_recording_done(hass)
+
+    response = await asyncio.wait_for(client.receive_json(), 2)
+    assert response["type"] == "event"
+    assert response["event"]["states"] == {
+        "sensor.one": [
+            {
+                "a": {"any": "again"},
+                "lu": sensor_one_off.last_updated.timestamp(),
+                "s": "off",
+            }
+        ],
+        "climate.test": [
+            {
+                "a": {"temperature": 20},
+                "lu": climate_test.last_changed.timestamp(),
+                "s": "heat",
+            },
+            {
+                "a": {"temperature": 21},
+                "lc": climate_test.last_changed.timestamp(),
+                "lu": climate_test.last_updated.timestamp(),
+                "s": "heat",
+            },
+        ],
+    }
+
+    await client.send_json({"id": 2, "type": "unsubscribe_events", "subscription": 1})
+    response = await client.receive_json()
+    assert response["success"]
+    assert response["id"] == 2
+
+
+async def test_history_stream_missed_commit(recorder_mock, hass, hass_ws_client):
+    """Test states that are not in the first query are sent after the recorder syncs."""
+    now = dt_util.utcnow()
+    await async_setup_component(hass, "history", {})
+    hass.states.async_set("sensor.one", "on", attributes={"any": "attr"})
+    sensor_one = hass.states.get("sensor.one")
+    await async_wait_recording_done(hass)
+
+    real_get_significant_states = history.get_significant_states
+    calls = 0
+
+    def _get_significant_states(*args):
+        # The state is not committed yet when the first query runs
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            return {}
+        return real_get_significant_states(*args)
+
+    client = await hass_ws_client()
+    with patch.object(
+        history, "get_significant_states", side_effect=_get_significant_states
+    ):
+        await client.send_json(
+            {
+                "id": 1,
+                "type": "history/stream",
+                "entity_ids": ["sensor.one"],
+                "start_time": now.isoformat(),
+                "include_start_time_state": False,
+            }
+        )
+        response = await client.receive_json()
+        assert response["success"]
+
+        response = await client.receive_json()
+        assert response["event"]["states"] == {}
+
+        response = await asyncio.wait_for(client.receive_json(), 2)
+        assert response["event"]["states"] == {
+            "sensor.one": [
+                {
+                    "a": {"any": "attr"},
+                    "lu": sensor_one.last_updated.timestamp(),
+                    "s": "on",
+                }
+            ]
+        }
+    assert calls == 2
+
+
+async def test_history_stream_bad_start_time(recorder_mock, hass, hass_ws_client):
+    """Test history stream bad start time."""
+    await async_setup_component(hass, "history", {})
+    client = await hass_ws_client()
+    await client.send_json(
+        {
+            "id": 1,
+            "type": "history/stream",
+            "entity_ids": ["climate.test"],
+            "start_time": "cats",
+        }
+    )
+    response = await client.receive_json()
+    assert not response["success"]
+    assert response["error"]["code"] == "invalid_start_time"
+
+
+async def test_history_stream_end_time_before_start_time(
+    recorder_mock, hass, hass_ws_client
+):
+    """Test history stream with an end_time before the start_time."""
+    end_time = dt_util.utcnow() - timedelta(seconds=2)
+    start_time = dt_util.utcnow() - timedelta(seconds=1)
+    await async_setup_component(hass, "history", {})
+    client = await hass_ws_client()
+    await client.send_json(
+        {
+            "id": 1,
+            "type": "history/stream",
+            "entity_ids": ["climate.test"],
+            "start_time": start_time.isoformat(),
+            "end_time": end_time.isoformat(),
+        }
+    )
+    response = await client.receive_json()
+    assert not response["success"]
+    assert response["error"]["code"] == "invalid_end_time"
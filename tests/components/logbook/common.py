@@ -27,6 +27,7 @@ class MockRow:
         self.shared_data = json.dumps(data, cls=JSONEncoder)
         self.data = data
         self.time_fired = dt_util.utcnow()
+        self.time_fired_ts = dt_util.utc_to_timestamp(self.time_fired)
         self.context_parent_id = context.parent_id if context else None
         self.context_user_id = context.user_id if context else None
         self.context_id = context.id if context else None
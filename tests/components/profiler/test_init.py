@@ -1,23 +1,37 @@
 """Test the Profiler config flow."""
+from collections import Counter
 from datetime import timedelta
+import logging
 import os
-from unittest.mock import patch
+from unittest.mock import AsyncMock, patch
 
 from homeassistant.components.profiler import (
     CONF_SECONDS,
     SERVICE_DUMP_LOG_OBJECTS,
+    SERVICE_LOG_COORDINATOR_REFRESHES,
     SERVICE_LOG_EVENT_LOOP_SCHEDULED,
+    SERVICE_LOG_EXECUTOR_POOLS,
+    SERVICE_LOG_NO_OP_STATE_WRITES,
     SERVICE_LOG_THREAD_FRAMES,
     SERVICE_MEMORY,
     SERVICE_START,
     SERVICE_START_LOG_OBJECTS,
+    SERVICE_START_LOOP_MONITOR,
     SERVICE_STOP_LOG_OBJECTS,
+    SERVICE_STOP_LOOP_MONITOR,
 )
 from homeassistant.components.profiler.const import DOMAIN
 from homeassistant.const import CONF_SCAN_INTERVAL, CONF_TYPE
+from homeassistant.helpers import loop_monitor
+from homeassistant.helpers.entity import DATA_NO_OP_STATE_WRITES
+from homeassistant.helpers.event import async_get_pending_timers
+from homeassistant.helpers.template import Template
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+from homeassistant.setup import async_setup_component
 import homeassistant.util.dt as dt_util
 
 from tests.common import MockConfigEntry, async_fire_time_changed
+from tests.components.diagnostics import get_diagnostics_for_config_entry
 
 
 async def test_basic_usage(hass, tmpdir):
@@ -194,3 +208,133 @@ async def test_log_scheduled(hass, caplog):
 
     assert await hass.config_entries.async_unload(entry.entry_id)
     await hass.async_block_till_done()
+
+
+async def test_log_no_op_state_writes(hass, caplog):
+    """Test we can log the no-op state writes by integration."""
+
+    entry = MockConfigEntry(domain=DOMAIN)
+    entry.add_to_hass(hass)
+
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert hass.services.has_service(DOMAIN, SERVICE_LOG_NO_OP_STATE_WRITES)
+
+    hass.data[DATA_NO_OP_STATE_WRITES] = Counter({"chatty": 5, "quiet": 1})
+    await hass.services.async_call(DOMAIN, SERVICE_LOG_NO_OP_STATE_WRITES, {})
+    await hass.async_block_till_done()
+
+    assert "[('chatty', 5), ('quiet', 1)]" in caplog.text
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+
+
+async def test_log_executor_pools(hass, caplog):
+    """Test we can log the statistics of the executor pools."""
+
+    entry = MockConfigEntry(domain=DOMAIN)
+    entry.add_to_hass(hass)
+
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert hass.services.has_service(DOMAIN, SERVICE_LOG_EXECUTOR_POOLS)
+
+    await hass.async_add_executor_pool_job("slow_cloud", lambda: None)
+    await hass.services.async_call(DOMAIN, SERVICE_LOG_EXECUTOR_POOLS, {})
+    await hass.async_block_till_done()
+
+    assert "Executor pool slow_cloud: {'submitted': 1" in caplog.text
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+
+
+async def test_log_coordinator_refreshes(hass, caplog):
+    """Test we can log the refresh statistics of the update coordinators."""
+
+    entry = MockConfigEntry(domain=DOMAIN)
+    entry.add_to_hass(hass)
+
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert hass.services.has_service(DOMAIN, SERVICE_LOG_COORDINATOR_REFRESHES)
+
+    coordinator = DataUpdateCoordinator(
+        hass,
+        logging.getLogger(__name__),
+        name="slow_cloud",
+        update_method=AsyncMock(return_value=1),
+        update_interval=timedelta(seconds=30),
+    )
+    coordinator.async_add_listener(lambda: None)
+    await coordinator.async_refresh()
+
+    await hass.services.async_call(DOMAIN, SERVICE_LOG_COORDINATOR_REFRESHES, {})
+    await hass.async_block_till_done()
+
+    assert "{'name': 'slow_cloud', 'count': 1, 'failures': 0" in caplog.text
+
+    coordinator._unschedule_refresh()
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+
+
+async def test_loop_monitor(hass, hass_ws_client, hass_client):
+    """Test we can monitor the event loop."""
+    assert await async_setup_component(hass, "diagnostics", {})
+
+    entry = MockConfigEntry(domain=DOMAIN)
+    entry.add_to_hass(hass)
+
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    client = await hass_ws_client(hass)
+    await client.send_json({"id": 1, "type": "profiler/loop_monitor"})
+    response = await client.receive_json()
+    assert not response["success"]
+    assert response["error"]["code"] == "not_found"
+
+    await hass.services.async_call(
+        DOMAIN, SERVICE_START_LOOP_MONITOR, {"slow_callback_threshold": 0.5}
+    )
+    await hass.async_block_till_done()
+    assert loop_monitor.async_get(hass) is not None
+
+    await client.send_json({"id": 2, "type": "profiler/loop_monitor"})
+    response = await client.receive_json()
+    assert response["success"]
+    assert response["result"]["slow_callback_threshold"] == 0.5
+
+    diagnostics = await get_diagnostics_for_config_entry(hass, hass_client, entry)
+    assert diagnostics["loop_monitor"]["slow_callback_threshold"] == 0.5
+    assert "executor_pools" in diagnostics
+    assert "compiled" in diagnostics["template_caches"]
+
+    Template("{{ 1 + 1 }}", hass).async_render()
+    await client.send_json({"id": 3, "type": "profiler/template_renders"})
+    response = await client.receive_json()
+    assert response["success"]
+    [stats] = [
+        stats for stats in response["result"] if stats["template"] == "{{ 1 + 1 }}"
+    ]
+    assert stats["renders"] == 1
+
+    diagnostics = await get_diagnostics_for_config_entry(hass, hass_client, entry)
+    assert stats in diagnostics["template_renders"]
+    assert diagnostics["pending_timers"] == async_get_pending_timers(hass)
+
+    await hass.services.async_call(DOMAIN, SERVICE_STOP_LOOP_MONITOR, {})
+    await hass.async_block_till_done()
+    assert loop_monitor.async_get(hass) is None
+
+    await hass.services.async_call(DOMAIN, SERVICE_START_LOOP_MONITOR, {})
+    await hass.async_block_till_done()
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+    assert loop_monitor.async_get(hass) is None
@@ -5,7 +5,11 @@ from sqlalchemy import select
 from sqlalchemy.engine.row import Row
 
 from homeassistant.components.recorder import get_instance
-from homeassistant.components.recorder.db_schema import EventData, States
+from homeassistant.components.recorder.db_schema import (
+    EventData,
+    States,
+    StatesMeta,
+)
 from homeassistant.components.recorder.filters import (
     Filters,
     extract_include_exclude_filter_conf,
@@ -39,9 +43,10 @@ async def _async_get_states_and_events_with_filter(
     def _get_states_with_session():
         with session_scope(hass=hass) as session:
             return session.execute(
-                select(States.entity_id).filter(
-                    sqlalchemy_filter.states_entity_filter()
-                )
+                select(StatesMeta.entity_id)
+                .select_from(States)
+                .join(StatesMeta, States.metadata_id == StatesMeta.metadata_id)
+                .filter(sqlalchemy_filter.states_entity_filter())
             ).all()
 
     filtered_states_entity_ids = {
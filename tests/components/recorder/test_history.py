@@ -9,6 +9,7 @@ from unittest.mock import patch, sentinel
 
 import pytest
 from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
 
 from homeassistant.components import recorder
 from homeassistant.components.recorder import history
@@ -17,8 +18,10 @@ from homeassistant.components.recorder.db_schema import (
     RecorderRuns,
     StateAttributes,
     States,
+    StatesMeta,
 )
 from homeassistant.components.recorder.models import LazyState, process_timestamp
+from homeassistant.components.recorder.tasks import PurgeEntitiesTask
 from homeassistant.components.recorder.util import session_scope
 import homeassistant.core as ha
 from homeassistant.core import HomeAssistant, State
@@ -71,16 +74,16 @@ def _add_db_entries(
                     event_type="state_changed",
                     event_data="{}",
                     origin="LOCAL",
-                    time_fired=point,
+                    time_fired_ts=dt_util.utc_to_timestamp(point),
                 )
             )
             session.add(
                 States(
-                    entity_id=entity_id,
+                    states_meta_rel=StatesMeta(entity_id=entity_id),
                     state="on",
                     attributes='{"name":"the light"}',
-                    last_changed=None,
-                    last_updated=point,
+                    last_changed_ts=None,
+                    last_updated_ts=dt_util.utc_to_timestamp(point),
                     event_id=1001 + idx,
                     attributes_id=1002 + idx,
                 )
@@ -449,6 +452,178 @@ def test_get_significant_states_with_initial(hass_recorder):
     assert states == hist
 
 
+def test_get_significant_state_rows_with_session(hass_recorder):
+    """Test the state rows match the significant states."""
+    hass = hass_recorder()
+    zero, four, _ = record_states(hass)
+    one_and_half = zero + timedelta(seconds=1.5)
+    entity_ids = ["media_player.test", "thermostat.test", "zone.home"]
+
+    with session_scope(hass=hass) as session:
+        hist = history.get_full_significant_states_with_session(
+            hass, session, one_and_half, four, entity_ids
+        )
+        rows = history.get_significant_state_rows_with_session(
+            hass, session, one_and_half, four, entity_ids
+        )
+
+    assert rows.keys() == hist.keys()
+    for entity_id, (initial_row, entity_rows) in rows.items():
+        states = hist[entity_id]
+        if initial_row is not None:
+            assert states[0].last_updated == one_and_half
+            assert states[0].state == initial_row.state
+            states = states[1:]
+        assert [state.state for state in states] == [row.state for row in entity_rows]
+        assert [state.last_updated.timestamp() for state in states] == [
+            row.last_updated_ts for row in entity_rows
+        ]
+
+
+def _as_dicts(hist):
+    """Return the history with every state as a dict."""
+    return {
+        entity_id: [
+            state if isinstance(state, dict) else state.as_dict() for state in states
+        ]
+        for entity_id, states in hist.items()
+    }
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {},
+        {"significant_changes_only": False},
+        {"minimal_response": True},
+        {"no_attributes": True},
+        {"include_start_time_state": False},
+        {"compressed_state_format": True},
+    ],
+)
+def test_get_significant_states_from_history_cache(hass_recorder, kwargs):
+    """Test the history cache returns the same states as the database."""
+    hass = hass_recorder({"history_cache_hours": 1})
+    zero, four, _ = record_states(hass)
+    instance = recorder.get_instance(hass)
+    assert instance.history_cache is not None
+    one_and_half = zero + timedelta(seconds=1.5)
+    three_and_half = zero + timedelta(seconds=3.5)
+    entity_ids = [
+        "media_player.test",
+        "media_player.test2",
+        "thermostat.test",
+        "thermostat.test2",
+        "script.can_cancel_this_one",
+        "zone.home",
+        "light.never_recorded",
+    ]
+
+    # Entirely before, partly inside and entirely inside of the cache
+    for start_time in (zero, one_and_half, three_and_half):
+        for query_entity_ids in (entity_ids, ["media_player.test"]):
+            for end_time in (four, None):
+                with session_scope(hass=hass) as session:
+                    cached = history.get_significant_states_with_session(
+                        hass, session, start_time, end_time, query_entity_ids, **kwargs
+                    )
+                with session_scope(hass=hass) as session, patch.object(
+                    instance, "history_cache", None
+                ):
+                    uncached = history.get_significant_states_with_session(
+                        hass, session, start_time, end_time, query_entity_ids, **kwargs
+                    )
+                assert _as_dicts(cached) == _as_dicts(uncached)
+
+
+def test_history_cache_avoids_database(hass_recorder):
+    """Test the database is not queried when all entities are cached."""
+    hass = hass_recorder({"history_cache_hours": 1})
+    zero, four, states = record_states(hass)
+    three_and_half = zero + timedelta(seconds=3.5)
+    entity_ids = ["media_player.test", "thermostat.test"]
+
+    with session_scope(hass=hass) as session, patch.object(
+        history,
+        "execute_stmt_lambda_element",
+        wraps=history.execute_stmt_lambda_element,
+    ) as execute_mock:
+        hist = history.get_significant_states_with_session(
+            hass, session, three_and_half, four, entity_ids
+        )
+        assert execute_mock.call_count == 0
+        history.get_significant_states_with_session(
+            hass, session, zero, four, entity_ids
+        )
+        assert execute_mock.call_count == 2
+
+    assert [state.state for state in hist["media_player.test"]] == ["Netflix"]
+    assert hist["thermostat.test"][0].last_updated == three_and_half
+
+
+def test_history_cache_is_cleared(hass_recorder):
+    """Test the cache is emptied when the states it holds are not in the database."""
+    hass = hass_recorder({"history_cache_hours": 1})
+    instance = recorder.get_instance(hass)
+    zero, four, _ = record_states(hass)
+    cache = instance.history_cache
+    one_and_half = zero + timedelta(seconds=1.5)
+
+    def _uncached_entity_ids(entity_ids):
+        return cache.get_history(
+            entity_ids, one_and_half.timestamp(), None, set(), True, False
+        ).uncached_entity_ids
+
+    assert _uncached_entity_ids(["media_player.test"]) == []
+    instance.queue_task(
+        PurgeEntitiesTask(lambda entity_id: entity_id == "media_player.test")
+    )
+    wait_recording_done(hass)
+    assert _uncached_entity_ids(["media_player.test", "thermostat.test"]) == [
+        "media_player.test"
+    ]
+
+    cache.purge(four.timestamp())
+    assert _uncached_entity_ids(["thermostat.test"]) == ["thermostat.test"]
+
+    hass.states.set("thermostat.test", 25)
+    wait_recording_done(hass)
+    instance.set_enable(False)
+    assert _uncached_entity_ids(["thermostat.test"]) == ["thermostat.test"]
+
+
+def test_history_cache_skips_rolled_back_states(hass_recorder):
+    """Test states are only cached once they are committed."""
+    hass = hass_recorder({"history_cache_hours": 1})
+    instance = recorder.get_instance(hass)
+
+    def _cached_states():
+        cached = instance.history_cache.get_history(
+            ["sensor.power"], 0, None, set(), False, False
+        )
+        return [row.state for row in cached.rows["sensor.power"]]
+
+    hass.states.set("sensor.power", "1")
+    wait_recording_done(hass)
+
+    with patch.object(instance, "db_max_retries", 1), patch.object(
+        instance.event_session,
+        "commit",
+        side_effect=OperationalError("commit", "fake params", "forced to fail"),
+    ):
+        hass.states.set("sensor.power", "2")
+        wait_recording_done(hass)
+
+    assert _cached_states() == ["1"]
+
+    hass.states.set("sensor.power", "3")
+    wait_recording_done(hass)
+
+    assert _cached_states() == ["1", "3"]
+    with session_scope(hass=hass) as session:
+        assert [state.state for state in session.query(States)] == ["1", "3"]
+
+
 def test_get_significant_states_without_initial(hass_recorder):
     """Test that only significant states are returned.
 
@@ -893,13 +1068,14 @@ async def test_get_full_significant_states_handles_empty_last_changed(
     db_sensor_one_states = await recorder.get_instance(hass).async_add_executor_job(
         _fetch_db_states
     )
-    assert db_sensor_one_states[0].last_changed is None
+    assert db_sensor_one_states[0].last_changed_ts is None
+    assert db_sensor_one_states[1].last_changed_ts == state0.last_changed.timestamp()
+    assert db_sensor_one_states[0].last_updated_ts is not None
+    assert db_sensor_one_states[1].last_updated_ts is not None
     assert (
-        process_timestamp(db_sensor_one_states[1].last_changed) == state0.last_changed
+        db_sensor_one_states[0].last_updated_ts
+        != db_sensor_one_states[1].last_updated_ts
     )
-    assert db_sensor_one_states[0].last_updated is not None
-    assert db_sensor_one_states[1].last_updated is not None
-    assert db_sensor_one_states[0].last_updated != db_sensor_one_states[1].last_updated
 
 
 def test_state_changes_during_period_multiple_entities_single_test(hass_recorder):
@@ -0,0 +1,41 @@
+"""Test the recorder history cache."""
+from homeassistant.components.recorder.history_cache import CachedStateRow, HistoryCache
+
+
+def _row(state: str, last_updated_ts: float) -> CachedStateRow:
+    return CachedStateRow("sensor.test", state, None, last_updated_ts, None, "{}")
+
+
+def test_rows_are_trimmed_to_the_window():
+    """Test the oldest row is kept while it is the state at the window start."""
+    cache = HistoryCache(10)
+    for state, last_updated_ts in (("1", 100), ("2", 105), ("3", 112)):
+        cache.add(_row(state, last_updated_ts))
+
+    cached = cache.get_history(["sensor.test"], 103, None, set(), False, False)
+    assert cached.initial_rows["sensor.test"].state == "1"
+    assert [row.state for row in cached.rows["sensor.test"]] == ["2", "3"]
+
+    cache.add(_row("4", 116))
+    cached = cache.get_history(["sensor.test"], 103, None, set(), False, False)
+    assert cached.stitched_entity_ids == ["sensor.test"]
+    assert cached.stitch_before == 105
+    assert [row.state for row in cached.rows["sensor.test"]] == ["2", "3", "4"]
+
+    cache.expire(200)
+    cached = cache.get_history(["sensor.test"], 150, None, set(), False, False)
+    assert cached.initial_rows["sensor.test"].state == "4"
+    assert cached.rows["sensor.test"] == []
+
+
+def test_rows_per_entity_are_bounded():
+    """Test the oldest rows are dropped when an entity has too many rows."""
+    cache = HistoryCache(3600, max_rows_per_entity=2)
+    for state, last_updated_ts in (("1", 100), ("2", 101), ("3", 102)):
+        cache.add(_row(state, last_updated_ts))
+
+    cached = cache.get_history(["sensor.test"], 100.5, 101, set(), False, False)
+    assert cached.uncached_entity_ids == ["sensor.test"]
+    cached = cache.get_history(["sensor.test"], 101.5, None, set(), False, False)
+    assert cached.initial_rows["sensor.test"].state == "2"
+    assert [row.state for row in cached.rows["sensor.test"]] == ["3"]
@@ -37,9 +37,11 @@ from homeassistant.components.recorder.db_schema import (
     SCHEMA_VERSION,
     EventData,
     Events,
+    EventTypes,
     RecorderRuns,
     StateAttributes,
     States,
+    StatesMeta,
     StatisticsRuns,
 )
 from homeassistant.components.recorder.models import process_timestamp
@@ -412,7 +414,8 @@ def test_saving_event(hass, hass_recorder):
     with session_scope(hass=hass) as session:
         for select_event, event_data in (
             session.query(Events, EventData)
-            .filter_by(event_type=event_type)
+            .outerjoin(EventTypes, Events.event_type_id == EventTypes.event_type_id)
+            .filter(EventTypes.event_type == event_type)
             .outerjoin(EventData, Events.data_id == EventData.data_id)
         ):
             select_event = cast(Events, select_event)
@@ -647,11 +650,11 @@ def test_saving_state_and_removing_entity(hass, hass_recorder):
     with session_scope(hass=hass) as session:
         states = list(session.query(States))
         assert len(states) == 3
-        assert states[0].entity_id == entity_id
+        assert states[0].states_meta_rel.entity_id == entity_id
         assert states[0].state == STATE_LOCKED
-        assert states[1].entity_id == entity_id
+        assert states[1].states_meta_rel.entity_id == entity_id
         assert states[1].state == STATE_UNLOCKED
-        assert states[2].entity_id == entity_id
+        assert states[2].states_meta_rel.entity_id == entity_id
         assert states[2].state is None
 
 
@@ -1112,6 +1115,57 @@ def test_compile_missing_statistics(tmpdir, freezer):
     hass.stop()
 
 
+def test_saving_state_shares_states_meta(hass_recorder):
+    """Test states of the same entity share a single states_meta row."""
+    hass = hass_recorder()
+
+    hass.states.set("test.one", "on", {})
+    hass.states.set("test.two", "on", {})
+    wait_recording_done(hass)
+    hass.states.set("test.one", "off", {})
+    hass.states.set("test.two", "off", {})
+    wait_recording_done(hass)
+
+    with session_scope(hass=hass) as session:
+        states_meta = {
+            meta.entity_id: meta.metadata_id for meta in session.query(StatesMeta)
+        }
+        assert set(states_meta) == {"test.one", "test.two"}
+        states = list(session.query(States))
+        assert len(states) == 4
+        for state in states:
+            assert state.entity_id is None
+            assert state.metadata_id == states_meta[state.to_native().entity_id]
+
+
+def test_saving_event_shares_event_types(hass_recorder):
+    """Test events of the same type share a single event_types row."""
+    hass = hass_recorder()
+
+    for _ in range(2):
+        hass.bus.fire("event_one", {})
+        hass.bus.fire("event_two", {"data": 1})
+        wait_recording_done(hass)
+
+    with session_scope(hass=hass) as session:
+        event_types = {
+            event_types.event_type: event_types.event_type_id
+            for event_types in session.query(EventTypes)
+        }
+        assert {"event_one", "event_two"}.issubset(event_types)
+        events = list(
+            session.query(Events).filter(
+                Events.event_type_id.in_(
+                    (event_types["event_one"], event_types["event_two"])
+                )
+            )
+        )
+        assert len(events) == 4
+        for event in events:
+            assert event.event_type is None
+            assert event.event_type_id == event_types[event.to_native().event_type]
+
+
 def test_saving_sets_old_state(hass_recorder):
     """Test saving sets old state."""
     hass = hass_recorder()
@@ -1127,10 +1181,10 @@ def test_saving_sets_old_state(hass_recorder):
         states = list(session.query(States))
         assert len(states) == 4
 
-        assert states[0].entity_id == "test.one"
-        assert states[1].entity_id == "test.two"
-        assert states[2].entity_id == "test.one"
-        assert states[3].entity_id == "test.two"
+        assert states[0].states_meta_rel.entity_id == "test.one"
+        assert states[1].states_meta_rel.entity_id == "test.two"
+        assert states[2].states_meta_rel.entity_id == "test.one"
+        assert states[3].states_meta_rel.entity_id == "test.two"
 
         assert states[0].old_state_id is None
         assert states[1].old_state_id is None
@@ -1138,6 +1192,82 @@ def test_saving_sets_old_state(hass_recorder):
         assert states[3].old_state_id == states[1].state_id
 
 
+def test_saving_with_bulk_insert(hass_recorder):
+    """Test saving states and events with bulk inserts."""
+    hass = hass_recorder({"bulk_insert": True})
+
+    hass.states.set("test.one", "on", {"attr": 1})
+    hass.states.set("test.one", "off", {"attr": 1})
+    hass.states.set("test.two", "on", {})
+    hass.bus.fire("event_one", {"data": 1})
+    hass.bus.fire("event_one")
+    wait_recording_done(hass)
+    hass.states.set("test.one", "on", {"attr": 2})
+    hass.states.remove("test.two")
+    hass.states.set("test.two", "on", {})
+    hass.bus.fire("event_one", {"data": 1})
+    wait_recording_done(hass)
+
+    with session_scope(hass=hass) as session:
+        states = list(session.query(States).order_by(States.state_id))
+        assert [(state.states_meta_rel.entity_id, state.state) for state in states] == [
+            ("test.one", "on"),
+            ("test.one", "off"),
+            ("test.two", "on"),
+            ("test.one", "on"),
+            ("test.two", None),
+            ("test.two", "on"),
+        ]
+        assert [state.old_state_id for state in states] == [
+            None,
+            states[0].state_id,
+            None,
+            states[1].state_id,
+            states[2].state_id,
+            None,
+        ]
+        assert states[0].attributes_id == states[1].attributes_id
+        assert states[0].attributes_id != states[3].attributes_id
+        assert states[3].state_attributes.to_native() == {"attr": 2}
+
+        events = list(
+            session.query(Events)
+            .outerjoin(EventTypes, Events.event_type_id == EventTypes.event_type_id)
+            .filter(EventTypes.event_type == "event_one")
+            .order_by(Events.event_id)
+        )
+        assert len(events) == 3
+        assert events[0].data_id is not None
+        assert events[1].data_id is None
+        assert events[2].data_id == events[0].data_id
+        assert events[2].event_data_rel.to_native() == {"data": 1}
+
+
+def test_id_caches_are_bounded_and_prewarmed(hass_recorder):
+    """Test the shared attributes cache is bounded, counted and prewarmed."""
+    hass = hass_recorder({"state_attributes_cache_size": 2})
+    instance = get_instance(hass)
+
+    for attr in range(3):
+        hass.states.set("test.one", "on", {"attr": attr})
+        wait_recording_done(hass)
+    hass.states.set("test.two", "on", {"attr": 1})
+    wait_recording_done(hass)
+
+    stats = instance.id_cache_stats["state_attributes"]
+    assert stats["size"] == 2
+    assert stats["max_size"] == 2
+    assert stats["evictions"] == 1
+    assert stats["hits"] >= 1
+
+    instance._state_attributes_ids.clear()
+    instance._prewarm_id_caches()
+    assert set(instance._state_attributes_ids.keys()) == {
+        '{"attr":1}',
+        '{"attr":2}',
+    }
+
+
 def test_saving_state_with_serializable_data(hass_recorder, caplog):
     """Test saving data that cannot be serialized does not crash."""
     hass = hass_recorder()
@@ -1154,8 +1284,8 @@ def test_saving_state_with_serializable_data(hass_recorder, caplog):
         states = list(session.query(States))
         assert len(states) == 2
 
-        assert states[0].entity_id == "test.two"
-        assert states[1].entity_id == "test.two"
+        assert states[0].states_meta_rel.entity_id == "test.two"
+        assert states[1].states_meta_rel.entity_id == "test.two"
         assert states[0].old_state_id is None
         assert states[1].old_state_id == states[0].state_id
 
@@ -1203,7 +1333,11 @@ def test_service_disable_events_not_recording(hass, hass_recorder):
     event = events[0]
 
     with session_scope(hass=hass) as session:
-        db_events = list(session.query(Events).filter_by(event_type=event_type))
+        db_events = list(
+            session.query(Events)
+            .outerjoin(EventTypes, Events.event_type_id == EventTypes.event_type_id)
+            .filter(EventTypes.event_type == event_type)
+        )
         assert len(db_events) == 0
 
     assert hass.services.call(
@@ -1225,7 +1359,8 @@ def test_service_disable_events_not_recording(hass, hass_recorder):
     with session_scope(hass=hass) as session:
         for select_event, event_data in (
             session.query(Events, EventData)
-            .filter_by(event_type=event_type)
+            .outerjoin(EventTypes, Events.event_type_id == EventTypes.event_type_id)
+            .filter(EventTypes.event_type == event_type)
             .outerjoin(EventData, Events.data_id == EventData.data_id)
         ):
             select_event = cast(Events, select_event)
@@ -1419,7 +1554,11 @@ def test_entity_id_filter(hass_recorder):
         wait_recording_done(hass)
 
         with session_scope(hass=hass) as session:
-            db_events = list(session.query(Events).filter_by(event_type="hello"))
+            db_events = list(
+                session.query(Events)
+                .outerjoin(EventTypes, Events.event_type_id == EventTypes.event_type_id)
+                .filter(EventTypes.event_type == "hello")
+            )
             assert len(db_events) == idx + 1, data
 
     for data in (
@@ -1430,7 +1569,11 @@ def test_entity_id_filter(hass_recorder):
         wait_recording_done(hass)
 
         with session_scope(hass=hass) as session:
-            db_events = list(session.query(Events).filter_by(event_type="hello"))
+            db_events = list(
+                session.query(Events)
+                .outerjoin(EventTypes, Events.event_type_id == EventTypes.event_type_id)
+                .filter(EventTypes.event_type == "hello")
+            )
             # Keep referring idx + 1, as no new events are being added
             assert len(db_events) == idx + 1, data
 
@@ -1451,7 +1594,11 @@ async def test_database_lock_and_unlock(
 
     def _get_db_events():
         with session_scope(hass=hass) as session:
-            return list(session.query(Events).filter_by(event_type=event_type))
+            return list(
+                session.query(Events)
+                .outerjoin(EventTypes, Events.event_type_id == EventTypes.event_type_id)
+                .filter(EventTypes.event_type == event_type)
+            )
 
     instance = get_instance(hass)
 
@@ -1493,7 +1640,11 @@ async def test_database_lock_and_overflow(
 
     def _get_db_events():
         with session_scope(hass=hass) as session:
-            return list(session.query(Events).filter_by(event_type=event_type))
+            return list(
+                session.query(Events)
+                .outerjoin(EventTypes, Events.event_type_id == EventTypes.event_type_id)
+                .filter(EventTypes.event_type == event_type)
+            )
 
     instance = get_instance(hass)
 
@@ -1619,7 +1770,8 @@ def test_deduplication_event_data_inside_commit_interval(hass_recorder, caplog):
     with session_scope(hass=hass) as session:
         events = list(
             session.query(Events)
-            .filter(Events.event_type == "this_event")
+            .outerjoin(EventTypes, Events.event_type_id == EventTypes.event_type_id)
+            .filter(EventTypes.event_type == "this_event")
             .outerjoin(EventData, (Events.data_id == EventData.data_id))
         )
         assert len(events) == 20
@@ -1654,7 +1806,8 @@ def test_deduplication_state_attributes_inside_commit_interval(hass_recorder, ca
     with session_scope(hass=hass) as session:
         states = list(
             session.query(States)
-            .filter(States.entity_id == entity_id)
+            .outerjoin(StatesMeta, States.metadata_id == StatesMeta.metadata_id)
+            .filter(StatesMeta.entity_id == entity_id)
             .outerjoin(
                 StateAttributes, (States.attributes_id == StateAttributes.attributes_id)
             )
@@ -1678,7 +1831,11 @@ async def test_async_block_till_done(async_setup_recorder_instance, hass):
 
     def _fetch_states():
         with session_scope(hass=hass) as session:
-            return list(session.query(States).filter(States.entity_id == entity_id))
+            return list(
+                session.query(States)
+                .outerjoin(StatesMeta, States.metadata_id == StatesMeta.metadata_id)
+                .filter(StatesMeta.entity_id == entity_id)
+            )
 
     await async_block_recorder(hass, 0.1)
     await instance.async_block_till_done()
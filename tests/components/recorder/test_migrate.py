@@ -15,7 +15,7 @@ from sqlalchemy.exc import (
     OperationalError,
     ProgrammingError,
 )
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, scoped_session, sessionmaker
 from sqlalchemy.pool import StaticPool
 
 from homeassistant.bootstrap import async_setup_component
@@ -23,8 +23,11 @@ from homeassistant.components import persistent_notification as pn, recorder
 from homeassistant.components.recorder import db_schema, migration
 from homeassistant.components.recorder.db_schema import (
     SCHEMA_VERSION,
+    Events,
+    EventTypes,
     RecorderRuns,
     States,
+    StatesMeta,
 )
 from homeassistant.components.recorder.util import session_scope
 from homeassistant.helpers import recorder as recorder_helper
@@ -41,7 +44,9 @@ def _get_native_states(hass, entity_id):
     with session_scope(hass=hass) as session:
         return [
             state.to_native()
-            for state in session.query(States).filter(States.entity_id == entity_id)
+            for state in session.query(States)
+            .outerjoin(StatesMeta, States.metadata_id == StatesMeta.metadata_id)
+            .filter(StatesMeta.entity_id == entity_id)
         ]
 
 
@@ -395,6 +400,119 @@ def test_modify_column(engine_type, substr):
         assert not connection.execute.called
 
 
+def test_migrate_entity_ids():
+    """Test that entity_ids are moved to the states_meta table."""
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    db_schema.Base.metadata.create_all(engine)
+    session_maker = scoped_session(sessionmaker(bind=engine, future=True))
+    now = dt_util.utcnow()
+    with session_scope(session=session_maker()) as session:
+        session.add(StatesMeta(entity_id="sensor.existing"))
+        session.add_all(
+            States(entity_id=entity_id, state="on", last_updated=now)
+            for entity_id in ("sensor.one", "sensor.two", "sensor.one")
+        )
+        session.add(States(entity_id="sensor.existing", state="on", last_updated=now))
+
+    migration._migrate_entity_ids(session_maker)
+
+    with session_scope(session=session_maker()) as session:
+        assert session.query(States).filter(States.entity_id.is_not(None)).count() == 0
+        assert [
+            (state.metadata_id, state.states_meta_rel.entity_id)
+            for state in session.query(States).order_by(States.state_id)
+        ] == [
+            (2, "sensor.one"),
+            (3, "sensor.two"),
+            (2, "sensor.one"),
+            (1, "sensor.existing"),
+        ]
+        assert session.query(StatesMeta).count() == 3
+
+
+def test_migrate_event_types():
+    """Test that event_types are moved to the event_types table."""
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    db_schema.Base.metadata.create_all(engine)
+    session_maker = scoped_session(sessionmaker(bind=engine, future=True))
+    now = dt_util.utcnow()
+    with session_scope(session=session_maker()) as session:
+        session.add(EventTypes(event_type="event_existing"))
+        session.add_all(
+            Events(event_type=event_type, origin_idx=0, time_fired=now)
+            for event_type in ("event_one", "event_two", "event_one")
+        )
+        session.add(Events(event_type="event_existing", origin_idx=0, time_fired=now))
+
+    migration._migrate_event_types(session_maker)
+
+    with session_scope(session=session_maker()) as session:
+        assert session.query(Events).filter(Events.event_type.is_not(None)).count() == 0
+        assert [
+            (event.event_type_id, event.event_type_rel.event_type)
+            for event in session.query(Events).order_by(Events.event_id)
+        ] == [
+            (2, "event_one"),
+            (3, "event_two"),
+            (2, "event_one"),
+            (1, "event_existing"),
+        ]
+        assert session.query(EventTypes).count() == 3
+
+
+def test_migrate_columns_to_timestamp():
+    """Test that the datetime columns are moved to the timestamp columns."""
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    db_schema.Base.metadata.create_all(engine)
+    session_maker = scoped_session(sessionmaker(bind=engine, future=True))
+    one_second_past = datetime.datetime(
+        2022, 12, 1, 10, 30, 59, 123456, tzinfo=dt_util.UTC
+    )
+    now = datetime.datetime(2022, 12, 1, 10, 31, 0, 654321, tzinfo=dt_util.UTC)
+    with session_scope(session=session_maker()) as session:
+        session.add(Events(event_type="event_one", origin_idx=0, time_fired=now))
+        session.add(
+            States(
+                entity_id="sensor.one",
+                state="on",
+                last_changed=one_second_past,
+                last_updated=now,
+            )
+        )
+        session.add(
+            States(
+                entity_id="sensor.two",
+                state="on",
+                last_changed=None,
+                last_updated=now,
+            )
+        )
+    with session_scope(session=session_maker()) as session:
+        # Rows written before the migration have no timestamps
+        session.execute(text("UPDATE states SET last_updated_ts=NULL"))
+
+    migration._migrate_columns_to_timestamp(session_maker, engine)
+
+    with session_scope(session=session_maker()) as session:
+        event = session.query(Events).one()
+        assert event.time_fired is None
+        assert event.time_fired_ts == pytest.approx(now.timestamp())
+        states = session.query(States).order_by(States.state_id).all()
+        assert [
+            (state.last_updated, state.last_changed, state.last_changed_ts)
+            for state in states
+        ] == [
+            (None, None, pytest.approx(one_second_past.timestamp())),
+            (None, None, None),
+        ]
+        assert [state.last_updated_ts for state in states] == [
+            pytest.approx(now.timestamp()),
+            pytest.approx(now.timestamp()),
+        ]
+        assert states[0].to_native().last_changed == one_second_past
+        assert states[1].to_native().last_changed == now
+
+
 def test_forgiving_add_column():
     """Test that add column will continue if column exists."""
     engine = create_engine("sqlite://", poolclass=StaticPool)
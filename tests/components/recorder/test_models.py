@@ -14,6 +14,7 @@ from homeassistant.components.recorder.db_schema import (
     RecorderRuns,
     StateAttributes,
     States,
+    StatesMeta,
 )
 from homeassistant.components.recorder.models import (
     LazyState,
@@ -58,6 +59,24 @@ def test_from_event_to_db_state_attributes():
     assert StateAttributes.from_event(event).to_native() == attrs
 
 
+def test_shared_attrs_bytes_from_event():
+    """Test the shared attributes reuse the JSON of the state when nothing is excluded."""
+    state = ha.State("sensor.temperature", "18", {"this_attr": True})
+    event = ha.Event(
+        EVENT_STATE_CHANGED,
+        {"entity_id": "sensor.temperature", "old_state": None, "new_state": state},
+        context=state.context,
+    )
+    shared_attrs_bytes = StateAttributes.shared_attrs_bytes_from_event(event, {})
+    assert shared_attrs_bytes is state.attributes_json
+    assert shared_attrs_bytes == b'{"this_attr":true}'
+
+    shared_attrs_bytes = StateAttributes.shared_attrs_bytes_from_event(
+        event, {"sensor": {"this_attr"}}
+    )
+    assert shared_attrs_bytes == b"{}"
+
+
 def test_handling_broken_json_state_attributes(caplog):
     """Test we handle broken json in state attributes."""
     state_attributes = StateAttributes(
@@ -81,8 +100,8 @@ def test_from_event_to_delete_state():
 
     assert db_state.entity_id == "sensor.temperature"
     assert db_state.state == ""
-    assert db_state.last_changed is None
-    assert db_state.last_updated == event.time_fired
+    assert db_state.last_changed_ts is None
+    assert db_state.last_updated_ts == event.time_fired.timestamp()
 
 
 def test_entity_ids():
@@ -117,35 +136,35 @@ def test_entity_ids():
 
     session.add(
         States(
-            entity_id="sensor.temperature",
+            states_meta_rel=StatesMeta(entity_id="sensor.temperature"),
             state="20",
-            last_changed=before_run,
-            last_updated=before_run,
+            last_changed_ts=dt_util.utc_to_timestamp(before_run),
+            last_updated_ts=dt_util.utc_to_timestamp(before_run),
         )
     )
     session.add(
         States(
-            entity_id="sensor.sound",
+            states_meta_rel=StatesMeta(entity_id="sensor.sound"),
             state="10",
-            last_changed=after_run,
-            last_updated=after_run,
+            last_changed_ts=dt_util.utc_to_timestamp(after_run),
+            last_updated_ts=dt_util.utc_to_timestamp(after_run),
         )
     )
 
     session.add(
         States(
-            entity_id="sensor.humidity",
+            states_meta_rel=StatesMeta(entity_id="sensor.humidity"),
             state="76",
-            last_changed=in_run,
-            last_updated=in_run,
+            last_changed_ts=dt_util.utc_to_timestamp(in_run),
+            last_updated_ts=dt_util.utc_to_timestamp(in_run),
         )
     )
     session.add(
         States(
-            entity_id="sensor.lux",
+            states_meta_rel=StatesMeta(entity_id="sensor.lux"),
             state="5",
-            last_changed=in_run3,
-            last_updated=in_run3,
+            last_changed_ts=dt_util.utc_to_timestamp(in_run3),
+            last_updated_ts=dt_util.utc_to_timestamp(in_run3),
         )
     )
 
@@ -272,8 +291,8 @@ async def test_lazy_state_handles_different_last_updated_and_last_changed(caplog
         entity_id="sensor.valid",
         state="off",
         shared_attrs='{"shared":true}',
-        last_updated=now,
-        last_changed=now - timedelta(seconds=60),
+        last_updated_ts=dt_util.utc_to_timestamp(now),
+        last_changed_ts=dt_util.utc_to_timestamp(now - timedelta(seconds=60)),
     )
     lstate = LazyState(row, {})
     assert lstate.as_dict() == {
@@ -283,8 +302,8 @@ async def test_lazy_state_handles_different_last_updated_and_last_changed(caplog
         "last_updated": "2021-06-12T03:04:01.000323+00:00",
         "state": "off",
     }
-    assert lstate.last_updated == row.last_updated
-    assert lstate.last_changed == row.last_changed
+    assert lstate.last_updated.timestamp() == row.last_updated_ts
+    assert lstate.last_changed.timestamp() == row.last_changed_ts
     assert lstate.as_dict() == {
         "attributes": {"shared": True},
         "entity_id": "sensor.valid",
@@ -301,8 +320,8 @@ async def test_lazy_state_handles_same_last_updated_and_last_changed(caplog):
         entity_id="sensor.valid",
         state="off",
         shared_attrs='{"shared":true}',
-        last_updated=now,
-        last_changed=now,
+        last_updated_ts=dt_util.utc_to_timestamp(now),
+        last_changed_ts=dt_util.utc_to_timestamp(now),
     )
     lstate = LazyState(row, {})
     assert lstate.as_dict() == {
@@ -312,8 +331,8 @@ async def test_lazy_state_handles_same_last_updated_and_last_changed(caplog):
         "last_updated": "2021-06-12T03:04:01.000323+00:00",
         "state": "off",
     }
-    assert lstate.last_updated == row.last_updated
-    assert lstate.last_changed == row.last_changed
+    assert lstate.last_updated.timestamp() == row.last_updated_ts
+    assert lstate.last_changed.timestamp() == row.last_changed_ts
     assert lstate.as_dict() == {
         "attributes": {"shared": True},
         "entity_id": "sensor.valid",
@@ -13,18 +13,26 @@ from homeassistant.components.recorder.const import MAX_ROWS_TO_PURGE, Supported
 from homeassistant.components.recorder.db_schema import (
     EventData,
     Events,
+    EventTypes,
     RecorderRuns,
     StateAttributes,
     States,
+    StatesMeta,
     StatisticsRuns,
     StatisticsShortTerm,
 )
-from homeassistant.components.recorder.purge import purge_old_data
+from homeassistant.components.recorder.purge import (
+    CONTINUOUS_PURGE_MAX_BACKLOG,
+    CONTINUOUS_PURGE_TARGET_TIME,
+    DEFAULT_STATES_BATCHES_PER_PURGE,
+    next_continuous_purge_batches,
+    purge_old_data,
+)
 from homeassistant.components.recorder.services import (
     SERVICE_PURGE,
     SERVICE_PURGE_ENTITIES,
 )
-from homeassistant.components.recorder.tasks import PurgeTask
+from homeassistant.components.recorder.tasks import ContinuousPurgeTask, PurgeTask
 from homeassistant.components.recorder.util import session_scope
 from homeassistant.const import EVENT_STATE_CHANGED, EVENT_THEMES_UPDATED, STATE_ON
 from homeassistant.core import HomeAssistant
@@ -460,7 +468,7 @@ async def test_purge_edge_case(
                     event_type="EVENT_TEST_PURGE",
                     event_data="{}",
                     origin="LOCAL",
-                    time_fired=timestamp,
+                    time_fired_ts=dt_util.utc_to_timestamp(timestamp),
                 )
             )
             session.add(
@@ -468,8 +476,8 @@ async def test_purge_edge_case(
                     entity_id="test.recorder2",
                     state="purgeme",
                     attributes="{}",
-                    last_changed=timestamp,
-                    last_updated=timestamp,
+                    last_changed_ts=dt_util.utc_to_timestamp(timestamp),
+                    last_updated_ts=dt_util.utc_to_timestamp(timestamp),
                     event_id=1001,
                     attributes_id=1002,
                 )
@@ -529,7 +537,7 @@ async def test_purge_cutoff_date(
                     event_type="KEEP",
                     event_data="{}",
                     origin="LOCAL",
-                    time_fired=timestamp_keep,
+                    time_fired_ts=dt_util.utc_to_timestamp(timestamp_keep),
                 )
             )
             session.add(
@@ -537,8 +545,8 @@ async def test_purge_cutoff_date(
                     entity_id="test.cutoff",
                     state="keep",
                     attributes="{}",
-                    last_changed=timestamp_keep,
-                    last_updated=timestamp_keep,
+                    last_changed_ts=dt_util.utc_to_timestamp(timestamp_keep),
+                    last_updated_ts=dt_util.utc_to_timestamp(timestamp_keep),
                     event_id=1000,
                     attributes_id=1000,
                 )
@@ -557,7 +565,7 @@ async def test_purge_cutoff_date(
                         event_type="PURGE",
                         event_data="{}",
                         origin="LOCAL",
-                        time_fired=timestamp_purge,
+                        time_fired_ts=dt_util.utc_to_timestamp(timestamp_purge),
                     )
                 )
                 session.add(
@@ -565,8 +573,8 @@ async def test_purge_cutoff_date(
                         entity_id="test.cutoff",
                         state="purge",
                         attributes="{}",
-                        last_changed=timestamp_purge,
-                        last_updated=timestamp_purge,
+                        last_changed_ts=dt_util.utc_to_timestamp(timestamp_purge),
+                        last_updated_ts=dt_util.utc_to_timestamp(timestamp_purge),
                         event_id=1000 + row,
                         attributes_id=1000 + row,
                     )
@@ -690,8 +698,8 @@ async def test_purge_filtered_states(
                     entity_id="sensor.excluded",
                     state="purgeme",
                     attributes="{}",
-                    last_changed=timestamp,
-                    last_updated=timestamp,
+                    last_changed_ts=dt_util.utc_to_timestamp(timestamp),
+                    last_updated_ts=dt_util.utc_to_timestamp(timestamp),
                 )
             )
             # Add states and state_changed events that should be keeped
@@ -716,8 +724,8 @@ async def test_purge_filtered_states(
                 entity_id="sensor.linked_old_state_id",
                 state="keep",
                 attributes="{}",
-                last_changed=timestamp,
-                last_updated=timestamp,
+                last_changed_ts=dt_util.utc_to_timestamp(timestamp),
+                last_updated_ts=dt_util.utc_to_timestamp(timestamp),
                 old_state_id=1,
                 state_attributes=state_attrs,
             )
@@ -726,8 +734,8 @@ async def test_purge_filtered_states(
                 entity_id="sensor.linked_old_state_id",
                 state="keep",
                 attributes="{}",
-                last_changed=timestamp,
-                last_updated=timestamp,
+                last_changed_ts=dt_util.utc_to_timestamp(timestamp),
+                last_updated_ts=dt_util.utc_to_timestamp(timestamp),
                 old_state_id=2,
                 state_attributes=state_attrs,
             )
@@ -735,8 +743,8 @@ async def test_purge_filtered_states(
                 entity_id="sensor.linked_old_state_id",
                 state="keep",
                 attributes="{}",
-                last_changed=timestamp,
-                last_updated=timestamp,
+                last_changed_ts=dt_util.utc_to_timestamp(timestamp),
+                last_updated_ts=dt_util.utc_to_timestamp(timestamp),
                 old_state_id=62,  # keep
                 state_attributes=state_attrs,
             )
@@ -748,9 +756,10 @@ async def test_purge_filtered_states(
                     event_type="EVENT_KEEP",
                     event_data="{}",
                     origin="LOCAL",
-                    time_fired=timestamp,
+                    time_fired_ts=dt_util.utc_to_timestamp(timestamp),
                 )
             )
+            _convert_pending_states_to_meta(session)
 
     service_data = {"keep_days": 10}
     _add_db_entries(hass)
@@ -804,8 +813,10 @@ async def test_purge_filtered_states(
         events_keep = session.query(Events).filter(Events.event_type == "EVENT_KEEP")
         assert events_keep.count() == 1
 
-        states_sensor_excluded = session.query(States).filter(
-            States.entity_id == "sensor.excluded"
+        states_sensor_excluded = (
+            session.query(States)
+            .outerjoin(StatesMeta, States.metadata_id == StatesMeta.metadata_id)
+            .filter(StatesMeta.entity_id == "sensor.excluded")
         )
         assert states_sensor_excluded.count() == 0
 
@@ -869,6 +880,7 @@ async def test_purge_filtered_states_to_empty(
                         timestamp,
                         event_id * days,
                     )
+            _convert_pending_states_to_meta(session)
 
     service_data = {"keep_days": 10}
     _add_db_entries(hass)
@@ -920,8 +932,8 @@ async def test_purge_without_state_attributes_filtered_states_to_empty(
                     entity_id="sensor.old_format",
                     state=STATE_ON,
                     attributes=json.dumps({"old": "not_using_state_attributes"}),
-                    last_changed=timestamp,
-                    last_updated=timestamp,
+                    last_changed_ts=dt_util.utc_to_timestamp(timestamp),
+                    last_updated_ts=dt_util.utc_to_timestamp(timestamp),
                     event_id=event_id,
                     state_attributes=None,
                 )
@@ -932,7 +944,7 @@ async def test_purge_without_state_attributes_filtered_states_to_empty(
                     event_type=EVENT_STATE_CHANGED,
                     event_data="{}",
                     origin="LOCAL",
-                    time_fired=timestamp,
+                    time_fired_ts=dt_util.utc_to_timestamp(timestamp),
                 )
             )
             session.add(
@@ -941,9 +953,10 @@ async def test_purge_without_state_attributes_filtered_states_to_empty(
                     event_type=EVENT_THEMES_UPDATED,
                     event_data="{}",
                     origin="LOCAL",
-                    time_fired=timestamp,
+                    time_fired_ts=dt_util.utc_to_timestamp(timestamp),
                 )
             )
+            _convert_pending_states_to_meta(session)
 
     service_data = {"keep_days": 10}
     _add_db_entries(hass)
@@ -993,7 +1006,7 @@ async def test_purge_filtered_events(
                             event_type="EVENT_PURGE",
                             event_data="{}",
                             origin="LOCAL",
-                            time_fired=timestamp,
+                            time_fired_ts=dt_util.utc_to_timestamp(timestamp),
                         )
                     )
 
@@ -1007,14 +1020,21 @@ async def test_purge_filtered_events(
                     timestamp,
                     event_id,
                 )
+            _convert_pending_events_to_event_types(session)
 
     service_data = {"keep_days": 10}
     _add_db_entries(hass)
 
     with session_scope(hass=hass) as session:
-        events_purge = session.query(Events).filter(Events.event_type == "EVENT_PURGE")
-        events_keep = session.query(Events).filter(
-            Events.event_type == EVENT_STATE_CHANGED
+        events_purge = (
+            session.query(Events)
+            .outerjoin(EventTypes, Events.event_type_id == EventTypes.event_type_id)
+            .filter(EventTypes.event_type == "EVENT_PURGE")
+        )
+        events_keep = (
+            session.query(Events)
+            .outerjoin(EventTypes, Events.event_type_id == EventTypes.event_type_id)
+            .filter(EventTypes.event_type == EVENT_STATE_CHANGED)
         )
         states = session.query(States)
 
@@ -1030,9 +1050,15 @@ async def test_purge_filtered_events(
     await async_wait_purge_done(hass)
 
     with session_scope(hass=hass) as session:
-        events_purge = session.query(Events).filter(Events.event_type == "EVENT_PURGE")
-        events_keep = session.query(Events).filter(
-            Events.event_type == EVENT_STATE_CHANGED
+        events_purge = (
+            session.query(Events)
+            .outerjoin(EventTypes, Events.event_type_id == EventTypes.event_type_id)
+            .filter(EventTypes.event_type == "EVENT_PURGE")
+        )
+        events_keep = (
+            session.query(Events)
+            .outerjoin(EventTypes, Events.event_type_id == EventTypes.event_type_id)
+            .filter(EventTypes.event_type == EVENT_STATE_CHANGED)
         )
         states = session.query(States)
         assert events_purge.count() == 60
@@ -1051,9 +1077,15 @@ async def test_purge_filtered_events(
     await async_wait_purge_done(hass)
 
     with session_scope(hass=hass) as session:
-        events_purge = session.query(Events).filter(Events.event_type == "EVENT_PURGE")
-        events_keep = session.query(Events).filter(
-            Events.event_type == EVENT_STATE_CHANGED
+        events_purge = (
+            session.query(Events)
+            .outerjoin(EventTypes, Events.event_type_id == EventTypes.event_type_id)
+            .filter(EventTypes.event_type == "EVENT_PURGE")
+        )
+        events_keep = (
+            session.query(Events)
+            .outerjoin(EventTypes, Events.event_type_id == EventTypes.event_type_id)
+            .filter(EventTypes.event_type == EVENT_STATE_CHANGED)
         )
         states = session.query(States)
         assert events_purge.count() == 0
@@ -1093,7 +1125,7 @@ async def test_purge_filtered_events_state_changed(
                         event_type="EVENT_KEEP",
                         event_data="{}",
                         origin="LOCAL",
-                        time_fired=timestamp,
+                        time_fired_ts=dt_util.utc_to_timestamp(timestamp),
                     )
                 )
             # Add states with linked old_state_ids that need to be handled
@@ -1102,8 +1134,8 @@ async def test_purge_filtered_events_state_changed(
                 entity_id="sensor.linked_old_state_id",
                 state="keep",
                 attributes="{}",
-                last_changed=timestamp,
-                last_updated=timestamp,
+                last_changed_ts=dt_util.utc_to_timestamp(timestamp),
+                last_updated_ts=dt_util.utc_to_timestamp(timestamp),
                 old_state_id=1,
             )
             timestamp = dt_util.utcnow() - timedelta(days=4)
@@ -1111,27 +1143,34 @@ async def test_purge_filtered_events_state_changed(
                 entity_id="sensor.linked_old_state_id",
                 state="keep",
                 attributes="{}",
-                last_changed=timestamp,
-                last_updated=timestamp,
+                last_changed_ts=dt_util.utc_to_timestamp(timestamp),
+                last_updated_ts=dt_util.utc_to_timestamp(timestamp),
                 old_state_id=2,
             )
             state_3 = States(
                 entity_id="sensor.linked_old_state_id",
                 state="keep",
                 attributes="{}",
-                last_changed=timestamp,
-                last_updated=timestamp,
+                last_changed_ts=dt_util.utc_to_timestamp(timestamp),
+                last_updated_ts=dt_util.utc_to_timestamp(timestamp),
                 old_state_id=62,  # keep
             )
             session.add_all((state_1, state_2, state_3))
+            _convert_pending_events_to_event_types(session)
 
     service_data = {"keep_days": 10, "apply_filter": True}
     _add_db_entries(hass)
 
     with session_scope(hass=hass) as session:
-        events_keep = session.query(Events).filter(Events.event_type == "EVENT_KEEP")
-        events_purge = session.query(Events).filter(
-            Events.event_type == EVENT_STATE_CHANGED
+        events_keep = (
+            session.query(Events)
+            .outerjoin(EventTypes, Events.event_type_id == EventTypes.event_type_id)
+            .filter(EventTypes.event_type == "EVENT_KEEP")
+        )
+        events_purge = (
+            session.query(Events)
+            .outerjoin(EventTypes, Events.event_type_id == EventTypes.event_type_id)
+            .filter(EventTypes.event_type == EVENT_STATE_CHANGED)
         )
         states = session.query(States)
 
@@ -1149,9 +1188,15 @@ async def test_purge_filtered_events_state_changed(
     await async_wait_purge_done(hass)
 
     with session_scope(hass=hass) as session:
-        events_keep = session.query(Events).filter(Events.event_type == "EVENT_KEEP")
-        events_purge = session.query(Events).filter(
-            Events.event_type == EVENT_STATE_CHANGED
+        events_keep = (
+            session.query(Events)
+            .outerjoin(EventTypes, Events.event_type_id == EventTypes.event_type_id)
+            .filter(EventTypes.event_type == "EVENT_KEEP")
+        )
+        events_purge = (
+            session.query(Events)
+            .outerjoin(EventTypes, Events.event_type_id == EventTypes.event_type_id)
+            .filter(EventTypes.event_type == EVENT_STATE_CHANGED)
         )
         states = session.query(States)
 
@@ -1216,6 +1261,7 @@ async def test_purge_entities(
                         timestamp,
                         event_id * days,
                     )
+            _convert_pending_states_to_meta(session)
 
     def _add_keep_records(hass: HomeAssistant) -> None:
         with session_scope(hass=hass) as session:
@@ -1229,6 +1275,7 @@ async def test_purge_entities(
                     timestamp,
                     event_id,
                 )
+            _convert_pending_states_to_meta(session)
 
     _add_purge_records(hass)
     _add_keep_records(hass)
@@ -1244,8 +1291,10 @@ async def test_purge_entities(
         states = session.query(States)
         assert states.count() == 10
 
-        states_sensor_kept = session.query(States).filter(
-            States.entity_id == "sensor.keep"
+        states_sensor_kept = (
+            session.query(States)
+            .outerjoin(StatesMeta, States.metadata_id == StatesMeta.metadata_id)
+            .filter(StatesMeta.entity_id == "sensor.keep")
         )
         assert states_sensor_kept.count() == 10
 
@@ -1274,8 +1323,10 @@ async def test_purge_entities(
         states = session.query(States)
         assert states.count() == 10
 
-        states_sensor_kept = session.query(States).filter(
-            States.entity_id == "sensor.keep"
+        states_sensor_kept = (
+            session.query(States)
+            .outerjoin(StatesMeta, States.metadata_id == StatesMeta.metadata_id)
+            .filter(StatesMeta.entity_id == "sensor.keep")
         )
         assert states_sensor_kept.count() == 10
 
@@ -1355,7 +1406,7 @@ async def _add_test_events(hass: HomeAssistant, iterations: int = 1):
                         event_type=event_type,
                         event_data=json.dumps(event_data),
                         origin="LOCAL",
-                        time_fired=timestamp,
+                        time_fired_ts=dt_util.utc_to_timestamp(timestamp),
                     )
                 )
 
@@ -1392,7 +1443,7 @@ async def _add_events_with_event_data(hass: HomeAssistant, iterations: int = 1):
                     Events(
                         event_type=event_type,
                         origin="LOCAL",
-                        time_fired=timestamp,
+                        time_fired_ts=dt_util.utc_to_timestamp(timestamp),
                         event_data_rel=event_data,
                     )
                 )
@@ -1494,8 +1545,8 @@ def _add_state_without_event_linkage(
             entity_id=entity_id,
             state=state,
             attributes=None,
-            last_changed=timestamp,
-            last_updated=timestamp,
+            last_changed_ts=dt_util.utc_to_timestamp(timestamp),
+            last_updated_ts=dt_util.utc_to_timestamp(timestamp),
             event_id=None,
             state_attributes=state_attrs,
         )
@@ -1519,8 +1570,8 @@ def _add_state_and_state_changed_event(
             entity_id=entity_id,
             state=state,
             attributes=None,
-            last_changed=timestamp,
-            last_updated=timestamp,
+            last_changed_ts=dt_util.utc_to_timestamp(timestamp),
+            last_updated_ts=dt_util.utc_to_timestamp(timestamp),
             event_id=event_id,
             state_attributes=state_attrs,
         )
@@ -1531,11 +1582,41 @@ def _add_state_and_state_changed_event(
             event_type=EVENT_STATE_CHANGED,
             event_data="{}",
             origin="LOCAL",
-            time_fired=timestamp,
+            time_fired_ts=dt_util.utc_to_timestamp(timestamp),
         )
     )
 
 
+def _convert_pending_states_to_meta(session: Session) -> None:
+    """Convert pending states to use states_meta."""
+    states_meta_objects: dict[str, StatesMeta] = {}
+    with session.no_autoflush:
+        for state in [obj for obj in session.new if isinstance(obj, States)]:
+            if (entity_id := state.entity_id) is None:
+                continue
+            state.entity_id = None
+            if entity_id not in states_meta_objects:
+                states_meta_objects[entity_id] = session.query(StatesMeta).filter(
+                    StatesMeta.entity_id == entity_id
+                ).one_or_none() or StatesMeta(entity_id=entity_id)
+            state.states_meta_rel = states_meta_objects[entity_id]
+
+
+def _convert_pending_events_to_event_types(session: Session) -> None:
+    """Convert pending events to use event_types."""
+    event_types_objects: dict[str, EventTypes] = {}
+    with session.no_autoflush:
+        for event in [obj for obj in session.new if isinstance(obj, Events)]:
+            if (event_type := event.event_type) is None:
+                continue
+            event.event_type = None
+            if event_type not in event_types_objects:
+                event_types_objects[event_type] = session.query(EventTypes).filter(
+                    EventTypes.event_type == event_type
+                ).one_or_none() or EventTypes(event_type=event_type)
+            event.event_type_rel = event_types_objects[event_type]
+
+
 async def test_purge_many_old_events(
     async_setup_recorder_instance: SetupRecorderInstanceT, hass: HomeAssistant
 ):
@@ -1589,6 +1670,102 @@ async def test_purge_many_old_events(
         assert event_datas.count() == 0
 
 
+async def test_continuous_purge(
+    async_setup_recorder_instance: SetupRecorderInstanceT, hass: HomeAssistant
+):
+    """Test continuous purge removes old events in bounded slices."""
+    instance = await async_setup_recorder_instance(hass, {"purge_keep_days": 4})
+
+    await _add_test_events(hass, MAX_ROWS_TO_PURGE)
+
+    def _count_events() -> int:
+        with session_scope(hass=hass) as session:
+            return (
+                session.query(Events)
+                .filter(Events.event_type.like("EVENT_TEST%"))
+                .count()
+            )
+
+    assert _count_events() == MAX_ROWS_TO_PURGE * 6
+
+    assert instance.continuous_purge_batches == 1
+    with patch(
+        "homeassistant.components.recorder.purge.CONTINUOUS_PURGE_TARGET_TIME", 60
+    ):
+        instance.queue_task(ContinuousPurgeTask())
+        await async_recorder_block_till_done(hass)
+    assert _count_events() == MAX_ROWS_TO_PURGE * 5
+    assert instance.continuous_purge_idle_until == 0
+    assert instance.continuous_purge_batches == 2
+
+    for _ in range(5):
+        instance.queue_task(ContinuousPurgeTask())
+        await async_recorder_block_till_done(hass)
+        if instance.continuous_purge_idle_until:
+            break
+
+    assert _count_events() == MAX_ROWS_TO_PURGE * 2
+    assert instance.continuous_purge_idle_until > 0
+
+
+async def test_continuous_purge_is_skipped_when_busy(
+    async_setup_recorder_instance: SetupRecorderInstanceT, hass: HomeAssistant
+):
+    """Test continuous purge slices are only queued when the recorder is idle."""
+    instance = await async_setup_recorder_instance(hass)
+    now = dt_util.utcnow()
+
+    with patch.object(instance, "queue_task") as queue_task, patch(
+        "homeassistant.components.recorder.core.Recorder.backlog",
+        CONTINUOUS_PURGE_MAX_BACKLOG + 1,
+    ):
+        instance._async_continuous_purge(now)
+    assert not queue_task.called
+
+    with patch.object(instance, "queue_task") as queue_task:
+        instance._async_continuous_purge(now)
+        instance._async_continuous_purge(now)
+    assert queue_task.call_count == 1
+    assert instance.continuous_purge_queued
+
+    await async_recorder_block_till_done(hass)
+    instance.continuous_purge_queued = False
+    instance.continuous_purge_idle_until = float("inf")
+    with patch.object(instance, "queue_task") as queue_task:
+        instance._async_continuous_purge(now)
+    assert not queue_task.called
+
+
+@pytest.mark.parametrize("continuous_purge", [True, False])
+async def test_continuous_purge_listener(
+    async_setup_recorder_instance: SetupRecorderInstanceT,
+    hass: HomeAssistant,
+    continuous_purge: bool,
+):
+    """Test continuous purge slices are only scheduled when enabled."""
+    instance = await async_setup_recorder_instance(
+        hass, {"continuous_purge": continuous_purge}
+    )
+    assert (instance._continuous_purge_listener is not None) is continuous_purge
+
+
+@pytest.mark.parametrize(
+    "batches,elapsed,backlog,expected",
+    [
+        (1, 0, 0, 2),
+        (4, 0, CONTINUOUS_PURGE_MAX_BACKLOG // 2, 4),
+        (4, CONTINUOUS_PURGE_TARGET_TIME * 0.75, 0, 4),
+        (4, CONTINUOUS_PURGE_TARGET_TIME * 2, 0, 2),
+        (4, 0, CONTINUOUS_PURGE_MAX_BACKLOG + 1, 2),
+        (1, CONTINUOUS_PURGE_TARGET_TIME * 2, 0, 1),
+        (DEFAULT_STATES_BATCHES_PER_PURGE, 0, 0, DEFAULT_STATES_BATCHES_PER_PURGE),
+    ],
+)
+def test_next_continuous_purge_batches(batches, elapsed, backlog, expected):
+    """Test continuous purge slices adapt to the slice time and backlog."""
+    assert next_continuous_purge_batches(batches, elapsed, backlog) == expected
+
+
 async def test_purge_can_mix_legacy_and_new_format(
     async_setup_recorder_instance: SetupRecorderInstanceT, hass: HomeAssistant
 ):
@@ -1600,8 +1777,8 @@ async def test_purge_can_mix_legacy_and_new_format(
         broken_state_no_time = States(
             event_id=None,
             entity_id="orphened.state",
-            last_updated=None,
-            last_changed=None,
+            last_updated_ts=None,
+            last_changed_ts=None,
         )
         session.add(broken_state_no_time)
         start_id = 50000
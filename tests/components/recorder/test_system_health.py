@@ -30,6 +30,8 @@ async def test_recorder_system_health(recorder_mock, hass, recorder_db_url):
         "estimated_db_size": ANY,
         "database_engine": SupportedDialect.SQLITE.value,
         "database_version": ANY,
+        "state_attributes_cache": ANY,
+        "event_data_cache": ANY,
     }
 
 
@@ -54,6 +56,8 @@ async def test_recorder_system_health_alternate_dbms(recorder_mock, hass, dialec
         "estimated_db_size": "1.00 MiB",
         "database_engine": dialect_name.value,
         "database_version": ANY,
+        "state_attributes_cache": ANY,
+        "event_data_cache": ANY,
     }
 
 
@@ -85,6 +89,8 @@ async def test_recorder_system_health_db_url_missing_host(
         "estimated_db_size": "1.00 MiB",
         "database_engine": dialect_name.value,
         "database_version": ANY,
+        "state_attributes_cache": ANY,
+        "event_data_cache": ANY,
     }
 
 
@@ -109,4 +115,6 @@ async def test_recorder_system_health_crashed_recorder_runs_table(
         "estimated_db_size": ANY,
         "database_engine": SupportedDialect.SQLITE.value,
         "database_version": ANY,
+        "state_attributes_cache": ANY,
+        "event_data_cache": ANY,
     }
@@ -0,0 +1,108 @@
+"""Test the recorder telemetry."""
+from unittest.mock import patch
+
+from homeassistant.components.recorder.telemetry import (
+    DurationHistogram,
+    RecorderTelemetry,
+)
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.entity import EntityCategory
+from homeassistant.setup import async_setup_component
+
+from .common import async_wait_recording_done
+
+from tests.common import SetupRecorderInstanceT
+
+
+def test_duration_histogram():
+    """Test durations are counted in cumulative buckets."""
+    histogram = DurationHistogram((0.1, 1))
+    assert histogram.as_dict() == {
+        "count": 0,
+        "sum": 0.0,
+        "last": None,
+        "max": 0.0,
+        "buckets": {"0.1": 0, "1": 0, "+Inf": 0},
+    }
+
+    for duration in (0.05, 0.1, 0.5, 5):
+        histogram.record(duration)
+
+    assert histogram.as_dict() == {
+        "count": 4,
+        "sum": 5.65,
+        "last": 5,
+        "max": 5,
+        "buckets": {"0.1": 2, "1": 3, "+Inf": 4},
+    }
+
+
+def test_rates():
+    """Test the written rows per second are averaged over the window."""
+    telemetry = RecorderTelemetry()
+    assert telemetry.rates() == (0.0, 0.0)
+
+    with patch(
+        "homeassistant.components.recorder.telemetry.time.monotonic",
+        return_value=100,
+    ):
+        telemetry.record_commit(0.01, 5, 10)
+    with patch(
+        "homeassistant.components.recorder.telemetry.time.monotonic",
+        return_value=110,
+    ):
+        telemetry.record_commit(0.01, 20, 30)
+        assert telemetry.rates() == (2.0, 3.0)
+    with patch(
+        "homeassistant.components.recorder.telemetry.time.monotonic",
+        return_value=200,
+    ):
+        telemetry.record_commit(0.01, 0, 0)
+        # Samples older than the window are dropped
+        assert telemetry.rates() == (0.0, 0.0)
+
+    assert telemetry.events_written == 25
+    assert telemetry.states_written == 40
+    assert telemetry.commit_duration.count == 3
+
+
+async def test_recorder_telemetry(
+    async_setup_recorder_instance: SetupRecorderInstanceT, hass: HomeAssistant
+):
+    """Test the recorder counts the written rows and the lookups."""
+    instance = await async_setup_recorder_instance(hass)
+    telemetry = instance.telemetry
+    events_written = telemetry.events_written
+    shared_data_lookups = telemetry.shared_data_lookups
+
+    hass.states.async_set("test.one", "on", {"attr": 1})
+    hass.states.async_set("test.two", "on", {"attr": 1})
+    hass.bus.async_fire("test_event", {"data": 1})
+    await async_wait_recording_done(hass)
+
+    assert telemetry.states_written == 2
+    assert telemetry.events_written == events_written + 1
+    assert telemetry.commit_duration.count > 0
+    assert telemetry.shared_attributes_lookups == 1
+    assert telemetry.shared_attributes_lookup_hits == 0
+    assert telemetry.shared_data_lookups == shared_data_lookups + 1
+    assert telemetry.shared_data_lookup_hits == 0
+
+
+async def test_telemetry_sensors(
+    async_setup_recorder_instance: SetupRecorderInstanceT, hass: HomeAssistant
+):
+    """Test the optional diagnostic sensors."""
+    await async_setup_recorder_instance(hass, {"telemetry_sensors": True})
+    assert await async_setup_component(hass, "sensor", {})
+    await hass.async_block_till_done()
+
+    state = hass.states.get("sensor.recorder_backlog")
+    assert state is not None
+    assert int(state.state) >= 0
+    assert hass.states.get("sensor.recorder_commit_duration") is not None
+
+    entity_registry = er.async_get(hass)
+    entry = entity_registry.async_get("sensor.recorder_states_written")
+    assert entry.entity_category is EntityCategory.DIAGNOSTIC
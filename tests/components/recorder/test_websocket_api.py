@@ -2033,12 +2033,65 @@ async def test_recorder_info(recorder_mock, hass, hass_ws_client):
     assert response["success"]
     assert response["result"] == {
         "backlog": 0,
+        "id_caches": ANY,
         "max_backlog": 40000,
         "migration_in_progress": False,
         "migration_is_live": False,
         "recording": True,
         "thread_running": True,
     }
+    assert set(response["result"]["id_caches"]) == {
+        "event_data",
+        "event_types",
+        "state_attributes",
+        "states_meta",
+    }
+    assert response["result"]["id_caches"]["state_attributes"] == {
+        "size": ANY,
+        "max_size": 2048,
+        "hits": ANY,
+        "misses": ANY,
+        "evictions": 0,
+    }
+
+
+async def test_recorder_telemetry(recorder_mock, hass, hass_ws_client):
+    """Test getting the recorder performance counters."""
+    client = await hass_ws_client()
+
+    hass.states.async_set("test.one", "on")
+    await async_wait_recording_done(hass)
+
+    await client.send_json({"id": 1, "type": "recorder/telemetry"})
+    response = await client.receive_json()
+    assert response["success"]
+    result = response["result"]
+    assert result["backlog"] == 0
+    assert result["max_backlog"] == 40000
+    assert result["states_written"] == 1
+    assert result["events_written"] > 0
+    assert result["events_per_second"] >= 0
+    assert result["commit_duration"]["count"] > 0
+    assert (
+        result["commit_duration"]["buckets"]["+Inf"]
+        == result["commit_duration"]["count"]
+    )
+    assert result["purge_duration"]["last"] is None
+    assert set(result) == {
+        "backlog",
+        "max_backlog",
+        "events_written",
+        "states_written",
+        "events_per_second",
+        "states_per_second",
+        "shared_attributes_lookups",
+        "shared_attributes_lookup_hits",
+        "shared_data_lookups",
+        "shared_data_lookup_hits",
+        "commit_duration",
+        "purge_duration",
+        "statistics_duration",
+    }
 
 
 async def test_recorder_info_no_recorder(hass, hass_ws_client):
@@ -26,7 +26,11 @@ from homeassistant.components.recorder.statistics import (
     list_statistic_ids,
 )
 from homeassistant.components.recorder.util import get_instance, session_scope
-from homeassistant.components.sensor import ATTR_OPTIONS, DOMAIN
+from homeassistant.components.sensor import (
+    ATTR_OPTIONS,
+    DOMAIN,
+    recorder as sensor_recorder,
+)
 from homeassistant.const import ATTR_FRIENDLY_NAME, STATE_UNAVAILABLE
 from homeassistant.core import HomeAssistant, State
 from homeassistant.setup import async_setup_component, setup_component
@@ -4351,3 +4355,56 @@ async def test_exclude_attributes(recorder_mock: None, hass: HomeAssistant) -> N
     for state in states:
         assert ATTR_OPTIONS not in state.attributes
         assert ATTR_FRIENDLY_NAME in state.attributes
+
+
+@pytest.mark.parametrize(
+    "timestamp",
+    [
+        0.0,
+        0.0000005,
+        0.0000015,
+        1670000000.000001,
+        1670000000.1234565,
+        1670000000.9999996,
+        1674568713.339178,
+        -1.5,
+    ],
+)
+def test_timestamp_to_microseconds(timestamp):
+    """Test timestamps are rounded to microseconds like datetimes."""
+    assert sensor_recorder._timestamp_to_microseconds(
+        timestamp
+    ) == sensor_recorder._datetime_to_microseconds(
+        dt_util.utc_from_timestamp(timestamp)
+    )
+
+
+def test_time_weighted_average_matches_datetime_durations():
+    """Test the time weighted average is the same as with datetime durations."""
+    start = dt_util.parse_datetime("2023-01-24 10:05:00.000000+00:00")
+    end = start + timedelta(minutes=5)
+    last_updated = [
+        start - timedelta(minutes=7, microseconds=3),
+        start + timedelta(seconds=13, microseconds=333333),
+        start + timedelta(seconds=97, microseconds=1),
+        start + timedelta(seconds=299, microseconds=999999),
+    ]
+    fvalues = [21.3, 0.1, 1e-7, 8765.4321]
+
+    accumulated = 0.0
+    period_start = start
+    for index, (fvalue, updated) in enumerate(zip(fvalues, last_updated)):
+        value_start = max(start, updated)
+        value_end = last_updated[index + 1] if index + 1 < len(fvalues) else end
+        accumulated += fvalue * (value_end - value_start).total_seconds()
+    expected = accumulated / (end - period_start).total_seconds()
+
+    assert (
+        sensor_recorder._time_weighted_average(
+            fvalues,
+            [sensor_recorder._datetime_to_microseconds(dt) for dt in last_updated],
+            sensor_recorder._datetime_to_microseconds(start),
+            sensor_recorder._datetime_to_microseconds(end),
+        )
+        == expected
+    )
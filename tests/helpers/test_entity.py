@@ -9,15 +9,19 @@ from unittest.mock import MagicMock, PropertyMock, patch
 import pytest
 import voluptuous as vol
 
+from homeassistant.config import DATA_CUSTOMIZE
 from homeassistant.const import (
     ATTR_ATTRIBUTION,
     ATTR_DEVICE_CLASS,
     ATTR_FRIENDLY_NAME,
+    ATTR_ICON,
     STATE_UNAVAILABLE,
     STATE_UNKNOWN,
 )
 from homeassistant.core import Context, HomeAssistantError
 from homeassistant.helpers import device_registry as dr, entity, entity_registry as er
+from homeassistant.helpers.entity_values import EntityValues
+from homeassistant.util.read_only_dict import ReadOnlyDict
 
 from tests.common import (
     MockConfigEntry,
@@ -114,11 +118,9 @@ class TestHelpersEntity:
         """Test device class attribute."""
         state = self.hass.states.get(self.entity.entity_id)
         assert state.attributes.get(ATTR_DEVICE_CLASS) is None
-        with patch(
-            "homeassistant.helpers.entity.Entity.device_class", new="test_class"
-        ):
-            self.entity.schedule_update_ha_state()
-            self.hass.block_till_done()
+        self.entity._attr_device_class = "test_class"
+        self.entity.schedule_update_ha_state()
+        self.hass.block_till_done()
         state = self.hass.states.get(self.entity.entity_id)
         assert state.attributes.get(ATTR_DEVICE_CLASS) == "test_class"
 
@@ -196,6 +198,32 @@ async def test_warn_slow_device_update_disabled(hass, caplog):
         assert update_call
 
 
+async def test_update_runs_in_platform_pool(hass):
+    """Test limited updates of polled entities run in a pool of their platform."""
+    threads = []
+
+    def update():
+        """Mock update."""
+        threads.append(threading.current_thread().name)
+
+    mock_entity = entity.Entity()
+    mock_entity.hass = hass
+    mock_entity.entity_id = "comp_test.test_entity"
+    mock_entity.platform = MagicMock(
+        domain="sensor", platform_name="comp_test", parallel_updates_limit=3
+    )
+    mock_entity.update = update
+
+    await mock_entity.async_device_update(warning=False)
+    assert threads[0].startswith("SyncWorker_sensor.comp_test")
+    assert hass.async_get_executor_pool("sensor.comp_test")._max_workers == 3
+
+    # Unlimited updates run in the default executor
+    mock_entity.platform.parallel_updates_limit = None
+    await mock_entity.async_device_update(warning=False)
+    assert not threads[1].startswith("SyncWorker_sensor.comp_test")
+
+
 async def test_async_schedule_update_ha_state(hass):
     """Warn we log when entity update takes a long time and trow exception."""
     update_call = False
@@ -936,6 +964,220 @@ async def test_friendly_name(
     assert state.attributes.get(ATTR_FRIENDLY_NAME) == expected_friendly_name
 
 
+async def test_static_attributes_are_cached(hass):
+    """Test the static attributes are cached until their inputs change."""
+
+    class DynamicIconEntity(entity.Entity):
+        """An entity with an icon that depends on its state."""
+
+        _attr_name = "Static"
+
+        @property
+        def icon(self):
+            """Return the icon."""
+            return f"mdi:{self.state}"
+
+    ent = DynamicIconEntity()
+    ent.hass = hass
+    ent.entity_id = "test.static"
+    ent._attr_attribution = "Home Assistant"
+    ent.async_write_ha_state()
+    static_attributes = ent._static_attributes
+    assert static_attributes == {
+        ATTR_ATTRIBUTION: "Home Assistant",
+        ATTR_FRIENDLY_NAME: "Static",
+    }
+
+    ent._attr_state = "dynamic"
+    ent.async_write_ha_state()
+    assert ent._static_attributes is static_attributes
+    state = hass.states.get("test.static")
+    assert state.attributes[ATTR_ICON] == "mdi:dynamic"
+
+    ent._attr_name = "Changed"
+    ent.async_write_ha_state()
+    assert hass.states.get("test.static").attributes[ATTR_FRIENDLY_NAME] == "Changed"
+
+    hass.data[DATA_CUSTOMIZE] = EntityValues({"test.static": {"custom": "value"}})
+    ent.async_write_ha_state()
+    assert hass.states.get("test.static").attributes["custom"] == "value"
+
+
+async def test_cached_attributes_keep_order(hass):
+    """Test the state attributes keep their order with a dynamic property."""
+
+    class DynamicIconEntity(entity.Entity):
+        """An entity with an icon that depends on its state."""
+
+        _attr_attribution = "Home Assistant"
+        _attr_device_class = "door"
+        _attr_name = "Ordered"
+        _attr_supported_features = 1
+
+        @property
+        def icon(self):
+            """Return the icon."""
+            return f"mdi:{self.state}"
+
+    ent = DynamicIconEntity()
+    ent.hass = hass
+    ent.entity_id = "test.ordered"
+    ent.async_write_ha_state()
+    assert list(hass.states.get("test.ordered").attributes) == [
+        ATTR_ATTRIBUTION,
+        ATTR_DEVICE_CLASS,
+        ATTR_ICON,
+        ATTR_FRIENDLY_NAME,
+        "supported_features",
+    ]
+
+
+async def test_cached_attributes_inputs(hass):
+    """Test setting an input of the cached attributes invalidates them."""
+
+    class IconMixin:
+        """A mixin setting an icon."""
+
+        _attr_icon = "mdi:mixin"
+
+    class MixinEntity(IconMixin, entity.Entity):
+        """An entity with an icon from a mixin."""
+
+    ent = MixinEntity()
+    ent.hass = hass
+    ent.entity_id = "test.mixin"
+    ent.async_write_ha_state()
+    assert hass.states.get("test.mixin").attributes[ATTR_ICON] == "mdi:mixin"
+    assert not hasattr(ent, "_attr_name")
+
+    ent._attr_icon = "mdi:changed"
+    ent.async_write_ha_state()
+    assert hass.states.get("test.mixin").attributes[ATTR_ICON] == "mdi:changed"
+
+    ent.registry_entry = er.RegistryEntry(
+        entity_id="test.mixin",
+        unique_id="mixin",
+        platform="test",
+        icon="mdi:registry",
+    )
+    ent.async_write_ha_state()
+    assert hass.states.get("test.mixin").attributes[ATTR_ICON] == "mdi:registry"
+
+    # Other attributes do not invalidate them
+    static_attributes = ent._static_attributes
+    ent._attr_state = "changed"
+    ent.async_write_ha_state()
+    assert ent._static_attributes is static_attributes
+
+
+async def test_unchanged_attributes_are_reused(hass):
+    """Test unchanged attribute inputs reuse the attributes without comparing."""
+    extra_state_attributes = ReadOnlyDict({"large": list(range(100))})
+
+    class ReadOnlyAttributesEntity(entity.Entity):
+        """An entity with read only extra state attributes."""
+
+        _attr_name = "Reused"
+
+        @property
+        def extra_state_attributes(self):
+            """Return the extra state attributes."""
+            return extra_state_attributes
+
+    ent = ReadOnlyAttributesEntity()
+    ent.hass = hass
+    ent.entity_id = "test.reused"
+    ent._attr_state = "on"
+    ent.async_write_ha_state()
+    attributes = hass.states.get("test.reused").attributes
+    assert attributes == {"large": list(range(100)), ATTR_FRIENDLY_NAME: "Reused"}
+
+    comparisons = []
+
+    def counting_eq(self, other):
+        comparisons.append(other)
+        return dict.__eq__(self, other)
+
+    with patch.object(ReadOnlyDict, "__eq__", counting_eq):
+        ent._attr_state = "off"
+        ent.async_write_ha_state()
+        assert not comparisons
+
+        state = hass.states.get("test.reused")
+        assert state.state == "off"
+        assert state.attributes is attributes
+
+        # Other inputs are only compared by the state machine
+        extra_state_attributes = ReadOnlyDict(extra_state_attributes)
+        ent.async_write_ha_state()
+        assert len(comparisons) == 1
+        assert ent._last_attributes is not attributes
+
+    # A mutable mapping may have been changed in place
+    ent._attr_extra_state_attributes = {"mutable": 1}
+    del ReadOnlyAttributesEntity.extra_state_attributes
+    ent.async_write_ha_state()
+    ent._attr_extra_state_attributes["mutable"] = 2
+    ent.async_write_ha_state()
+    assert hass.states.get("test.reused").attributes["mutable"] == 2
+
+
+async def test_friendly_name_follows_device_name(hass):
+    """Test the cached friendly name is updated when the device is renamed."""
+
+    async def async_setup_entry(hass, config_entry, async_add_entities):
+        """Mock setup entry method."""
+        ent = entity.Entity()
+        ent._attr_unique_id = "qwer"
+        ent._attr_device_info = {
+            "identifiers": {("hue", "1234")},
+            "name": "Device Bla",
+        }
+        ent._attr_has_entity_name = True
+        ent._attr_name = "Entity Blu"
+        async_add_entities([ent])
+        return True
+
+    platform = MockPlatform(async_setup_entry=async_setup_entry)
+    config_entry = MockConfigEntry(entry_id="super-mock-id")
+    entity_platform = MockEntityPlatform(
+        hass, platform_name=config_entry.domain, platform=platform
+    )
+
+    assert await entity_platform.async_setup_entry(config_entry)
+    await hass.async_block_till_done()
+
+    state = hass.states.async_all()[0]
+    assert state.attributes[ATTR_FRIENDLY_NAME] == "Device Bla Entity Blu"
+    ent = entity_platform.entities[state.entity_id]
+
+    device_registry = dr.async_get(hass)
+    device = device_registry.async_get_device({("hue", "1234")})
+    device_registry.async_update_device(device.id, name_by_user="Device Blo")
+    await hass.async_block_till_done()
+    ent.async_write_ha_state()
+
+    state = hass.states.get(state.entity_id)
+    assert state.attributes[ATTR_FRIENDLY_NAME] == "Device Blo Entity Blu"
+
+
+async def test_no_op_state_writes_are_counted(hass):
+    """Test state writes that change nothing are counted by integration."""
+    platform = MockEntityPlatform(hass, platform_name="chatty")
+    ent = entity.Entity()
+    ent.entity_id = "test.chatty"
+    await platform.async_add_entities([ent])
+    assert entity.no_op_state_writes(hass)["chatty"] == 0
+
+    ent.async_write_ha_state()
+    ent.async_write_ha_state()
+    assert entity.no_op_state_writes(hass)["chatty"] == 2
+
+    ent._attr_state = "changed"
+    ent.async_write_ha_state()
+    assert entity.no_op_state_writes(hass)["chatty"] == 2
+
+
 async def test_translation_key(hass):
     """Test translation key property."""
     mock_entity1 = entity.Entity()
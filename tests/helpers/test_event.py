@@ -2,6 +2,7 @@
 # pylint: disable=protected-access
 import asyncio
 from datetime import date, datetime, timedelta
+import time
 from unittest.mock import patch
 
 from astral import LocationInfo
@@ -15,12 +16,17 @@ from homeassistant.const import MATCH_ALL
 import homeassistant.core as ha
 from homeassistant.core import callback
 from homeassistant.exceptions import TemplateError
+from homeassistant.helpers import template as template_helper
+from homeassistant.helpers.device_registry import EVENT_DEVICE_REGISTRY_UPDATED
 from homeassistant.helpers.entity_registry import EVENT_ENTITY_REGISTRY_UPDATED
 from homeassistant.helpers.event import (
+    TRACK_TIMER_WHEEL,
     TrackStates,
     TrackTemplate,
     TrackTemplateResult,
     async_call_later,
+    async_get_pending_timers,
+    async_track_device_registry_updated_event,
     async_track_entity_registry_updated_event,
     async_track_point_in_time,
     async_track_point_in_utc_time,
@@ -43,7 +49,7 @@ from homeassistant.helpers.template import Template, result_as_boolean
 from homeassistant.setup import async_setup_component
 import homeassistant.util.dt as dt_util
 
-from tests.common import async_fire_time_changed
+from tests.common import async_fire_time_changed, async_fire_time_changed_exact
 
 DEFAULT_TIME_ZONE = dt_util.DEFAULT_TIME_ZONE
 
@@ -123,6 +129,131 @@ async def test_track_point_in_time_drift_rearm(hass):
     assert len(specific_runs) == 1
 
 
+async def test_track_point_in_time_shares_loop_timer(hass):
+    """Test coalesced listeners for points in time share one event loop timer."""
+    point = (dt_util.utcnow() + timedelta(hours=1)).replace(microsecond=0)
+    runs = []
+    pending = async_get_pending_timers(hass)
+    handles = [handle for handle in hass.loop._scheduled if not handle.cancelled()]
+
+    for offset in range(10):
+        async_track_point_in_utc_time(
+            hass,
+            callback(lambda x, offset=offset: runs.append(offset)),
+            point + timedelta(seconds=(offset + 1) / 10),
+            coalesce=True,
+        )
+    unsub = async_track_point_in_utc_time(
+        hass,
+        callback(lambda x: runs.append("cancelled")),
+        point + timedelta(seconds=0.5),
+        coalesce=True,
+    )
+    async_track_point_in_utc_time(
+        hass, callback(lambda x: runs.append("later")), point + timedelta(minutes=1)
+    )
+
+    assert async_get_pending_timers(hass) == pending + 12
+    new_handles = [
+        handle
+        for handle in hass.loop._scheduled
+        if not handle.cancelled() and handle not in handles
+    ]
+    # The loop timer is armed for the whole second the listeners are due before
+    assert len(new_handles) == 1
+    assert new_handles[0].when() - hass.loop.time() == pytest.approx(
+        point.timestamp() + 1 - time.time(), abs=0.1
+    )
+
+    unsub()
+    assert async_get_pending_timers(hass) == pending + 11
+
+    async_fire_time_changed_exact(hass, point + timedelta(seconds=0.5))
+    await hass.async_block_till_done()
+    assert runs == [0, 1, 2, 3, 4]
+
+    async_fire_time_changed_exact(hass, point + timedelta(seconds=1))
+    await hass.async_block_till_done()
+    assert runs == list(range(10))
+    assert async_get_pending_timers(hass) == pending + 1
+
+    async_fire_time_changed(hass, point + timedelta(minutes=1))
+    await hass.async_block_till_done()
+    assert runs == [*range(10), "later"]
+    assert async_get_pending_timers(hass) == pending
+
+
+async def test_track_point_in_time_runs_on_time(hass):
+    """Test listeners that do not coalesce are armed for their own time."""
+    point = dt_util.utcnow().replace(microsecond=0) + timedelta(hours=1, seconds=0.3)
+    runs = []
+    pending = async_get_pending_timers(hass)
+    handles = [handle for handle in hass.loop._scheduled if not handle.cancelled()]
+
+    async_track_point_in_utc_time(hass, callback(lambda x: runs.append(x)), point)
+    assert async_get_pending_timers(hass) == pending + 1
+    wheel = hass.data[TRACK_TIMER_WHEEL]
+    new_handles = [
+        handle
+        for handle in hass.loop._scheduled
+        if not handle.cancelled()
+        and handle not in handles
+        and handle._callback == wheel._async_run_timer
+    ]
+    assert len(new_handles) == 1
+    # Not armed for the end of the slot, 0.7 seconds later
+    assert new_handles[0].when() - hass.loop.time() == pytest.approx(
+        point.timestamp() - time.time(), abs=0.3
+    )
+
+    # Runs before the end of its slot
+    async_fire_time_changed_exact(hass, point + timedelta(seconds=0.1))
+    await hass.async_block_till_done()
+    assert runs == [point]
+    assert async_get_pending_timers(hass) == pending
+
+
+async def test_track_point_in_time_rescheduled(hass):
+    """Test listeners rescheduled over and over do not pile up in their slot."""
+    point = (dt_util.utcnow() + timedelta(hours=1)).replace(microsecond=0)
+    runs = []
+    pending = async_get_pending_timers(hass)
+
+    unsub = async_track_point_in_utc_time(
+        hass, callback(lambda x: runs.append(x)), point
+    )
+    for _ in range(100):
+        unsub()
+        unsub = async_track_point_in_utc_time(
+            hass, callback(lambda x: runs.append(x)), point
+        )
+
+    wheel = hass.data[TRACK_TIMER_WHEEL]
+    assert len(wheel._slots[int(point.timestamp())].timers) <= 2
+    assert async_get_pending_timers(hass) == pending + 1
+
+    async_fire_time_changed(hass, point)
+    await hass.async_block_till_done()
+    assert runs == [point]
+
+
+async def test_track_point_in_time_soon(hass):
+    """Test listeners due in less than a second are counted as pending."""
+    runs = []
+    pending = async_get_pending_timers(hass)
+
+    unsub = async_call_later(hass, 0.1, callback(lambda x: runs.append(x)))
+    async_call_later(hass, 0.1, callback(lambda x: runs.append(x)))
+    assert async_get_pending_timers(hass) == pending + 2
+
+    unsub()
+    assert async_get_pending_timers(hass) == pending + 1
+
+    await asyncio.sleep(0.2)
+    assert len(runs) == 1
+    assert async_get_pending_timers(hass) == pending
+
+
 async def test_track_state_change_from_to_state_match(hass):
     """Test track_state_change with from and to state matchers."""
     from_and_to_state_runs = []
@@ -2206,6 +2337,177 @@ async def test_track_template_result_errors(hass, caplog):
         assert isinstance(not_exist_runs[2][3], TemplateError)
 
 
+async def test_track_template_result_error_tracks_static_dependencies(hass):
+    """Test a template that fails to render only tracks the states it reads."""
+    hass.states.async_set("sensor.power", "unavailable")
+    template_power = Template("{{ states('sensor.power') | float > 100 }}", hass)
+    runs = []
+
+    @ha.callback
+    def listener(event, updates):
+        runs.append(updates.pop().result)
+
+    info = async_track_template_result(
+        hass, [TrackTemplate(template_power, None)], listener
+    )
+    await hass.async_block_till_done()
+    assert info.listeners == {
+        "all": False,
+        "domains": set(),
+        "entities": {"sensor.power"},
+        "time": False,
+    }
+
+    hass.states.async_set("sensor.other", "1")
+    await hass.async_block_till_done()
+    assert runs == []
+
+    hass.states.async_set("sensor.power", "200")
+    await hass.async_block_till_done()
+    assert runs == [True]
+
+
+async def test_track_template_result_refreshes_in_one_pass(hass):
+    """Test the trackers triggered by a state change are refreshed together."""
+    hass.states.async_set("sensor.power", "1")
+    runs = []
+
+    def listener_for(name):
+        @ha.callback
+        def listener(event, updates):
+            runs.append((name, event.data["entity_id"], updates.pop().result))
+
+        return listener
+
+    for name in ("first", "second"):
+        async_track_template_result(
+            hass,
+            [TrackTemplate(Template("{{ states('sensor.power') }}", hass), None)],
+            listener_for(name),
+        )
+
+    with patch(
+        "homeassistant.helpers.template._template_state",
+        wraps=template_helper._template_state,
+    ) as template_state:
+        hass.states.async_set("sensor.power", "2")
+        assert runs == []
+        await hass.async_block_till_done()
+
+    assert runs == [("first", "sensor.power", 2), ("second", "sensor.power", 2)]
+    # The state is looked up once for both templates
+    assert template_state.call_count == 1
+
+
+async def test_track_template_result_renders_once_for_state_changes(hass):
+    """Test a template is rendered once for the state changes of a batch."""
+    hass.states.async_set("sensor.a", "1")
+    hass.states.async_set("sensor.b", "1")
+    runs = []
+
+    @ha.callback
+    def listener(event, updates):
+        runs.append((event.data["entity_id"], updates.pop().result))
+
+    async_track_template_result(
+        hass,
+        [
+            TrackTemplate(
+                Template("{{ states('sensor.a') }} {{ states('sensor.b') }}", hass),
+                None,
+            )
+        ],
+        listener,
+    )
+
+    with patch.object(
+        Template,
+        "async_render_to_info",
+        autospec=True,
+        side_effect=Template.async_render_to_info,
+    ) as render_to_info:
+        hass.states.async_set("sensor.a", "2")
+        hass.states.async_set("sensor.b", "2")
+        await hass.async_block_till_done()
+
+    assert render_to_info.call_count == 1
+    assert runs == [("sensor.b", "2 2")]
+
+
+async def test_track_template_result_removed_before_refresh(hass):
+    """Test a tracker removed before the batch is refreshed does not run."""
+    runs = []
+
+    @ha.callback
+    def listener(event, updates):
+        runs.append(updates.pop().result)
+
+    info = async_track_template_result(
+        hass,
+        [TrackTemplate(Template("{{ states('sensor.power') }}", hass), None)],
+        listener,
+    )
+    hass.states.async_set("sensor.power", "2")
+    info.async_remove()
+    await hass.async_block_till_done()
+    assert runs == []
+
+
+async def test_track_template_result_records_rerender_triggers(hass):
+    """Test what triggered tracked templates to re-render is recorded."""
+    template_refresh = Template(
+        "{{ states('sensor.a') }} {{ states.light | count }}", hass
+    )
+    info = async_track_template_result(
+        hass,
+        [TrackTemplate(template_refresh, None)],
+        ha.callback(lambda event, updates: None),
+    )
+    await hass.async_block_till_done()
+
+    hass.states.async_set("light.b", "on")
+    await hass.async_block_till_done()
+    hass.states.async_set("sensor.a", "1")
+    await hass.async_block_till_done()
+    info.async_refresh()
+
+    [stats] = template_helper.async_get_render_stats(hass)
+    assert stats["renders"] == 4
+    assert stats["rerenders"] == {"domain": 1, "entity": 1, "refresh": 1}
+
+
+async def test_track_template_result_error_follows_group_members(hass):
+    """Test a failing template reading a group follows changes of its members."""
+    hass.states.async_set("sensor.a", "unavailable")
+    hass.states.async_set("sensor.b", "unavailable")
+    hass.states.async_set("group.power", "on", {"entity_id": ["sensor.a"]})
+    template_power = Template(
+        "{{ expand('group.power') | map(attribute='state') | map('float') | sum }}",
+        hass,
+    )
+    runs = []
+
+    @ha.callback
+    def listener(event, updates):
+        runs.append(updates.pop().result)
+
+    info = async_track_template_result(
+        hass, [TrackTemplate(template_power, None)], listener
+    )
+    await hass.async_block_till_done()
+    assert info.listeners["entities"] == {"group.power", "sensor.a"}
+
+    # The group is tracked, so its new members are found when it changes
+    hass.states.async_set("group.power", "on", {"entity_id": ["sensor.a", "sensor.b"]})
+    await hass.async_block_till_done()
+    assert info.listeners["entities"] == {"group.power", "sensor.a", "sensor.b"}
+
+    hass.states.async_set("sensor.a", "1")
+    hass.states.async_set("sensor.b", "2")
+    await hass.async_block_till_done()
+    assert runs[-1] == 3.0
+
+
 async def test_static_string(hass):
     """Test a static string."""
     template_refresh = Template("{{ 'static' }}", hass)
@@ -4376,3 +4678,32 @@ async def test_async_track_entity_registry_updated_event_with_empty_list(hass):
 
     unsub_single2()
     unsub_single()
+
+
+async def test_async_track_device_registry_updated_event(hass):
+    """Test tracking device registry updates for a device_id."""
+    event_data = []
+
+    @ha.callback
+    def run_callback(event):
+        event_data.append(event.data)
+
+    unsub = async_track_device_registry_updated_event(hass, "device_1", run_callback)
+    hass.bus.async_fire(
+        EVENT_DEVICE_REGISTRY_UPDATED,
+        {"action": "update", "device_id": "device_1", "changes": {"name": "Old"}},
+    )
+    hass.bus.async_fire(
+        EVENT_DEVICE_REGISTRY_UPDATED, {"action": "create", "device_id": "device_2"}
+    )
+    await hass.async_block_till_done()
+
+    unsub()
+    hass.bus.async_fire(
+        EVENT_DEVICE_REGISTRY_UPDATED, {"action": "remove", "device_id": "device_1"}
+    )
+    await hass.async_block_till_done()
+
+    assert event_data == [
+        {"action": "update", "device_id": "device_1", "changes": {"name": "Old"}}
+    ]
@@ -0,0 +1,102 @@
+"""Test the event loop monitor."""
+import asyncio
+import time
+
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
+from homeassistant.core import HassJob, callback
+from homeassistant.helpers import loop_monitor
+
+
+def _block_loop(seconds: float) -> None:
+    """Keep the event loop busy."""
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+async def test_loop_monitor(hass):
+    """Test the lag and the slow callbacks are measured."""
+    monitor = loop_monitor.LoopMonitor(
+        hass, slow_callback_threshold=0.02, lag_interval=0.01
+    )
+    monitor.async_start()
+    assert asyncio.Handle._run is not loop_monitor._ORIGINAL_HANDLE_RUN
+
+    await asyncio.sleep(0.02)
+    hass.loop.call_soon(_block_loop, 0.05)
+    await asyncio.sleep(0.05)
+
+    monitor.async_stop()
+    assert asyncio.Handle._run is loop_monitor._ORIGINAL_HANDLE_RUN
+
+    data = monitor.as_dict()
+    assert data["slow_callback_threshold"] == 0.02
+    assert data["lag"]["count"] > 0
+    assert data["lag"]["max"] >= 0.02
+    assert data["integrations"][loop_monitor.CORE] >= 0.05
+    slow_callback = data["slow_callbacks"][0]
+    assert slow_callback["target"] == "_block_loop"
+    assert slow_callback["integration"] is None
+    assert slow_callback["duration"] >= 0.05
+
+
+async def test_records_job_target(hass):
+    """Test the job is recorded when a core handle runs it."""
+    hass.async_batch_callbacks()
+    monitor = loop_monitor.LoopMonitor(hass, slow_callback_threshold=0.02)
+    monitor.async_start()
+
+    hass.async_add_hass_job(HassJob(callback(_block_loop)), 0.1)
+    await asyncio.sleep(0.15)
+    monitor.async_stop()
+
+    [slow_callback] = monitor.as_dict()["slow_callbacks"]
+    assert slow_callback["target"] == "_block_loop"
+
+
+async def test_start_and_stop(hass):
+    """Test there is one monitor that is stopped with Home Assistant."""
+    assert loop_monitor.async_get(hass) is None
+
+    monitor = loop_monitor.async_start(hass, 0.5)
+    assert monitor.slow_callback_threshold == 0.5
+    assert loop_monitor.async_start(hass) is monitor
+    assert loop_monitor.async_get(hass) is monitor
+
+    hass.bus.async_fire(EVENT_HOMEASSISTANT_STOP)
+    await hass.async_block_till_done()
+
+    assert loop_monitor.async_get(hass) is None
+    assert asyncio.Handle._run is loop_monitor._ORIGINAL_HANDLE_RUN
+
+
+async def test_stop_removes_listener(hass):
+    """Test stopping the monitor removes its listener of the stop event."""
+    listeners = hass.bus.async_listeners().get(EVENT_HOMEASSISTANT_STOP, 0)
+
+    for _ in range(3):
+        loop_monitor.async_start(hass)
+        loop_monitor.async_stop(hass)
+
+    assert hass.bus.async_listeners().get(EVENT_HOMEASSISTANT_STOP, 0) == listeners
+
+
+def test_integration_from_filename(hass):
+    """Test files are attributed to integrations."""
+    monitor = loop_monitor.LoopMonitor(hass)
+    assert (
+        monitor._integration_from_filename(
+            "/usr/src/homeassistant/homeassistant/components/hue/light.py"
+        )
+        == "hue"
+    )
+    assert (
+        monitor._integration_from_filename("/config/custom_components/meter/sensor.py")
+        == "meter"
+    )
+    assert (
+        monitor._integration_from_filename(
+            "/usr/src/homeassistant/homeassistant/core.py"
+        )
+        is None
+    )
@@ -3,6 +3,7 @@ from __future__ import annotations
 
 from collections.abc import Iterable
 from datetime import datetime, timedelta
+import gc
 import logging
 import math
 import random
@@ -3663,35 +3664,211 @@ def test_iif(hass: HomeAssistant) -> None:
     assert tpl.async_render() == "no"
 
 
-async def test_cache_garbage_collection() -> None:
-    """Test caching a template."""
+async def test_compiled_template_cache(hass: HomeAssistant) -> None:
+    """Test compiled templates are cached after the templates are gone."""
     template_string = (
         "{% set dict = {'foo': 'x&y', 'bar': 42} %} {{ dict | urlencode }}"
     )
+    tpl = template.Template(template_string, hass)
+    tpl.ensure_valid()
+    key = (tpl._env.compiled_code_id, template_string)
+    assert tpl.async_render() == "foo=x%26y&bar=42"
+    code = template._COMPILED_CODE_CACHE.get(key)
+    assert code is not None
+    stats = template.async_get_template_cache_stats(hass)
+
+    del tpl
+    gc.collect()
+    tpl2 = template.Template(template_string, hass)
+    tpl2.ensure_valid()
+    assert tpl2.async_render() == "foo=x%26y&bar=42"
+    assert template._COMPILED_CODE_CACHE.get(key) is code
+
+    new_stats = template.async_get_template_cache_stats(hass)
+    assert new_stats["compiled"]["misses"] == stats["compiled"]["misses"]
+    assert new_stats["compiled"]["hits"] > stats["compiled"]["hits"]
+    assert new_stats["parsed"]["misses"] == stats["parsed"]["misses"]
+    assert new_stats["parsed"]["hits"] == stats["parsed"]["hits"] + 1
+
+    # Limited templates are bound to their own environment
+    tpl3 = template.Template(template_string, hass)
+    assert tpl3.async_render(limited=True) == "foo=x%26y&bar=42"
+    assert tpl3._compiled is not tpl2._compiled
+    assert template.async_get_template_cache_stats(hass)["parsed_limited"]["size"] == 1
+
+    # Environments with the same options do not share compiled code
+    env = template.TemplateEnvironment(hass)
+    assert env.compile(template_string) is not code
+    assert env.compile(template_string) is env.compile(template_string)
+
+
+@pytest.mark.parametrize(
+    ("template_string", "variables", "entities", "domains", "all_states"),
+    [
+        ("{{ states('sensor.A') }}", {}, {"sensor.a"}, set(), False),
+        (
+            "{{ is_state('light.a', 'on') and state_attr('light.b', 'color') }}",
+            {},
+            {"light.a", "light.b"},
+            set(),
+            False,
+        ),
+        (
+            "{{ 'sensor.a' | states }} {{ 'light.a' is is_state('on') }}",
+            {},
+            {"sensor.a", "light.a"},
+            set(),
+            False,
+        ),
+        (
+            "{{ states.sensor.a.state }} {{ states['light.b'].state }}",
+            {},
+            {"sensor.a", "light.b"},
+            set(),
+            False,
+        ),
+        ("{{ states.sensor | count }}", {}, set(), {"sensor"}, False),
+        (
+            "{% set prefix = 'sensor.' %}{{ states(prefix ~ name) }}",
+            {"name": "b"},
+            {"sensor.b"},
+            set(),
+            False,
+        ),
+        ("{{ states(entities[0]) }}", {"entities": ["sensor.a"]}, None, None, None),
+        ("{{ states | count }}", {}, set(), set(), True),
+        ("{{ states(entity_id) }}", {}, None, None, None),
+        ("{{ states[entity_id] }}", {}, None, None, None),
+        ("{{ states.sensor[entity_id] }}", {}, set(), {"sensor"}, False),
+        (
+            "{% for entity_id in ['sensor.a'] %}{{ states(entity_id) }}{% endfor %}",
+            {},
+            None,
+            None,
+            None,
+        ),
+        ("{{ ['sensor.a'] | map('states') | list }}", {}, None, None, None),
+        ("{{ closest(states.device_tracker) }}", {}, None, None, None),
+        (
+            "{% macro m(e) %}{{ states(e) }}{% endmacro %}{{ m('sensor.a') }}",
+            {},
+            None,
+            None,
+            None,
+        ),
+    ],
+)
+async def test_static_dependencies(
+    hass: HomeAssistant,
+    template_string: str,
+    variables: dict[str, Any],
+    entities: set[str] | None,
+    domains: set[str] | None,
+    all_states: bool | None,
+) -> None:
+    """Test finding the states a template depends on without rendering it."""
+    dependencies = template.Template(template_string, hass).async_static_dependencies(
+        variables
+    )
+    if entities is None:
+        assert dependencies is None
+        return
+    assert dependencies == template.StaticDependencies(
+        frozenset(entities), frozenset(domains), all_states, False
+    )
+
+
+async def test_static_dependencies_expand_and_time(hass: HomeAssistant) -> None:
+    """Test expanded groups and time in the dependencies of a template."""
+    hass.states.async_set("group.outer", "on", {"entity_id": ["group.inner"]})
+    hass.states.async_set("group.inner", "on", {"entity_id": ["light.a", "light.b"]})
+
+    dependencies = template.Template(
+        "{{ expand('group.outer', 'switch.c') | list }} {{ now() }}", hass
+    ).async_static_dependencies()
+    assert dependencies == template.StaticDependencies(
+        frozenset({"group.outer", "group.inner", "light.a", "light.b", "switch.c"}),
+        frozenset(),
+        False,
+        True,
+    )
+
+
+async def test_render_to_info_with_exception_static_dependencies(
+    hass: HomeAssistant,
+) -> None:
+    """Test a failed render tracks the states found without rendering."""
+    hass.states.async_set("sensor.a", "unavailable")
     tpl = template.Template(
-        (template_string),
+        "{{ states('sensor.a') | float > 2 and is_state('light.b', 'on') }}", hass
     )
-    tpl.ensure_valid()
-    assert template._NO_HASS_ENV.template_cache.get(
-        template_string
-    )  # pylint: disable=protected-access
 
-    tpl2 = template.Template(
-        (template_string),
+    info = tpl.async_render_to_info()
+    assert info.exception is not None
+    assert info.static_dependencies is not None
+    assert info.entities == {"sensor.a", "light.b"}
+    assert info.filter("light.b")
+    assert not info.filter("light.c")
+    assert info.rate_limit is None
+
+    info = template.Template(
+        "{{ states(entity_id) | float }}", hass
+    ).async_render_to_info({"entity_id": "sensor.a"})
+    assert info.exception is not None
+    assert info.entities == {"sensor.a"}
+
+    info = template.Template(
+        "{{ states(entity_id) | float }}", hass
+    ).async_render_to_info()
+    assert info.exception is not None
+    assert info.static_dependencies is None
+    assert info.filter("light.c")
+    assert info.rate_limit == template.ALL_STATES_RATE_LIMIT
+
+
+async def test_render_pass(hass: HomeAssistant) -> None:
+    """Test the renders of a pass share the state lookups."""
+    hass.states.async_set("sensor.a", "1")
+    tpl = template.Template(
+        "{{ states.sensor.a.state }} {{ states('sensor.b') }}", hass
     )
-    tpl2.ensure_valid()
-    assert template._NO_HASS_ENV.template_cache.get(
-        template_string
-    )  # pylint: disable=protected-access
 
-    del tpl
-    assert template._NO_HASS_ENV.template_cache.get(
-        template_string
-    )  # pylint: disable=protected-access
-    del tpl2
-    assert not template._NO_HASS_ENV.template_cache.get(
-        template_string
-    )  # pylint: disable=protected-access
+    with template.render_pass(hass), patch(
+        "homeassistant.helpers.template._template_state",
+        wraps=template._template_state,
+    ) as template_state:
+        infos = [tpl.async_render_to_info() for _ in range(3)]
+
+    assert template_state.call_count == 1
+    for info in infos:
+        assert_result_info(info, "1 unknown", ["sensor.a", "sensor.b"])
+
+
+async def test_render_stats(hass: HomeAssistant) -> None:
+    """Test the renders of templates are recorded."""
+    tpl = template.Template("{{ states('sensor.a') | float }}", hass)
+    with pytest.raises(TemplateError):
+        tpl.async_render()
+    hass.states.async_set("sensor.a", "1")
+    assert tpl.async_render() == 1.0
+    tpl.async_record_rerender(template.RERENDER_ENTITY)
+
+    [stats] = template.async_get_render_stats(hass)
+    assert stats["template"] == "{{ states('sensor.a') | float }}"
+    assert stats["renders"] == 2
+    assert stats["errors"] == 1
+    assert stats["max_time"] > 0
+    assert stats["total_time"] >= stats["max_time"]
+    assert stats["rerenders"] == {"entity": 1}
+
+    # Templates with the same source share the statistics
+    template.Template("{{ states('sensor.a') | float }}", hass).async_render()
+    template.Template("{{ 1 + 1 }}", hass).async_render()
+    assert [stats["renders"] for stats in template.async_get_render_stats(hass)] in (
+        [3, 1],
+        [1, 3],
+    )
+    assert len(template.async_get_render_stats(hass, 1)) == 1
 
 
 def test_is_template_string() -> None:
@@ -14,9 +14,14 @@ from homeassistant.const import EVENT_HOMEASSISTANT_STOP
 from homeassistant.core import CoreState
 from homeassistant.exceptions import ConfigEntryNotReady
 from homeassistant.helpers import update_coordinator
+from homeassistant.helpers.event import TRACK_TIMER_WHEEL, async_get_pending_timers
 from homeassistant.util.dt import utcnow
 
-from tests.common import MockConfigEntry, async_fire_time_changed
+from tests.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+    async_fire_time_changed_exact,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -431,3 +436,223 @@ async def test_async_set_update_error(crd, caplog):
     assert crd.last_update_success is False
     assert "Client Failure #2" not in caplog.text
     update_callback.assert_called_once()
+
+
+def _scheduled_timestamps(hass):
+    """Return when the armed refreshes of the polling scheduler fire."""
+    scheduler = update_coordinator.async_get_polling_scheduler(hass)
+    wheel = hass.data[TRACK_TIMER_WHEEL]
+    return sorted(
+        timer.timestamp
+        for slot in wheel._slots.values()
+        for timer in slot.timers
+        if not timer.done
+        and getattr(timer.job.target, "func", None) == scheduler._async_fire
+    )
+
+
+async def test_coordinators_share_slot_timer(hass):
+    """Test coordinators due in the same second share the timer of a slot."""
+    crd1 = get_crd(hass, DEFAULT_UPDATE_INTERVAL)
+    crd2 = get_crd(hass, DEFAULT_UPDATE_INTERVAL)
+    crd2.name = "other"
+    crd2._microsecond = crd1._microsecond + 1
+    pending = async_get_pending_timers(hass)
+
+    now = utcnow().replace(microsecond=0)
+    with patch("homeassistant.helpers.update_coordinator.utcnow", return_value=now):
+        crd1.async_add_listener(lambda: None)
+        crd2.async_add_listener(lambda: None)
+    expected = now.timestamp() + 10 + crd1._microsecond / 1e6
+    assert _scheduled_timestamps(hass) == [
+        pytest.approx(expected, abs=1e-3),
+        pytest.approx(expected + 1e-6, abs=1e-3),
+    ]
+    assert async_get_pending_timers(hass) == pending + 2
+    timer_handles = [
+        handle
+        for handle in hass.loop._scheduled
+        if not handle.cancelled() and handle.when() > hass.loop.time() + 9
+    ]
+    assert len(timer_handles) == 1
+
+    async_fire_time_changed(hass, now + DEFAULT_UPDATE_INTERVAL)
+    await hass.async_block_till_done()
+    assert crd1.data == 1
+    assert crd2.data == 1
+
+    stats = update_coordinator.async_get_polling_scheduler(hass).async_refresh_stats()
+    assert sorted(stat["name"] for stat in stats) == ["other", "test"]
+    assert all(stat["count"] == 1 and stat["failures"] == 0 for stat in stats)
+
+    crd1._unschedule_refresh()
+    assert len(_scheduled_timestamps(hass)) == 1
+    crd2._unschedule_refresh()
+    assert _scheduled_timestamps(hass) == []
+    assert async_get_pending_timers(hass) == pending
+
+
+async def test_update_group_is_refreshed_together(hass):
+    """Test the coordinators of an update group are refreshed one after the other."""
+    refreshing = []
+    refreshed = []
+
+    def get_group_crd(name, update_interval):
+        async def refresh():
+            refreshing.append(name)
+            await asyncio.sleep(0)
+            refreshed.append(name)
+            assert refreshing == refreshed
+
+        return update_coordinator.DataUpdateCoordinator[int](
+            hass,
+            _LOGGER,
+            name=name,
+            update_method=refresh,
+            update_interval=update_interval,
+            update_group="192.168.1.2",
+        )
+
+    crd1 = get_group_crd("first", timedelta(seconds=10))
+    crd2 = get_group_crd("second", timedelta(seconds=15))
+    crd1.async_add_listener(lambda: None)
+    crd2.async_add_listener(lambda: None)
+    assert len(_scheduled_timestamps(hass)) == 1
+
+    async_fire_time_changed(hass, utcnow() + timedelta(seconds=10))
+    await hass.async_block_till_done()
+    assert refreshed == ["first", "second"]
+
+
+async def test_spread_updates(hass):
+    """Test refreshes are aligned to a phase of the update interval."""
+    crd = get_crd(hass, DEFAULT_UPDATE_INTERVAL)
+    crd.spread_updates = True
+
+    with patch("homeassistant.helpers.update_coordinator.uniform", return_value=3.0):
+        crd.async_add_listener(lambda: None)
+    [when] = _scheduled_timestamps(hass)
+    assert when % 10 == pytest.approx(3.0)
+    assert utcnow().timestamp() < when <= utcnow().timestamp() + 10
+
+
+async def test_update_jitter(hass):
+    """Test a random delay is added to the refreshes."""
+    crd = get_crd(hass, DEFAULT_UPDATE_INTERVAL)
+    crd.update_jitter = timedelta(seconds=5)
+
+    now = utcnow().replace(microsecond=0)
+    with patch(
+        "homeassistant.helpers.update_coordinator.utcnow", return_value=now
+    ), patch("homeassistant.helpers.update_coordinator.uniform", return_value=4.0):
+        crd.async_add_listener(lambda: None)
+    assert _scheduled_timestamps(hass) == [
+        pytest.approx(now.timestamp() + 14 + crd._microsecond / 1e6)
+    ]
+
+
+async def test_max_update_backoff(hass):
+    """Test the update interval doubles after each failed refresh."""
+    crd = get_crd(hass, DEFAULT_UPDATE_INTERVAL)
+    crd.max_update_backoff = timedelta(seconds=30)
+    crd._microsecond = 0
+    crd.async_add_listener(lambda: None)
+
+    now = utcnow().replace(microsecond=0)
+    crd.update_method = AsyncMock(side_effect=update_coordinator.UpdateFailed)
+    with patch("homeassistant.helpers.update_coordinator.utcnow", return_value=now):
+        await crd.async_refresh()
+        assert _scheduled_timestamps(hass) == [now.timestamp() + 20]
+        await crd.async_refresh()
+        assert _scheduled_timestamps(hass) == [now.timestamp() + 30]
+
+        crd.update_method = AsyncMock(return_value=1)
+        await crd.async_refresh()
+        assert _scheduled_timestamps(hass) == [now.timestamp() + 10]
+    assert crd.refresh_stats.count == 3
+    assert crd.refresh_stats.failures == 2
+
+
+async def test_slot_refreshes_are_not_early(hass):
+    """Test a slot only refreshes the coordinators that are due."""
+    crd1 = get_crd(hass, DEFAULT_UPDATE_INTERVAL)
+    crd2 = get_crd(hass, DEFAULT_UPDATE_INTERVAL)
+    crd1._microsecond = 100000
+    crd2._microsecond = 400000
+
+    now = utcnow().replace(microsecond=0)
+    with patch("homeassistant.helpers.update_coordinator.utcnow", return_value=now):
+        crd1.async_add_listener(lambda: None)
+        crd2.async_add_listener(lambda: None)
+
+    async_fire_time_changed_exact(hass, now + timedelta(seconds=10.2))
+    await hass.async_block_till_done()
+    assert crd1.data == 1
+    assert crd2.data is None
+
+    async_fire_time_changed_exact(hass, now + timedelta(seconds=10.5))
+    await hass.async_block_till_done()
+    assert crd2.data == 1
+
+    crd1._unschedule_refresh()
+    crd2._unschedule_refresh()
+
+
+async def test_unschedule_keeps_other_refreshes(hass):
+    """Test removing the earliest refresh of a second keeps the others."""
+    crd1 = get_crd(hass, DEFAULT_UPDATE_INTERVAL)
+    crd2 = get_crd(hass, DEFAULT_UPDATE_INTERVAL)
+    crd1._microsecond = 100000
+    crd2._microsecond = 400000
+
+    now = utcnow().replace(microsecond=0)
+    with patch("homeassistant.helpers.update_coordinator.utcnow", return_value=now):
+        crd1.async_add_listener(lambda: None)
+        crd2.async_add_listener(lambda: None)
+    assert _scheduled_timestamps(hass) == [
+        pytest.approx(now.timestamp() + 10.1, abs=1e-3),
+        pytest.approx(now.timestamp() + 10.4, abs=1e-3),
+    ]
+
+    crd1._unschedule_refresh()
+    assert _scheduled_timestamps(hass) == [
+        pytest.approx(now.timestamp() + 10.4, abs=1e-3)
+    ]
+
+    crd2._unschedule_refresh()
+    assert _scheduled_timestamps(hass) == []
+
+
+async def test_max_update_backoff_only_update_failed(hass):
+    """Test other errors than UpdateFailed do not back off."""
+    crd = get_crd(hass, DEFAULT_UPDATE_INTERVAL)
+    crd.max_update_backoff = timedelta(seconds=30)
+    crd._microsecond = 0
+    crd.async_add_listener(lambda: None)
+
+    now = utcnow().replace(microsecond=0)
+    crd.update_method = AsyncMock(side_effect=update_coordinator.UpdateFailed)
+    with patch("homeassistant.helpers.update_coordinator.utcnow", return_value=now):
+        await crd.async_refresh()
+        assert _scheduled_timestamps(hass) == [now.timestamp() + 20]
+
+        crd.update_method = AsyncMock(side_effect=asyncio.TimeoutError)
+        await crd.async_refresh()
+        assert _scheduled_timestamps(hass) == [now.timestamp() + 10]
+    assert crd.last_update_success is False
+    crd._unschedule_refresh()
+
+
+async def test_max_update_backoff_many_failures(hass):
+    """Test the backoff does not overflow after many failed refreshes."""
+    crd = get_crd(hass, DEFAULT_UPDATE_INTERVAL)
+    crd.max_update_backoff = timedelta(minutes=15)
+    crd._microsecond = 0
+    crd._failed_refreshes = 2000
+    crd.async_add_listener(lambda: None)
+
+    now = utcnow().replace(microsecond=0)
+    with patch("homeassistant.helpers.update_coordinator.utcnow", return_value=now):
+        crd._schedule_refresh()
+    assert _scheduled_timestamps(hass) == [now.timestamp() + 900]
+    crd._unschedule_refresh()
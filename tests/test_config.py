@@ -422,6 +422,7 @@ async def test_loading_configuration_from_storage(hass, hass_storage):
     assert len(hass.config.allowlist_external_dirs) == 3
     assert "/etc" in hass.config.allowlist_external_dirs
     assert hass.config.config_source is ConfigSource.STORAGE
+    assert hass._callback_batch is None
 
 
 async def test_loading_configuration_from_storage_with_yaml_only(hass, hass_storage):
@@ -540,6 +541,7 @@ async def test_loading_configuration(hass):
             "internal_url": "http://example.local",
             "media_dirs": {"mymedia": "/usr"},
             "legacy_templates": True,
+            "batch_callbacks": True,
             "currency": "EUR",
             "country": "SE",
             "language": "sv",
@@ -560,6 +562,7 @@ async def test_loading_configuration(hass):
     assert hass.config.media_dirs == {"mymedia": "/usr"}
     assert hass.config.config_source is ConfigSource.YAML
     assert hass.config.legacy_templates is True
+    assert hass._callback_batch == []
     assert hass.config.currency == "EUR"
     assert hass.config.country == "SE"
     assert hass.config.language == "sv"
@@ -4,11 +4,13 @@ from __future__ import annotations
 # pylint: disable=protected-access
 import array
 import asyncio
+from contextvars import ContextVar
 from datetime import datetime, timedelta
 import functools
 import gc
 import logging
 import os
+import threading
 from tempfile import TemporaryDirectory
 from typing import Any
 from unittest.mock import MagicMock, Mock, PropertyMock, patch
@@ -35,11 +37,13 @@ from homeassistant.const import (
 import homeassistant.core as ha
 from homeassistant.core import State
 from homeassistant.exceptions import (
+    HomeAssistantError,
     InvalidEntityFormatError,
     InvalidStateError,
     MaxLengthExceeded,
     ServiceNotFound,
 )
+from homeassistant.helpers.json import json_loads
 import homeassistant.util.dt as dt_util
 from homeassistant.util.read_only_dict import ReadOnlyDict
 from homeassistant.util.unit_system import METRIC_SYSTEM
@@ -66,7 +70,7 @@ def test_split_entity_id():
 
 def test_async_add_hass_job_schedule_callback():
     """Test that we schedule coroutines and add jobs to the job pool."""
-    hass = MagicMock()
+    hass = MagicMock(_callback_batch=None)
     job = MagicMock()
 
     ha.HomeAssistant.async_add_hass_job(hass, ha.HassJob(ha.callback(job)))
@@ -77,7 +81,7 @@ def test_async_add_hass_job_schedule_callback():
 
 def test_async_add_hass_job_schedule_partial_callback():
     """Test that we schedule partial coros and add jobs to the job pool."""
-    hass = MagicMock()
+    hass = MagicMock(_callback_batch=None)
     job = MagicMock()
     partial = functools.partial(ha.callback(job))
 
@@ -87,6 +91,67 @@ def test_async_add_hass_job_schedule_partial_callback():
     assert len(hass.add_job.mock_calls) == 0
 
 
+async def test_async_add_hass_job_batched_callbacks(hass):
+    """Test callbacks scheduled in the same loop iteration run in one batch."""
+    calls = []
+
+    @ha.callback
+    def job(value):
+        calls.append(value)
+        if value == "first":
+            hass.async_add_hass_job(ha.HassJob(job), "next batch")
+
+    @ha.callback
+    def failing_job():
+        raise ValueError("Boom")
+
+    hass.async_batch_callbacks()
+    with patch.object(
+        hass.loop, "call_soon", wraps=hass.loop.call_soon
+    ) as call_soon, patch.object(
+        hass.loop, "call_exception_handler"
+    ) as call_exception_handler:
+        hass.async_add_hass_job(ha.HassJob(job), "first")
+        hass.async_add_hass_job(ha.HassJob(failing_job))
+        hass.async_add_hass_job(ha.HassJob(job), "second")
+        assert len(call_soon.mock_calls) == 1
+        await asyncio.sleep(0)
+        assert calls == ["first", "second"]
+        await asyncio.sleep(0)
+
+    assert calls == ["first", "second", "next batch"]
+    assert isinstance(
+        call_exception_handler.mock_calls[0][1][0]["exception"], ValueError
+    )
+
+    hass.async_batch_callbacks(False)
+    hass.async_add_hass_job(ha.HassJob(job), "unbatched")
+    await asyncio.sleep(0)
+    assert calls[-1] == "unbatched"
+
+
+async def test_async_add_hass_job_batched_callbacks_context(hass):
+    """Test batched callbacks run in the context they were added in."""
+    var: ContextVar[str] = ContextVar("var", default="unset")
+    seen = []
+
+    @ha.callback
+    def job(value):
+        seen.append(var.get())
+        var.set(value)
+
+    hass.async_batch_callbacks()
+    var.set("first")
+    hass.async_add_hass_job(ha.HassJob(job), "changed")
+    var.set("second")
+    hass.async_add_hass_job(ha.HassJob(job), "changed")
+    await asyncio.sleep(0)
+
+    assert seen == ["first", "second"]
+    assert var.get() == "second"
+    hass.async_batch_callbacks(False)
+
+
 def test_async_add_hass_job_schedule_coroutinefunction(event_loop):
     """Test that we schedule coroutines and add jobs to the job pool."""
     hass = MagicMock(loop=MagicMock(wraps=event_loop))
@@ -292,6 +357,56 @@ async def test_async_add_job_pending_tasks_executor(hass):
     assert len(call_count) == 2
 
 
+async def test_async_add_executor_pool_job(hass):
+    """Test jobs in an executor pool are not delayed by the jobs of other pools."""
+    release = threading.Event()
+
+    def blocking_job():
+        release.wait(5)
+        return threading.current_thread().name
+
+    pool = hass.async_get_executor_pool("slow_cloud", 1)
+    blocked = [
+        hass.async_add_executor_pool_job("slow_cloud", blocking_job) for _ in range(2)
+    ]
+    assert hass.async_get_executor_pool("slow_cloud") is pool
+    assert pool.stats.submitted == 2
+
+    thread_name = await hass.async_add_executor_pool_job(
+        "local_io", threading.current_thread
+    )
+    assert thread_name.name.startswith("SyncWorker_local_io")
+    assert not any(job.done() for job in blocked)
+
+    release.set()
+    assert [await job for job in blocked][0].startswith("SyncWorker_slow_cloud")
+    assert pool.stats.completed == 2
+    assert pool.stats.as_dict()["queued"] == 0
+    assert pool.stats.max_wait_time > 0
+    assert set(hass.async_executor_pools()) == {"slow_cloud", "local_io"}
+
+    await hass.async_stop()
+    assert hass.async_executor_pools() == {}
+    assert hass.async_get_executor_pool("slow_cloud") is None
+    # Jobs run in the default executor once the pools are shut down
+    assert await hass.async_add_executor_pool_job("slow_cloud", lambda: 1) == 1
+
+
+async def test_executor_pool_max_workers(hass):
+    """Test the workers of an executor pool are set when it is created."""
+    assert (
+        await hass.async_add_executor_pool_job(
+            "single", threading.current_thread, max_workers=1
+        )
+    ).name.startswith("SyncWorker_single")
+    assert hass.async_get_executor_pool("single")._max_workers == 1
+    assert hass.async_get_executor_pool("single", 4)._max_workers == 1
+    assert (
+        hass.async_get_executor_pool("default")._max_workers
+        == ha.DEFAULT_EXECUTOR_POOL_MAX_WORKERS
+    )
+
+
 async def test_async_add_job_pending_tasks_callback(hass):
     """Run a callback in pending tasks."""
     call_count = []
@@ -400,6 +515,75 @@ def test_state_as_dict():
     assert state.as_dict() is as_dict_1
 
 
+def test_state_as_json():
+    """Test the cached JSON representations of a State."""
+    last_time = datetime(1984, 12, 8, 12, 0, 0)
+    state = ha.State(
+        "happy.happy",
+        "on",
+        {"pig": "dog"},
+        last_updated=last_time,
+        last_changed=last_time,
+        context=ha.Context(id="01G0BTRAH05SHF0NW2XTGB8ZZG"),
+    )
+    as_dict_json = state.as_dict_json
+    assert json_loads(as_dict_json) == state.as_dict()
+    assert state.as_dict_json is as_dict_json
+
+    compressed_state = {
+        "s": "on",
+        "a": {"pig": "dog"},
+        "c": "01G0BTRAH05SHF0NW2XTGB8ZZG",
+        "lc": last_time.timestamp(),
+    }
+    assert state.as_compressed_state == compressed_state
+    assert state.as_compressed_state is state.as_compressed_state
+    with pytest.raises(RuntimeError):
+        state.as_compressed_state["s"] = "off"
+    assert json_loads(state.as_compressed_state_json) == compressed_state
+    assert state.as_compressed_state_json is state.as_compressed_state_json
+
+    assert state.attributes_json == b'{"pig":"dog"}'
+    assert state.attributes_json is state.attributes_json
+
+    # Expiring the state keeps the serialized context
+    state.expire()
+    assert state.as_dict_json is as_dict_json
+    assert json_loads(as_dict_json) == state.as_dict()
+
+
+def test_state_as_compressed_state_with_context_and_last_updated():
+    """Test the compressed State with a full context and a later update."""
+    last_changed = datetime(1984, 12, 8, 11, 0, 0)
+    last_updated = datetime(1984, 12, 8, 12, 0, 0)
+    context = ha.Context(id="01G0BTRAH05SHF0NW2XTGB8ZZG", user_id="user")
+    state = ha.State(
+        "happy.happy",
+        "on",
+        last_changed=last_changed,
+        last_updated=last_updated,
+        context=context,
+    )
+    assert state.as_compressed_state == {
+        "s": "on",
+        "a": {},
+        "c": context.as_dict(),
+        "lc": last_changed.timestamp(),
+        "lu": last_updated.timestamp(),
+    }
+    with pytest.raises(RuntimeError):
+        state.as_compressed_state["c"]["user_id"] = "other"
+
+
+def test_state_as_json_not_serializable():
+    """Test the JSON of a State that can not be serialized is not cached."""
+    state = ha.State("happy.happy", "on", {"pig": object()})
+    for name in ("as_dict_json", "as_compressed_state_json", "attributes_json"):
+        for _ in range(2):
+            with pytest.raises(TypeError):
+                getattr(state, name)
+
+
 async def test_eventbus_add_remove_listener(hass):
     """Test remove_listener method."""
     old_count = len(hass.bus.async_listeners())
@@ -466,6 +650,148 @@ async def test_eventbus_run_immediately(hass):
     unsub()
 
 
+async def test_eventbus_dispatch_follows_listener_changes(hass):
+    """Test the listeners run for an event type are updated when listeners change."""
+    calls = []
+
+    @ha.callback
+    def listener(event):
+        """Mock listener."""
+        calls.append(("test", event.event_type))
+
+    @ha.callback
+    def match_all_listener(event):
+        """Mock listener for all events."""
+        calls.append((MATCH_ALL, event.event_type))
+
+    unsub = hass.bus.async_listen("test", listener, run_immediately=True)
+    hass.bus.async_fire("test")
+    assert calls == [("test", "test")]
+
+    calls.clear()
+    unsub_match_all = hass.bus.async_listen(
+        MATCH_ALL, match_all_listener, run_immediately=True
+    )
+    hass.bus.async_fire("test")
+    hass.bus.async_fire("other")
+    hass.bus.async_fire(EVENT_HOMEASSISTANT_CLOSE)
+    # The listeners for all events run first and never for the close event
+    assert calls == [(MATCH_ALL, "test"), ("test", "test"), (MATCH_ALL, "other")]
+
+    calls.clear()
+    unsub()
+    hass.bus.async_fire("test")
+    assert calls == [(MATCH_ALL, "test")]
+
+    calls.clear()
+    unsub_match_all()
+    hass.bus.async_fire("test")
+    assert calls == []
+
+
+async def test_eventbus_listener_removed_while_firing(hass):
+    """Test removing a listener while an event is dispatched does not skip others."""
+    calls = []
+
+    @ha.callback
+    def listener(event):
+        """Mock listener."""
+        calls.append(1)
+        unsub()
+
+    @ha.callback
+    def listener2(event):
+        """Mock listener."""
+        calls.append(2)
+
+    unsub = hass.bus.async_listen("test", listener, run_immediately=True)
+    hass.bus.async_listen("test", listener2, run_immediately=True)
+    hass.bus.async_fire("test")
+    hass.bus.async_fire("test")
+    assert calls == [1, 2, 2]
+
+
+async def test_eventbus_fire_without_listeners(hass):
+    """Test no event is created when nobody listens unless it is an origin."""
+    context = ha.Context()
+    with patch.object(ha._LOGGER, "isEnabledFor", return_value=False), patch.object(
+        ha, "Event", wraps=ha.Event
+    ) as mock_event:
+        hass.bus.async_fire("no_listeners")
+        assert mock_event.call_count == 0
+
+        hass.bus.async_fire("no_listeners", context=context)
+        assert mock_event.call_count == 1
+        assert context.origin_event is not None
+
+        hass.bus.async_fire("no_listeners", context=context)
+        assert mock_event.call_count == 1
+
+
+async def test_eventbus_listen_state_changed(hass):
+    """Test listening for state changes of entities and domains."""
+    calls = []
+
+    @ha.callback
+    def entity_listener(event):
+        """Mock listener for an entity."""
+        calls.append(("entity", event.data["entity_id"]))
+
+    @ha.callback
+    def domain_listener(event):
+        """Mock listener for a domain."""
+        calls.append(("domain", event.data["entity_id"]))
+
+    unsub_entity = hass.bus.async_listen_state_changed(
+        entity_listener, entity_ids=["light.kitchen", "switch.one"]
+    )
+    unsub_domain = hass.bus.async_listen_state_changed(
+        domain_listener,
+        entity_ids=["light.kitchen", "sensor.one"],
+        domains=["light"],
+        run_immediately=True,
+    )
+    assert hass.bus.async_listeners()[EVENT_STATE_CHANGED] == 1
+
+    hass.states.async_set("light.kitchen", "on")
+    hass.states.async_set("light.bedroom", "on")
+    hass.states.async_set("switch.one", "on")
+    hass.states.async_set("sensor.one", "on")
+    hass.states.async_set("sensor.two", "on")
+    # Listeners that run immediately do not wait for call_soon
+    assert calls == [
+        ("domain", "light.kitchen"),
+        ("domain", "light.bedroom"),
+        ("domain", "sensor.one"),
+    ]
+    await hass.async_block_till_done()
+    assert calls[3:] == [("entity", "light.kitchen"), ("entity", "switch.one")]
+
+    calls.clear()
+    unsub_domain()
+    hass.states.async_set("light.kitchen", "off")
+    hass.states.async_set("light.bedroom", "off")
+    await hass.async_block_till_done()
+    assert calls == [("entity", "light.kitchen")]
+
+    unsub_entity()
+    assert EVENT_STATE_CHANGED not in hass.bus.async_listeners()
+    assert hass.bus._state_changed_entity_listeners == {}
+    assert hass.bus._state_changed_domain_listeners == {}
+
+
+async def test_eventbus_listen_state_changed_run_immediately_not_callback(hass):
+    """Test listening for state changes with a coroutine that runs immediately."""
+
+    async def listener(event):
+        """Mock listener."""
+
+    with pytest.raises(HomeAssistantError):
+        hass.bus.async_listen_state_changed(
+            listener, entity_ids=["light.kitchen"], run_immediately=True
+        )
+
+
 async def test_eventbus_unsubscribe_listener(hass):
     """Test unsubscribe listener from returned function."""
     calls = []
@@ -700,6 +1026,49 @@ async def test_statemachine_entity_ids(hass):
     assert states == ["light.bowl", "switch.ac"]
 
 
+async def test_statemachine_domain_filter(hass):
+    """Test the domain filtered methods and views of the state machine."""
+    hass.states.async_set("light.bowl", "on", {})
+    hass.states.async_set("switch.ac", "off", {})
+    hass.states.async_set("light.kitchen", "off", {})
+    domain_states = hass.states.async_domain_states("LIGHT")
+    assert dict(domain_states) == {
+        "light.bowl": hass.states.get("light.bowl"),
+        "light.kitchen": hass.states.get("light.kitchen"),
+    }
+    with pytest.raises(TypeError):
+        domain_states["light.other"] = hass.states.get("light.bowl")
+
+    assert hass.states.async_entity_ids("Light") == ["light.bowl", "light.kitchen"]
+    assert hass.states.async_entity_ids(["switch", "light", "switch"]) == [
+        "switch.ac",
+        "light.bowl",
+        "light.kitchen",
+    ]
+    assert hass.states.async_entity_ids_count("light") == 2
+    assert hass.states.async_entity_ids_count(["light", "switch", "sensor"]) == 3
+    assert [state.entity_id for state in hass.states.async_all(["switch"])] == [
+        "switch.ac"
+    ]
+
+    hass.states.async_set("light.bowl", "off", {})
+    hass.states.async_remove("light.kitchen")
+    # The view reflects the changes
+    assert list(domain_states) == ["light.bowl"]
+    assert domain_states["light.bowl"].state == "off"
+    assert hass.states.async_all("light") == [hass.states.get("light.bowl")]
+
+    hass.states.async_remove("light.bowl")
+    assert hass.states.async_entity_ids("light") == []
+    assert hass.states.async_all("light") == []
+    assert hass.states.async_entity_ids_count("light") == 0
+    assert not domain_states
+    assert hass.states.async_entity_ids_count("sensor") == 0
+    assert hass.states.async_domain_states("sensor") == {}
+    # Unknown domains do not get a bucket
+    assert "sensor" not in hass.states._domain_states
+
+
 async def test_statemachine_remove(hass):
     """Test remove method."""
     hass.states.async_set("light.bowl", "on", {})
@@ -763,6 +1132,25 @@ async def test_statemachine_force_update(hass):
     assert len(events) == 1
 
 
+async def test_statemachine_shares_unchanged_attributes(hass):
+    """Test unchanged attributes are shared with the previous state."""
+    assert hass.states.async_set("light.bowl", "on", {"brightness": 100})
+    old_state = hass.states.get("light.bowl")
+    attributes_json = old_state.attributes_json
+
+    assert not hass.states.async_set("light.bowl", "on", {"brightness": 100})
+    assert not hass.states.async_set("light.bowl", "on", old_state.attributes)
+    assert hass.states.get("light.bowl") is old_state
+
+    assert hass.states.async_set("light.bowl", "off", {"brightness": 100})
+    new_state = hass.states.get("light.bowl")
+    assert new_state.attributes is old_state.attributes
+    assert new_state.attributes_json is attributes_json
+
+    assert hass.states.async_set("light.bowl", "off", {"brightness": 50})
+    assert hass.states.get("light.bowl").attributes == {"brightness": 50}
+
+
 def test_service_call_repr():
     """Test ServiceCall repr."""
     call = ha.ServiceCall("homeassistant", "start")
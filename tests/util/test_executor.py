@@ -7,7 +7,10 @@ from unittest.mock import patch
 import pytest
 
 from homeassistant.util import executor
-from homeassistant.util.executor import InterruptibleThreadPoolExecutor
+from homeassistant.util.executor import (
+    InterruptibleThreadPoolExecutor,
+    MeasuredThreadPoolExecutor,
+)
 
 
 async def test_executor_shutdown_can_interrupt_threads(caplog):
@@ -89,3 +92,34 @@ async def test_overall_timeout_reached(caplog):
     assert finish - start < 1
 
     iexecutor.shutdown()
+
+
+async def test_measured_executor_stats():
+    """Test the measured executor records how long jobs wait and run."""
+
+    mexecutor = MeasuredThreadPoolExecutor(max_workers=1)
+
+    def _sleep(seconds):
+        time.sleep(seconds)
+        return seconds
+
+    def _fail():
+        raise ValueError
+
+    futures = [mexecutor.submit(_sleep, 0.05), mexecutor.submit(_sleep, seconds=0)]
+    assert [future.result() for future in futures] == [0.05, 0]
+    with pytest.raises(ValueError):
+        mexecutor.submit(_fail).result()
+
+    stats = mexecutor.stats.as_dict()
+    assert stats["submitted"] == 3
+    assert stats["started"] == 3
+    assert stats["completed"] == 3
+    assert stats["queued"] == 0
+    assert stats["running"] == 0
+    assert stats["max_run_time"] >= 0.05
+    assert stats["run_time"] >= stats["max_run_time"]
+    # The second job waited for the first one to finish
+    assert stats["max_wait_time"] >= 0.04
+
+    mexecutor.shutdown()